@@ -1,13 +1,26 @@
+import os
 import numpy as np
 import sys
-from scipy.ndimage import zoom
+from concurrent.futures import ProcessPoolExecutor
+
+from .TrackResampler import TrackResampler
+from .TrackStore import TrackStore
+from .PreprocessingCache import saveEntry, loadEntry
 
 
 class AbstractLoader:
-    def __init__(self, resampleTo, minTrackLength):
+    def __init__(self, resampleTo, minTrackLength, workers=1, resampleMode="spline", dtype=np.float64, storePath=None, statePath=None):
         """ Initialization with basic members.
             Child classes must fill self.trackList, self.dim and 
             self.attributeNames!
+            workers > 1 lets folder-based loaders parse files in a process pool.
+            resampleMode is one of TrackResampler.modes.
+            dtype of the resulting matrices, e.g. np.float32 to halve their memory.
+            storePath: if given, the matrices are written to a TrackStore in this
+            folder (memory-mapped) instead of being allocated in memory.
+            statePath: folder-based loaders that support it (CSV, TGMM) remember
+            their state in this folder and only parse new or changed files in the
+            next run (incremental mode).
         """
         self.trackList = {}
         self.tracksMatrix = np.empty((0))
@@ -16,70 +29,134 @@ class AbstractLoader:
         self.resampleTo = resampleTo
         self.dim = 3
         self.minTrackLength = minTrackLength
+        self.workers = workers
+        self.resampler = TrackResampler(resampleTo, resampleMode)
+        self.dtype = dtype
+        self.storePath = storePath
+        self.store = None
+        self.statePath = statePath
+        self.matrixTrackKeys = []
 
-    def convertTrackListToMatrix(self):
+    def convertTrackListToMatrix(self, trackKeys=None, previous=None):
         """ Converts the internal list (dictionary trackId -> track, where
             each track is an array of [x, y, z, a1, a2, ...]) to
             a numpy array and resizes them to self.resampleTo.
+            The matrices are allocated once, for the tracks that are longer
+            than self.minTrackLength. Tracks of the same length are resampled
+            together.
             Requries self.dim and self.attributeNames to be properly filled.
+            Incremental mode: trackKeys are the ids of all tracks (in the order of
+            the matrices) and previous holds "trackKeys", "tracks" and "attributes"
+            of an earlier conversion. Then self.trackList only holds the new or
+            changed tracks, all others are copied from previous.
         """
-        self.initEmptyTrackMatrix()
-        counterValidTracks = 0
         print("Convert tracks to numpy array")
-        for trackId in self.trackList.keys():
-            track, attributes = self.trackFromListToMatrix(trackId)
-            if len(track) > self.minTrackLength:
-                track, attributes = self.resizeTrack(track, attributes)
-                self.addTrackToMatrix(counterValidTracks,
-                                      track, attributes)
-                self.simpleStatusPrint(counterValidTracks, 50)
-                counterValidTracks += 1
+        trackKeys = list(self.trackList.keys()) if trackKeys is None else trackKeys
+        previousRows = {} if previous is None else {key: row for row, key in enumerate(previous["trackKeys"])}
+        groups = {}
+        copyFrom = []
+        copyTo = []
+        self.matrixTrackKeys = []
+        for trackId in trackKeys:
+            if trackId in self.trackList:
+                length = len(self.trackList[trackId])
+                if length <= self.minTrackLength:
+                    continue
+                groups.setdefault(length, []).append((len(self.matrixTrackKeys), trackId))
+            elif trackId in previousRows:
+                copyFrom.append(previousRows[trackId])
+                copyTo.append(len(self.matrixTrackKeys))
             else:
-                self.shrinkTrackMatrix()
+                continue  # Unchanged and too short
+            self.matrixTrackKeys.append(trackId)
+        self.initEmptyTrackMatrix(len(self.matrixTrackKeys))
+        if len(copyTo) > 0:
+            print("Keep", len(copyTo), "unchanged tracks, resample", len(self.matrixTrackKeys) - len(copyTo))
+        # Bound the temporary memory of resampling to a few 10 MB per batch
+        batchSize = max(1, 2**22 // (self.resampleTo * (3 + len(self.attributeNames))))
+        for start in range(0, len(copyTo), batchSize):
+            self.tracksMatrix[copyTo[start:start + batchSize]] = previous["tracks"][copyFrom[start:start + batchSize]]
+            self.attributesMatrix[copyTo[start:start + batchSize]] = previous["attributes"][copyFrom[start:start + batchSize]]
+        counter = 0
+        for group in groups.values():
+            for start in range(0, len(group), batchSize):
+                batch = group[start:(start + batchSize)]
+                positions = [g[0] for g in batch]
+                tracks = [self.trackFromListToMatrix(g[1]) for g in batch]
+                resampled = self.resampler.resample(np.concatenate(
+                    [np.stack([t[0] for t in tracks]), np.stack([t[1] for t in tracks])], axis=2))
+                self.tracksMatrix[positions] = resampled[:, :, 0:3]
+                self.attributesMatrix[positions] = resampled[:, :, 3:]
+                self.simpleStatusPrint(counter, 10)
+                counter += 1
+        if self.store is not None:
+            self.store.flush()
+            # The raw tracks are not needed anymore
+            self.trackList = {}
         print()
 
     def trackFromListToMatrix(self, index):
-        track = np.zeros((len(self.trackList[index]), 3))
-        attributes = np.zeros(
-            (len(self.trackList[index]), len(self.attributeNames)))
-        for j in range(len(self.trackList[index])):
-            track[j, 0] = self.trackList[index][j][0]
-            track[j, 1] = self.trackList[index][j][1]
-            track[j, 2] = self.trackList[index][j][2]
-            for a in range(len(self.attributeNames)):
-                attributes[j, a] = self.trackList[index][j][self.dim + a]
+        """ Splits a raw track (rows of [x, y, z, a1, a2, ...], either as list of
+            lists or as 2D numpy array) into positions and attributes """
+        rows = np.asarray(self.trackList[index], dtype=np.float64)
+        if rows.size == 0:
+            return np.zeros((0, 3)), np.zeros((0, len(self.attributeNames)))
+        track = rows[:, 0:3]
+        attributes = rows[:, self.dim:(self.dim + len(self.attributeNames))]
         return track, attributes
 
-    def initEmptyTrackMatrix(self):
+    def initEmptyTrackMatrix(self, numTracks):
+        if self.storePath is not None:
+            self.store = TrackStore.create(self.storePath, numTracks, self.resampleTo, self.attributeNames, self.dtype)
+            self.tracksMatrix, self.attributesMatrix = self.store.tracks, self.store.attributes
+            return
         self.tracksMatrix = np.zeros(
-            (len(self.trackList.keys()), self.resampleTo, self.dim))
+            (numTracks, self.resampleTo, self.dim), dtype=self.dtype)
         self.attributesMatrix = np.zeros(
-            (len(self.trackList.keys()), self.resampleTo, len(self.attributeNames)))
+            (numTracks, self.resampleTo, len(self.attributeNames)), dtype=self.dtype)
+
+    def getStateParameters(self):
+        """ Everything the matrices of the incremental mode depend on (besides the files) """
+        return {"resampleTo": self.resampleTo, "minTrackLength": self.minTrackLength,
+                "resampleMode": self.resampler.mode, "dtype": np.dtype(self.dtype).str,
+                "attributeNames": list(self.attributeNames)}
 
-    def addTrackToMatrix(self, position, track, attributes):
-        self.tracksMatrix[position] = track
-        self.attributesMatrix[position] = attributes
+    def loadState(self):
+        """ The state of the previous run in self.statePath (None if there is none),
+            see saveState. Its "tracks" and "attributes" are memory-mapped. """
+        return loadEntry(os.path.join(self.statePath, "loader"), mmapMode="r")
 
-    def shrinkTrackMatrix(self):
-        """ Removes the last column of the track/attribute matrices,
-            e.g. after a track was deleted """
-        self.tracksMatrix = self.tracksMatrix[0:(len(self.tracksMatrix)-1)]
-        self.attributesMatrix = self.attributesMatrix[0:(len(self.attributesMatrix)-1)]
+    def getPreviousMatrices(self, state):
+        """ The state, if its matrices can be reused (see convertTrackListToMatrix),
+            i.e. they were created with the same parameters, otherwise None """
+        if state is None or state["parameters"] != self.getStateParameters():
+            return None
+        return state
+
+    def saveState(self, entry):
+        """ Stores the loader-specific entry (JSON-compatible values and numpy arrays)
+            together with the matrices for the next run in incremental mode """
+        entry = dict(entry)
+        entry.update({"parameters": self.getStateParameters(), "trackKeys": self.matrixTrackKeys,
+                      "tracks": np.asarray(self.tracksMatrix), "attributes": np.asarray(self.attributesMatrix)})
+        os.makedirs(self.statePath, exist_ok=True)
+        saveEntry(os.path.join(self.statePath, "loader"), entry)
 
     def resizeTrack(self, track, attributes):
-        scale = float(self.resampleTo) / len(track)
-        trackZoomed = zoom(track, (scale, 1))
-        attributesZoomed = zoom(attributes, (scale, 1))
-        if len(trackZoomed) != self.resampleTo:
-            print("Warning: Unexpected length after resampling:", len(trackZoomed))
-
-        # Copy first and last to always keep original start and end points,
-        # avoiding interpolation artifacts.
-        trackZoomed[0] = track[0]
-        attributesZoomed[0] = attributes[0]
-        trackZoomed[-1] = track[-1]
-        attributesZoomed[-1] = attributes[-1]
-        return trackZoomed, attributesZoomed
+        """ Resamples a single track (and its attributes) to self.resampleTo """
+        resampled = self.resampler.resample(np.concatenate([track, attributes], axis=1)[None])[0]
+        return resampled[:, 0:3], resampled[:, 3:]
+
+    def mapFiles(self, function, filenames):
+        """ Applies function (must be picklable, i.e. defined on module level) to
+            each file. With self.workers > 1 the files are handled by a process
+            pool. Either way, results are yielded in the order of filenames. """
+        if self.workers <= 1 or len(filenames) <= 1:
+            yield from map(function, filenames)
+            return
+        chunksize = max(1, min(64, len(filenames) // (self.workers * 4)))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield from pool.map(function, filenames, chunksize=chunksize)
 
     def simpleStatusPrint(self, i=1, sparse=1):
         """ Prints a star (*) if for each call (or only if i % sparse == 0, to only print 
@@ -1,9 +1,7 @@
 import os
 import numpy as np
-from scipy.ndimage import zoom
 import json
 import csv
-import sys
 
 from .AbstractLoader import AbstractLoader
 
@@ -14,8 +12,8 @@ class BiotracksLoader(AbstractLoader):
         - a numpy array for attributes, [n_tracks, n_pos_per_track, n_attributes]
         - a list of attribute names, derived from the header or automatically [att0, att1,...] """
 
-    def __init__(self, jsonPath, resampleTo=50, minTrackLength=2, dim=3):
-        super(BiotracksLoader, self).__init__(resampleTo, minTrackLength)
+    def __init__(self, jsonPath, resampleTo=50, minTrackLength=2, dim=3, resampleMode="spline", dtype=np.float64, storePath=None):
+        super(BiotracksLoader, self).__init__(resampleTo, minTrackLength, resampleMode=resampleMode, dtype=dtype, storePath=storePath)
         self.dim = dim
         self.jsonPath = jsonPath # Better a slash too much...
         self.folder = os.path.dirname(jsonPath)
@@ -33,9 +31,15 @@ class BiotracksLoader(AbstractLoader):
         self.objectKeys = {}
         self.objectColumns = {}
         self.linkCollection = {}
+        # Object lists that were already read (several link files may refer to one)
+        self.loadedObjectLists = set()
         self.attributeNames.append("Frame")
-        self.objects = {}
-        self.links = {}
+        # Columnar tables: object ids and their [x, y, z, t] (per object list),
+        # link ids and the object ids they refer to (per link file)
+        self.objectIds = []
+        self.objectValues = []
+        self.linkIds = []
+        self.linkObjects = []
 
     def createFullTracks(self):
         """ Loads all objects (and their unique ID), loads the links (which
@@ -61,46 +65,96 @@ class BiotracksLoader(AbstractLoader):
         objectColumnY = "cmso_y_coord"
         objectColumnZ = "cmso_z_coord"
 
-        # Open objects and store x, y, z, t
-        try:
-            with open(self.objectPaths[objectListName]) as objectFile:
-                objectReader = csv.DictReader(objectFile, delimiter=',')
-                for row in objectReader:
-                    c = [row[objectColumnX], row[objectColumnY]]
-                    if objectColumnZ in row:
-                        c.append(row[objectColumnZ])
-                    else:
-                        c.append(0)
-                    c.append(row[objectColumnTime])
-                    self.objects[row[objectColumnName]] = c
-        except IOError:
-            self.stopBecauseMissingFile(self.objectPaths[objectListName], "object file")
+        # Open objects (once per object list) and store id and x, y, z, t
+        if objectListName not in self.loadedObjectLists:
+            self.loadedObjectLists.add(objectListName)
+            path = self.objectPaths[objectListName]
+            header = self.readHeader(path, "object file")
+            columns = [objectColumnName, objectColumnX, objectColumnY, objectColumnZ, objectColumnTime]
+            if objectColumnZ not in header:
+                columns.remove(objectColumnZ)
+            try:
+                indices = [header.index(c) for c in columns]
+            except ValueError as e:
+                self.stopBecauseError("Missing column in object file " + path + ": " + str(e))
+            # A single pass over the file: ids as strings, coordinates and frame as numbers
+            table = self.readTable(path, "object file", indices,
+                                   np.dtype([("id", object), ("values", np.float64, (len(columns) - 1,))]))
+            values = table["values"]
+            if objectColumnZ not in columns:
+                values = np.insert(values, 2, 0., axis=1)
+            self.objectIds.append(table["id"].astype(str))
+            self.objectValues.append(np.ascontiguousarray(values))
 
         # Get list of links
+        table = self.readTable(self.linkPaths[i], "link file", [0, 1], str)
+        self.linkIds.append(table[:, 0])
+        self.linkObjects.append(table[:, 1])
+
+    def readHeader(self, path, description):
         try:
-            with open(self.linkPaths[i]) as linkFile:
-                linkReader = csv.reader(linkFile, delimiter=',')
-                next(linkReader, None)  # skip header
-                for row in linkReader:
-                    if not row[0] in self.links:
-                        self.links[row[0]] = []
-                    self.links[row[0]].append(row[1])
+            with open(path) as f:
+                return next(csv.reader([f.readline()], delimiter=','), [])
         except IOError:
-            self.stopBecauseMissingFile(self.linkPaths[i], "link file")
+            self.stopBecauseMissingFile(path, description)
 
-    def buildTracks(self):
+    def readTable(self, path, description, columns, dtype):
+        """ Reads the given columns (indices) of a csv file, without its header, into
+            a 2D array [n_rows, n_columns] of the given type (or, for a structured
+            dtype, a 1D array of records) """
         try:
-            with open(self.trackPath) as trackFile:
-                trackReader = csv.reader(trackFile, delimiter=',')
-                next(trackReader, None)  # skip header
-
-                for row in trackReader:
-                    if not row[0] in self.trackList:
-                        self.trackList[row[0]] = []
-                    for p in self.links[row[1]]:
-                        self.trackList[row[0]].append(self.objects[p])
+            with open(path) as f:
+                table = np.loadtxt(f, dtype=dtype, delimiter=',', quotechar='"', skiprows=1,
+                                   usecols=columns, ndmin=1)
+                return table if table.dtype.names is not None else table.reshape((-1, len(columns)))
         except IOError:
-            self.stopBecauseMissingFile(self.trackPath, "track file")
+            self.stopBecauseMissingFile(path, description)
+        except ValueError as e:
+            self.stopBecauseError("Invalid " + description + " " + path + ": " + str(e))
+
+    def buildTracks(self):
+        """ Joins tracks -> links -> objects with sorted lookups and groups the
+            resulting points by track (in order of appearance), sorted by frame """
+        table = self.readTable(self.trackPath, "track file", [0, 1], str)
+        trackIds = table[:, 0]
+        trackLinks = table[:, 1]
+        if len(self.linkIds) == 0 or len(trackIds) == 0:
+            return
+
+        # All links of a track row, in the order they were listed
+        linkIds = np.concatenate(self.linkIds)
+        linkOrder = np.argsort(linkIds, kind="stable")
+        linkIds = linkIds[linkOrder]
+        starts = np.searchsorted(linkIds, trackLinks, side="left")
+        counts = np.searchsorted(linkIds, trackLinks, side="right") - starts
+        if np.any(counts == 0):
+            self.stopBecauseError("Unknown link in track file: " + str(trackLinks[counts == 0][0]))
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        pointObjects = np.concatenate(self.linkObjects)[linkOrder[offsets]]
+
+        # The objects of these links; if an object id is defined twice, the latest wins
+        objectIds = np.concatenate(self.objectIds)
+        objectOrder = np.argsort(objectIds, kind="stable")
+        objectIds = objectIds[objectOrder]
+        latest = np.ones(len(objectIds), dtype=bool)
+        latest[:-1] = objectIds[1:] != objectIds[:-1]
+        objectIds = objectIds[latest]
+        objectValues = np.concatenate(self.objectValues)[objectOrder[latest]]
+        found = np.minimum(np.searchsorted(objectIds, pointObjects), len(objectIds) - 1)
+        if len(objectIds) == 0 or np.any(objectIds[found] != pointObjects):
+            self.stopBecauseError("Unknown object in link file")
+        points = objectValues[found]
+
+        # Tracks keep the order in which they appear first, points are sorted by frame
+        names, firstRow, inverse = np.unique(trackIds, return_index=True, return_inverse=True)
+        rank = np.empty(len(names), dtype=np.int64)
+        rank[np.argsort(firstRow)] = np.arange(len(names))
+        pointTracks = np.repeat(rank[inverse], counts)
+        order = np.lexsort((points[:, 3], pointTracks))
+        points = points[order]
+        bounds = np.searchsorted(pointTracks[order], np.arange(len(names) + 1))
+        for t, name in enumerate(names[np.argsort(firstRow)]):
+            self.trackList[str(name)] = points[bounds[t]:bounds[t + 1]]
 
     def analyzeSettingFile(self, path):
         self.trackPath = self.folder + "/tracks.csv"
@@ -0,0 +1,120 @@
+import zlib
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Compressor:
+    """ Incremental compression with formats the viewer can inflate (pako):
+        - "zlib": zlib stream (the former --zip format)
+        - "gzip": gzip stream
+        - "deflate": raw deflate stream, without header and checksum
+        With threads > 1, the data is split into blocks of blockSize bytes that are
+        compressed in parallel (like pigz: each block is primed with the last 32 KB
+        of the previous one and ends byte-aligned). The result is a single regular
+        stream, just slightly larger. Use compress() for each piece of data and
+        flush() for the rest; bytesIn, bytesOut and duration collect statistics. """
+
+    codecs = ["zlib", "gzip", "deflate"]
+    windowBits = {"zlib": 15, "gzip": 31, "deflate": -15}
+
+    def __init__(self, codec="zlib", level=6, threads=1, blockSize=2**20):
+        if codec not in self.codecs:
+            raise ValueError("Unknown codec " + str(codec) + ", use one of " + str(self.codecs))
+        if not 0 <= level <= 9:
+            raise ValueError("Compression level must be between 0 and 9, not " + str(level))
+        self.codec = codec
+        self.level = level
+        self.threads = threads
+        self.blockSize = blockSize
+        self.bytesIn = 0
+        self.bytesOut = 0
+        self.duration = 0.
+        if threads <= 1:
+            self.compressor = zlib.compressobj(level, zlib.DEFLATED, self.windowBits[codec])
+        else:
+            self.pool = ThreadPoolExecutor(threads)
+            self.pending = []
+            self.buffer = bytearray()
+            self.dictionary = b""
+            self.checksum = 1 if codec == "zlib" else 0
+            self.header = self.getHeader()
+
+    def compress(self, data):
+        """ Compresses the next piece of data, returns what is ready so far """
+        start = time.time()
+        self.bytesIn += len(data)
+        if self.threads <= 1:
+            result = self.compressor.compress(data)
+        else:
+            self.buffer += data
+            while len(self.buffer) >= self.blockSize:
+                self.submitBlock(bytes(self.buffer[:self.blockSize]), False)
+                del self.buffer[:self.blockSize]
+            # Limit the number of blocks in memory
+            result = self.collectBlocks(2 * self.threads)
+        return self.account(result, start)
+
+    def flush(self):
+        """ Finishes the stream, returns the remaining compressed data """
+        start = time.time()
+        if self.threads <= 1:
+            result = self.compressor.flush()
+        else:
+            self.submitBlock(bytes(self.buffer), True)
+            self.buffer = bytearray()
+            result = self.collectBlocks(0) + self.getTrailer()
+            self.pool.shutdown()
+        return self.account(result, start)
+
+    def compressAll(self, data):
+        """ Compresses a complete payload """
+        return self.compress(data) + self.flush()
+
+    def account(self, result, start):
+        self.bytesOut += len(result)
+        self.duration += time.time() - start
+        return result
+
+    def submitBlock(self, block, last):
+        if self.codec == "zlib":
+            self.checksum = zlib.adler32(block, self.checksum)
+        elif self.codec == "gzip":
+            self.checksum = zlib.crc32(block, self.checksum)
+        self.pending.append(self.pool.submit(compressBlock, block, self.dictionary, self.level, last))
+        self.dictionary = (self.dictionary + block)[-32768:]
+
+    def collectBlocks(self, keep):
+        """ Returns the compressed blocks (in order), until at most keep are pending """
+        result = [self.header]
+        self.header = b""
+        while len(self.pending) > keep:
+            result.append(self.pending.pop(0).result())
+        return b"".join(result)
+
+    def getHeader(self):
+        if self.codec == "zlib":
+            levelFlag = 0 if self.level < 2 else 1 if self.level < 6 else 2 if self.level == 6 else 3
+            flags = levelFlag << 6
+            return bytes([0x78, flags + 31 - (0x7800 + flags) % 31])
+        if self.codec == "gzip":
+            extraFlag = 2 if self.level == 9 else 4 if self.level == 1 else 0
+            return bytes([0x1f, 0x8b, 8, 0, 0, 0, 0, 0, extraFlag, 255])
+        return b""
+
+    def getTrailer(self):
+        if self.codec == "zlib":
+            return struct.pack(">I", self.checksum)
+        if self.codec == "gzip":
+            return struct.pack("<II", self.checksum, self.bytesIn & 0xffffffff)
+        return b""
+
+
+def compressBlock(block, dictionary, level, last):
+    """ Raw deflate of a block, continuing the window of the previous block. Only the
+        last block closes the stream, all others end with a sync flush (byte-aligned). """
+    if len(dictionary) > 0:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
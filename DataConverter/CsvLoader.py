@@ -1,34 +1,64 @@
 import csv
 import os
+import functools
+import numpy as np
 
 from .AbstractLoader import AbstractLoader
+from .PreprocessingCache import getFileFingerprint
 
 
 class CsvLoader(AbstractLoader):
     """ A helper to load a folder of CSV files and to represent it by:
         - a numpy array for the positions, [n_tracks, n_pos_per_track, 3 (x/y/z)]
         - a numpy array for attributes, [n_tracks, n_pos_per_track, n_attributes]
-        - a list of attribute names, derived from the header or automatically [att0, att1,...] 
+        - a list of attribute names, derived from the header or automatically [att0, att1,...]
+        With statePath (incremental mode), only new or changed files are read and
+        resampled in later runs, the tracks of all other files are kept.
     """
 
-    def __init__(self, folderWithCSVs, resampleTo=50, minTrackLength=2, firstLineIsHeader=True, csvSeparator=",", dim=3):
-        super(CsvLoader, self).__init__(resampleTo, minTrackLength)
+    def __init__(self, folderWithCSVs, resampleTo=50, minTrackLength=2, firstLineIsHeader=True, csvSeparator=",", dim=3, workers=1, resampleMode="spline", dtype=np.float64, storePath=None, statePath=None):
+        super(CsvLoader, self).__init__(resampleTo, minTrackLength, workers, resampleMode, dtype, storePath, statePath)
         self.csvSeparator = csvSeparator
         self.firstLineIsHeader = firstLineIsHeader
+        self.previousMatrices = None
         self.loadCsvs(folderWithCSVs)
-        self.convertTrackListToMatrix()
+        self.convertTrackListToMatrix(self.trackKeys, self.previousMatrices)
+        if self.statePath is not None:
+            self.saveState({"files": self.files})
 
     def loadCsvs(self, folder):
-        """ Calls the loading-function for each csv file """
-        counter = 0
-        for filename in sorted(os.listdir(folder)):
-            if filename.endswith(".csv"):
-                if counter == 0:
-                    self.analyzeHeader(folder + "/" + filename)
-                self.handleCsv(folder + "/" + filename, counter)
-                counter += 1
+        """ Calls the loading-function for each csv file (in parallel, if workers > 1) """
+        filenames = [folder + "/" + f for f in sorted(os.listdir(folder)) if f.endswith(".csv")]
+        if len(filenames) > 0:
+            self.analyzeHeader(filenames[0])
+        # Each file is a track, named by the file
+        self.trackKeys = [os.path.basename(f) for f in filenames]
+        if self.statePath is not None:
+            filenames = self.findChangedFiles(filenames)
+        reader = functools.partial(readCsv, csvSeparator=self.csvSeparator,
+                                   firstLineIsHeader=self.firstLineIsHeader)
+        try:
+            for counter, (filename, track) in enumerate(zip(filenames, self.mapFiles(reader, filenames))):
+                self.simpleStatusPrint(counter, 50)
+                self.trackList[os.path.basename(filename)] = track
+        except IOError as e:
+            self.stopBecauseMissingFile(e.filename, "csv file")
+        except ValueError as e:
+            self.stopBecauseError("Could not parse csv file " + str(e))
         print()
 
+    def findChangedFiles(self, filenames):
+        """ The files that are new or changed since the previous run (in incremental
+            mode), or all files if the previous matrices cannot be reused """
+        self.files = [getFileFingerprint(f) for f in filenames]
+        self.previousMatrices = self.getPreviousMatrices(self.loadState())
+        if self.previousMatrices is None:
+            return filenames
+        known = set(tuple(f) for f in self.previousMatrices["files"])
+        changed = [name for name, fingerprint in zip(filenames, self.files) if tuple(fingerprint) not in known]
+        print("Read", len(changed), "new or changed of", len(filenames), "files")
+        return changed
+
     def analyzeHeader(self, filename):
         try:
             with open(filename) as f:
@@ -42,16 +72,33 @@ class CsvLoader(AbstractLoader):
         except IOError:
             self.stopBecauseMissingFile(filename, "csv file")
 
-    def handleCsv(self, filename, counter):
+
+def readCsv(filename, csvSeparator=",", firstLineIsHeader=True):
+    """ Reads a whole csv file in one go into a 2D numpy array [n_pos, n_columns].
+        Whitespace separators are treated like csv.reader with skipinitialspace,
+        i.e. consecutive blanks count as one separator. Files that np.loadtxt
+        cannot handle (e.g. quoted numbers) are read with the csv module instead.
+        Module-level function, so that it can be sent to worker processes. """
+    delimiter = None if csvSeparator.isspace() else csvSeparator
+    with open(filename) as f:
         try:
-            with open(filename) as f:
-                self.trackList[counter] = []
-                self.simpleStatusPrint(counter, 50)
-                objectReader = csv.reader(f, delimiter=self.csvSeparator, skipinitialspace=True)
-                # skip first line if it's a header
-                if self.firstLineIsHeader:
-                    row = next(objectReader)
-                for row in objectReader:
-                    self.trackList[counter].append([float(x) for x in row])
-        except IOError:
-            self.stopBecauseMissingFile(filename, "csv file")
\ No newline at end of file
+            # comments=None: "#" is not special in csv files
+            return np.loadtxt(f, delimiter=delimiter, skiprows=(1 if firstLineIsHeader else 0),
+                              ndmin=2, dtype=np.float64, comments=None)
+        except ValueError:
+            pass
+    return readCsvRows(filename, csvSeparator, firstLineIsHeader)
+
+
+def readCsvRows(filename, csvSeparator=",", firstLineIsHeader=True):
+    """ Slow path of readCsv: parses the rows with csv.reader, which handles
+        quoting, and converts each value with float() """
+    with open(filename, newline="") as f:
+        objectReader = csv.reader(f, delimiter=csvSeparator, skipinitialspace=True)
+        if firstLineIsHeader:
+            next(objectReader, None)
+        try:
+            rows = [[float(x) for x in row] for row in objectReader if len(row) > 0]
+            return np.array(rows, dtype=np.float64, ndmin=2).reshape((len(rows), -1))
+        except ValueError as e:
+            raise ValueError(filename + ": " + str(e))
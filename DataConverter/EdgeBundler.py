@@ -1,11 +1,13 @@
-import os
 import math
+import itertools
 import random
-import copy
 import sys
 import numpy as np
 import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from scipy.ndimage import zoom
+from .EdgeBundlerSession import EdgeBundlerSession
 
 
 TYPEF = np.float64
@@ -45,6 +47,12 @@ class EdgeBundler:
         self.quickBundleIterations = 20
         self.bundlingIterations = 15
         self.chunkSize = 10000  # number of calculations per CL-call
+        self.workers = 1  # number of processes of the CPU backend
+        self.useGridIndex = True  # CPU backend: find neighbours with a grid instead of comparing whole clusters
+        self.clusterSeeding = "kmeans++"  # or "strided"
+        self.clusterSeed = 0  # random seed of the k-means++ seeding
+        self.clusterMode = "full"  # or "hierarchical"
+        self.clusterMemoryBudget = 2**26  # bytes for the distance matrices of the clustering
         self.scale = 1.
 
     def initOclParameters(self):
@@ -73,11 +81,41 @@ class EdgeBundler:
             By default, we use 20 iterations and a step size of 0.5 """
         self.bundlingIterations = val
 
+    def setWorkers(self, val):
+        """ Number of processes used by runEdgeBundlingCpu. The tracks are shared
+            between the processes (shared memory), each one works on chunks of tracks. """
+        self.workers = val
+
+    def setGridIndex(self, val):
+        """ If True (default), the CPU backend finds the points within the magnet
+            radius with a grid index (roughly linear costs) instead of comparing all
+            points of a cluster (quadratic in the cluster size). Results are the same. """
+        self.useGridIndex = val
+
     def setClusterIterations(self, val):
         """ Number of iterations for the initial subdivision of the data. After
             10-20 iterations, usually nothing changes anymore. """
         self.quickBundleIterations = val
 
+    def setClusterSeeding(self, val, seed=0):
+        """ How the clustering picks its initial mean tracks: "kmeans++" (default,
+            random tracks far apart from each other, reproducible by seed) or
+            "strided" (every n-th track, as in earlier versions). """
+        if val not in ["kmeans++", "strided"]:
+            raise ValueError("Unknown cluster seeding " + str(val) + ", use kmeans++ or strided")
+        self.clusterSeeding = val
+        self.clusterSeed = seed
+
+    def setClusterMode(self, val, memoryBudget=2**26):
+        """ "full" (default) clusters all tracks against all clusters. "hierarchical"
+            clusters coarsely first (mini-batches) and then refines within the coarse
+            clusters, for millions of tracks. memoryBudget bounds the distance
+            matrices (in bytes), work is split into blocks accordingly. """
+        if val not in ["full", "hierarchical"]:
+            raise ValueError("Unknown cluster mode " + str(val) + ", use full or hierarchical")
+        self.clusterMode = val
+        self.clusterMemoryBudget = memoryBudget
+
     def simpleStatusPrint(self, i=1, sparse=1):
         """ Prints a star (*) if for each call (or only if i % sparse == 0, to only print 
             every sparse^th), makes a line break every 50 """
@@ -116,28 +154,22 @@ class EdgeBundler:
     def prepareOpenClData(self, cl):
         """ Prepare the data (tracks, clusters) by copying into OpenCl-readable layout """
         # We first care about tracks and what points belong to them
-        self.oclFiberStarts = np.array([self.trackLength * x for x in range(len(self.tracksNp))], dtype=TYPEI)
-        self.oclFiberLengths = np.array([self.trackLength for x in range(len(self.tracksNp))], dtype=TYPEI)
+        numTracks = len(self.tracksNp)
+        self.oclFiberStarts = np.arange(numTracks, dtype=TYPEI) * self.trackLength
+        self.oclFiberLengths = np.full(numTracks, self.trackLength, dtype=TYPEI)
         cl.oclPoints = self.trackNpToNpOpenCl4D(self.tracksNp)
-        pointCounter = len(self.tracksNp) * self.trackLength
 
         # The result array is just the same like the input. Since the result might only fill some 
         # (sparse) positions, we have to initialize the result with all the original points.
-        cl.oclPointsResult = copy.deepcopy(cl.oclPoints)
+        cl.oclPointsResult = cl.oclPoints.copy()
 
-        # Now we store clusters and their relation to the tracks
-        self.oclClusterIndices = np.empty(0, dtype=TYPEI)
-        self.oclClusterInverse = np.zeros(shape=(len(self.tracksNp)), dtype=TYPEI)
-        self.oclClusterStarts = np.empty(0, dtype=TYPEI)
-        self.oclClusterLengths = np.empty(0, dtype=TYPEI)
-        trackCounter = 0
-        for c in range(len(self.clusters)):
-            self.oclClusterStarts = np.append(self.oclClusterStarts, trackCounter)
-            self.oclClusterLengths = np.append(self.oclClusterLengths, len(self.clusters[c]))
-            for i in range(len(self.clusters[c])):
-                self.oclClusterIndices = np.append(self.oclClusterIndices, self.clusters[c][i])
-                self.oclClusterInverse[self.clusters[c][i]] = c
-            trackCounter += len(self.clusters[c])
+        # Now we store clusters (one after another) and their relation to the tracks
+        self.oclClusterLengths = np.array([len(c) for c in self.clusters], dtype=TYPEI)
+        self.oclClusterStarts = (np.cumsum(self.oclClusterLengths) - self.oclClusterLengths).astype(TYPEI)
+        self.oclClusterIndices = np.concatenate(self.clusters + [np.empty(0, dtype=TYPEI)]).astype(TYPEI)
+        self.oclClusterInverse = np.zeros(numTracks, dtype=TYPEI)
+        self.oclClusterInverse[self.oclClusterIndices] = np.repeat(np.arange(len(self.clusters), dtype=TYPEI),
+                                                                   self.oclClusterLengths)
 
     def printPrepareOpenClSummary(self, cl):
         """ Just some debug output """
@@ -151,13 +183,13 @@ class EdgeBundler:
         """ Converts to respective c-like floats/ints. This step is performed separately, which 
             allows easy adjustment of the values with python-types beforehand (meaning, the user
             doesn't have to care about using proper types when he/she sets up parameters) """
-        # Array-like structures
-        cl.oclFiberStarts = np.array(self.oclFiberStarts, dtype=np.int32)
-        cl.oclFiberLengths = np.array(self.oclFiberLengths, dtype=np.int32)
-        cl.oclClusterStarts = np.array(self.oclClusterStarts, dtype=np.int32)
-        cl.oclClusterLengths = np.array(self.oclClusterLengths, dtype=np.int32)
-        cl.oclClusterIndices = np.array(self.oclClusterIndices, dtype=np.int32)
-        cl.oclClusterInverse = np.array(self.oclClusterInverse, dtype=np.int32)
+        # Array-like structures (only copied if they are not int32 arrays yet)
+        cl.oclFiberStarts = np.ascontiguousarray(self.oclFiberStarts, dtype=np.int32)
+        cl.oclFiberLengths = np.ascontiguousarray(self.oclFiberLengths, dtype=np.int32)
+        cl.oclClusterStarts = np.ascontiguousarray(self.oclClusterStarts, dtype=np.int32)
+        cl.oclClusterLengths = np.ascontiguousarray(self.oclClusterLengths, dtype=np.int32)
+        cl.oclClusterIndices = np.ascontiguousarray(self.oclClusterIndices, dtype=np.int32)
+        cl.oclClusterInverse = np.ascontiguousarray(self.oclClusterInverse, dtype=np.int32)
         # Scalar values; For copy-and-paste reasons they are handled as array, too, since
         # openCl doesn't care anyway (in OpenCL we receive pointers only)
         cl.oclMagnetRadius = np.array([self.magnetRadius * self.scale], dtype=np.float32)
@@ -204,31 +236,29 @@ class EdgeBundler:
         cl.oclSmoothIntensityBuf = pyopencl.Buffer(
             cl.ctx, cl.mf.READ_ONLY | cl.mf.COPY_HOST_PTR, hostbuf=cl.oclSmoothIntensity)
 
-    def getChunkSizes(self):
+    def getChunkSizes(self, chunkSize=None):
         """ Splits the workload into chunks that are processed separately. Reason: too many 
             items at once can make the GPU crash. Furthermore we have more frequent status
             updates this way """
-        num = math.floor(len(self.tracksNp) / self.chunkSize)
-        remainder = len(self.tracksNp) % self.chunkSize
-        return [self.chunkSize] * num + [remainder]
+        chunkSize = self.chunkSize if chunkSize is None else chunkSize
+        num = math.floor(len(self.tracksNp) / chunkSize)
+        remainder = len(self.tracksNp) % chunkSize
+        return [chunkSize] * num + ([remainder] if remainder > 0 else [])
 
     def postProcessOpenCl(self, cl):
         """ Check the results and convert them back to the array structure """
-        totalCounter = 0
         print("Convert data back")
-        for t in range(len(self.tracksBundledNp)):
-            for i in range(self.trackLength):
-                self.tracksBundledNp[t, i, 0] = cl.oclPoints[totalCounter][0]
-                self.tracksBundledNp[t, i, 1] = cl.oclPoints[totalCounter][1]
-                self.tracksBundledNp[t, i, 2] = cl.oclPoints[totalCounter][2]
-                totalCounter += 1
-
-    def prepareOpenCl(self, cl):
-        """ Create the basic OpenCL structures """
-        import pyopencl as pyopencl
-        cl.ctx = pyopencl.create_some_context()
-        cl.queue = pyopencl.CommandQueue(cl.ctx)
-        cl.mf = pyopencl.mem_flags
+        self.tracksBundledNp[:, :, 0:3] = self.openClPointsToTracks(cl)
+
+    def openClPointsToTracks(self, cl):
+        """ The positions of the (host) float4 points as [n_tracks, n_pos, 3] """
+        return float4View(cl.oclPoints)[:, 0:3].reshape((len(self.tracksNp), self.trackLength, 3))
+
+    def prepareOpenCl(self, cl, session):
+        """ Create the basic OpenCL structures (context and queue of the session) """
+        cl.ctx = session.ctx
+        cl.queue = session.queue
+        cl.mf = session.mf
         self.prepareOpenClData(cl)
         self.printPrepareOpenClSummary(cl)
         self.prepareOpenClBuffers(cl)
@@ -237,103 +267,238 @@ class EdgeBundler:
         """ Retrieve the results from here """
         return self.tracksBundledNp
 
-    def runEdgeBundlingOpenCl(self):
-        """ The whole magic! """
+    def runEdgeBundlingOpenCl(self, session=None):
+        """ The whole magic! Pass an EdgeBundlerSession to reuse the OpenCL context
+            and the compiled kernels of previous runs. """
         if self.bundlingIterations == 0:
             return
 
+        if session is None:
+            session = EdgeBundlerSession()
         cl = EdgeBundlerClComponents()
         self.quickBundles()
-        self.prepareOpenCl(cl)
-        chunkSizes = self.getChunkSizes()
+        self.prepareOpenCl(cl, session)
         startTime = time.time()
-        import pyopencl as pyopencl
+        self.runOpenClIterations(cl, session, self.bundlingIterations)
+        print("Finished edge bundling after", time.time() - startTime)
+        self.postProcessOpenCl(cl)
 
-        sourceCode = ""
-        with open(os.path.dirname(os.path.realpath(__file__))+'/EdgeBundlerKernel.cl', 'r') as sourceCodeFile:
-            sourceCode = sourceCodeFile.read()
-        # How to add flags, like constants: .build(options=['-D', "WINDOW=111",...])
-        prg = pyopencl.Program(cl.ctx, sourceCode).build()
-        print("Run edge bundling in ", (self.bundlingIterations * len(chunkSizes)), "iterations: ")
-        for i in range(self.bundlingIterations):
+    def runOpenClIterations(self, cl, session, iterations, snapshotIterations=[]):
+        """ Runs the kernels on the buffers of cl for the given number of iterations,
+            the result is read back to cl.oclPoints. Returns a copy of the tracks after
+            each iteration (counted from 1) in snapshotIterations. """
+        import pyopencl as pyopencl
+        chunkSizes = self.getChunkSizes()
+        snapshots = []
+        print("Run edge bundling in ", (iterations * len(chunkSizes)), "iterations: ")
+        for i in range(iterations):
             # Step 1: edge bundling (piecewise, to avoid freezes and to provide better status updates)
             offset = 0
             for j in range(len(chunkSizes)):
                 self.simpleStatusPrint(i * len(chunkSizes) + j)
                 numThreads = chunkSizes[j]
-                offsetInt32 = np.array(offset, dtype=np.int32)
-                cl.oclOffsetBuf = pyopencl.Buffer(cl.ctx, cl.mf.READ_ONLY | cl.mf.COPY_HOST_PTR, hostbuf=offsetInt32)
-                prg.skeletonize(cl.queue, [numThreads], None,
-                                cl.oclFiberStartsBuf,
-                                cl.oclFiberLengthsBuf,
-                                cl.oclClusterStartsBuf,
-                                cl.oclClusterLengthsBuf,
-                                cl.oclClusterIndicesBuf,
-                                cl.oclClusterInverseBuf,
-                                cl.oclPointsBuf,
-                                cl.oclPointsResultBuf,
-                                cl.oclMagnetRadiusBuf,
-                                cl.oclStepsizeBuf,
-                                cl.oclAngleMinBuf,
-                                cl.oclAngleStickBuf,
-                                cl.oclOffsetBuf,
-                                cl.oclBundleEndPointsBuf)
+                session.skeletonize(cl.queue, [numThreads], None,
+                                    cl.oclFiberStartsBuf,
+                                    cl.oclFiberLengthsBuf,
+                                    cl.oclClusterStartsBuf,
+                                    cl.oclClusterLengthsBuf,
+                                    cl.oclClusterIndicesBuf,
+                                    cl.oclClusterInverseBuf,
+                                    cl.oclPointsBuf,
+                                    cl.oclPointsResultBuf,
+                                    cl.oclMagnetRadiusBuf,
+                                    cl.oclStepsizeBuf,
+                                    cl.oclAngleMinBuf,
+                                    cl.oclAngleStickBuf,
+                                    np.int32(offset),
+                                    cl.oclBundleEndPointsBuf)
                 offset += chunkSizes[j]
 
-            # Step 2: move result to input slot
-            pyopencl.enqueue_copy(cl.queue, cl.oclPoints,
-                                  cl.oclPointsResultBuf)
-            pyopencl.enqueue_copy(cl.queue, cl.oclPointsBuf, cl.oclPoints)
+            # Step 2: move result to input slot (on the device)
+            pyopencl.enqueue_copy(cl.queue, cl.oclPointsBuf, cl.oclPointsResultBuf)
 
             # Step 3: smoothing (piecewise, to avoid freezes and to provide better status updates)
             offset = 0
             for j in range(len(chunkSizes)):
                 numThreads = chunkSizes[j]
-                offsetInt32 = np.array(offset, dtype=np.int32)
-                cl.oclOffsetBuf = pyopencl.Buffer(
-                    cl.ctx, cl.mf.READ_ONLY | cl.mf.COPY_HOST_PTR, hostbuf=offsetInt32)
-                prg.smooth(cl.queue, [numThreads], None,
-                           cl.oclFiberStartsBuf,
-                           cl.oclFiberLengthsBuf,
-                           cl.oclPointsBuf,
-                           cl.oclPointsResultBuf,
-                           cl.oclSmoothRadiusBuf,
-                           cl.oclSmoothIntensityBuf,
-                           cl.oclOffsetBuf)
+                session.smooth(cl.queue, [numThreads], None,
+                               cl.oclFiberStartsBuf,
+                               cl.oclFiberLengthsBuf,
+                               cl.oclPointsBuf,
+                               cl.oclPointsResultBuf,
+                               cl.oclSmoothRadiusBuf,
+                               cl.oclSmoothIntensityBuf,
+                               np.int32(offset))
                 offset += chunkSizes[j]
 
             # Step 4: again, move result to input slot
-            pyopencl.enqueue_copy(cl.queue, cl.oclPoints, cl.oclPointsResultBuf)
-            pyopencl.enqueue_copy(cl.queue, cl.oclPointsBuf, cl.oclPoints)
+            pyopencl.enqueue_copy(cl.queue, cl.oclPointsBuf, cl.oclPointsResultBuf)
+
+            # Only the snapshots and the final result are read back to the host
+            if i + 1 in snapshotIterations or i + 1 == iterations:
+                pyopencl.enqueue_copy(cl.queue, cl.oclPoints, cl.oclPointsBuf)
+            if i + 1 in snapshotIterations:
+                snapshots.append(self.openClPointsToTracks(cl).astype(self.tracksNp.dtype))
         print(" ")  # Newline after status prints
+        return snapshots
+
+    def runEdgeBundlingCpu(self):
+        """ Same as runEdgeBundlingOpenCl, but computed with numpy on the CPU (no
+            OpenCL required). Follows the kernels (EdgeBundlerKernel.cl) step by step,
+            including their float32 positions. With workers > 1, the chunks are
+            processed by a pool of processes that share the input and result
+            buffers (like oclPoints/oclPointsResult) via shared memory. """
+        if self.bundlingIterations == 0:
+            return
 
+        self.quickBundles()
+        startTime = time.time()
+        parameters = self.getCpuParameters(self.magnetRadius, self.stepsize)
+        result = self.runCpuBackend(lambda mapChunks, chunkSizes: self.runCpuIterations(
+            mapChunks, chunkSizes, parameters, self.bundlingIterations, [self.bundlingIterations]))
         print("Finished edge bundling after", time.time() - startTime)
-        self.postProcessOpenCl(cl)
+        self.tracksBundledNp[:, :, 0:3] = result[0]
+
+    def getCpuParameters(self, magnetRadius, stepsize):
+        return (magnetRadius * self.scale, stepsize, self.bundleEndPoints,
+                int(self.smoothRadius), self.smoothIntensity, self.useGridIndex)
+
+    def runCpuBackend(self, work):
+        """ Sets up the input/result buffers of the CPU backend (with workers > 1 in
+            shared memory, with a pool of processes) and returns the result of
+            work(mapChunks, chunkSizes). work finds the buffers in bundlingData. """
+        shape = (len(self.tracksNp), self.trackLength, 3)
+        if self.workers <= 1:
+            points = np.array(self.tracksNp[:, :, 0:3], dtype=np.float32)
+            setBundlingData(points, points.copy(), self.clusters, self.clustersReverse)
+            try:
+                return work(map, self.getChunkSizes())
+            finally:
+                setBundlingData(None, None, None, None)
+
+        size = int(np.prod(shape)) * np.dtype(np.float32).itemsize
+        buffers = [shared_memory.SharedMemory(create=True, size=max(size, 1)) for i in range(2)]
+        points = pointsResult = None
+        try:
+            points, pointsResult = [np.ndarray(shape, dtype=np.float32, buffer=b.buf) for b in buffers]
+            points[:] = self.tracksNp[:, :, 0:3]
+            pointsResult[:] = points
+            setBundlingData(points, pointsResult, self.clusters, self.clustersReverse)
+            # Several chunks per process, to balance the load
+            chunkSize = min(self.chunkSize, max(1, math.ceil(shape[0] / (4 * self.workers))))
+            with ProcessPoolExecutor(self.workers, initializer=attachBundlingData,
+                                     initargs=([b.name for b in buffers], shape, self.clusters,
+                                               self.clustersReverse)) as pool:
+                return work(pool.map, self.getChunkSizes(chunkSize))
+        finally:
+            # The buffers can only be released without any array still using them
+            setBundlingData(None, None, None, None)
+            points = pointsResult = None
+            for b in buffers:
+                b.close()
+                b.unlink()
+
+    def runCpuIterations(self, mapChunks, chunkSizes, parameters, iterations, snapshotIterations=[]):
+        """ The iterations of runEdgeBundlingCpu, mapChunks applies runBundlingChunk
+            to the chunks (either directly or in worker processes). Returns a copy of
+            the tracks after each iteration (counted from 1) in snapshotIterations. """
+        points = bundlingData["points"]
+        pointsResult = bundlingData["pointsResult"]
+        offsets = np.cumsum([0] + chunkSizes[:-1]).tolist()
+        numChunks = len(chunkSizes)
+        snapshots = []
+        print("Run edge bundling (CPU) in ", (iterations * numChunks), "iterations: ")
+        for i in range(iterations):
+            # Step 1: edge bundling, chunk by chunk (like the OpenCL kernel calls)
+            for j, done in enumerate(mapChunks(runBundlingChunk, ["skeletonize"] * numChunks, offsets, chunkSizes,
+                                               [parameters] * numChunks)):
+                self.simpleStatusPrint(i * numChunks + j)
+
+            # Step 2: move result to input slot
+            points[:] = pointsResult
+
+            # Step 3: smoothing
+            for done in mapChunks(runBundlingChunk, ["smooth"] * numChunks, offsets, chunkSizes, [parameters] * numChunks):
+                pass
+
+            # Step 4: again, move result to input slot
+            points[:] = pointsResult
+            if i + 1 in snapshotIterations:
+                snapshots.append(points.astype(self.tracksNp.dtype))
+        print(" ")  # Newline after status prints
+        return snapshots
+
+    def runParameterSweep(self, magnetRadii=None, stepsizes=None, snapshotIterations=None, backend="cpu", session=None):
+        """ Bundles the tracks with every combination of magnetRadii and stepsizes
+            (default: the current values). The tracks are clustered and the buffers
+            are prepared (uploaded) only once. Each setting starts from the original
+            tracks and runs max(snapshotIterations) iterations (default:
+            bundlingIterations), a copy of the tracks is kept after each iteration in
+            snapshotIterations. Returns a list of (name, tracks) for all settings and
+            snapshots, e.g. for WebGlToolBuilder.addTrajectoryDatasetState. """
+        magnetRadii = [self.magnetRadius] if magnetRadii is None else magnetRadii
+        stepsizes = [self.stepsize] if stepsizes is None else stepsizes
+        snapshotIterations = sorted(set([self.bundlingIterations] if snapshotIterations is None else snapshotIterations))
+        snapshotIterations = [i for i in snapshotIterations if i > 0]
+        if len(snapshotIterations) == 0:
+            raise ValueError("A parameter sweep needs at least one snapshot after 1 or more iterations")
+        settings = list(itertools.product(magnetRadii, stepsizes))
+        iterations = snapshotIterations[-1]
+        print("Parameter sweep with", len(settings), "settings and snapshots after", snapshotIterations, "iterations")
+
+        self.quickBundles()
+        startTime = time.time()
+        if backend == "opencl":
+            snapshots = self.runOpenClSweep(settings, iterations, snapshotIterations, session)
+        else:
+            def work(mapChunks, chunkSizes):
+                result = []
+                for magnetRadius, stepsize in settings:
+                    bundlingData["points"][:] = self.tracksNp[:, :, 0:3]
+                    bundlingData["pointsResult"][:] = bundlingData["points"]
+                    result.append(self.runCpuIterations(mapChunks, chunkSizes, self.getCpuParameters(magnetRadius, stepsize),
+                                                        iterations, snapshotIterations))
+                return result
+            snapshots = self.runCpuBackend(work)
+        print("Finished parameter sweep after", time.time() - startTime)
+
+        results = []
+        for (magnetRadius, stepsize), settingSnapshots in zip(settings, snapshots):
+            for numIterations, tracks in zip(snapshotIterations, settingSnapshots):
+                bundled = self.tracksNp.copy()
+                bundled[:, :, 0:3] = tracks
+                name = "bundled r=" + format(magnetRadius, ".3g") + " s=" + format(stepsize, ".3g") + " i=" + str(numIterations)
+                results.append((name, bundled))
+        return results
+
+    def runOpenClSweep(self, settings, iterations, snapshotIterations, session=None):
+        """ The OpenCL part of runParameterSweep: the points are uploaded once (and
+            copied on the device for each setting), only the magnet radius and the
+            step size are uploaded per setting """
+        import pyopencl as pyopencl
+        if session is None:
+            session = EdgeBundlerSession()
+        cl = EdgeBundlerClComponents()
+        self.prepareOpenCl(cl, session)
+        initialPointsBuf = pyopencl.Buffer(cl.ctx, cl.mf.READ_ONLY | cl.mf.COPY_HOST_PTR, hostbuf=cl.oclPoints)
+        snapshots = []
+        for magnetRadius, stepsize in settings:
+            cl.oclMagnetRadius[:] = magnetRadius * self.scale
+            cl.oclStepsize[:] = stepsize
+            pyopencl.enqueue_copy(cl.queue, cl.oclMagnetRadiusBuf, cl.oclMagnetRadius)
+            pyopencl.enqueue_copy(cl.queue, cl.oclStepsizeBuf, cl.oclStepsize)
+            pyopencl.enqueue_copy(cl.queue, cl.oclPointsBuf, initialPointsBuf)
+            pyopencl.enqueue_copy(cl.queue, cl.oclPointsResultBuf, initialPointsBuf)
+            snapshots.append(self.runOpenClIterations(cl, session, iterations, snapshotIterations))
+        return snapshots
 
     def trackNpToNpOpenCl4D(self, tracks):
-        """ Creates cl-typed array and fills it with track positions """
+        """ Creates cl-typed array (one float4 per point, w = 0) and fills it with
+            the track positions in a single copy """
         import pyopencl.array as cl_array
-        npa = np.zeros((len(tracks), self.trackLength),
-                       dtype=cl_array.vec.float4)
-        for i in range(len(tracks)):
-            for p in range(self.trackLength):
-                npa[i, p][0] = tracks[i, p, 0]
-                npa[i, p][1] = tracks[i, p, 1]
-                npa[i, p][2] = tracks[i, p, 2]
-        return npa.flatten()
-
-    def calculateMeanTracksNumpy(self, tracks, clusters):
-        """ Calculates the mean of a number of tracks. Works only for equally sized tracks. """
-        meanTracks = np.zeros((self.numClusters, self.quickBundleLength, 3))
-        meanTrackCounter = [0] * len(meanTracks)
-        i = 0
-        for t in range(len(tracks)):
-            meanTrackCounter[clusters[i]] += 1.
-            ratio = 1. / float(meanTrackCounter[clusters[i]])
-            meanTracks[clusters[i]] = (
-                1. - ratio) * meanTracks[clusters[i]] + ratio * tracks[i]
-            i += 1
-        return meanTracks
+        npa = np.zeros(len(tracks) * self.trackLength, dtype=cl_array.vec.float4)
+        float4View(npa)[:, 0:3] = tracks[:, :, 0:3].reshape((-1, 3))
+        return npa
 
     def distanceBetweenTracks(self, t1, t2):
         """ Sum of distances between the points of two tracks (pairwise
@@ -344,55 +509,95 @@ class EdgeBundler:
         return dist
 
     def quickBundles(self):
-        """ Simple clustering based on spatial proximity """
-        # Some loop variables
-        print("Performing clustering in",
-              self.quickBundleIterations, "iterations: ")
-
+        """ Simple clustering based on spatial proximity (k-means on tracks resampled
+            to quickBundleLength points). In "hierarchical" mode, the tracks are first
+            clustered coarsely and then refined within the coarse clusters, which is
+            much cheaper for huge numbers of tracks. Work is split into blocks, so that
+            distance matrices stay within clusterMemoryBudget bytes. """
         targetScale = float(self.quickBundleLength) / float(self.trackLength)
         tracksQb = zoom(self.tracksNp, (1, targetScale, 1))
+        vectors = tracksQb.reshape((len(tracksQb), -1)).astype(np.float64)
+        numClusters = min(self.numClusters, len(vectors))
+        rng = np.random.default_rng(self.clusterSeed)
+        # Distances and dot products of a block, both float64
+        maxValuesPerBlock = max(1, self.clusterMemoryBudget // 16)
 
-        clusters = [[] for i in range(self.numClusters)]
-        # Actually we want to have it all filled -
-        clustersReverse = list(range(len(self.tracksNp)))
-
-        # Put a streamline to each clusters
-        fillStepsize = int(len(tracksQb) / self.numClusters)
-        meanTracks = np.zeros((self.numClusters, self.quickBundleLength, 3))
-        for i in range(self.numClusters):
-            meanTracks[i] = tracksQb[i * fillStepsize]
-
-        clusterSizesDebug = []
-        for i in range(len(clusters)):
-            clusterSizesDebug.append(len(clusters[i]))
-
         start = time.time()
-        for i in range(self.quickBundleIterations):
-            self.simpleStatusPrint(i)
-            clusters = [[] for i in range(self.numClusters)]
-
-            for t in range(len(tracksQb)):
-                bestIndex = -1
-
-                # Create an array only filled with n times the track of interest (track t)
-                trackRepeated = np.zeros_like(meanTracks)
-                for ii in range(len(trackRepeated)):
-                    trackRepeated[ii] = tracksQb[t]
-
-                diff = np.sum(np.sum(np.square(trackRepeated - meanTracks), axis=2), axis=1)
-                bestIndex = np.argmin(diff)
-                clusters[bestIndex].append(t)
-                clustersReverse[t] = bestIndex
-            meanTracks = self.calculateMeanTracksNumpy(tracksQb, clustersReverse)
-            clusterSizesDebug = []
-            for ii in range(len(clusters)):
-                clusterSizesDebug.append(len(clusters[ii]))
-            print("After iteration", i, ", cluster sizes:", clusterSizesDebug)
+        if self.clusterMode == "hierarchical":
+            clustersReverse, meanTracks = self.hierarchicalClustering(vectors, numClusters, rng, maxValuesPerBlock)
+        else:
+            print("Performing clustering in at most",
+                  self.quickBundleIterations, "iterations: ")
+            clustersReverse, meanTracks = self.kMeans(vectors, numClusters, rng, maxValuesPerBlock, verbose=True)
+        clusterSizes = np.bincount(clustersReverse, minlength=len(meanTracks))
+        print("Finished clustering of", len(vectors), "tracks into", len(meanTracks), "clusters after",
+              round(time.time() - start, 3), "s")
+        self.debugMeanTracks = meanTracks.reshape((len(meanTracks), self.quickBundleLength, 3))
+        # Clusters differ in size, so they are kept as list of index arrays
+        order = np.argsort(clustersReverse, kind="stable").astype(TYPEI)
+        self.clusters = np.split(order, np.cumsum(clusterSizes)[:-1])
+        self.clustersReverse = clustersReverse
+
+    def kMeans(self, vectors, numClusters, rng, maxValuesPerBlock, verbose=False):
+        """ Clusters the vectors (flattened tracks) into numClusters clusters. Seeds
+            are chosen by k-means++ (or strided), distances to all mean tracks are
+            computed in blocks of matrix products. Stops early when no track changes
+            its cluster anymore. Returns the cluster of each track and the means. """
+        start = time.time()
+        if self.clusterSeeding == "kmeans++":
+            # Seeding costs n_tracks * n_clusters, so it only looks at a random sample
+            sample = np.sort(rng.permutation(len(vectors))[:32 * numClusters])
+            seeds = sample[seedClustersKMeansPlusPlus(vectors[sample], numClusters, rng)]
+        else:
+            seeds = np.arange(numClusters) * (len(vectors) // numClusters)
+        meanTracks = vectors[seeds]
+        if verbose:
+            print("Seeding (" + self.clusterSeeding + ") took", round(time.time() - start, 3), "s")
+
+        clustersReverse = np.full(len(vectors), -1, dtype=np.int64)
+        for i in range(max(1, self.quickBundleIterations)):
+            iterationStart = time.time()
+            newClustersReverse = assignToClusters(vectors, meanTracks, maxValuesPerBlock)
+            changed = np.count_nonzero(newClustersReverse != clustersReverse)
+            clustersReverse = newClustersReverse
+            meanTracks, clusterSizes = calculateMeanTracks(vectors, clustersReverse, meanTracks)
+            if verbose:
+                print("After iteration", i, ",", changed, "tracks changed their cluster, cluster sizes", clusterSizes.min(),
+                      "-", clusterSizes.max(), "(" + str(round(time.time() - iterationStart, 3)), "s)")
+            if changed == 0:
+                break
+        return clustersReverse, meanTracks
+
+    def hierarchicalClustering(self, vectors, numClusters, rng, maxValuesPerBlock):
+        """ Two-level clustering: mini-batch k-means into about sqrt(numClusters)
+            coarse clusters, then k-means within each of them. The clusters are
+            distributed among the coarse clusters in proportion to their sizes. Per
+            iteration, this costs n_tracks * 2 sqrt(numClusters) distances instead of
+            n_tracks * numClusters. """
+        numCoarse = min(numClusters, math.ceil(math.sqrt(numClusters)))
+        batchSize = min(len(vectors), max(numCoarse, maxValuesPerBlock // numCoarse))
+        # At least quickBundleIterations batches, and enough to see each track about twice
+        numBatches = max(self.quickBundleIterations, 2 * math.ceil(len(vectors) / batchSize))
+        print("Coarse clustering into", numCoarse, "clusters with", numBatches, "mini-batches of", batchSize, "tracks")
+        coarseMeans = miniBatchKMeans(vectors, numCoarse, numBatches, batchSize, rng, maxValuesPerBlock)
+        coarse = assignToClusters(vectors, coarseMeans, maxValuesPerBlock)
+        coarseSizes = np.bincount(coarse, minlength=numCoarse)
+        groups = np.split(np.argsort(coarse, kind="stable"), np.cumsum(coarseSizes)[:-1])
+
+        print("Refining the coarse clusters (sizes", coarseSizes.min(), "-", coarseSizes.max(), "): ")
+        clustersReverse = np.empty(len(vectors), dtype=np.int64)
+        meanTracks = []
+        numRefined = 0
+        for g, (members, k) in enumerate(zip(groups, distributeClusters(numClusters, coarseSizes))):
+            self.simpleStatusPrint(g)
+            if k == 0:
+                continue
+            groupClusters, groupMeans = self.kMeans(vectors[members], k, rng, maxValuesPerBlock)
+            clustersReverse[members] = numRefined + groupClusters
+            meanTracks.append(groupMeans)
+            numRefined += k
         print(" ")
-        print("Finished clustering after", time.time() - start)
-        self.debugMeanTracks = meanTracks
-        self.clusters = np.array(clusters)
-        self.clustersReverse = np.array(clustersReverse)
+        return clustersReverse, np.concatenate(meanTracks)
 
     def plotTracks(self, tracks, clusters=[], alpha=0.2):
         """ Simple 3D plot """
@@ -420,6 +625,282 @@ class EdgeBundler:
         plt.show()
 
 
+def seedClustersKMeansPlusPlus(vectors, numClusters, rng):
+    """ k-means++ seeding: the first seed is random, each further one is picked
+        with a probability proportional to its squared distance to the closest
+        seed so far. Returns the indices of the seeds. """
+    seeds = np.empty(numClusters, dtype=np.int64)
+    seeds[0] = rng.integers(len(vectors))
+    closest = ((vectors - vectors[seeds[0]])**2).sum(axis=1)
+    for i in range(1, numClusters):
+        cumulative = np.cumsum(closest)
+        if cumulative[-1] > 0:
+            seeds[i] = min(np.searchsorted(cumulative, rng.random() * cumulative[-1], side="right"), len(vectors) - 1)
+        else:  # All tracks coincide with seeds
+            seeds[i] = rng.integers(len(vectors))
+        np.minimum(closest, ((vectors - vectors[seeds[i]])**2).sum(axis=1), out=closest)
+    return seeds
+
+
+def assignToClusters(vectors, meanTracks, maxValuesPerBlock=2**22):
+    """ Index of the closest mean track for each track (flattened to vectors).
+        Squared distances are |v|^2 - 2 v.m + |m|^2, |v|^2 does not change the
+        minimum. Blocks of tracks keep the distance matrix below maxValuesPerBlock. """
+    squaredMeans = (meanTracks**2).sum(axis=1)
+    result = np.empty(len(vectors), dtype=np.int64)
+    tracksPerBlock = max(1, maxValuesPerBlock // len(meanTracks))
+    for b in range(0, len(vectors), tracksPerBlock):
+        block = vectors[b:b + tracksPerBlock]
+        result[b:b + tracksPerBlock] = np.argmin(squaredMeans[None, :] - 2. * (block @ meanTracks.T), axis=1)
+    return result
+
+
+def sumPerCluster(vectors, clustersReverse, numClusters):
+    """ Sum of the vectors and number of vectors in each cluster """
+    size = vectors.shape[1]
+    counts = np.bincount(clustersReverse, minlength=numClusters)
+    indices = (clustersReverse[:, None] * size + np.arange(size)[None, :]).reshape(-1)
+    sums = np.bincount(indices, weights=vectors.reshape(-1), minlength=numClusters * size).reshape((numClusters, size))
+    return sums, counts
+
+
+def calculateMeanTracks(vectors, clustersReverse, previousMeans):
+    """ Mean track of each cluster (and the cluster sizes). Empty clusters keep
+        their previous mean track. """
+    sums, counts = sumPerCluster(vectors, clustersReverse, len(previousMeans))
+    meanTracks = previousMeans.copy()
+    nonEmpty = counts > 0
+    meanTracks[nonEmpty] = sums[nonEmpty] / counts[nonEmpty, None]
+    return meanTracks, counts
+
+
+def miniBatchKMeans(vectors, numClusters, numBatches, batchSize, rng, maxValuesPerBlock=2**22):
+    """ Mini-batch k-means: each batch of random tracks pulls the closest means
+        towards its members, with a learning rate of 1 / (tracks seen by the mean).
+        Seeded by k-means++ on a sample. Returns the mean tracks. """
+    sample = rng.permutation(len(vectors))[:32 * numClusters]
+    meanTracks = vectors[sample[seedClustersKMeansPlusPlus(vectors[sample], numClusters, rng)]]
+    seen = np.zeros(numClusters)
+    for i in range(numBatches):
+        batch = vectors[rng.integers(len(vectors), size=batchSize)]
+        sums, counts = sumPerCluster(batch, assignToClusters(batch, meanTracks, maxValuesPerBlock), numClusters)
+        seen += counts
+        nonEmpty = counts > 0
+        meanTracks[nonEmpty] += (sums[nonEmpty] - counts[nonEmpty, None] * meanTracks[nonEmpty]) / seen[nonEmpty, None]
+    return meanTracks
+
+
+def distributeClusters(numClusters, groupSizes):
+    """ Splits numClusters between groups in proportion to their sizes (largest
+        remainder), each non-empty group gets at least one and at most one per track """
+    quota = numClusters * groupSizes / groupSizes.sum()
+    result = np.minimum(np.maximum(np.floor(quota), groupSizes > 0), groupSizes).astype(np.int64)
+    candidates = np.flatnonzero(result < groupSizes)
+    missing = numClusters - result.sum()
+    if missing > 0:
+        result[candidates[np.argsort(result[candidates] - quota[candidates])[:missing]]] += 1
+    return result
+
+
+def float4View(values):
+    """ View of an array of float4 (x, y, z, w) as float32 array [n, 4], no copy """
+    return values.view(np.float32).reshape((-1, 4))
+
+
+# Data of the CPU backend, per process (see setBundlingData)
+bundlingData = {}
+sharedBuffers = []
+
+
+def setBundlingData(points, pointsResult, clusters, clusterInverse):
+    bundlingData["points"] = points
+    bundlingData["pointsResult"] = pointsResult
+    bundlingData["clusters"] = clusters
+    bundlingData["clusterInverse"] = clusterInverse
+
+
+def attachBundlingData(bufferNames, shape, clusters, clusterInverse):
+    """ Initializer of the worker processes: maps the shared input/result buffers """
+    sharedBuffers[:] = [shared_memory.SharedMemory(name=name) for name in bufferNames]
+    points, pointsResult = [np.ndarray(shape, dtype=np.float32, buffer=b.buf) for b in sharedBuffers]
+    setBundlingData(points, pointsResult, clusters, clusterInverse)
+
+
+def runBundlingChunk(step, offset, size, parameters):
+    """ Runs skeletonize or smooth for the tracks offset ... offset + size - 1 """
+    radius, stepsize, bundleEndPoints, smoothRadius, smoothIntensity, useGridIndex = parameters
+    trackIds = np.arange(offset, offset + size)
+    if step == "skeletonize":
+        skeletonizeTracks(bundlingData["points"], bundlingData["pointsResult"], trackIds, bundlingData["clusters"],
+                          bundlingData["clusterInverse"], radius, stepsize, bundleEndPoints, useGridIndex)
+    else:
+        smoothTracks(bundlingData["points"], bundlingData["pointsResult"], trackIds, smoothRadius, smoothIntensity)
+
+
+def skeletonizeTracks(points, pointsResult, trackIds, clusters, clusterInverse, radius, stepsize,
+                      bundleEndPoints, useGridIndex=True, maxValuesPerBlock=2**22):
+    """ CPU version of the skeletonize kernel for the tracks trackIds. points and
+        pointsResult are [n_tracks, n_pos, 3]. Each point is attracted by the closest
+        point of every other track of its cluster within radius (weighted by
+        ((radius - distance) / radius)^2, normalized by 1 + sum of weights). The force
+        is transformed like in transformForcePerpendicular, using the overall
+        direction of the track. Like in the kernel, angleMin/angleStick have no
+        effect. The closest points are either found with a grid index over the
+        cluster (only points in neighbouring cells are compared) or by comparing all
+        points of the cluster. Work is split into blocks of at most maxValuesPerBlock
+        distances. """
+    trackLength = points.shape[1]
+    skip = 1 - bundleEndPoints
+    positions = np.arange(skip, trackLength - skip)
+    if len(trackIds) == 0 or len(positions) == 0:
+        return
+    trackClusters = clusterInverse[trackIds]
+    for c in np.unique(trackClusters):
+        members = clusters[c]
+        candidates = points[members]  # [n_members, n_pos, 3]
+        tracks = trackIds[trackClusters == c]
+        if useGridIndex:
+            grid = buildGrid(candidates.reshape((-1, 3)), radius)
+            tracksPerBlock = len(tracks)  # gridForces splits the work itself
+        else:
+            flatCandidates = candidates.reshape((-1, 3)).astype(np.float64)
+            squaredCandidates = (flatCandidates**2).sum(axis=1)
+            tracksPerBlock = max(1, maxValuesPerBlock // (len(positions) * len(flatCandidates)))
+        for b in range(0, len(tracks), tracksPerBlock):
+            blockTracks = tracks[b:b + tracksPerBlock]
+            myPositions = points[blockTracks][:, positions].reshape((-1, 3))
+            if useGridIndex:
+                force = gridForces(myPositions, candidates, grid, radius, maxValuesPerBlock)
+            else:
+                force = denseForces(myPositions, candidates, flatCandidates, squaredCandidates, radius)
+
+            directions = np.repeat(overallDirections(points[blockTracks]), len(positions), axis=0)
+            force = transformForcesPerpendicular(directions, force)
+            result = myPositions + np.float32(stepsize) * force
+            pointsResult[blockTracks[:, None], positions[None, :]] = result.reshape((len(blockTracks), len(positions), 3))
+
+
+def denseForces(myPositions, candidates, flatCandidates, squaredCandidates, radius):
+    """ Forces on myPositions [n, 3], comparing each of them with all candidate points """
+    numMembers, trackLength = candidates.shape[0], candidates.shape[1]
+    # Closest point of each member track (squared distances via dot products)
+    q = myPositions.astype(np.float64)
+    squaredDistances = (q**2).sum(axis=1)[:, None] + squaredCandidates[None, :] - 2. * (q @ flatCandidates.T)
+    closest = np.argmin(squaredDistances.reshape((len(q), numMembers, trackLength)), axis=2)
+    vectors = candidates[np.arange(numMembers)[None, :], closest] - myPositions[:, None, :]
+    distances = np.sqrt((vectors**2).sum(axis=2))
+    weights = np.where((distances <= radius) & (distances > 0.),
+                       ((radius - distances) / radius)**2, 0.).astype(np.float32)
+    return (weights[:, :, None] * vectors).sum(axis=1) / (1. + weights.sum(axis=1))[:, None]
+
+
+# The 27 cells around (and including) a cell
+neighbourCells = np.array(list(itertools.product((-1, 0, 1), repeat=3)), dtype=np.int64)
+
+
+def buildGrid(flatCandidates, radius):
+    """ Sorts the points [n, 3] into cubic cells (of size radius, if possible), so
+        that all points within radius of a position lie in its 27 surrounding cells """
+    origin = flatCandidates.min(axis=0).astype(np.float64)
+    extent = flatCandidates.max(axis=0) - origin
+    # Larger cells for tiny radii, the cell ids must fit into int64
+    cellSize = max(radius, extent.max() / 2**20, 1e-30)
+    dims = np.floor(extent / cellSize).astype(np.int64) + 1
+    keys = getCellKeys(np.floor((flatCandidates - origin) / cellSize).astype(np.int64), dims)
+    order = np.argsort(keys, kind="stable")
+    return origin, cellSize, dims, order, keys[order]
+
+
+def getCellKeys(cells, dims):
+    return (cells[..., 0] * dims[1] + cells[..., 1]) * dims[2] + cells[..., 2]
+
+
+def gridForces(myPositions, candidates, grid, radius, maxValuesPerBlock):
+    """ Same as denseForces, but only points in the surrounding cells of a position
+        are compared. If the closest point of a track is within radius, it is one of
+        them; tracks without such a point have no influence anyway. """
+    force = np.zeros_like(myPositions)
+    if radius <= 0 or len(myPositions) == 0:
+        return force
+    origin, cellSize, dims, order, sortedKeys = grid
+    numMembers, trackLength = candidates.shape[0], candidates.shape[1]
+    flatCandidates = candidates.reshape((-1, 3))
+    cells = np.floor((myPositions - origin) / cellSize).astype(np.int64)
+    neighbours = cells[:, None, :] + neighbourCells[None, :, :]
+    valid = ((neighbours >= 0) & (neighbours < dims)).all(axis=2)
+    keys = getCellKeys(neighbours, dims)
+    starts = np.searchsorted(sortedKeys, keys, side="left")
+    counts = np.where(valid, np.searchsorted(sortedKeys, keys, side="right") - starts, 0)
+
+    # Split the positions, so that at most maxValuesPerBlock pairs are compared at once
+    pairsPerPosition = np.cumsum(counts.sum(axis=1))
+    begin = 0
+    while begin < len(myPositions):
+        done = pairsPerPosition[begin - 1] if begin > 0 else 0
+        end = max(begin + 1, np.searchsorted(pairsPerPosition, done + maxValuesPerBlock, side="right"))
+        blockCounts = counts[begin:end].reshape(-1)
+        total = blockCounts.sum()
+        positionIds = np.repeat(np.repeat(np.arange(begin, end), len(neighbourCells)), blockCounts)
+        pointIds = order[np.arange(total) - np.repeat(np.cumsum(blockCounts) - blockCounts, blockCounts) +
+                         np.repeat(starts[begin:end].reshape(-1), blockCounts)]
+        squaredDistances = ((flatCandidates[pointIds] - myPositions[positionIds]).astype(np.float64)**2).sum(axis=1)
+        near = squaredDistances <= (radius * (1. + 1e-5))**2
+        positionIds, pointIds, squaredDistances = positionIds[near], pointIds[near], squaredDistances[near]
+
+        # Closest point per (position, member track), first one in case of equal distances
+        group = (positionIds - begin) * numMembers + pointIds // trackLength
+        sort = np.lexsort((pointIds, squaredDistances, group))
+        first = sort[np.r_[True, group[sort][1:] != group[sort][:-1]]] if len(sort) > 0 else sort
+        positionIds, pointIds = positionIds[first], pointIds[first]
+
+        vectors = flatCandidates[pointIds] - myPositions[positionIds]
+        distances = np.sqrt((vectors**2).sum(axis=1))
+        weights = np.where((distances <= radius) & (distances > 0.),
+                           ((radius - distances) / radius)**2, 0.).astype(np.float32)
+        local = positionIds - begin
+        weightSum = 1. + np.bincount(local, weights, minlength=end - begin)
+        for d in range(3):
+            force[begin:end, d] = np.bincount(local, weights * vectors[:, d], minlength=end - begin) / weightSum
+        begin = end
+    return force
+
+
+def overallDirections(tracks):
+    """ Normalized vector from first to last position of each track (0 if both are equal) """
+    directions = tracks[:, -1] - tracks[:, 0]
+    lengths = np.sqrt((directions**2).sum(axis=1))[:, None]
+    return np.divide(directions, lengths, out=np.zeros_like(directions), where=lengths > 0)
+
+
+def transformForcesPerpendicular(directions, forces):
+    """ Vectorized transformForcePerpendicular of the kernel. Note, like there, t is
+        always made negative, so only forces against the direction lose their
+        tangential part, forces along it get it doubled. """
+    lengths = np.sqrt((forces**2).sum(axis=1))[:, None]
+    normalized = np.divide(forces, lengths, out=np.zeros_like(forces), where=lengths > 0)
+    t = (directions * normalized).sum(axis=1)[:, None]
+    t = np.where(t > 0., -t, t)
+    normalized = normalized - t * directions
+    normalized = np.where(((forces * normalized).sum(axis=1) < 0)[:, None], -normalized, normalized)
+    return np.where(lengths > 0, lengths * normalized, forces)
+
+
+def smoothTracks(points, pointsResult, trackIds, radius, intensity):
+    """ CPU version of the smooth kernel: inner positions are blended (by intensity)
+        with the mean of their neighbours within radius (positions along the track) """
+    if radius == 0 or intensity < 0.001 or len(trackIds) == 0:
+        return
+    trackLength = points.shape[1]
+    inner = np.arange(1, trackLength - 1)
+    first = np.maximum(0, inner - radius)
+    last = np.minimum(trackLength - 1, inner + radius)
+    tracks = points[trackIds]
+    cumulative = np.zeros((len(trackIds), trackLength + 1, 3))
+    np.cumsum(tracks, axis=1, out=cumulative[:, 1:])
+    mean = (cumulative[:, last + 1] - cumulative[:, first]) / (last - first + 1)[None, :, None]
+    pointsResult[trackIds[:, None], inner[None, :]] = mean * intensity + tracks[:, inner] * (1. - intensity)
+
+
 class EdgeBundlerClComponents:
     """ Contains data/buffers that are only relevant for opencl. """
 
@@ -436,7 +917,6 @@ class EdgeBundlerClComponents:
         self.oclStepsizeBuf = 0
         self.oclAngleMinBuf = 0
         self.oclAngleStickBuf = 0
-        self.oclOffsetBuf = 0
         self.oclBundleEndPointsBuf = 0
         self.ctx = 0
         self.oclFiberStarts = 0
@@ -169,12 +169,12 @@ __kernel void skeletonize(
     __global const float *stepsize,
     __global const float *angleMin,
     __global const float *angleStick,
-    __global const int *offset,
+    int offset,
     __global const int *bundleEndPoints)
 {
     // Orientation phase - who am I, to which clusters do I belong,
     // who are my colleagues?
-    int slId = get_global_id(0) + *offset;
+    int slId = get_global_id(0) + offset;
     int clusterId = clusterInverse[slId];
     int fiberStart = fiberStarts[slId];
     int fiberLength = fiberLengths[slId];
@@ -263,7 +263,7 @@ __kernel void smooth(
     __global float4 *pointsResult,
     __global const int *radius,
     __global const float *intensity,
-    __global const int *offset)
+    int offset)
 {
     // If smoothing is (practically) disabled, leave
     if (*radius == 0 || *intensity < 0.001)
@@ -273,7 +273,7 @@ __kernel void smooth(
 
     // Orientation phase - who am I, to which clusters do I belong,
     // who are my colleagues?
-    int slId = get_global_id(0) + *offset;
+    int slId = get_global_id(0) + offset;
     int fiberStart = fiberStarts[slId];
     int fiberLength = fiberLengths[slId];
 
@@ -0,0 +1,73 @@
+import os
+import hashlib
+
+
+class EdgeBundlerSession:
+    """ OpenCL context, queue and compiled kernels for edge bundling. Create it once
+        and pass it to EdgeBundler.runEdgeBundlingOpenCl to bundle several datasets (or
+        parameter settings) without setting up OpenCL again each time.
+        Compiled program binaries are cached on disk (in cacheDir), keyed by a hash of
+        the kernel source and the device (name, vendor, driver). Only the first run on
+        a device compiles the kernels, later runs and processes load the binaries. """
+
+    def __init__(self, cacheDir=None, kernelPath=None):
+        import pyopencl
+        self.ctx = pyopencl.create_some_context()
+        self.queue = pyopencl.CommandQueue(self.ctx)
+        self.mf = pyopencl.mem_flags
+        if cacheDir is None:
+            cacheDir = os.path.join(os.path.expanduser("~"), ".cache", "linus", "opencl")
+        self.cacheDir = cacheDir
+        if kernelPath is None:
+            kernelPath = os.path.join(os.path.dirname(os.path.realpath(__file__)), "EdgeBundlerKernel.cl")
+        with open(kernelPath, "r") as sourceCodeFile:
+            self.sourceCode = sourceCodeFile.read()
+        self.program = self.loadProgram()
+        self.skeletonize = pyopencl.Kernel(self.program, "skeletonize")
+        self.smooth = pyopencl.Kernel(self.program, "smooth")
+
+    def loadProgram(self):
+        """ Builds the program from cached binaries if available for all devices,
+            otherwise compiles the source and stores the binaries """
+        import pyopencl
+        devices = self.ctx.devices
+        paths = [self.getCachePath(device) for device in devices]
+        if all(os.path.exists(path) for path in paths):
+            try:
+                binaries = []
+                for path in paths:
+                    with open(path, "rb") as f:
+                        binaries.append(f.read())
+                program = pyopencl.Program(self.ctx, devices, binaries).build()
+                print("Loaded compiled kernels from", self.cacheDir)
+                return program
+            except (IOError, pyopencl.Error) as e:
+                print("Could not use cached kernels, compiling them again:", e)
+
+        # How to add flags, like constants: .build(options=['-D', "WINDOW=111",...])
+        program = pyopencl.Program(self.ctx, self.sourceCode).build()
+        self.storeBinaries(program)
+        return program
+
+    def storeBinaries(self, program):
+        """ Writes the binary of each device (via a temporary file, so that parallel
+            runs never see half-written binaries). The cache is optional: if it cannot
+            be written, we just compile again next time. """
+        import pyopencl
+        devices = program.get_info(pyopencl.program_info.DEVICES)
+        binaries = program.get_info(pyopencl.program_info.BINARIES)
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            for device, binary in zip(devices, binaries):
+                path = self.getCachePath(device)
+                with open(path + ".tmp" + str(os.getpid()), "wb") as f:
+                    f.write(binary)
+                os.replace(path + ".tmp" + str(os.getpid()), path)
+            print("Compiled kernels, cached in", self.cacheDir)
+        except (IOError, OSError) as e:
+            print("Compiled kernels, but could not cache them:", e)
+
+    def getCachePath(self, device):
+        key = "\n".join([self.sourceCode, device.name, device.vendor, device.version,
+                         device.driver_version, device.platform.name, device.platform.version])
+        return os.path.join(self.cacheDir, hashlib.sha256(key.encode()).hexdigest() + ".bin")
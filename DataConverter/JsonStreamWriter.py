@@ -0,0 +1,102 @@
+import json
+import base64
+import numpy as np
+
+
+class JsonStreamWriter:
+    """ Writes a (nested) data structure as JSON to a file, piece by piece, without
+        creating the whole string in memory. Numpy arrays are written in chunks of
+        chunkSize values. Optionally, the JSON is compressed on the fly (with a
+        Compressor) and base64-encoded, which results in a quoted string. Without
+        base64, the compressed bytes are written as they are (outfile must be binary).
+    """
+
+    def __init__(self, outfile, compressor=None, chunkSize=3 * 2**16, encodeBase64=True):
+        self.outfile = outfile
+        self.chunkSize = chunkSize
+        self.compressor = compressor
+        self.encodeBase64 = encodeBase64
+        # base64 encodes blocks of 3 bytes, the rest waits for the next piece
+        self.leftover = b""
+
+    def writeDocument(self, data, prefix=""):
+        """ Writes prefix (uncompressed) and data, then finishes the file """
+        if self.compressor is None:
+            self.outfile.write(prefix)
+        elif self.encodeBase64:
+            self.outfile.write(prefix + "\"")
+        self.writeValue(data)
+        self.finish()
+
+    def writeValue(self, item):
+        """ Writes any JSON-compatible item. Numpy arrays are written like lists,
+            tuples (values, transform) like the array transform(values), where
+            transform is applied to each chunk of values separately. """
+        if isinstance(item, dict):
+            self.write("{")
+            for i, (key, value) in enumerate(item.items()):
+                self.write(("," if i > 0 else "") + json.dumps(str(key)) + ":")
+                self.writeValue(value)
+            self.write("}")
+        elif isinstance(item, list):
+            self.write("[")
+            for i, value in enumerate(item):
+                if i > 0:
+                    self.write(",")
+                self.writeValue(value)
+            self.write("]")
+        elif isinstance(item, np.ndarray):
+            self.writeArray(item)
+        elif isinstance(item, tuple):
+            self.writeArray(item[0], item[1])
+        else:
+            self.write(json.dumps(item.item() if isinstance(item, np.generic) else item))
+
+    def writeArray(self, values, transform=None):
+        """ Writes an array as flat JSON list, chunk by chunk """
+        self.write("[")
+        for i, chunk in enumerate(iterateChunks(values, self.chunkSize)):
+            if transform is not None:
+                chunk = transform(chunk)
+            text = json.dumps(chunk.tolist(), separators=(",", ":"))[1:-1]
+            self.write(text if i == 0 else "," + text)
+        self.write("]")
+
+    def write(self, text):
+        if self.compressor is None:
+            self.outfile.write(text)
+        else:
+            self.writeCompressed(self.compressor.compress(text.encode()))
+
+    def writeCompressed(self, data):
+        """ base64-encodes complete blocks of 3 bytes and keeps the rest """
+        if not self.encodeBase64:
+            self.outfile.write(data)
+            return
+        data = self.leftover + data
+        complete = len(data) - len(data) % 3
+        self.leftover = data[complete:]
+        if complete > 0:
+            self.outfile.write(base64.b64encode(data[:complete]).decode())
+
+    def finish(self):
+        if self.compressor is not None:
+            self.writeCompressed(self.compressor.flush())
+            if self.encodeBase64:
+                self.outfile.write(base64.b64encode(self.leftover).decode() + "\"")
+                self.leftover = b""
+
+
+def iterateChunks(values, chunkSize):
+    """ Yields the values of an array (in C order) as flat chunks of at most
+        chunkSize values. Arrays that cannot be flattened without a copy (like
+        attributes[:, :, i] of a memmap) are split along the first axis, so that only
+        one chunk is copied at a time. """
+    if values.ndim <= 1 or values.flags.c_contiguous:
+        values = values.reshape(-1)
+        for start in range(0, len(values), chunkSize):
+            yield values[start:start + chunkSize]
+        return
+    rows = max(1, chunkSize // max(1, values[0].size))
+    for start in range(0, len(values), rows):
+        yield values[start:start + rows].reshape(-1)
@@ -0,0 +1,134 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+
+
+class PreprocessingCache:
+    """ Remembers results of the preprocessing (loaded tracks, derived attributes,
+        bundled states) across runs, so that a run that only changes the export
+        options skips straight to the export.
+        Each entry is a folder (named by its key) with one .npy file per numpy array
+        and meta.json for everything else. Keys are hashes of the stage, the input
+        files (path, size and modification time of each file, i.e. files are not read
+        for the key) and the parameters, see getKey. Keys of later stages include the
+        key of the stage they are based on.
+        The cache holds at most maxSize bytes, the least recently used entries are
+        removed first. """
+
+    def __init__(self, cacheDir=None, maxSize=2**32):
+        if cacheDir is None:
+            cacheDir = os.path.join(os.path.expanduser("~"), ".cache", "linus", "preprocessing")
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+
+    def getKey(self, stage, inputPaths=[], parameters={}):
+        """ Hash of the stage name, the input files (a folder stands for all files in
+            it) and the parameters (anything JSON can represent, e.g. a previous key) """
+        description = {"stage": stage, "inputs": [self.getFingerprint(path) for path in inputPaths],
+                       "parameters": parameters}
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def getFingerprint(self, path):
+        """ [path, size, modification time] of each file (of a folder) """
+        if path is None:
+            return None
+        if not os.path.isdir(path):
+            return [getFileFingerprint(path)]
+        files = []
+        for folder, subfolders, filenames in os.walk(path):
+            subfolders.sort()
+            files += [os.path.join(folder, f) for f in sorted(filenames)]
+        return [getFileFingerprint(f) for f in files]
+
+    def getEntryPath(self, key):
+        return os.path.join(self.cacheDir, key)
+
+    def load(self, key):
+        """ The entry (dictionary of arrays and values) of key, or None if it is not cached """
+        path = self.getEntryPath(key)
+        entry = loadEntry(path)
+        if entry is None:
+            return None
+        # Mark as recently used
+        os.utime(path)
+        return entry
+
+    def save(self, key, entry):
+        """ Stores entry, a dictionary of numpy arrays and JSON-compatible values, and
+            evicts old entries if the cache is full. Writing the cache is optional, if
+            it fails, the next run just computes everything again. """
+        size = sum(value.nbytes for value in entry.values() if isinstance(value, np.ndarray))
+        if size > self.maxSize:
+            print("Not cached, the result (" + str(size // 2**20), "MB) is larger than the cache")
+            return
+        try:
+            saveEntry(self.getEntryPath(key), entry)
+        except (IOError, OSError) as e:
+            print("Could not write to the cache:", e)
+            return
+        self.evict(key)
+
+    def evict(self, keep=None):
+        """ Removes the least recently used entries (except keep) until the cache
+            holds at most maxSize bytes """
+        entries = []
+        for name in os.listdir(self.cacheDir):
+            path = os.path.join(self.cacheDir, name)
+            if os.path.isdir(path) and ".tmp" not in name:
+                size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+                entries.append((os.path.getmtime(path), size, name))
+        total = sum(entry[1] for entry in entries)
+        for lastUsed, size, name in sorted(entries):
+            if total <= self.maxSize:
+                break
+            if name != keep:
+                shutil.rmtree(os.path.join(self.cacheDir, name), ignore_errors=True)
+                total -= size
+
+
+def getFileFingerprint(path):
+    """ [absolute path, size, modification time] of a file (size and time are None
+        if it does not exist) """
+    path = os.path.abspath(path)
+    try:
+        info = os.stat(path)
+        return [path, info.st_size, info.st_mtime_ns]
+    except OSError:
+        return [path, None, None]
+
+
+def saveEntry(path, entry):
+    """ Writes entry, a dictionary of numpy arrays and JSON-compatible values, to the
+        folder path (one .npy file per array, meta.json for the rest). The folder is
+        written under a temporary name and then replaces the old one, so readers never
+        see a half-written entry. """
+    arrays = [name for name, value in entry.items() if isinstance(value, np.ndarray)]
+    temporaryPath = path + ".tmp" + str(os.getpid())
+    try:
+        os.makedirs(temporaryPath, exist_ok=True)
+        for name in arrays:
+            np.save(os.path.join(temporaryPath, name + ".npy"), entry[name])
+        with open(os.path.join(temporaryPath, "meta.json"), "w") as f:
+            json.dump({"arrays": arrays, "values": {name: value for name, value in entry.items()
+                                                    if name not in arrays}}, f)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(temporaryPath, path)
+    except (IOError, OSError):
+        shutil.rmtree(temporaryPath, ignore_errors=True)
+        raise
+
+
+def loadEntry(path, mmapMode=None):
+    """ The entry written by saveEntry to path, or None if there is none. With
+        mmapMode (see numpy.load), arrays are memory-mapped instead of read. """
+    try:
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        entry = meta["values"]
+        for name in meta["arrays"]:
+            entry[name] = np.load(os.path.join(path, name + ".npy"), mmap_mode=mmapMode)
+    except (IOError, ValueError, KeyError):
+        return None
+    return entry
@@ -1,5 +1,7 @@
-
 import csv
+import itertools
+import time
+import numpy as np
 from .AbstractLoader import AbstractLoader
 
 
@@ -7,42 +9,151 @@ class SvfLoader(AbstractLoader):
     """ A helper to load a folder of SVF files.
     """
 
-    def __init__(self, svfPath, resampleTo=50, minTrackLength=2, csvSeparator=",", dim=3):
-        super(SvfLoader, self).__init__(resampleTo, minTrackLength)
+    def __init__(self, svfPath, resampleTo=50, minTrackLength=2, csvSeparator=",", dim=3, chunkSize=1000000, lineageFrameWindow=None, resampleMode="spline", dtype=np.float64, storePath=None):
+        """ The SVF file is read in chunks of chunkSize rows. By default, all cells
+            are remembered as potential mothers. For huge files sorted by time,
+            lineageFrameWindow limits this to cells of the last lineageFrameWindow
+            frames (before the latest frame seen so far), which saves memory, but
+            mothers more frames before their daughter (tracking gaps) are unknown then. """
+        super(SvfLoader, self).__init__(resampleTo, minTrackLength, resampleMode=resampleMode, dtype=dtype, storePath=storePath)
         self.csvSeparator = csvSeparator
+        self.chunkSize = chunkSize
+        self.lineageFrameWindow = lineageFrameWindow
         self.loadSvf(svfPath)
         self.convertTrackListToMatrix()
-        
+
     def loadSvf(self, path):
         """ Loads the points from (a single, huge) CSV and establishes
             the tracking connection by using the "mother_id" attribute
         """
         self.initDataStructure()
+        start = time.time()
+        numRows = 0
+        delimiter = None if self.csvSeparator.isspace() else self.csvSeparator
         try:
             with open(path) as f:
-                objectReader = csv.DictReader(f, delimiter=self.csvSeparator, skipinitialspace=True)
-                for row in objectReader:
-                    self.handleCsvRow(row)
+                header = next(csv.reader([f.readline()], delimiter=self.csvSeparator, skipinitialspace=True), [])
+                columns = self.findColumns(header, path)
+                while True:
+                    lines = list(itertools.islice(f, self.chunkSize))
+                    if len(lines) == 0:
+                        break
+                    rows = np.loadtxt(lines, delimiter=delimiter, usecols=columns, ndmin=2)
+                    if len(rows) > 0:
+                        self.handleChunk(rows)
+                        numRows += len(rows)
+                    self.simpleStatusPrint(numRows // self.chunkSize)
         except IOError:
             self.stopBecauseMissingFile(path, "csv file")
-        print()
-
-    def handleCsvRow(self, row):
-        if int(row["mother_id"]) == -1:
-            self.trackList[self.trackCounter] = []
-            trackId = self.trackCounter
-            self.trackCounter += 1
-            self.simpleStatusPrint(self.trackCounter, 50)
-        else:
-            trackId = self.parentsTrack[int(row["mother_id"])]
-        self.parentsTrack[int(row["id"])] = trackId
-        self.trackList[trackId].append([float(row["x"]), float(row["y"]), float(row["z"]), float(row["t"])])
+        except ValueError as e:
+            self.stopBecauseError("Could not parse csv file " + path + ": " + str(e))
+        self.assembleTracks()
+        duration = max(time.time() - start, 1e-9)
+        print("\nRead", numRows, "rows in", round(duration, 2), "s (" + str(int(numRows / duration)), "rows/s)")
+
+    def findColumns(self, header, path):
+        """ Indices of the columns id, mother_id, x, y, z, t """
+        header = [name.strip() for name in header]
+        columns = []
+        for name in ["id", "mother_id", "x", "y", "z", "t"]:
+            if name not in header:
+                self.stopBecauseError("Missing column " + name + " in svf file " + path)
+            columns.append(header.index(name))
+        return columns
+
+    def handleChunk(self, rows):
+        """ Assigns a track to each row of the chunk [id, mother_id, x, y, z, t].
+            Rows without mother start a new track, all others inherit the track
+            of their mother, which is either part of this chunk (and must appear
+            before the row) or was remembered from previous chunks. """
+        n = len(rows)
+        ids = rows[:, 0].astype(np.int64)
+        mothers = rows[:, 1].astype(np.int64)
+        frames = rows[:, 5]
+        tracks = np.full(n, -1, dtype=np.int64)
+
+        isRoot = mothers == -1
+        numNewTracks = np.count_nonzero(isRoot)
+        tracks[isRoot] = self.trackCounter + np.arange(numNewTracks)
+        self.trackCounter += numNewTracks
+
+        # Mothers within this chunk: the last row with the mother's id before the
+        # row (ids may be reused). Sort the rows by (id, row) and search (mother, row).
+        uniqueIds, idRanks = np.unique(ids, return_inverse=True)
+        motherRanks = np.minimum(np.searchsorted(uniqueIds, mothers), len(uniqueIds) - 1)
+        keys = np.sort(idRanks * n + np.arange(n))
+        positions = np.searchsorted(keys, motherRanks * n + np.arange(n)) - 1
+        candidates = keys[np.maximum(positions, 0)] % n
+        inChunk = ~isRoot & (positions >= 0) & (uniqueIds[motherRanks] == mothers) & \
+            (idRanks[candidates] == motherRanks)
+
+        # Mothers of previous chunks
+        fromBefore = np.flatnonzero(~isRoot & ~inChunk)
+        if len(fromBefore) > 0:
+            known = np.minimum(np.searchsorted(self.parentIds, mothers[fromBefore]), len(self.parentIds) - 1)
+            found = self.parentIds[known] == mothers[fromBefore] if len(self.parentIds) > 0 else np.zeros(len(known), dtype=bool)
+            if not found.all():
+                self.stopBecauseError("Unknown mother_id " + str(mothers[fromBefore][~found][0]) +
+                                      " (with lineageFrameWindow, the file must be sorted by time and mothers" +
+                                      " at most lineageFrameWindow frames before their daughters)")
+            tracks[fromBefore] = self.parentTracks[known]
+
+        # Resolve chains of mothers within the chunk by pointer jumping
+        pointer = np.where(inChunk, candidates, np.arange(n))
+        unresolved = np.flatnonzero(tracks < 0)
+        while len(unresolved) > 0:
+            inherited = tracks[pointer[unresolved]]
+            done = inherited >= 0
+            tracks[unresolved[done]] = inherited[done]
+            unresolved = unresolved[~done]
+            pointer[unresolved] = pointer[pointer[unresolved]]
+
+        self.chunkTracks.append(tracks)
+        self.chunkPoints.append(rows[:, 2:6].copy())
+        self.rememberParents(ids, tracks, frames)
+
+    def rememberParents(self, ids, tracks, frames):
+        """ Merges the cells of a chunk into the (sorted) mother lookup and forgets
+            cells that are too old to become a mother again """
+        allIds = np.concatenate([self.parentIds, ids])
+        allTracks = np.concatenate([self.parentTracks, tracks])
+        allFrames = np.concatenate([self.parentFrames, frames])
+        order = np.argsort(allIds, kind="stable")
+        allIds = allIds[order]
+        # If an id is reused, the most recent cell wins
+        keep = np.ones(len(allIds), dtype=bool)
+        keep[:-1] = allIds[1:] != allIds[:-1]
+        if self.lineageFrameWindow is not None:
+            self.latestFrame = max(self.latestFrame, frames.max())
+            keep &= allFrames[order] >= self.latestFrame - self.lineageFrameWindow
+        self.parentIds = allIds[keep]
+        self.parentTracks = allTracks[order][keep]
+        self.parentFrames = allFrames[order][keep]
+
+    def assembleTracks(self):
+        """ Groups the points of all chunks by track (keeping the row order) """
+        if len(self.chunkTracks) == 0:
+            return
+        tracks = np.concatenate(self.chunkTracks)
+        order = np.argsort(tracks, kind="stable")
+        points = np.concatenate(self.chunkPoints)[order]
+        bounds = np.searchsorted(tracks[order], np.arange(self.trackCounter + 1))
+        self.chunkTracks = []
+        self.chunkPoints = []
+        for t in range(self.trackCounter):
+            self.trackList[t] = points[bounds[t]:bounds[t + 1]]
 
     def initDataStructure(self):
         self.trackList = {}
-        # We must remember what the track name of a certain cell is
-        self.parentsTrack = {}
+        # We must remember what the track name of a certain cell is (sorted by cell id)
+        self.parentIds = np.empty(0, dtype=np.int64)
+        self.parentTracks = np.empty(0, dtype=np.int64)
+        self.parentFrames = np.empty(0)
+        self.latestFrame = -np.inf
+        # Per chunk: track of each row and its [x, y, z, t]
+        self.chunkTracks = []
+        self.chunkPoints = []
         # We use the trackCounter to identify tracks with unique names
         self.trackCounter = 0
         # So far we only support one attribute, which is the time
-        self.attributeNames = ["Frame"]
\ No newline at end of file
+        self.attributeNames = ["Frame"]
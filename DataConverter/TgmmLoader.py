@@ -1,57 +1,199 @@
 import os
-import xml.etree.ElementTree as ET
-import copy
+from xml.parsers import expat
+import numpy as np
 
 from .AbstractLoader import AbstractLoader
+from .PreprocessingCache import getFileFingerprint
 
 
 class TgmmLoader(AbstractLoader):
-    """ A helper to load a folder of TGMM files
+    """ A helper to load a folder of TGMM files.
+        With statePath (incremental mode), the lineage of the last frame, the raw
+        points of all tracks and the list of parsed files are kept in that folder. A
+        later run only parses the frames that were added since (new files, sorted
+        after the known ones) and resamples only the tracks that got new points.
+        If any known file changed, everything is loaded again.
     """
-    def __init__(self, folderWithXMLs, resampleTo=50, minTrackLength=2,dim=3):
-        super(TgmmLoader, self).__init__(resampleTo, minTrackLength)
+    def __init__(self, folderWithXMLs, resampleTo=50, minTrackLength=2,dim=3, workers=1, resampleMode="spline", dtype=np.float64, storePath=None, statePath=None):
+        super(TgmmLoader, self).__init__(resampleTo, minTrackLength, workers, resampleMode, dtype, storePath, statePath)
         self.loadXMLs(folderWithXMLs)
-        self.convertTrackListToMatrix()
+        self.convertTrackListToMatrix(self.trackNames, self.previousMatrices)
+        if self.statePath is not None:
+            self.saveState({"files": self.files, "trackNames": self.trackNames, "lastCells": self.lastCells,
+                            "numPoints": self.numKnownPoints})
 
     def loadXMLs(self, folder):
+        """ Parses the frames (in parallel, if workers > 1) and links them to
+            tracks in the order of their file names """
         self.prepareDataStructure()
-        for filename in sorted(os.listdir(folder)):
-            self.simpleStatusPrint(self.counter, 1)
-            if filename.endswith(".xml"):
-                self.handleXmlFile(folder + "/" + filename)
+        filenames = [folder + "/" + f for f in sorted(os.listdir(folder)) if f.endswith(".xml")]
+        if self.statePath is not None:
+            self.restoreState(filenames)
+            print("Parse", len(filenames) - self.counter, "new of", len(filenames), "files")
+        try:
+            for cells in self.mapFiles(readTgmmFile, filenames[self.counter:]):
+                self.simpleStatusPrint(self.counter, 1)
+                self.linkFrame(cells)
+        except Exception:
+            self.stopBecauseError("Could not handle XML file (invalid syntax?):" + filenames[self.counter])
+        self.assembleTracks()
         print()
 
     def prepareDataStructure(self):
         self.trackList = {}
+        self.trackNames = []
         self.lastCells = {}
         self.counter = 0
+        self.previousMatrices = None
+        self.numKnownPoints = 0
+        # Per frame: [x, y, z, frame] of each cell and the index of its track
+        self.framePoints = []
+        self.frameTracks = []
 
-    def handleXmlFile(self, filename):
-        self.currentCells = {}
-        try:
-            root = ET.parse(filename).getroot()
-            self.cellCounter = 0
-            for child in root:
-                self.loadTrack(child)
-                self.cellCounter += 1
-            self.lastCells = copy.deepcopy(self.currentCells)
-            self.counter += 1
-        except Exception:
-            self.stopBecauseError("Could not handle XML file (invalid syntax?):" + filename)
+    def linkFrame(self, frame):
+        """ Assigns the cells (ids, parents, coords) of the next frame to tracks.
+            The lineage maps are swapped, not copied: each frame only needs the
+            cells of its predecessor. """
+        ids, parents, coords = frame
+        lastCells = self.lastCells
+        currentCells = {}
+        tracks = np.empty(len(ids), dtype=np.int64)
+        for cellCounter, (cellId, parent) in enumerate(zip(ids, parents)):
+            trackIndex = lastCells.get(parent)
+            if trackIndex is None:
+                trackIndex = len(self.trackNames)
+                self.trackNames.append(str(self.counter) + "_" + str(cellCounter))
+            currentCells[cellId] = trackIndex
+            tracks[cellCounter] = trackIndex
+        self.framePoints.append(np.column_stack([coords, np.full(len(coords), self.counter)]))
+        self.frameTracks.append(tracks)
+        self.lastCells = currentCells
+        self.counter += 1
 
+    def restoreState(self, filenames):
+        """ Continues where the previous run (in incremental mode) stopped, if the
+            files it parsed are still the first ones and did not change """
+        self.files = [getFileFingerprint(f) for f in filenames]
+        state = self.loadState()
+        if state is None or state["files"] != self.files[0:len(state["files"])]:
+            if state is not None:
+                print("Known files changed, load all files again")
+            return
+        self.counter = len(state["files"])
+        self.trackNames = state["trackNames"]
+        self.lastCells = state["lastCells"]
+        self.numKnownPoints = state["numPoints"]
+        self.previousMatrices = self.getPreviousMatrices(state)
 
-    def loadTrack(self, xmlTrack):
-        if not xmlTrack.attrib["parent"] in self.lastCells.keys():
-            trackName = str(self.counter) + "_" + str(self.cellCounter)
-            self.trackList[trackName] = []
+    def assembleTracks(self):
+        """ Groups the points of all frames by track (in frame order). In
+            incremental mode, only the tracks that got new points (or all, if the
+            previous matrices cannot be reused) """
+        if self.statePath is not None:
+            tracks, points = self.appendPoints()
+        elif len(self.frameTracks) == 0:
+            return
         else:
-            trackName = self.lastCells[xmlTrack.attrib["parent"]]
-        self.currentCells[xmlTrack.attrib["id"]] = trackName
-        coords = [float(x) for x in xmlTrack.attrib["m"].strip().split(" ")]
-        if "scale" in xmlTrack.attrib:
-            scales = [float(x) for x in xmlTrack.attrib["scale"].strip().split(" ")]
-            coords = [a*b for a, b in zip(scales, coords)]
+            tracks = np.concatenate(self.frameTracks)
+            points = np.concatenate(self.framePoints)
+        order = np.argsort(tracks, kind="stable")
+        points = points[order]
+        bounds = np.searchsorted(tracks[order], np.arange(len(self.trackNames) + 1))
+        self.trackList = {}
+        for t in np.flatnonzero(bounds[1:] > bounds[:-1]):
+            self.trackList[self.trackNames[t]] = points[bounds[t]:bounds[t + 1]]
+
+    def appendPoints(self):
+        """ Appends the points of the new frames to the raw points in statePath and
+            returns track index and [x, y, z, frame] of all points of the tracks that
+            have to be resampled """
+        newTracks = np.concatenate(self.frameTracks) if len(self.frameTracks) > 0 else np.zeros(0, dtype=np.int64)
+        newPoints = np.concatenate(self.framePoints) if len(self.framePoints) > 0 else np.zeros((0, 4))
+        self.frameTracks = []
+        self.framePoints = []
+        os.makedirs(self.statePath, exist_ok=True)
+        for name, values in [("pointTracks.bin", newTracks.astype("<i8")), ("points.bin", newPoints.astype("<f8"))]:
+            path = os.path.join(self.statePath, name)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # Drop points of an interrupted run
+                f.truncate(self.numKnownPoints * values.itemsize * int(np.prod(values.shape[1:])))
+                f.seek(0, os.SEEK_END)
+                f.write(values.tobytes())
+        self.numKnownPoints += len(newTracks)
+        tracks = np.fromfile(os.path.join(self.statePath, "pointTracks.bin"), dtype="<i8", count=self.numKnownPoints)
+        points = np.memmap(os.path.join(self.statePath, "points.bin"), dtype="<f8", mode="r",
+                           shape=(self.numKnownPoints, 4)) if self.numKnownPoints > 0 else np.zeros((0, 4))
+        if self.previousMatrices is None:
+            return tracks, np.array(points)
+        update = np.isin(tracks, np.unique(newTracks))
+        return tracks[update], points[update]
+
+def readTgmmFile(filename):
+    """ Parses a single TGMM frame incrementally (streaming, without building an
+        element tree) into the lists of ids and parents and an array of
+        coordinates [n_cells, 3]. Module-level function, so that it can be sent
+        to worker processes. """
+    ids = []
+    parents = []
+    means = []
+    scales = []
+    depth = 0
+
+    def startElement(name, attrib):
+        nonlocal depth
+        depth += 1
+        if depth == 2:  # the cells are the children of the root element
+            ids.append(attrib["id"])
+            parents.append(attrib["parent"])
+            means.append(attrib["m"])
+            scales.append(attrib.get("scale"))
+
+    def endElement(name):
+        nonlocal depth
+        depth -= 1
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = startElement
+    parser.EndElementHandler = endElement
+    with open(filename, "rb") as f:
+        parser.ParseFile(f)
+    return ids, parents, parseCoordinates(means, scales)
+
+
+def parseCoordinates(means, scales):
+    """ Converts the "m" (and optional "scale") attribute strings of all cells to
+        coordinates [n_cells, 3], missing dimensions are filled up with 0. All strings
+        are parsed at once if the cells agree in their number of dimensions. """
+    if len(means) == 0:
+        return np.zeros((0, 3))
+    m = np.fromstring(" ".join(means), sep=" ")
+    numDims = len(means[0].split())
+    hasScale = [s is not None for s in scales]
+    if len(m) == numDims * len(means) and (all(hasScale) or not any(hasScale)):
+        coords = m.reshape((len(means), numDims))
+        if all(hasScale):
+            s = np.fromstring(" ".join(scales), sep=" ")
+            numScales = len(scales[0].split())
+            if len(s) != numScales * len(scales):
+                return parseCoordinatesPerCell(means, scales)
+            numDims = min(numDims, numScales)
+            coords = coords[:, 0:numDims] * s.reshape((len(scales), numScales))[:, 0:numDims]
+    else:
+        return parseCoordinatesPerCell(means, scales)
+    if numDims < 3:
+        coords = np.hstack([coords, np.zeros((len(coords), 3 - numDims))])
+    return coords
+
+
+def parseCoordinatesPerCell(means, scales):
+    """ Fallback of parseCoordinates for cells of varying dimensions """
+    rows = []
+    for m, scale in zip(means, scales):
+        coords = [float(x) for x in m.strip().split(" ")]
+        if scale is not None:
+            factors = [float(x) for x in scale.strip().split(" ")]
+            coords = [a*b for a, b in zip(factors, coords)]
         for i in range(len(coords), 3):
             coords.append(0)  # Fill up missing dimensions with 0
-        coords.append(self.counter)
-        self.trackList[trackName].append(coords)
+        rows.append(coords)
+    return np.array(rows, dtype=np.float64)
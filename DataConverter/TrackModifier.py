@@ -3,38 +3,64 @@ import math
 
 
 class TrackModifier:
-    """ Provides functionality to add features to - or modify - a trajectory """
+    """ Provides functionality to add features to - or modify - a trajectory.
+        All operations work on blocks of tracks, so that tracks and attributes can
+        be memmaps of a TrackStore (pass it as store, new attributes are then
+        added to the store as well). """
 
-    def __init__(self, tracks, attributes, attributeNames):
+    # Attributes of addDerivedAttributes, key -> attribute name
+    derivedAttributes = {"speed": "Speed", "acceleration": "Acceleration", "curvature": "Curvature",
+                         "pathLength": "Path length", "displacement": "Displacement", "msd": "MSD",
+                         "straightness": "Straightness"}
+
+    # Attributes of addAttributes besides the derived ones, key -> attribute name
+    basicAttributes = {"time": "Time", "radius": "Radius", "angleToStart": "Angle to start"}
+
+    def __init__(self, tracks, attributes, attributeNames, store=None):
         self.tracks = tracks
         self.attributes = attributes
         self.attributeNames = attributeNames
+        self.store = store
 
     def get(self):
         """ Returns the (altered, updated) tracks """
         return self.tracks, self.attributes, self.attributeNames
 
+    def getBlocks(self, maxPositions=2**18):
+        """ Slices of tracks with at most about maxPositions positions each """
+        blockSize = max(1, maxPositions // max(1, self.tracks.shape[1]))
+        return [slice(start, start + blockSize) for start in range(0, self.tracks.shape[0], blockSize)]
+
     def translate(self, x, y, z):
         """ Moves all track positions by x/y/z """
-        self.tracks[:, :, 0] += x
-        self.tracks[:, :, 1] += y
-        self.tracks[:, :, 2] += z
+        for block in self.getBlocks():
+            self.tracks[block, :, 0] += x
+            self.tracks[block, :, 1] += y
+            self.tracks[block, :, 2] += z
 
     def scale(self, scale):
         """ scales all track positions by a certain value """
-        self.tracks[:, :, :] *= scale
+        for block in self.getBlocks():
+            self.tracks[block, :, :] *= scale
 
     def getBarycenter(self):
         """ Average of all track positions """
-        return[self.tracks[:, :, 0].mean(), self.tracks[:, :, 1].mean(), self.tracks[:, :, 2].mean()]
+        sums = [0., 0., 0.]
+        for block in self.getBlocks():
+            for i in range(3):
+                sums[i] += self.tracks[block, :, i].sum(dtype=np.float64)
+        return [s / (self.tracks.shape[0] * self.tracks.shape[1]) for s in sums]
 
     def getMin(self):
         """ Minimum ( [x, y, z] ) of all track positions """
-        return[self.tracks[:, :, 0].min(), self.tracks[:, :, 1].min(), self.tracks[:, :, 2].max()]
+        mins = [self.tracks[block, :, 0:3].min(axis=(0, 1)) for block in self.getBlocks()]
+        maxs = [self.tracks[block, :, 2].max() for block in self.getBlocks()]
+        return [min(m[0] for m in mins), min(m[1] for m in mins), max(maxs)]
 
     def getMax(self):
         """ Maximum ( [x, y, z] ) of all track positions """
-        return[self.tracks[:, :, 0].max(), self.tracks[:, :, 1].max(), self.tracks[:, :, 2].max()]
+        maxs = [self.tracks[block, :, 0:3].max(axis=(0, 1)) for block in self.getBlocks()]
+        return [max(m[0] for m in maxs), max(m[1] for m in maxs), max(m[2] for m in maxs)]
 
     def getExtent(self):
         """ The longest extent of any dimension """
@@ -42,51 +68,155 @@ class TrackModifier:
         ma = self.getMax()
         return max(ma[0] - mi[0], ma[1] - mi[1], ma[2] - mi[2])
 
-    def addAttributeRadius(self):
+    def addAttributeRadius(self, values=None):
         """ Calculates the distance of each position to 0/0/0. If center  
-            point is somewhere else, translate the tracks accordingly """
-        centers = np.zeros_like(self.tracks)
-        dist = centers - self.tracks
-        dist = np.square(dist)
-        dist = np.sum(dist, axis=2)
-        dist = np.sqrt(dist)
-        self.addAttribute("Radius", dist)
+            point is somewhere else, translate the tracks accordingly. Written
+            to values [n_tracks, n_pos, 1] if given, else to a new attribute """
+        if values is None:
+            values = self.allocateAttributes(["Radius"])
+        for block in self.getBlocks():
+            dist = np.square(np.asarray(self.tracks[block]))
+            dist = np.sum(dist, axis=2)
+            values[block, :, 0] = np.sqrt(dist)
 
     def sim(self, p1, p2):
         """ Cosine similarity with clamped negative values - If two vectors
-            look in opposing directions, result is 0 instead of -1 """
-        l1 = math.sqrt((p1[0])**2 + (p1[1])**2 + (p1[2])**2)
-        l2 = math.sqrt((p2[0])**2 + (p2[1])**2 + (p2[2])**2)
-        if l1 == 0 or l2 == 0:
-            return 0.
-        return ((p1[0] * p2[0] + p1[1] * p2[1] + p1[2] * p2[2]) / l1 / l2) / 2. + 0.5
-
-    def addAttributeAngleToStart(self):
+            look in opposing directions, result is 0 instead of -1. Works on
+            single vectors as well as on arrays of vectors [..., 3] (batch). """
+        p1 = np.asarray(p1)
+        p2 = np.asarray(p2)
+        l1 = np.sqrt(p1[..., 0]**2 + p1[..., 1]**2 + p1[..., 2]**2)
+        l2 = np.sqrt(p2[..., 0]**2 + p2[..., 1]**2 + p2[..., 2]**2)
+        valid = (l1 != 0) & (l2 != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = ((p1[..., 0] * p2[..., 0] + p1[..., 1] * p2[..., 1] + p1[..., 2] * p2[..., 2]) / l1 / l2) / 2. + 0.5
+        return np.where(valid, result, 0.)[()]
+
+    def addAttributeAngleToStart(self, values=None):
         """ Creates an attribute holding the angle between the beginning (the 
-            first 5%) of the track and each local position """
+            first 5%) of the track and each local position (the segment to the
+            next position, the last position gets 0). Written to values
+            [n_tracks, n_pos, 1] if given, else to a new attribute """
         print("Determining angle similarity values")
-        similarityValues = np.zeros((self.tracks.shape[0], self.tracks.shape[1]))
-        for t in range(self.tracks.shape[0]):
-            self.simpleStatusPrint(t, 50)
-            endOfFirstPart = int(0.05 * self.tracks.shape[1])
-            initialDirection = self.tracks[t, endOfFirstPart, :] - self.tracks[t, 0, :]
-            for p in range(self.tracks.shape[1] - 1):
-                currentDirection = self.tracks[t, p+1, :] - self.tracks[t, p, :]
-                similarityValues[t, p] = self.sim(initialDirection, currentDirection)
-        print()
-        self.addAttribute("Angle to start", similarityValues)
-
-    def addAttributeTime(self):
+        if values is None:
+            values = self.allocateAttributes(["Angle to start"])
+        endOfFirstPart = int(0.05 * self.tracks.shape[1])
+        for block in self.getBlocks():
+            tracks = self.tracks[block]
+            initialDirections = tracks[:, endOfFirstPart, 0:3] - tracks[:, 0, 0:3]
+            currentDirections = tracks[:, 1:, 0:3] - tracks[:, :-1, 0:3]
+            values[block, :-1, 0] = self.sim(initialDirections[:, None, :], currentDirections)
+            values[block, -1, 0] = 0.
+
+    def addAttributeTime(self, values=None):
         """ Adds an attribute with numbers 0, 1, ..., n for the respective 
-            position of a track """
-        values = range(self.attributes.shape[1])
-        self.addAttribute("Time", values)
+            position of a track. Written to values [n_tracks, n_pos, 1] if
+            given, else to a new attribute """
+        if values is None:
+            values = self.allocateAttributes(["Time"])
+        for block in self.getBlocks():
+            values[block, :, 0] = np.arange(self.tracks.shape[1])
+
+    def addAttributes(self, basic=(), derived=(), timeStep=1.):
+        """ Adds the basic attributes (keys of basicAttributes, in this order) and
+            the derived attributes (keys of derivedAttributes, see addDerivedAttributes)
+            with a single allocateAttributes call, i.e. the attributes are copied once """
+        for key in basic:
+            if key not in self.basicAttributes:
+                raise ValueError("Unknown attribute " + str(key) + ", use one of " + str(list(self.basicAttributes)))
+        self.checkDerivedKeys(derived)
+        basic = [key for key in self.basicAttributes if key in basic]
+        if len(basic) + len(derived) == 0:
+            return
+        values = self.allocateAttributes([self.basicAttributes[key] for key in basic] +
+                                         [self.derivedAttributes[key] for key in derived])
+        adders = {"time": self.addAttributeTime, "radius": self.addAttributeRadius,
+                  "angleToStart": self.addAttributeAngleToStart}
+        for i, key in enumerate(basic):
+            adders[key](values[:, :, i:i + 1])
+        if len(derived) > 0:
+            self.addDerivedAttributes(derived, timeStep, values[:, :, len(basic):])
+
+    def addDerivedAttributes(self, keys=None, timeStep=1., values=None):
+        """ Adds derived attributes, all of them (default) or the given keys of
+            derivedAttributes:
+            - speed, acceleration: length of the first/second derivative of the
+              position (central differences, timeStep between two positions)
+            - curvature: |v x a| / |v|^3 (0 where the track does not move)
+            - pathLength: distance travelled along the track so far
+            - displacement: distance to the first position
+            - msd: mean squared displacement, with the position index as time lag
+            - straightness: displacement / path length (1 as long as it is 0)
+            They are computed together in one pass over blocks of tracks, sharing
+            intermediate results, and written into a single new attributes array
+            (or into values [n_tracks, n_pos, len(keys)], if given). """
+        keys = list(self.derivedAttributes) if keys is None else keys
+        self.checkDerivedKeys(keys)
+        print("Determining derived attributes:", ", ".join(keys))
+        if values is None:
+            values = self.allocateAttributes([self.derivedAttributes[key] for key in keys])
+        for block in self.getBlocks():
+            positions = self.tracks[block, :, 0:3].astype(np.float64)
+            self.computeDerivedAttributes(positions, keys, timeStep, values[block])
+
+    def checkDerivedKeys(self, keys):
+        for key in keys:
+            if key not in self.derivedAttributes:
+                raise ValueError("Unknown derived attribute " + str(key) + ", use one of " + str(list(self.derivedAttributes)))
+
+    def computeDerivedAttributes(self, positions, keys, timeStep, out):
+        """ Writes the attributes keys of positions [n_tracks, n_pos, 3] to out [n_tracks, n_pos, len(keys)] """
+        results = {}
+        if "speed" in keys or "acceleration" in keys or "curvature" in keys:
+            velocity = np.gradient(positions, timeStep, axis=1)
+            speed = vectorLength(velocity)
+            results["speed"] = speed
+        if "acceleration" in keys or "curvature" in keys:
+            acceleration = np.gradient(velocity, timeStep, axis=1)
+            results["acceleration"] = vectorLength(acceleration)
+        if "curvature" in keys:
+            v, a = velocity, acceleration
+            cross = vectorLength(np.stack([v[..., 1] * a[..., 2] - v[..., 2] * a[..., 1],
+                                           v[..., 2] * a[..., 0] - v[..., 0] * a[..., 2],
+                                           v[..., 0] * a[..., 1] - v[..., 1] * a[..., 0]], axis=-1))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results["curvature"] = np.where(speed > 0, cross / speed**3, 0.)
+        if "pathLength" in keys or "straightness" in keys:
+            pathLength = np.zeros(positions.shape[0:2])
+            np.cumsum(vectorLength(np.diff(positions, axis=1)), axis=1, out=pathLength[:, 1:])
+            results["pathLength"] = pathLength
+        if "displacement" in keys or "straightness" in keys:
+            displacement = vectorLength(positions - positions[:, 0:1])
+            results["displacement"] = displacement
+        if "straightness" in keys:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results["straightness"] = np.where(pathLength > 0, np.minimum(displacement / pathLength, 1.), 1.)
+        if "msd" in keys:
+            results["msd"] = meanSquaredDisplacement(positions)
+        for i, key in enumerate(keys):
+            out[:, :, i] = results[key]
+
+    def allocateAttributes(self, names):
+        """ Appends the attributes names at once (a single new array) and returns
+            the view [n_tracks, n_pos, len(names)] of the new ones to fill in """
+        if self.store is not None:
+            values = self.store.allocateAttributes(names)
+            self.attributes = self.store.attributes
+            self.attributeNames.extend(names)
+            return values
+        numAttributes = self.attributes.shape[2]
+        # Keep the precision of the loaded data (e.g. --float32)
+        dtype = self.attributes.dtype if self.attributes.size > 0 else self.tracks.dtype
+        attributes = np.empty(self.attributes.shape[0:2] + (numAttributes + len(names),), dtype=dtype)
+        attributes[:, :, 0:numAttributes] = self.attributes
+        self.attributes = attributes
+        self.attributeNames.extend(names)
+        return attributes[:, :, numAttributes:]
 
     def addAttribute(self, name, values):
-        self.attributeNames.append(name)
-        self.attributes = np.append(self.attributes, np.zeros(
-            (self.attributes.shape[0], self.attributes.shape[1], 1)), axis=2)
-        self.attributes[:, :, self.attributes.shape[2]-1] = values
+        newValues = self.allocateAttributes([name])
+        for block in self.getBlocks():
+            newValues[block, :, 0] = values if np.ndim(values) < 2 else values[block]
 
     def simpleStatusPrint(self, i=1, sparse=1):
         """ Prints a star (*) if for each call (or only if i % sparse == 0, to only print 
@@ -95,4 +225,30 @@ class TrackModifier:
         if i % sparse == 0:
             print("*", end='', flush=True)
         if i % (50 * sparse) == 0 and i > 0:
-            print("("+str(i)+")")
\ No newline at end of file
+            print("("+str(i)+")")
+
+
+def vectorLength(vectors):
+    """ Length of each vector [..., 3] (component-wise, faster than summing over the short axis) """
+    return np.sqrt(vectors[..., 0]**2 + vectors[..., 1]**2 + vectors[..., 2]**2)
+
+
+def meanSquaredDisplacement(positions):
+    """ Mean squared displacement of each track [n_tracks, n_pos, 3] for each lag
+        0 ... n_pos - 1: mean of |x(i + lag) - x(i)|^2 over all i. Computed as
+        sum(|x(i + lag)|^2 + |x(i)|^2) - 2 * autocorrelation (via FFT), which costs
+        n_pos * log(n_pos) instead of n_pos^2 per track. """
+    numPositions = positions.shape[1]
+    positions = positions - positions.mean(axis=1, keepdims=True)  # better precision, same result
+    squared = positions[..., 0]**2 + positions[..., 1]**2 + positions[..., 2]**2
+    # Sum of |x(i)|^2 + |x(i + lag)|^2 over i: all terms minus the first/last lag ones
+    removed = np.cumsum(squared + squared[:, ::-1], axis=1)
+    sumOfSquares = 2. * squared.sum(axis=1, keepdims=True) - np.concatenate(
+        [np.zeros((len(positions), 1)), removed[:, :-1]], axis=1)
+    # Autocorrelation of each coordinate, summed up (the FFT runs along the last, contiguous axis)
+    spectrum = np.fft.rfft(np.ascontiguousarray(positions.transpose((0, 2, 1))), n=2 * numPositions, axis=2)
+    power = spectrum.real**2 + spectrum.imag**2
+    autocorrelation = np.fft.irfft(power.sum(axis=1), n=2 * numPositions, axis=1)[:, :numPositions]
+    result = (sumOfSquares - 2. * autocorrelation) / (numPositions - np.arange(numPositions))[None, :]
+    result[:, 0] = 0.
+    return np.maximum(result, 0.)
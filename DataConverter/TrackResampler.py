@@ -0,0 +1,101 @@
+import numpy as np
+from scipy.ndimage import spline_filter1d
+
+
+class TrackResampler:
+    """ Resamples a block of equally long tracks [n_tracks, n_pos, n_values] to
+        [n_tracks, resampleTo, n_values] in one go. The first three values of a
+        position are x/y/z, the others (attributes) are resampled alike.
+        Available modes:
+        - "spline": cubic spline, like scipy.ndimage.zoom (the former default)
+        - "linear": linear interpolation between neighbouring positions
+        - "arclength": positions evenly spaced along the (polyline) track
+        First and last position are always kept as they are. """
+
+    modes = ["spline", "linear", "arclength"]
+
+    def __init__(self, resampleTo, mode="spline"):
+        if mode not in self.modes:
+            raise ValueError("Unknown resampling mode " + str(mode) + ", use one of " + str(self.modes))
+        self.resampleTo = resampleTo
+        self.mode = mode
+
+    def resample(self, tracks):
+        """ Resamples all tracks of the block [n_tracks, n_pos, n_values] """
+        tracks = np.asarray(tracks, dtype=np.float64)
+        length = tracks.shape[1]
+        if length == 1:
+            return np.repeat(tracks, self.resampleTo, axis=1)
+        if self.mode == "spline":
+            resampled = self.resampleSpline(tracks, self.getSamplePositions(length))
+        elif self.mode == "linear":
+            resampled = self.resampleLinear(tracks, self.getSamplePositions(length))
+        else:
+            resampled = self.resampleArcLength(tracks)
+
+        # Copy first and last to always keep original start and end points,
+        # avoiding interpolation artifacts.
+        resampled[:, 0] = tracks[:, 0]
+        resampled[:, -1] = tracks[:, -1]
+        return resampled
+
+    def getSamplePositions(self, length):
+        """ Evenly spaced (fractional) indices from the first to the last position """
+        if self.resampleTo == 1:
+            return np.zeros(1)
+        return np.arange(self.resampleTo) * ((length - 1) / (self.resampleTo - 1))
+
+    def resampleSpline(self, tracks, x):
+        """ Cubic B-spline interpolation along the positions axis, with the
+            boundary handling of scipy.ndimage.zoom """
+        length = tracks.shape[1]
+        coefficients = spline_filter1d(tracks, order=3, axis=1, mode="mirror")
+        base = np.floor(x).astype(np.int64)
+        t = x - base
+        weights = [(1 - t)**3 / 6,
+                   (3 * t**3 - 6 * t**2 + 4) / 6,
+                   (-3 * t**3 + 3 * t**2 + 3 * t + 1) / 6,
+                   t**3 / 6]
+        result = np.zeros((tracks.shape[0], len(x), tracks.shape[2]))
+        for offset, w in zip(range(-1, 3), weights):
+            result += w[None, :, None] * coefficients[:, self.mirrorIndices(base + offset, length)]
+        return result
+
+    def mirrorIndices(self, indices, length):
+        """ Mirrors indices outside of [0, length - 1] at the borders """
+        period = 2 * (length - 1)
+        indices = np.mod(indices, period)
+        return np.where(indices > length - 1, period - indices, indices)
+
+    def resampleLinear(self, tracks, x):
+        """ Linear interpolation at the fractional indices x (same for all tracks) """
+        base = np.minimum(np.floor(x).astype(np.int64), tracks.shape[1] - 2)
+        t = (x - base)[None, :, None]
+        return tracks[:, base] * (1 - t) + tracks[:, base + 1] * t
+
+    def resampleArcLength(self, tracks):
+        """ Linear interpolation at positions evenly spaced along each track's path.
+            Tracks without any extent fall back to evenly spaced indices. """
+        n, length = tracks.shape[0], tracks.shape[1]
+        segments = np.linalg.norm(np.diff(tracks[:, :, 0:3], axis=1), axis=2)
+        cumulative = np.zeros((n, length))
+        np.cumsum(segments, axis=1, out=cumulative[:, 1:])
+        total = cumulative[:, -1:].copy()
+        flat = total[:, 0] <= 0
+        cumulative[flat] = np.arange(length) / (length - 1)
+        total[flat] = 1.
+        cumulative /= total
+
+        # One searchsorted for all tracks: shift each track into its own interval
+        fractions = np.linspace(0., 1., self.resampleTo)[None, :]
+        targets = fractions + 2. * np.arange(n)[:, None]
+        shifted = cumulative + 2. * np.arange(n)[:, None]
+        base = np.searchsorted(shifted.ravel(), targets.ravel(), side="right").reshape(targets.shape) - 1
+        base = np.clip(base - length * np.arange(n)[:, None], 0, length - 2)
+        rows = np.arange(n)[:, None]
+        start = cumulative[rows, base]
+        segmentLength = cumulative[rows, base + 1] - start
+        t = np.divide(fractions - start, segmentLength,
+                      out=np.zeros_like(start), where=segmentLength > 0)
+        t = np.clip(t, 0., 1.)[:, :, None]
+        return tracks[rows, base] * (1 - t) + tracks[rows, base + 1] * t
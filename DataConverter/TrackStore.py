@@ -0,0 +1,146 @@
+import os
+import json
+import numpy as np
+
+
+class TrackStore:
+    """ Tracks and attributes on disk, memory-mapped, for datasets larger than the
+        RAM. A store is a folder with:
+        - tracks.bin: positions [n_tracks, n_pos, 3] as raw little-endian numbers
+        - attributes.bin: attribute values [n_tracks, n_pos, n_attributes]
+        - header.json: numTracks, numPositions, dtype, attributeNames, scale, barycenter
+        tracks and attributes are numpy memmaps, so they can be used like arrays, but
+        only the pages that are touched are read (and they stay in the page cache,
+        not in the memory of the process). Work on them in blocks of tracks (see
+        getBlocks) to keep temporary arrays small. """
+
+    def __init__(self, path):
+        """ Opens an existing store """
+        self.path = path
+        try:
+            with open(os.path.join(path, "header.json")) as f:
+                self.header = json.load(f)
+        except IOError:
+            raise IOError("Could not open track store " + path + " (missing header.json)")
+        self.mapArrays()
+
+    @classmethod
+    def create(cls, path, numTracks, numPositions, attributeNames, dtype=np.float64):
+        """ Creates a new (empty) store for numTracks tracks, replacing an existing
+            one. The files are allocated sparsely, i.e. filled with zeros on demand. """
+        os.makedirs(path, exist_ok=True)
+        header = {"numTracks": 0, "numPositions": numPositions, "dtype": np.dtype(dtype).newbyteorder("<").str,
+                  "attributeNames": list(attributeNames), "scale": 1., "barycenter": [0., 0., 0.]}
+        for name in ["tracks.bin", "attributes.bin"]:
+            open(os.path.join(path, name), "wb").close()
+        for name in ["lineIds.bin", "indices.bin"]:
+            if os.path.exists(os.path.join(path, name)):
+                os.remove(os.path.join(path, name))
+        with open(os.path.join(path, "header.json"), "w") as f:
+            json.dump(header, f)
+        store = cls(path)
+        store.resize(numTracks)
+        return store
+
+    def getFilename(self, name):
+        return os.path.join(self.path, name)
+
+    def getShapes(self, numAttributes=None):
+        numAttributes = len(self.header["attributeNames"]) if numAttributes is None else numAttributes
+        numTracks, numPositions = self.header["numTracks"], self.header["numPositions"]
+        return {"tracks.bin": (numTracks, numPositions, 3), "attributes.bin": (numTracks, numPositions, numAttributes)}
+
+    def mapArrays(self):
+        """ (Re-)Maps tracks and attributes to the files """
+        shapes = self.getShapes()
+        self.tracks = self.mapFile("tracks.bin", shapes["tracks.bin"])
+        self.attributes = self.mapFile("attributes.bin", shapes["attributes.bin"])
+
+    def mapFile(self, name, shape, dtype=None, mode="r+"):
+        dtype = np.dtype(self.header["dtype"]) if dtype is None else dtype
+        if int(np.prod(shape)) == 0:  # Empty files cannot be mapped
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.getFilename(name), dtype=dtype, mode=mode, shape=shape)
+
+    def resize(self, numTracks):
+        """ Changes the number of tracks (new tracks are 0) """
+        self.flush()
+        self.tracks = self.attributes = None
+        self.header["numTracks"] = numTracks
+        itemSize = np.dtype(self.header["dtype"]).itemsize
+        for name, shape in self.getShapes().items():
+            os.truncate(self.getFilename(name), int(np.prod(shape)) * itemSize)
+        self.writeHeader()
+        self.mapArrays()
+
+    def append(self, tracks, attributes):
+        """ Adds tracks [n, n_pos, 3] and their attributes [n, n_pos, n_attributes] at
+            the end, e.g. for loaders that do not know the number of tracks in advance """
+        numTracks = self.header["numTracks"]
+        self.resize(numTracks + len(tracks))
+        self.tracks[numTracks:] = tracks
+        self.attributes[numTracks:] = attributes
+
+    def allocateAttributes(self, names):
+        """ Appends the attributes names (the attributes file is rewritten block by
+            block) and returns the memmap [n_tracks, n_pos, len(names)] of the new ones """
+        numAttributes = len(self.header["attributeNames"])
+        shape = self.getShapes(numAttributes + len(names))["attributes.bin"]
+        newAttributes = np.memmap(self.getFilename("attributes.bin.tmp"), dtype=np.dtype(self.header["dtype"]),
+                                  mode="w+", shape=shape) if np.prod(shape) > 0 else np.zeros(shape)
+        for block in self.getBlocks():
+            newAttributes[block, :, 0:numAttributes] = self.attributes[block]
+        if isinstance(newAttributes, np.memmap):
+            newAttributes.flush()
+        del newAttributes
+        self.attributes = None
+        if os.path.exists(self.getFilename("attributes.bin.tmp")):
+            os.replace(self.getFilename("attributes.bin.tmp"), self.getFilename("attributes.bin"))
+        self.header["attributeNames"] = self.header["attributeNames"] + list(names)
+        self.writeHeader()
+        self.mapArrays()
+        return self.attributes[:, :, numAttributes:]
+
+    def getIndices(self):
+        """ Line ids and segment indices of the tracks (like
+            WebGlToolBuilder.tracksToIndices), written block by block to lineIds.bin
+            and indices.bin and returned as memmaps """
+        numTracks, numPositions = self.header["numTracks"], self.header["numPositions"]
+        numSegments = max(numPositions - 1, 0)
+        lineIds = self.mapFile("lineIds.bin", (numTracks * numPositions,), np.dtype("<u4"), "w+")
+        indices = self.mapFile("indices.bin", (numTracks * numSegments * 2,), np.dtype("<u4"), "w+")
+        for block in self.getBlocks():
+            tracks = np.arange(block.start, min(block.stop, numTracks), dtype=np.uint32)
+            lineIds[block.start * numPositions:block.start * numPositions + len(tracks) * numPositions] = \
+                np.repeat(tracks, numPositions)
+            starts = (tracks[:, None] * numPositions + np.arange(numSegments, dtype=np.uint32)[None, :])
+            blockIndices = np.stack([starts, starts + 1], axis=2).reshape(-1)
+            indices[block.start * numSegments * 2:block.start * numSegments * 2 + len(blockIndices)] = blockIndices
+        return lineIds, indices
+
+    def getBlocks(self, maxPositions=2**18):
+        """ Slices of tracks with at most about maxPositions positions each """
+        numTracks = self.header["numTracks"]
+        blockSize = max(1, maxPositions // max(1, self.header["numPositions"]))
+        return [slice(start, min(start + blockSize, numTracks)) for start in range(0, numTracks, blockSize)]
+
+    def setTransformation(self, scale, barycenter):
+        """ Remembers how the tracks were scaled and moved (see run.py) """
+        self.header["scale"] = float(scale)
+        self.header["barycenter"] = [float(x) for x in barycenter]
+        self.writeHeader()
+
+    def get(self):
+        """ Tracks, attributes and attribute names, like the loaders """
+        return self.tracks, self.attributes, list(self.header["attributeNames"])
+
+    def flush(self):
+        for array in [getattr(self, "tracks", None), getattr(self, "attributes", None)]:
+            if isinstance(array, np.memmap):
+                array.flush()
+        self.writeHeader()
+
+    def writeHeader(self):
+        with open(self.getFilename("header.json.tmp"), "w") as f:
+            json.dump(self.header, f)
+        os.replace(self.getFilename("header.json.tmp"), self.getFilename("header.json"))
@@ -1,11 +1,12 @@
 import numpy as np
 import json
-import re
-import zlib
-import base64
+import functools
 import math
 import os 
 
+from .JsonStreamWriter import JsonStreamWriter, iterateChunks
+from .Compressor import Compressor
+
 class WebGlToolBuilder:
     """ Tool to combine data in order to create a JSON file for the WebGL tool """
 
@@ -15,37 +16,51 @@ class WebGlToolBuilder:
         self.data["sets"] = []
         self.max = [-999999, -999999, -999999]
         self.accuracy = 4
+        self.attributeAccuracy = {}
+        self.quantizationBits = None
         self.useZip = True
 
     def setDecimalDigits(self, value):
         """ Number of digits (after decimal point) that should be stored in JSON """
         self.accuracy = value
 
+    def setAttributeDecimalDigits(self, attributeName, value):
+        """ Number of digits (after decimal point) for a single attribute, overrides
+            setDecimalDigits for its values """
+        self.attributeAccuracy[attributeName] = value
+
+    def setQuantization(self, bits=16):
+        """ Store positions and attribute values of trajectory datasets as integers of
+            the given number of bits (at most 16), relative to the bounding box of the
+            dataset (or the range of an attribute). The viewer restores the values
+            from the stored offset/scale. Use None to store floats again. """
+        if bits is not None and not 1 <= bits <= 16:
+            raise ValueError("Quantization supports 1 to 16 bits, not " + str(bits))
+        self.quantizationBits = bits
+
     def tracksToIndices(self, tracks):
         """ Creates index list and line ID list for a set of tracks 
             E.g. 2 tracks represented by p1_1, p1_2, p1_3 and p2_1, p2_2, p2_3 result in:
             - an index list  0, 1, 1, 2,   3, 4, 4, 5
-            - a list representing to which line a position belongs: 0, 0, 0, 1, 1, 1 """
-        indices = []
-        lineIds = []
-        counter = 0
-        for trackId in range(tracks.shape[0]):
-            for posId in range(tracks.shape[1] - 1):
-                lineIds.append(trackId)
-                indices.append(counter)
-                counter += 1
-                indices.append(counter)
-            lineIds.append(trackId)
-            counter += 1  # the skipped one
-        return lineIds, indices
+            - a list representing to which line a position belongs: 0, 0, 0, 1, 1, 1
+            Both are returned as uint32 arrays. """
+        numTracks, numPos = tracks.shape[0], tracks.shape[1]
+        lineIds = np.repeat(np.arange(numTracks, dtype=np.uint32), numPos)
+        # Each segment connects a position (except the last of a track) with the next one
+        starts = np.arange(numTracks * numPos, dtype=np.uint32).reshape((numTracks, numPos))[:, :-1]
+        indices = np.empty((numTracks, max(numPos - 1, 0), 2), dtype=np.uint32)
+        indices[:, :, 0] = starts
+        indices[:, :, 1] = starts + 1
+        return lineIds, indices.reshape(-1)
 
     def exportJsonHelperState(self, tracks, attributes, attributeNames, stateName, stateNumber):
-        """ Creates JSON structure (and delivers indices/lineIDs) for a certain
-            state of the data """
-        lineIds, indices = self.tracksToIndices(tracks)
+        """ Creates JSON structure for a certain state of the data. Positions and
+            attribute values are kept as numpy arrays (views, no copies) until the
+            data is written, where they are flattened chunk by chunk.
+            Indices/lineIDs belong to the dataset (all states share them). """
         state = {}
         state["name"] = stateName
-        state["positions"] = [tracks.flatten().tolist()]
+        state["positions"] = [tracks.reshape(-1)]
         self.updateMaxValues(state["positions"])
         state["attributes"] = []
 
@@ -56,9 +71,8 @@ class WebGlToolBuilder:
                 state["attributes"][i]["dim"] = 1
                 state["attributes"][i]["shared"] = True
                 state["attributes"][i]["fixedColor"] = True
-                state["attributes"][i]["values"] = [
-                    attributes[:, :, i].flatten().tolist()]
-        return state, lineIds, indices
+                state["attributes"][i]["values"] = [attributes[:, :, i]]
+        return state
 
     def createAxe(self, dimension, start, end, stepSize, startIndex):
         values = [0., 0., 0.]
@@ -162,15 +176,21 @@ class WebGlToolBuilder:
 
         s["states"].append({})
         s["states"][-1]["name"] = "original"
-        s["states"][-1]["positions"] = positions[0]
-        s["states"][-1]["normals"] = normals[0]
+        s["states"][-1]["positions"] = [np.asarray(p, dtype=np.float64) for p in positions[0]]
+        s["states"][-1]["normals"] = [np.asarray(n, dtype=np.float64) for n in normals[0]]
         s["states"][-1]["attributes"] = []
         self.data["sets"].append(s)
 
-    def addTrajectoryDataset(self, tracks, attributes, attributeNames, datasetName, scale):
-        """ Create the JSON structure for a new data set """
+    def addTrajectoryDataset(self, tracks, attributes, attributeNames, datasetName, scale, store=None):
+        """ Create the JSON structure for a new data set. If tracks and attributes
+            belong to a TrackStore, pass it as store: the indices are then written to
+            the store as well, instead of being held in memory. """
         s = {}
-        state, lineIds, indices = self.exportJsonHelperState(
+        if store is not None:
+            lineIds, indices = store.getIndices()
+        else:
+            lineIds, indices = self.tracksToIndices(tracks)
+        state = self.exportJsonHelperState(
             tracks, attributes, attributeNames, "original", 0)
         s["states"] = [state]
         s["name"] = datasetName
@@ -185,43 +205,193 @@ class WebGlToolBuilder:
 
     def updateMaxValues(self, positions):
         for j in range(0, len(positions)):
-            for i in range(0, len(positions[j])):
-                k = i % self.data["dim"]
-                self.max[k] = max(self.max[k], positions[j][i])
+            if len(positions[j]) == 0:
+                continue
+            maxima = np.asarray(positions[j]).reshape((-1, self.data["dim"])).max(axis=0)
+            self.max = [max(m, float(v)) for m, v in zip(self.max, maxima)]
 
     def addTrajectoryDatasetState(self, tracks, stateName, attributes=[]):
         """ Adds another state to the newest dataset. Note, the state must have identical
-            number of tracks/positions as previous state. """
-        state, lineIds, indices = self.exportJsonHelperState(
+            number of tracks/positions as previous state (it uses the indices of the dataset). """
+        state = self.exportJsonHelperState(
             tracks, attributes, [], stateName, len(self.data["sets"][-1]["states"]))
         self.data["sets"][-1]["states"].append(state)
 
-    def writeJson(self, path, zipped):
-        """ Outputs the data, and optionally zips it """
+    def writeJson(self, path, zipped, compressor=None, sidecarPath=None):
+        """ Outputs the data, and optionally zips it (with the given Compressor, by
+            default zlib). The JSON is streamed to the file (and the compressor) chunk
+            by chunk, it never exists as a whole in memory. Zipped data is stored as
+            base64 string, or - if sidecarPath is given - as raw bytes in the sidecar
+            file, which path then refers to (requires a web server, like writeBinary). """
         print("Prepare data export")
-        data = json.dumps(self.data)
-        data = self.reduceAccuracy(data)
+        data = self.prepareNumbers(rounded=True, chunked=True)
+        chunkSize = self.data["dim"] * 2**16
+        if not zipped:
+            compressor = None
+        elif compressor is None:
+            compressor = Compressor()
+        if compressor is not None:
+            print("Create zipped version (" + compressor.codec + ", level " + str(compressor.level) + ")")
+        try:
+            if compressor is not None and sidecarPath is not None:
+                with open(sidecarPath, 'wb') as sidecar:
+                    JsonStreamWriter(sidecar, compressor, chunkSize, encodeBase64=False).writeDocument(data)
+                reference = {"compressed": os.path.basename(sidecarPath), "codec": compressor.codec}
+                with open(path, 'w') as outfile:
+                    outfile.write("var data = " + json.dumps(reference))
+            else:
+                with open(path, 'w') as outfile:
+                    JsonStreamWriter(outfile, compressor, chunkSize).writeDocument(data, "var data = ")
+        except IOError:
+            print("Error! Could not create output file", path)
+        if compressor is not None:
+            self.printCompressionStatistics(compressor)
+
+    def compareCompression(self, codecs=Compressor.codecs, levels=[1, 6, 9], threads=1):
+        """ Compresses the JSON with each codec and level (without writing anything)
+            and reports size and time, to choose between export time and download size """
+        data = self.prepareNumbers(rounded=True, chunked=True)
+        with open(os.devnull, 'wb') as devnull:
+            for codec in codecs:
+                for level in levels:
+                    compressor = Compressor(codec, level, threads)
+                    JsonStreamWriter(devnull, compressor, self.data["dim"] * 2**16, encodeBase64=False).writeDocument(data)
+                    self.printCompressionStatistics(compressor)
 
-        if zipped:
-            print("Create zipped version")
-            data = self.zipData(data)
+    def printCompressionStatistics(self, compressor):
+        megaBytes = lambda b: str(round(b / 1024 / 1024, 1))
+        print(compressor.codec, "level", compressor.level, "-", megaBytes(compressor.bytesIn), "MB to",
+              megaBytes(compressor.bytesOut), "MB (" + megaBytes(compressor.bytesOut * 4 / 3), "MB as base64),",
+              "ratio", round(compressor.bytesIn / max(compressor.bytesOut, 1), 2), "in",
+              round(compressor.duration, 2), "s")
 
+    def writeBinary(self, path, binaryPath):
+        """ Alternative to writeJson: all numpy arrays (positions, attributes, indices,
+            entities) are written as little-endian float32/uint32 (uint16, if quantized)
+            blobs into binaryPath, chunk by chunk.
+            The JSON at path only holds the remaining structure and, instead of each
+            array, a reference {"binaryType", "offset", "length"} into the blob. The
+            viewer maps these directly to typed arrays. Both files must be served
+            from the same folder (via http). """
+        print("Prepare binary data export")
+        data = self.prepareNumbers(rounded=False, chunked=True)
         try:
+            with open(binaryPath, 'wb') as binaryFile:
+                manifest = self.replaceArraysByReferences(data, binaryFile)
+            manifest["binary"] = os.path.basename(binaryPath)
             with open(path, 'w') as outfile:
-                outfile.write("var data = " + data)
+                outfile.write("var data = " + json.dumps(manifest))
         except IOError:
-            print("Error! Could not create output file", path)
+            print("Error! Could not create output files", path, binaryPath)
 
-    def reduceAccuracy(self, data):
-        # Replace long digits by regex accepting only n digits
-        decimal = ""
-        for i in range(self.accuracy):
-            decimal += "[0-9]"
-        print("Reduce accuracy to", self.accuracy, "digits")
-        data = re.sub('\s(-?[0-9]+\.'+decimal+')([0-9]*)', r'\1', data)
+    def prepareNumbers(self, rounded, chunked=False):
+        """ Copy of the data (sharing all unchanged arrays), where positions and
+            attributes are quantized (see setQuantization) or, if rounded, reduced to
+            the number of digits set by setDecimalDigits/setAttributeDecimalDigits.
+            If chunked, arrays are not converted but replaced by (values, transform),
+            so that JsonStreamWriter converts them chunk by chunk. """
+        if self.quantizationBits is not None:
+            print("Quantize to", self.quantizationBits, "bits")
+        elif rounded:
+            print("Reduce accuracy to", self.accuracy, "digits")
+        data = dict(self.data)
+        data["sets"] = []
+        for dataset in self.data["sets"]:
+            s = dict(dataset)
+            s["states"] = [dict(state) for state in dataset["states"]]
+            quantization = {}
+            if self.quantizationBits is not None and dataset["type"] == "lines":
+                quantization = self.getQuantizationParameters(s["states"])
+                s["quantization"] = quantization
+            for state in s["states"]:
+                state["positions"] = [self.prepareArray(p, self.accuracy, quantization.get("positions"), rounded, chunked)
+                                      for p in state["positions"]]
+                if "normals" in state:
+                    state["normals"] = [self.prepareArray(n, self.accuracy, None, rounded, chunked)
+                                        for n in state["normals"]]
+                state["attributes"] = [dict(a) for a in state["attributes"]]
+                for a in state["attributes"]:
+                    digits = self.attributeAccuracy.get(a["name"], self.accuracy)
+                    parameters = quantization.get("attributes", {}).get(a["name"])
+                    a["values"] = [self.prepareArray(v, digits, parameters, rounded, chunked) for v in a["values"]]
+            data["sets"].append(s)
         return data
 
-    def zipData(self, data):
-        data = zlib.compress(str.encode(data))
-        data = "\""+base64.b64encode(data).decode()+"\""
-        return data
+    def getQuantizationParameters(self, states):
+        """ Offset/scale per dimension for the positions (bounding box of all states)
+            and per attribute (range of its values) """
+        dim = self.data["dim"]
+        positions = [np.asarray(p).reshape((-1, dim)) for state in states for p in state["positions"] if len(p) > 0]
+        quantization = {"attributes": {}}
+        if len(positions) > 0:
+            quantization["positions"] = self.getOffsetAndScale(
+                np.min([p.min(axis=0) for p in positions], axis=0),
+                np.max([p.max(axis=0) for p in positions], axis=0))
+        ranges = {}
+        for state in states:
+            for a in state["attributes"]:
+                for v in a["values"]:
+                    if np.size(v) > 0 and a["dim"] == 1:
+                        low, high = ranges.get(a["name"], (np.inf, -np.inf))
+                        ranges[a["name"]] = (min(low, np.min(v)), max(high, np.max(v)))
+        for name, (low, high) in ranges.items():
+            quantization["attributes"][name] = self.getOffsetAndScale(np.array([low]), np.array([high]))
+        return quantization
+
+    def getOffsetAndScale(self, low, high):
+        """ Maps [low, high] to the integers 0 ... 2^bits - 1 """
+        scale = (high - low) / (2**self.quantizationBits - 1)
+        scale[scale <= 0] = 1.
+        return {"offset": low.tolist(), "scale": scale.tolist()}
+
+    def prepareArray(self, values, digits, quantization, rounded, chunked):
+        """ See prepareNumbers """
+        if not chunked or not isinstance(values, np.ndarray):
+            return self.reduceAccuracy(values, digits, quantization, rounded)
+        return values, functools.partial(self.reduceAccuracy, digits=digits, quantization=quantization, rounded=rounded)
+
+    def reduceAccuracy(self, values, digits, quantization, rounded):
+        """ Quantizes the (flat) values, if quantization parameters are given, or
+            rounds them to the number of digits. Lists are left as they are. """
+        if not isinstance(values, np.ndarray):
+            return values
+        if quantization is not None:
+            offset = np.array(quantization["offset"])
+            scale = np.array(quantization["scale"])
+            quantized = np.rint((values.reshape((-1, len(scale))) - offset) / scale)
+            return np.clip(quantized, 0, 2**self.quantizationBits - 1).astype(np.uint16).reshape(-1)
+        if rounded:
+            # Round in double precision, float32 values would be printed with all their digits
+            return np.round(values.astype(np.float64), digits)
+        return values
+
+    def replaceArraysByReferences(self, item, binaryFile, chunkSize=None):
+        """ Copy of the (nested) data structure, where numpy arrays (and tuples
+            (values, transform), see prepareNumbers) are written to binaryFile chunk by
+            chunk and replaced by a reference. chunkSize must be a multiple of dim
+            (quantization works on whole positions), by default dim * 2^18. """
+        if chunkSize is None:
+            chunkSize = self.data["dim"] * 2**18
+        if isinstance(item, dict):
+            return {k: self.replaceArraysByReferences(v, binaryFile, chunkSize) for k, v in item.items()}
+        if isinstance(item, list):
+            return [self.replaceArraysByReferences(v, binaryFile, chunkSize) for v in item]
+        if isinstance(item, (np.ndarray, tuple)):
+            values, transform = item if isinstance(item, tuple) else (item, None)
+            # The transform may change the type (quantization), apply it to no values
+            resultType = values.dtype if transform is None else transform(values[:0]).dtype
+            if resultType == np.uint16:
+                binaryType, dtype = "uint16", "<u2"
+            elif np.issubdtype(resultType, np.integer):
+                binaryType, dtype = "uint32", "<u4"
+            else:
+                binaryType, dtype = "float32", "<f4"
+            # Typed arrays must start at a multiple of their element size
+            binaryFile.write(bytes(-binaryFile.tell() % 4))
+            reference = {"binaryType": binaryType, "offset": binaryFile.tell(), "length": values.size}
+            for chunk in iterateChunks(values, chunkSize):
+                if transform is not None:
+                    chunk = transform(chunk)
+                binaryFile.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+            return reference
+        return item
@@ -4,6 +4,12 @@ from .BiotracksLoader import BiotracksLoader
 from .TgmmLoader import TgmmLoader
 from .SvfLoader import SvfLoader
 from .EdgeBundler import EdgeBundler
+from .EdgeBundlerSession import EdgeBundlerSession
 from .TrackModifier import TrackModifier
+from .TrackStore import TrackStore
+from .PreprocessingCache import PreprocessingCache
 from .WebGlToolBuilder import WebGlToolBuilder
+from .JsonStreamWriter import JsonStreamWriter
+from .Compressor import Compressor
 from .TriangleLoader import TriangleLoader
+from .TrackResampler import TrackResampler
@@ -7,4 +7,4 @@ t.exports=function(){"use strict";function t(e){return(t="function"==typeof Symb
  * @author   Feross Aboukhadijeh <http://feross.org>
  * @license  MIT
  */
-var i=n(9),r=n(10),a=n(11);function o(){return l.TYPED_ARRAY_SUPPORT?2147483647:1073741823}function s(t,e){if(o()<e)throw new RangeError("Invalid typed array length");return l.TYPED_ARRAY_SUPPORT?(t=new Uint8Array(e)).__proto__=l.prototype:(null===t&&(t=new l(e)),t.length=e),t}function l(t,e,n){if(!(l.TYPED_ARRAY_SUPPORT||this instanceof l))return new l(t,e,n);if("number"==typeof t){if("string"==typeof e)throw new Error("If encoding is specified then the first argument must be a string");return u(this,t)}return c(this,t,e,n)}function c(t,e,n,i){if("number"==typeof e)throw new TypeError('"value" argument must not be a number');return"undefined"!=typeof ArrayBuffer&&e instanceof ArrayBuffer?function(t,e,n,i){if(e.byteLength,n<0||e.byteLength<n)throw new RangeError("'offset' is out of bounds");if(e.byteLength<n+(i||0))throw new RangeError("'length' is out of bounds");e=void 0===n&&void 0===i?new Uint8Array(e):void 0===i?new Uint8Array(e,n):new Uint8Array(e,n,i);l.TYPED_ARRAY_SUPPORT?(t=e).__proto__=l.prototype:t=d(t,e);return t}(t,e,n,i):"string"==typeof e?function(t,e,n){"string"==typeof n&&""!==n||(n="utf8");if(!l.isEncoding(n))throw new TypeError('"encoding" must be a valid string encoding');var i=0|f(e,n),r=(t=s(t,i)).write(e,n);r!==i&&(t=t.slice(0,r));return t}(t,e,n):function(t,e){if(l.isBuffer(e)){var n=0|p(e.length);return 0===(t=s(t,n)).length||e.copy(t,0,0,n),t}if(e){if("undefined"!=typeof ArrayBuffer&&e.buffer instanceof ArrayBuffer||"length"in e)return"number"!=typeof e.length||(i=e.length)!=i?s(t,0):d(t,e);if("Buffer"===e.type&&a(e.data))return d(t,e.data)}var i;throw new TypeError("First argument must be a string, Buffer, ArrayBuffer, Array, or array-like object.")}(t,e)}function h(t){if("number"!=typeof t)throw new TypeError('"size" argument must be a number');if(t<0)throw new RangeError('"size" argument must not be negative')}function u(t,e){if(h(e),t=s(t,e<0?0:0|p(e)),!l.TYPED_ARRAY_SUPPORT)for(var n=0;n<e;++n)t[n]=0;return t}function d(t,e){var n=e.length<0?0:0|p(e.length);t=s(t,n);for(var i=0;i<n;i+=1)t[i]=255&e[i];return t}function p(t){if(t>=o())throw new RangeError("Attempt to allocate Buffer larger than maximum size: 0x"+o().toString(16)+" bytes");return 0|t}function f(t,e){if(l.isBuffer(t))return t.length;if("undefined"!=typeof ArrayBuffer&&"function"==typeof ArrayBuffer.isView&&(ArrayBuffer.isView(t)||t instanceof ArrayBuffer))return t.byteLength;"string"!=typeof t&&(t=""+t);var n=t.length;if(0===n)return 0;for(var i=!1;;)switch(e){case"ascii":case"latin1":case"binary":return n;case"utf8":case"utf-8":case void 0:return U(t).length;case"ucs2":case"ucs-2":case"utf16le":case"utf-16le":return 2*n;case"hex":return n>>>1;case"base64":return H(t).length;default:if(i)return U(t).length;e=(""+e).toLowerCase(),i=!0}}function m(t,e,n){var i=!1;if((void 0===e||e<0)&&(e=0),e>this.length)return"";if((void 0===n||n>this.length)&&(n=this.length),n<=0)return"";if((n>>>=0)<=(e>>>=0))return"";for(t||(t="utf8");;)switch(t){case"hex":return L(this,e,n);case"utf8":case"utf-8":return E(this,e,n);case"ascii":return T(this,e,n);case"latin1":case"binary":return C(this,e,n);case"base64":return S(this,e,n);case"ucs2":case"ucs-2":case"utf16le":case"utf-16le":return R(this,e,n);default:if(i)throw new TypeError("Unknown encoding: "+t);t=(t+"").toLowerCase(),i=!0}}function g(t,e,n){var i=t[e];t[e]=t[n],t[n]=i}function v(t,e,n,i,r){if(0===t.length)return-1;if("string"==typeof n?(i=n,n=0):n>2147483647?n=2147483647:n<-2147483648&&(n=-2147483648),n=+n,isNaN(n)&&(n=r?0:t.length-1),n<0&&(n=t.length+n),n>=t.length){if(r)return-1;n=t.length-1}else if(n<0){if(!r)return-1;n=0}if("string"==typeof e&&(e=l.from(e,i)),l.isBuffer(e))return 0===e.length?-1:y(t,e,n,i,r);if("number"==typeof e)return e&=255,l.TYPED_ARRAY_SUPPORT&&"function"==typeof Uint8Array.prototype.indexOf?r?Uint8Array.prototype.indexOf.call(t,e,n):Uint8Array.prototype.lastIndexOf.call(t,e,n):y(t,[e],n,i,r);throw new TypeError("val must be string, number or Buffer")}function y(t,e,n,i,r){var a,o=1,s=t.length,l=e.length;if(void 0!==i&&("ucs2"===(i=String(i).toLowerCase())||"ucs-2"===i||"utf16le"===i||"utf-16le"===i)){if(t.length<2||e.length<2)return-1;o=2,s/=2,l/=2,n/=2}function c(t,e){return 1===o?t[e]:t.readUInt16BE(e*o)}if(r){var h=-1;for(a=n;a<s;a++)if(c(t,a)===c(e,-1===h?0:a-h)){if(-1===h&&(h=a),a-h+1===l)return h*o}else-1!==h&&(a-=a-h),h=-1}else for(n+l>s&&(n=s-l),a=n;a>=0;a--){for(var u=!0,d=0;d<l;d++)if(c(t,a+d)!==c(e,d)){u=!1;break}if(u)return a}return-1}function b(t,e,n,i){n=Number(n)||0;var r=t.length-n;i?(i=Number(i))>r&&(i=r):i=r;var a=e.length;if(a%2!=0)throw new TypeError("Invalid hex string");i>a/2&&(i=a/2);for(var o=0;o<i;++o){var s=parseInt(e.substr(2*o,2),16);if(isNaN(s))return o;t[n+o]=s}return o}function x(t,e,n,i){return G(U(e,t.length-n),t,n,i)}function _(t,e,n,i){return G(function(t){for(var e=[],n=0;n<t.length;++n)e.push(255&t.charCodeAt(n));return e}(e),t,n,i)}function w(t,e,n,i){return _(t,e,n,i)}function M(t,e,n,i){return G(H(e),t,n,i)}function A(t,e,n,i){return G(function(t,e){for(var n,i,r,a=[],o=0;o<t.length&&!((e-=2)<0);++o)n=t.charCodeAt(o),i=n>>8,r=n%256,a.push(r),a.push(i);return a}(e,t.length-n),t,n,i)}function S(t,e,n){return 0===e&&n===t.length?i.fromByteArray(t):i.fromByteArray(t.slice(e,n))}function E(t,e,n){n=Math.min(t.length,n);for(var i=[],r=e;r<n;){var a,o,s,l,c=t[r],h=null,u=c>239?4:c>223?3:c>191?2:1;if(r+u<=n)switch(u){case 1:c<128&&(h=c);break;case 2:128==(192&(a=t[r+1]))&&(l=(31&c)<<6|63&a)>127&&(h=l);break;case 3:a=t[r+1],o=t[r+2],128==(192&a)&&128==(192&o)&&(l=(15&c)<<12|(63&a)<<6|63&o)>2047&&(l<55296||l>57343)&&(h=l);break;case 4:a=t[r+1],o=t[r+2],s=t[r+3],128==(192&a)&&128==(192&o)&&128==(192&s)&&(l=(15&c)<<18|(63&a)<<12|(63&o)<<6|63&s)>65535&&l<1114112&&(h=l)}null===h?(h=65533,u=1):h>65535&&(h-=65536,i.push(h>>>10&1023|55296),h=56320|1023&h),i.push(h),r+=u}return function(t){var e=t.length;if(e<=4096)return String.fromCharCode.apply(String,t);var n="",i=0;for(;i<e;)n+=String.fromCharCode.apply(String,t.slice(i,i+=4096));return n}(i)}e.Buffer=l,e.SlowBuffer=function(t){+t!=t&&(t=0);return l.alloc(+t)},e.INSPECT_MAX_BYTES=50,l.TYPED_ARRAY_SUPPORT=void 0!==t.TYPED_ARRAY_SUPPORT?t.TYPED_ARRAY_SUPPORT:function(){try{var t=new Uint8Array(1);return t.__proto__={__proto__:Uint8Array.prototype,foo:function(){return 42}},42===t.foo()&&"function"==typeof t.subarray&&0===t.subarray(1,1).byteLength}catch(t){return!1}}(),e.kMaxLength=o(),l.poolSize=8192,l._augment=function(t){return t.__proto__=l.prototype,t},l.from=function(t,e,n){return c(null,t,e,n)},l.TYPED_ARRAY_SUPPORT&&(l.prototype.__proto__=Uint8Array.prototype,l.__proto__=Uint8Array,"undefined"!=typeof Symbol&&Symbol.species&&l[Symbol.species]===l&&Object.defineProperty(l,Symbol.species,{value:null,configurable:!0})),l.alloc=function(t,e,n){return function(t,e,n,i){return h(e),e<=0?s(t,e):void 0!==n?"string"==typeof i?s(t,e).fill(n,i):s(t,e).fill(n):s(t,e)}(null,t,e,n)},l.allocUnsafe=function(t){return u(null,t)},l.allocUnsafeSlow=function(t){return u(null,t)},l.isBuffer=function(t){return!(null==t||!t._isBuffer)},l.compare=function(t,e){if(!l.isBuffer(t)||!l.isBuffer(e))throw new TypeError("Arguments must be Buffers");if(t===e)return 0;for(var n=t.length,i=e.length,r=0,a=Math.min(n,i);r<a;++r)if(t[r]!==e[r]){n=t[r],i=e[r];break}return n<i?-1:i<n?1:0},l.isEncoding=function(t){switch(String(t).toLowerCase()){case"hex":case"utf8":case"utf-8":case"ascii":case"latin1":case"binary":case"base64":case"ucs2":case"ucs-2":case"utf16le":case"utf-16le":return!0;default:return!1}},l.concat=function(t,e){if(!a(t))throw new TypeError('"list" argument must be an Array of Buffers');if(0===t.length)return l.alloc(0);var n;if(void 0===e)for(e=0,n=0;n<t.length;++n)e+=t[n].length;var i=l.allocUnsafe(e),r=0;for(n=0;n<t.length;++n){var o=t[n];if(!l.isBuffer(o))throw new TypeError('"list" argument must be an Array of Buffers');o.copy(i,r),r+=o.length}return i},l.byteLength=f,l.prototype._isBuffer=!0,l.prototype.swap16=function(){var t=this.length;if(t%2!=0)throw new RangeError("Buffer size must be a multiple of 16-bits");for(var e=0;e<t;e+=2)g(this,e,e+1);return this},l.prototype.swap32=function(){var t=this.length;if(t%4!=0)throw new RangeError("Buffer size must be a multiple of 32-bits");for(var e=0;e<t;e+=4)g(this,e,e+3),g(this,e+1,e+2);return this},l.prototype.swap64=function(){var t=this.length;if(t%8!=0)throw new RangeError("Buffer size must be a multiple of 64-bits");for(var e=0;e<t;e+=8)g(this,e,e+7),g(this,e+1,e+6),g(this,e+2,e+5),g(this,e+3,e+4);return this},l.prototype.toString=function(){var t=0|this.length;return 0===t?"":0===arguments.length?E(this,0,t):m.apply(this,arguments)},l.prototype.equals=function(t){if(!l.isBuffer(t))throw new TypeError("Argument must be a Buffer");return this===t||0===l.compare(this,t)},l.prototype.inspect=function(){var t="",n=e.INSPECT_MAX_BYTES;return this.length>0&&(t=this.toString("hex",0,n).match(/.{2}/g).join(" "),this.length>n&&(t+=" ... ")),"<Buffer "+t+">"},l.prototype.compare=function(t,e,n,i,r){if(!l.isBuffer(t))throw new TypeError("Argument must be a Buffer");if(void 0===e&&(e=0),void 0===n&&(n=t?t.length:0),void 0===i&&(i=0),void 0===r&&(r=this.length),e<0||n>t.length||i<0||r>this.length)throw new RangeError("out of range index");if(i>=r&&e>=n)return 0;if(i>=r)return-1;if(e>=n)return 1;if(this===t)return 0;for(var a=(r>>>=0)-(i>>>=0),o=(n>>>=0)-(e>>>=0),s=Math.min(a,o),c=this.slice(i,r),h=t.slice(e,n),u=0;u<s;++u)if(c[u]!==h[u]){a=c[u],o=h[u];break}return a<o?-1:o<a?1:0},l.prototype.includes=function(t,e,n){return-1!==this.indexOf(t,e,n)},l.prototype.indexOf=function(t,e,n){return v(this,t,e,n,!0)},l.prototype.lastIndexOf=function(t,e,n){return v(this,t,e,n,!1)},l.prototype.write=function(t,e,n,i){if(void 0===e)i="utf8",n=this.length,e=0;else if(void 0===n&&"string"==typeof e)i=e,n=this.length,e=0;else{if(!isFinite(e))throw new Error("Buffer.write(string, encoding, offset[, length]) is no longer supported");e|=0,isFinite(n)?(n|=0,void 0===i&&(i="utf8")):(i=n,n=void 0)}var r=this.length-e;if((void 0===n||n>r)&&(n=r),t.length>0&&(n<0||e<0)||e>this.length)throw new RangeError("Attempt to write outside buffer bounds");i||(i="utf8");for(var a=!1;;)switch(i){case"hex":return b(this,t,e,n);case"utf8":case"utf-8":return x(this,t,e,n);case"ascii":return _(this,t,e,n);case"latin1":case"binary":return w(this,t,e,n);case"base64":return M(this,t,e,n);case"ucs2":case"ucs-2":case"utf16le":case"utf-16le":return A(this,t,e,n);default:if(a)throw new TypeError("Unknown encoding: "+i);i=(""+i).toLowerCase(),a=!0}},l.prototype.toJSON=function(){return{type:"Buffer",data:Array.prototype.slice.call(this._arr||this,0)}};function T(t,e,n){var i="";n=Math.min(t.length,n);for(var r=e;r<n;++r)i+=String.fromCharCode(127&t[r]);return i}function C(t,e,n){var i="";n=Math.min(t.length,n);for(var r=e;r<n;++r)i+=String.fromCharCode(t[r]);return i}function L(t,e,n){var i=t.length;(!e||e<0)&&(e=0),(!n||n<0||n>i)&&(n=i);for(var r="",a=e;a<n;++a)r+=F(t[a]);return r}function R(t,e,n){for(var i=t.slice(e,n),r="",a=0;a<i.length;a+=2)r+=String.fromCharCode(i[a]+256*i[a+1]);return r}function P(t,e,n){if(t%1!=0||t<0)throw new RangeError("offset is not uint");if(t+e>n)throw new RangeError("Trying to access beyond buffer length")}function D(t,e,n,i,r,a){if(!l.isBuffer(t))throw new TypeError('"buffer" argument must be a Buffer instance');if(e>r||e<a)throw new RangeError('"value" argument is out of bounds');if(n+i>t.length)throw new RangeError("Index out of range")}function O(t,e,n,i){e<0&&(e=65535+e+1);for(var r=0,a=Math.min(t.length-n,2);r<a;++r)t[n+r]=(e&255<<8*(i?r:1-r))>>>8*(i?r:1-r)}function I(t,e,n,i){e<0&&(e=4294967295+e+1);for(var r=0,a=Math.min(t.length-n,4);r<a;++r)t[n+r]=e>>>8*(i?r:3-r)&255}function k(t,e,n,i,r,a){if(n+i>t.length)throw new RangeError("Index out of range");if(n<0)throw new RangeError("Index out of range")}function B(t,e,n,i,a){return a||k(t,0,n,4),r.write(t,e,n,i,23,4),n+4}function N(t,e,n,i,a){return a||k(t,0,n,8),r.write(t,e,n,i,52,8),n+8}l.prototype.slice=function(t,e){var n,i=this.length;if((t=~~t)<0?(t+=i)<0&&(t=0):t>i&&(t=i),(e=void 0===e?i:~~e)<0?(e+=i)<0&&(e=0):e>i&&(e=i),e<t&&(e=t),l.TYPED_ARRAY_SUPPORT)(n=this.subarray(t,e)).__proto__=l.prototype;else{var r=e-t;n=new l(r,void 0);for(var a=0;a<r;++a)n[a]=this[a+t]}return n},l.prototype.readUIntLE=function(t,e,n){t|=0,e|=0,n||P(t,e,this.length);for(var i=this[t],r=1,a=0;++a<e&&(r*=256);)i+=this[t+a]*r;return i},l.prototype.readUIntBE=function(t,e,n){t|=0,e|=0,n||P(t,e,this.length);for(var i=this[t+--e],r=1;e>0&&(r*=256);)i+=this[t+--e]*r;return i},l.prototype.readUInt8=function(t,e){return e||P(t,1,this.length),this[t]},l.prototype.readUInt16LE=function(t,e){return e||P(t,2,this.length),this[t]|this[t+1]<<8},l.prototype.readUInt16BE=function(t,e){return e||P(t,2,this.length),this[t]<<8|this[t+1]},l.prototype.readUInt32LE=function(t,e){return e||P(t,4,this.length),(this[t]|this[t+1]<<8|this[t+2]<<16)+16777216*this[t+3]},l.prototype.readUInt32BE=function(t,e){return e||P(t,4,this.length),16777216*this[t]+(this[t+1]<<16|this[t+2]<<8|this[t+3])},l.prototype.readIntLE=function(t,e,n){t|=0,e|=0,n||P(t,e,this.length);for(var i=this[t],r=1,a=0;++a<e&&(r*=256);)i+=this[t+a]*r;return i>=(r*=128)&&(i-=Math.pow(2,8*e)),i},l.prototype.readIntBE=function(t,e,n){t|=0,e|=0,n||P(t,e,this.length);for(var i=e,r=1,a=this[t+--i];i>0&&(r*=256);)a+=this[t+--i]*r;return a>=(r*=128)&&(a-=Math.pow(2,8*e)),a},l.prototype.readInt8=function(t,e){return e||P(t,1,this.length),128&this[t]?-1*(255-this[t]+1):this[t]},l.prototype.readInt16LE=function(t,e){e||P(t,2,this.length);var n=this[t]|this[t+1]<<8;return 32768&n?4294901760|n:n},l.prototype.readInt16BE=function(t,e){e||P(t,2,this.length);var n=this[t+1]|this[t]<<8;return 32768&n?4294901760|n:n},l.prototype.readInt32LE=function(t,e){return e||P(t,4,this.length),this[t]|this[t+1]<<8|this[t+2]<<16|this[t+3]<<24},l.prototype.readInt32BE=function(t,e){return e||P(t,4,this.length),this[t]<<24|this[t+1]<<16|this[t+2]<<8|this[t+3]},l.prototype.readFloatLE=function(t,e){return e||P(t,4,this.length),r.read(this,t,!0,23,4)},l.prototype.readFloatBE=function(t,e){return e||P(t,4,this.length),r.read(this,t,!1,23,4)},l.prototype.readDoubleLE=function(t,e){return e||P(t,8,this.length),r.read(this,t,!0,52,8)},l.prototype.readDoubleBE=function(t,e){return e||P(t,8,this.length),r.read(this,t,!1,52,8)},l.prototype.writeUIntLE=function(t,e,n,i){(t=+t,e|=0,n|=0,i)||D(this,t,e,n,Math.pow(2,8*n)-1,0);var r=1,a=0;for(this[e]=255&t;++a<n&&(r*=256);)this[e+a]=t/r&255;return e+n},l.prototype.writeUIntBE=function(t,e,n,i){(t=+t,e|=0,n|=0,i)||D(this,t,e,n,Math.pow(2,8*n)-1,0);var r=n-1,a=1;for(this[e+r]=255&t;--r>=0&&(a*=256);)this[e+r]=t/a&255;return e+n},l.prototype.writeUInt8=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,1,255,0),l.TYPED_ARRAY_SUPPORT||(t=Math.floor(t)),this[e]=255&t,e+1},l.prototype.writeUInt16LE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,2,65535,0),l.TYPED_ARRAY_SUPPORT?(this[e]=255&t,this[e+1]=t>>>8):O(this,t,e,!0),e+2},l.prototype.writeUInt16BE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,2,65535,0),l.TYPED_ARRAY_SUPPORT?(this[e]=t>>>8,this[e+1]=255&t):O(this,t,e,!1),e+2},l.prototype.writeUInt32LE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,4,4294967295,0),l.TYPED_ARRAY_SUPPORT?(this[e+3]=t>>>24,this[e+2]=t>>>16,this[e+1]=t>>>8,this[e]=255&t):I(this,t,e,!0),e+4},l.prototype.writeUInt32BE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,4,4294967295,0),l.TYPED_ARRAY_SUPPORT?(this[e]=t>>>24,this[e+1]=t>>>16,this[e+2]=t>>>8,this[e+3]=255&t):I(this,t,e,!1),e+4},l.prototype.writeIntLE=function(t,e,n,i){if(t=+t,e|=0,!i){var r=Math.pow(2,8*n-1);D(this,t,e,n,r-1,-r)}var a=0,o=1,s=0;for(this[e]=255&t;++a<n&&(o*=256);)t<0&&0===s&&0!==this[e+a-1]&&(s=1),this[e+a]=(t/o>>0)-s&255;return e+n},l.prototype.writeIntBE=function(t,e,n,i){if(t=+t,e|=0,!i){var r=Math.pow(2,8*n-1);D(this,t,e,n,r-1,-r)}var a=n-1,o=1,s=0;for(this[e+a]=255&t;--a>=0&&(o*=256);)t<0&&0===s&&0!==this[e+a+1]&&(s=1),this[e+a]=(t/o>>0)-s&255;return e+n},l.prototype.writeInt8=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,1,127,-128),l.TYPED_ARRAY_SUPPORT||(t=Math.floor(t)),t<0&&(t=255+t+1),this[e]=255&t,e+1},l.prototype.writeInt16LE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,2,32767,-32768),l.TYPED_ARRAY_SUPPORT?(this[e]=255&t,this[e+1]=t>>>8):O(this,t,e,!0),e+2},l.prototype.writeInt16BE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,2,32767,-32768),l.TYPED_ARRAY_SUPPORT?(this[e]=t>>>8,this[e+1]=255&t):O(this,t,e,!1),e+2},l.prototype.writeInt32LE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,4,2147483647,-2147483648),l.TYPED_ARRAY_SUPPORT?(this[e]=255&t,this[e+1]=t>>>8,this[e+2]=t>>>16,this[e+3]=t>>>24):I(this,t,e,!0),e+4},l.prototype.writeInt32BE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,4,2147483647,-2147483648),t<0&&(t=4294967295+t+1),l.TYPED_ARRAY_SUPPORT?(this[e]=t>>>24,this[e+1]=t>>>16,this[e+2]=t>>>8,this[e+3]=255&t):I(this,t,e,!1),e+4},l.prototype.writeFloatLE=function(t,e,n){return B(this,t,e,!0,n)},l.prototype.writeFloatBE=function(t,e,n){return B(this,t,e,!1,n)},l.prototype.writeDoubleLE=function(t,e,n){return N(this,t,e,!0,n)},l.prototype.writeDoubleBE=function(t,e,n){return N(this,t,e,!1,n)},l.prototype.copy=function(t,e,n,i){if(n||(n=0),i||0===i||(i=this.length),e>=t.length&&(e=t.length),e||(e=0),i>0&&i<n&&(i=n),i===n)return 0;if(0===t.length||0===this.length)return 0;if(e<0)throw new RangeError("targetStart out of bounds");if(n<0||n>=this.length)throw new RangeError("sourceStart out of bounds");if(i<0)throw new RangeError("sourceEnd out of bounds");i>this.length&&(i=this.length),t.length-e<i-n&&(i=t.length-e+n);var r,a=i-n;if(this===t&&n<e&&e<i)for(r=a-1;r>=0;--r)t[r+e]=this[r+n];else if(a<1e3||!l.TYPED_ARRAY_SUPPORT)for(r=0;r<a;++r)t[r+e]=this[r+n];else Uint8Array.prototype.set.call(t,this.subarray(n,n+a),e);return a},l.prototype.fill=function(t,e,n,i){if("string"==typeof t){if("string"==typeof e?(i=e,e=0,n=this.length):"string"==typeof n&&(i=n,n=this.length),1===t.length){var r=t.charCodeAt(0);r<256&&(t=r)}if(void 0!==i&&"string"!=typeof i)throw new TypeError("encoding must be a string");if("string"==typeof i&&!l.isEncoding(i))throw new TypeError("Unknown encoding: "+i)}else"number"==typeof t&&(t&=255);if(e<0||this.length<e||this.length<n)throw new RangeError("Out of range index");if(n<=e)return this;var a;if(e>>>=0,n=void 0===n?this.length:n>>>0,t||(t=0),"number"==typeof t)for(a=e;a<n;++a)this[a]=t;else{var o=l.isBuffer(t)?t:U(new l(t,i).toString()),s=o.length;for(a=0;a<n-e;++a)this[a+e]=o[a%s]}return this};var z=/[^+\/0-9A-Za-z-_]/g;function F(t){return t<16?"0"+t.toString(16):t.toString(16)}function U(t,e){var n;e=e||1/0;for(var i=t.length,r=null,a=[],o=0;o<i;++o){if((n=t.charCodeAt(o))>55295&&n<57344){if(!r){if(n>56319){(e-=3)>-1&&a.push(239,191,189);continue}if(o+1===i){(e-=3)>-1&&a.push(239,191,189);continue}r=n;continue}if(n<56320){(e-=3)>-1&&a.push(239,191,189),r=n;continue}n=65536+(r-55296<<10|n-56320)}else r&&(e-=3)>-1&&a.push(239,191,189);if(r=null,n<128){if((e-=1)<0)break;a.push(n)}else if(n<2048){if((e-=2)<0)break;a.push(n>>6|192,63&n|128)}else if(n<65536){if((e-=3)<0)break;a.push(n>>12|224,n>>6&63|128,63&n|128)}else{if(!(n<1114112))throw new Error("Invalid code point");if((e-=4)<0)break;a.push(n>>18|240,n>>12&63|128,n>>6&63|128,63&n|128)}}return a}function H(t){return i.toByteArray(function(t){if((t=function(t){return t.trim?t.trim():t.replace(/^\s+|\s+$/g,"")}(t).replace(z,"")).length<2)return"";for(;t.length%4!=0;)t+="=";return t}(t))}function G(t,e,n,i){for(var r=0;r<i&&!(r+n>=e.length||r>=t.length);++r)e[r+n]=t[r];return r}}).call(this,n(1))},function(t,e,n){"use strict";e.byteLength=function(t){var e=c(t),n=e[0],i=e[1];return 3*(n+i)/4-i},e.toByteArray=function(t){var e,n,i=c(t),o=i[0],s=i[1],l=new a(function(t,e,n){return 3*(e+n)/4-n}(0,o,s)),h=0,u=s>0?o-4:o;for(n=0;n<u;n+=4)e=r[t.charCodeAt(n)]<<18|r[t.charCodeAt(n+1)]<<12|r[t.charCodeAt(n+2)]<<6|r[t.charCodeAt(n+3)],l[h++]=e>>16&255,l[h++]=e>>8&255,l[h++]=255&e;2===s&&(e=r[t.charCodeAt(n)]<<2|r[t.charCodeAt(n+1)]>>4,l[h++]=255&e);1===s&&(e=r[t.charCodeAt(n)]<<10|r[t.charCodeAt(n+1)]<<4|r[t.charCodeAt(n+2)]>>2,l[h++]=e>>8&255,l[h++]=255&e);return l},e.fromByteArray=function(t){for(var e,n=t.length,r=n%3,a=[],o=0,s=n-r;o<s;o+=16383)a.push(h(t,o,o+16383>s?s:o+16383));1===r?(e=t[n-1],a.push(i[e>>2]+i[e<<4&63]+"==")):2===r&&(e=(t[n-2]<<8)+t[n-1],a.push(i[e>>10]+i[e>>4&63]+i[e<<2&63]+"="));return a.join("")};for(var i=[],r=[],a="undefined"!=typeof Uint8Array?Uint8Array:Array,o="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",s=0,l=o.length;s<l;++s)i[s]=o[s],r[o.charCodeAt(s)]=s;function c(t){var e=t.length;if(e%4>0)throw new Error("Invalid string. Length must be a multiple of 4");var n=t.indexOf("=");return-1===n&&(n=e),[n,n===e?0:4-n%4]}function h(t,e,n){for(var r,a,o=[],s=e;s<n;s+=3)r=(t[s]<<16&16711680)+(t[s+1]<<8&65280)+(255&t[s+2]),o.push(i[(a=r)>>18&63]+i[a>>12&63]+i[a>>6&63]+i[63&a]);return o.join("")}r["-".charCodeAt(0)]=62,r["_".charCodeAt(0)]=63},function(t,e){e.read=function(t,e,n,i,r){var a,o,s=8*r-i-1,l=(1<<s)-1,c=l>>1,h=-7,u=n?r-1:0,d=n?-1:1,p=t[e+u];for(u+=d,a=p&(1<<-h)-1,p>>=-h,h+=s;h>0;a=256*a+t[e+u],u+=d,h-=8);for(o=a&(1<<-h)-1,a>>=-h,h+=i;h>0;o=256*o+t[e+u],u+=d,h-=8);if(0===a)a=1-c;else{if(a===l)return o?NaN:1/0*(p?-1:1);o+=Math.pow(2,i),a-=c}return(p?-1:1)*o*Math.pow(2,a-i)},e.write=function(t,e,n,i,r,a){var o,s,l,c=8*a-r-1,h=(1<<c)-1,u=h>>1,d=23===r?Math.pow(2,-24)-Math.pow(2,-77):0,p=i?0:a-1,f=i?1:-1,m=e<0||0===e&&1/e<0?1:0;for(e=Math.abs(e),isNaN(e)||e===1/0?(s=isNaN(e)?1:0,o=h):(o=Math.floor(Math.log(e)/Math.LN2),e*(l=Math.pow(2,-o))<1&&(o--,l*=2),(e+=o+u>=1?d/l:d*Math.pow(2,1-u))*l>=2&&(o++,l/=2),o+u>=h?(s=0,o=h):o+u>=1?(s=(e*l-1)*Math.pow(2,r),o+=u):(s=e*Math.pow(2,u-1)*Math.pow(2,r),o=0));r>=8;t[n+p]=255&s,p+=f,s/=256,r-=8);for(o=o<<r|s,c+=r;c>0;t[n+p]=255&o,p+=f,o/=256,c-=8);t[n+p-f]|=128*m}},function(t,e){var n={}.toString;t.exports=Array.isArray||function(t){return"[object Array]"==n.call(t)}},function(t,e,n){(function(t){var i=void 0!==t&&t||"undefined"!=typeof self&&self||window,r=Function.prototype.apply;function a(t,e){this._id=t,this._clearFn=e}e.setTimeout=function(){return new a(r.call(setTimeout,i,arguments),clearTimeout)},e.setInterval=function(){return new a(r.call(setInterval,i,arguments),clearInterval)},e.clearTimeout=e.clearInterval=function(t){t&&t.close()},a.prototype.unref=a.prototype.ref=function(){},a.prototype.close=function(){this._clearFn.call(i,this._id)},e.enroll=function(t,e){clearTimeout(t._idleTimeoutId),t._idleTimeout=e},e.unenroll=function(t){clearTimeout(t._idleTimeoutId),t._idleTimeout=-1},e._unrefActive=e.active=function(t){clearTimeout(t._idleTimeoutId);var e=t._idleTimeout;e>=0&&(t._idleTimeoutId=setTimeout((function(){t._onTimeout&&t._onTimeout()}),e))},n(13),e.setImmediate="undefined"!=typeof self&&self.setImmediate||void 0!==t&&t.setImmediate||this&&this.setImmediate,e.clearImmediate="undefined"!=typeof self&&self.clearImmediate||void 0!==t&&t.clearImmediate||this&&this.clearImmediate}).call(this,n(1))},function(t,e,n){(function(t,e){!function(t,n){"use strict";if(!t.setImmediate){var i,r,a,o,s,l=1,c={},h=!1,u=t.document,d=Object.getPrototypeOf&&Object.getPrototypeOf(t);d=d&&d.setTimeout?d:t,"[object process]"==={}.toString.call(t.process)?i=function(t){e.nextTick((function(){f(t)}))}:!function(){if(t.postMessage&&!t.importScripts){var e=!0,n=t.onmessage;return t.onmessage=function(){e=!1},t.postMessage("","*"),t.onmessage=n,e}}()?t.MessageChannel?((a=new MessageChannel).port1.onmessage=function(t){f(t.data)},i=function(t){a.port2.postMessage(t)}):u&&"onreadystatechange"in u.createElement("script")?(r=u.documentElement,i=function(t){var e=u.createElement("script");e.onreadystatechange=function(){f(t),e.onreadystatechange=null,r.removeChild(e),e=null},r.appendChild(e)}):i=function(t){setTimeout(f,0,t)}:(o="setImmediate$"+Math.random()+"$",s=function(e){e.source===t&&"string"==typeof e.data&&0===e.data.indexOf(o)&&f(+e.data.slice(o.length))},t.addEventListener?t.addEventListener("message",s,!1):t.attachEvent("onmessage",s),i=function(e){t.postMessage(o+e,"*")}),d.setImmediate=function(t){"function"!=typeof t&&(t=new Function(""+t));for(var e=new Array(arguments.length-1),n=0;n<e.length;n++)e[n]=arguments[n+1];var r={callback:t,args:e};return c[l]=r,i(l),l++},d.clearImmediate=p}function p(t){delete c[t]}function f(t){if(h)setTimeout(f,0,t);else{var e=c[t];if(e){h=!0;try{!function(t){var e=t.callback,n=t.args;switch(n.length){case 0:e();break;case 1:e(n[0]);break;case 2:e(n[0],n[1]);break;case 3:e(n[0],n[1],n[2]);break;default:e.apply(void 0,n)}}(e)}finally{p(t),h=!1}}}}}("undefined"==typeof self?void 0===t?this:t:self)}).call(this,n(1),n(14))},function(t,e){var n,i,r=t.exports={};function a(){throw new Error("setTimeout has not been defined")}function o(){throw new Error("clearTimeout has not been defined")}function s(t){if(n===setTimeout)return setTimeout(t,0);if((n===a||!n)&&setTimeout)return n=setTimeout,setTimeout(t,0);try{return n(t,0)}catch(e){try{return n.call(null,t,0)}catch(e){return n.call(this,t,0)}}}!function(){try{n="function"==typeof setTimeout?setTimeout:a}catch(t){n=a}try{i="function"==typeof clearTimeout?clearTimeout:o}catch(t){i=o}}();var l,c=[],h=!1,u=-1;function d(){h&&l&&(h=!1,l.length?c=l.concat(c):u=-1,c.length&&p())}function p(){if(!h){var t=s(d);h=!0;for(var e=c.length;e;){for(l=c,c=[];++u<e;)l&&l[u].run();u=-1,e=c.length}l=null,h=!1,function(t){if(i===clearTimeout)return clearTimeout(t);if((i===o||!i)&&clearTimeout)return i=clearTimeout,clearTimeout(t);try{i(t)}catch(e){try{return i.call(null,t)}catch(e){return i.call(this,t)}}}(t)}}function f(t,e){this.fun=t,this.array=e}function m(){}r.nextTick=function(t){var e=new Array(arguments.length-1);if(arguments.length>1)for(var n=1;n<arguments.length;n++)e[n-1]=arguments[n];c.push(new f(t,e)),1!==c.length||h||s(p)},f.prototype.run=function(){this.fun.apply(null,this.array)},r.title="browser",r.browser=!0,r.env={},r.argv=[],r.version="",r.versions={},r.on=m,r.addListener=m,r.once=m,r.off=m,r.removeListener=m,r.removeAllListeners=m,r.emit=m,r.prependListener=m,r.prependOnceListener=m,r.listeners=function(t){return[]},r.binding=function(t){throw new Error("process.binding is not supported")},r.cwd=function(){return"/"},r.chdir=function(t){throw new Error("process.chdir is not supported")},r.umask=function(){return 0}},function(t,e,n){"use strict";n.r(e),n.d(e,"LinusStarter",(function(){return L}));var i=n(0),r=function(t,e){var n=this,r=-1,a=0,o=1,s=2,l=3,c=4;this.object=t,this.domElement=void 0!==e?e:document,this.enabled=!0,this.screen={left:0,top:0,width:0,height:0},this.rotateSpeed=1,this.zoomSpeed=1.2,this.panSpeed=.3,this.noRotate=!1,this.noZoom=!1,this.noPan=!1,this.staticMoving=!1,this.dynamicDampingFactor=.2,this.minDistance=0,this.maxDistance=1/0,this.keys=[65,83,68],this.mouseButtons={LEFT:i.MOUSE.ROTATE,MIDDLE:i.MOUSE.ZOOM,RIGHT:i.MOUSE.PAN},this.target=new i.Vector3;var h=new i.Vector3,u=r,d=r,p=new i.Vector3,f=new i.Vector2,m=new i.Vector2,g=new i.Vector3,v=0,y=new i.Vector2,b=new i.Vector2,x=0,_=0,w=new i.Vector2,M=new i.Vector2;this.target0=this.target.clone(),this.position0=this.object.position.clone(),this.up0=this.object.up.clone();var A={type:"change"},S={type:"start"},E={type:"end"};this.handleResize=function(){if(this.domElement===document)this.screen.left=0,this.screen.top=0,this.screen.width=window.innerWidth,this.screen.height=window.innerHeight;else{var t=this.domElement.getBoundingClientRect(),e=this.domElement.ownerDocument.documentElement;this.screen.left=t.left+window.pageXOffset-e.clientLeft,this.screen.top=t.top+window.pageYOffset-e.clientTop,this.screen.width=t.width,this.screen.height=t.height}};var T,C,L,R,P,D,O,I,k,B,N,z=(T=new i.Vector2,function(t,e){return T.set((t-n.screen.left)/n.screen.width,(e-n.screen.top)/n.screen.height),T}),F=function(){var t=new i.Vector2;return function(e,i){return t.set((e-.5*n.screen.width-n.screen.left)/(.5*n.screen.width),(n.screen.height+2*(n.screen.top-i))/n.screen.width),t}}();function U(t){!1!==n.enabled&&(window.removeEventListener("keydown",U),d===r&&(t.keyCode!==n.keys[a]||n.noRotate?t.keyCode!==n.keys[o]||n.noZoom?t.keyCode!==n.keys[s]||n.noPan||(d=s):d=o:d=a))}function H(){!1!==n.enabled&&(d=r,window.addEventListener("keydown",U,!1))}function G(t){if(!1!==n.enabled){if(t.preventDefault(),t.stopPropagation(),u===r)switch(t.button){case n.mouseButtons.LEFT:u=a;break;case n.mouseButtons.MIDDLE:u=o;break;case n.mouseButtons.RIGHT:u=s;break;default:u=r}var e=d!==r?d:u;e!==a||n.noRotate?e!==o||n.noZoom?e!==s||n.noPan||(w.copy(z(t.pageX,t.pageY)),M.copy(w)):(y.copy(z(t.pageX,t.pageY)),b.copy(y)):(m.copy(F(t.pageX,t.pageY)),f.copy(m)),document.addEventListener("mousemove",V,!1),document.addEventListener("mouseup",j,!1),n.dispatchEvent(S)}}function V(t){if(!1!==n.enabled){t.preventDefault(),t.stopPropagation();var e=d!==r?d:u;e!==a||n.noRotate?e!==o||n.noZoom?e!==s||n.noPan||M.copy(z(t.pageX,t.pageY)):b.copy(z(t.pageX,t.pageY)):(f.copy(m),m.copy(F(t.pageX,t.pageY)))}}function j(t){!1!==n.enabled&&(t.preventDefault(),t.stopPropagation(),u=r,document.removeEventListener("mousemove",V),document.removeEventListener("mouseup",j),n.dispatchEvent(E))}function W(t){if(!1!==n.enabled&&!0!==n.noZoom){switch(t.preventDefault(),t.stopPropagation(),t.deltaMode){case 2:y.y-=.025*t.deltaY;break;case 1:y.y-=.01*t.deltaY;break;default:y.y-=25e-5*t.deltaY}n.dispatchEvent(S),n.dispatchEvent(E)}}function Y(t){if(!1!==n.enabled){switch(t.preventDefault(),t.touches.length){case 1:u=l,m.copy(F(t.touches[0].pageX,t.touches[0].pageY)),f.copy(m);break;default:u=c;var e=t.touches[0].pageX-t.touches[1].pageX,i=t.touches[0].pageY-t.touches[1].pageY;_=x=Math.sqrt(e*e+i*i);var r=(t.touches[0].pageX+t.touches[1].pageX)/2,a=(t.touches[0].pageY+t.touches[1].pageY)/2;w.copy(z(r,a)),M.copy(w)}n.dispatchEvent(S)}}function X(t){if(!1!==n.enabled)switch(t.preventDefault(),t.stopPropagation(),t.touches.length){case 1:f.copy(m),m.copy(F(t.touches[0].pageX,t.touches[0].pageY));break;default:var e=t.touches[0].pageX-t.touches[1].pageX,i=t.touches[0].pageY-t.touches[1].pageY;_=Math.sqrt(e*e+i*i);var r=(t.touches[0].pageX+t.touches[1].pageX)/2,a=(t.touches[0].pageY+t.touches[1].pageY)/2;M.copy(z(r,a))}}function Z(t){if(!1!==n.enabled){switch(t.touches.length){case 0:u=r;break;case 1:u=l,m.copy(F(t.touches[0].pageX,t.touches[0].pageY)),f.copy(m)}n.dispatchEvent(E)}}function q(t){!1!==n.enabled&&t.preventDefault()}this.rotateCamera=(L=new i.Vector3,R=new i.Quaternion,P=new i.Vector3,D=new i.Vector3,O=new i.Vector3,I=new i.Vector3,function(){I.set(m.x-f.x,m.y-f.y,0),(C=I.length())?(p.copy(n.object.position).sub(n.target),P.copy(p).normalize(),D.copy(n.object.up).normalize(),O.crossVectors(D,P).normalize(),D.setLength(m.y-f.y),O.setLength(m.x-f.x),I.copy(D.add(O)),L.crossVectors(I,p).normalize(),C*=n.rotateSpeed,R.setFromAxisAngle(L,C),p.applyQuaternion(R),n.object.up.applyQuaternion(R),g.copy(L),v=C):!n.staticMoving&&v&&(v*=Math.sqrt(1-n.dynamicDampingFactor),p.copy(n.object.position).sub(n.target),R.setFromAxisAngle(g,v),p.applyQuaternion(R),n.object.up.applyQuaternion(R)),f.copy(m)}),this.zoomCamera=function(){var t;u===c?(t=x/_,x=_,p.multiplyScalar(t)):(1!==(t=1+(b.y-y.y)*n.zoomSpeed)&&t>0&&p.multiplyScalar(t),n.staticMoving?y.copy(b):y.y+=(b.y-y.y)*this.dynamicDampingFactor)},this.panCamera=(k=new i.Vector2,B=new i.Vector3,N=new i.Vector3,function(){k.copy(M).sub(w),k.lengthSq()&&(k.multiplyScalar(p.length()*n.panSpeed),N.copy(p).cross(n.object.up).setLength(k.x),N.add(B.copy(n.object.up).setLength(k.y)),n.object.position.add(N),n.target.add(N),n.staticMoving?w.copy(M):w.add(k.subVectors(M,w).multiplyScalar(n.dynamicDampingFactor)))}),this.checkDistances=function(){n.noZoom&&n.noPan||(p.lengthSq()>n.maxDistance*n.maxDistance&&(n.object.position.addVectors(n.target,p.setLength(n.maxDistance)),y.copy(b)),p.lengthSq()<n.minDistance*n.minDistance&&(n.object.position.addVectors(n.target,p.setLength(n.minDistance)),y.copy(b)))},this.update=function(){p.subVectors(n.object.position,n.target),n.noRotate||n.rotateCamera(),n.noZoom||n.zoomCamera(),n.noPan||n.panCamera(),n.object.position.addVectors(n.target,p),n.checkDistances(),n.object.lookAt(n.target),h.distanceToSquared(n.object.position)>1e-6&&(n.dispatchEvent(A),h.copy(n.object.position))},this.reset=function(){u=r,d=r,n.target.copy(n.target0),n.object.position.copy(n.position0),n.object.up.copy(n.up0),p.subVectors(n.object.position,n.target),n.object.lookAt(n.target),n.dispatchEvent(A),h.copy(n.object.position)},this.dispose=function(){this.domElement.removeEventListener("contextmenu",q,!1),this.domElement.removeEventListener("mousedown",G,!1),this.domElement.removeEventListener("wheel",W,!1),this.domElement.removeEventListener("touchstart",Y,!1),this.domElement.removeEventListener("touchend",Z,!1),this.domElement.removeEventListener("touchmove",X,!1),document.removeEventListener("mousemove",V,!1),document.removeEventListener("mouseup",j,!1),window.removeEventListener("keydown",U,!1),window.removeEventListener("keyup",H,!1)},this.domElement.addEventListener("contextmenu",q,!1),this.domElement.addEventListener("mousedown",G,!1),this.domElement.addEventListener("wheel",W,!1),this.domElement.addEventListener("touchstart",Y,!1),this.domElement.addEventListener("touchend",Z,!1),this.domElement.addEventListener("touchmove",X,!1),window.addEventListener("keydown",U,!1),window.addEventListener("keyup",H,!1),this.handleResize(),this.update()};(r.prototype=Object.create(i.EventDispatcher.prototype)).constructor=r;var a=n(4),o=n.n(a),s=function(t,e){function n(){r.style.display="",r.style.cursor="auto",r.style.left="calc(50% - 75px)",r.style.width="150px",r.onmouseenter=null,r.onmouseleave=null,r.onclick=null,r.textContent="VR NOT SUPPORTED"}function i(t){t.style.position="absolute",t.style.bottom="20px",t.style.padding="12px 6px",t.style.border="1px solid #fff",t.style.borderRadius="4px",t.style.background="rgba(0,0,0,0.1)",t.style.color="#fff",t.style.font="normal 13px sans-serif",t.style.textAlign="center",t.style.opacity="0.5",t.style.outline="none",t.style.zIndex="999"}if(e&&console.error('THREE.VRButton: The "options" parameter has been removed. Please set the reference space type via renderer.xr.setReferenceSpaceType() instead.'),"xr"in navigator){var r=document.createElement("button");return r.style.display="none",i(r),navigator.xr.isSessionSupported("immersive-vr").then((function(e){e?function(){var e=null;function n(n){n.addEventListener("end",i),t.xr.setSession(n),r.textContent="EXIT VR",e=n}function i(){e.removeEventListener("end",i),r.textContent="ENTER VR",e=null}r.style.display="",r.style.cursor="pointer",r.style.left="calc(50% - 50px)",r.style.width="100px",r.textContent="ENTER VR",r.onmouseenter=function(){r.style.opacity="1.0"},r.onmouseleave=function(){r.style.opacity="0.5"},r.onclick=function(){if(null===e){navigator.xr.requestSession("immersive-vr",{optionalFeatures:["local-floor","bounded-floor"]}).then(n)}else e.end()}}():n()})),r}var a=document.createElement("a");return!1===window.isSecureContext?(a.href=document.location.href.replace(/^http:/,"https:"),a.innerHTML="WEBXR NEEDS HTTPS"):(a.href="https://immersiveweb.dev/",a.innerHTML="WEBXR NOT AVAILABLE"),a.style.left="calc(50% - 90px)",a.style.width="180px",a.style.textDecoration="none",i(a),a},c=n(5),h=n.n(c),u=n(6),d=n.n(u);class p{getColorMaps(){return{"Hot iron":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAADSHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHjarZVrruQoDIX/s4peQvzCsBye0uxglt8HQlXdqr7dUo8mKC/H2OZ8QML4958ZfuCgSzWoeYo5xguHZs1c8JCu+7jv8NvXffD5hPc3e3g8wIMuwV3u1ziOf4HdXh1cj72+24O3EyedQI/AJ6CszKuMfoo8gYRvO533kE+tJX4Zzjln47xMVu9Pn+/qEKMb4gkHHkJy7SvfmeQ+C07dV+TCV8KzSsJVtueHfuEp3TcCPkX/0O9qx0NectyBHsOKHzodO9n3+m2VvlZEfFz49WFrUl+0f9Fv9jTnuEdXNAbIFc+gHkPcT3CEpCq7W0RznIZn3y2jpatcDdQ6hlrDVfGSiaH4JKVOhSaNfW/UUKLyYMedubFsWxLnzE0WAl2NJnuQLB0sWBrICcz8rIV23rzyIVlC5k7wZEIwMH5v4dPwX9tboDnXNCc6gtINmJfgKGORW1d4AQjNo6ltfSnct+vzWGAFBG3LnDDActU7RDV6zS3ZnOWyAFe97vVC3k8ASITchmIwo5WuSGIU6XJmJ4KOCXwKKmdRriBAFow7qmQViYCTeOVGH6fty8a3GdsLQJhEcaDJUgBL1TRivSVMoRJMTM0smluybCVK1GgxRo9rnyourm4e3T159pIkabIUk6eUciqZs2Abs5Bj9pxyzqUgadGCWAX+BYbKVapWq7F6TTXX0jB9mjZrsXlLLbfSuUvHFhB67N5Tz70MGphKQ4eNOHykkUeZmGtTpk6bcfpMM8/ypHaovlP7JPdnanSo8Qa1/PxFDWb3Rwha24ktZiDGSiDuiwAmNC9mVyJVXuQWsyuzBBFjVGkLTqdFDAR1ENukJ7sXud9yC1D3b7nxd+TCQvd/kAsL3Rdyv3L7hlove7uVDWitQmiKHVKw/OaFYlJB9kzddZa8JocaWarYZop3RXVx+TTLI5uMguhYOGqgAeewfcbxgXAl7zCmc4fRNDXmiYXUrS2fYZnwGxmPV865YU+vIUPGVUoa0dFBCjmX0ZHJSdtEZsceaacbCh7IzNOsPgwNc8JL8N0nGqEHMikQrLi9FdTbcpovA8GAHb/4GpDXvMrPItAMv83wE2rk5dPhHy6XAAABhWlDQ1BJQ0MgcHJvZmlsZQAAeJx9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitGsOMYAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJMCAicDfKAAAARElEQVQI13WKIQ7AMAzE3JLQSm3agWnT/v/CkGygASED1lnWFRV5mxkTGMEMNHkHtIC0dNLw9dN6BTmAC7iBJ3yv+8kHKRwH7I3cRvoAAAAASUVORK5CYII=",Viridis:"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAIAAAAw6DswAAADOnpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHjarZRpjiQpDIX/c4o5QnjDcBxWaW4wx58HQWZWZlWPNK0GxYJxGPt9BGH88/cMf6HRxSmoeYo5xgtNs2YueEnX3e4nXbrvu/GZwvjNHh4v8KBL8JR7GMfxL7Db6wPXY6/v9uDtxEkn0CPwCShr5ZVGP0meQMK3nc445JNriV/KOddsnJfJ6j31OVaHGN0QTzjwEJJr3/leSe6r4NJ9x1qYJbyrJNxZ5Lt+4SndDwI+Rf/Q72rHQ15y3IEeZcUPnY6d7Gf9tkpfMyI+LvyaWG20F+1v+s2e5hx3dUVjgFzxFPUocb/BEZLqrUZEd1yGd989o6erXA3UOkqt4aoYZGIoPkmpU6FJYz8bNaSoPNjxZG4s25bEOXOThUBXp8keJEsHC5YGcgIzP3OhvW5e62GxhJU7wZMJwcD4vYdPw+/2t0Bzrm1OdASlGzAvwZHGIrfu8AIQmkdT2/pSuB/XZ1tgBQRty5xQYLnqHaIavfaWbM5yWYCrXvf/Qt5PAEiEtQ3JYEcrXZHEKNLlzE4EHRP4FGTOolxBgCwYd2TJKhIBJ/FaG984bV82vs04XgDCJIoDTZYCWKqmEf9bwhYqwcTUzKK5JctWokSNFmP0uM6p4uLq5tHdk2cvSZImSzF5SimnkjkLjjELOWbPKedcChYtWhCrwL/AULlK1Wo1Vq+p5loatk/TZi02b6nlVjp36TgCQo/de+q5l0EDW2nosBGHjzTyKBN7bcrUaTNOn2nmWZ7UDtV3ap/k/psaHWq8QS0/f1GD2f0RgtZxYosZiLESiPsigA3Ni9mVSJUXucXsyixBxBhZ2oLTaREDQR3ENunJ7kXul9wC1P2/3PgncmGh+xPkwkL3hdx3bj9Q62Uft7IBrb8QmuKEFPx+k6lUUSMbg7EvMqRCTpxgzUWxGP4RNfwjLUEqWzO6BxEFYJBDdNbk+HRFudqI+ZooOhWUFF0U3+W55jJCDoXfXB82xJHKhuqXax5BY3ysh5CtqiH8WJMJcmtTlNf2bK4mhXrGNimVdvbWdSQvpC2HcVcwuRRX6Siov75lGqmLQJUc/gWKktqrxMhodAAAAYVpQ0NQSUNDIHByb2ZpbGUAAHicfZE9SMNAHMVf00pVWhzsICKYoTpZEBVxlCoWwUJpK7TqYHLph9CkIUlxcRRcCw5+LFYdXJx1dXAVBMEPECdHJ0UXKfF/SaFFjAfH/Xh373H3DhAaFaaagXFA1SwjnYiLufyKGHxFAD0IYhhhiZl6MrOQhef4uoePr3cxnuV97s8RVgomA3wi8SzTDYt4nXh609I57xNHWFlSiM+Jxwy6IPEj12WX3ziXHBZ4ZsTIpueII8RiqYPlDmZlQyWeIo4qqkb5Qs5lhfMWZ7VSY6178heGCtpyhus0h5DAIpJIQYSMGjZQgYUYrRopJtK0H/fwDzr+FLlkcm2AkWMeVaiQHD/4H/zu1ixOTrhJoTjQ9WLbHyNAcBdo1m37+9i2myeA/xm40tr+agOY+SS93taiR0DfNnBx3dbkPeByBxh40iVDciQ/TaFYBN7P6JvyQP8t0Lvq9tbax+kDkKWulm6Ag0NgtETZax7v7u7s7d8zrf5+ACogcorRrDjGAAAABmJLR0QA/wD/AP+gvaeTAAAACXBIWXMAAC4jAAAuIwF4pT92AAAAB3RJTUUH5AQJCTAXms2SxQAAAFtJREFUCNcFwYkNgCAMAMDytgViNIobOYT7b+CTEG3RO7OF3ZZicoLMPaGmoOyUvbAVBiGjZARBCZS+jp8QACqQRhLCN+MzYBtjm+I9x3vxZw3n6o7qr2qfavEHhDge/yNMINEAAAAASUVORK5CYII=",Rainbow:"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAADjHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHjarZVrsuQmDEb/s4osAQmE0HLEqyo7yPLzgelO3zuTqsnDlDGWhSR0BA7zj99X+A0XUYkhi9ZipURc2bKxY1Djc/npKebTn4vvJ7x/kYfXABoUE57pea3lyifkmE3XQu3XjkMuH4Zs3g/t6we/hrheBy+H11Gix0Ec15BfQ4mv5/y8t+u5WNXPJdx5cd3vJw11Lw1dTspFCmlGnzmqFsO4csyKvA05E9n2PGkvQ1/fw0uVERPPRCmenp8o03M77nx6gx6hOd4r+pRuOgKQIQSM7eb2jeXn199FHz7Dv9i/YH2PvuF+l8ilHV4UCl+V9I1SeT9/Kid5GfqG9bD78FzqHfFXOVKRPpccXvj2vdaoa81ndZ4Lllzuol5LPCPotZ2tM6ugaSwBRVgx2M3QKrZFRy2N2GND62TEQLko0yCnRfM8O3WEmHmy4sncA6cjrIBh3NOGm3ejxZosDUDm1FESCVJ+x0LHrR13nWocIQ6CKhOMoXr+fQu/qrjOniC6+aSHL++qQxSRgH8/oAYitG5S5ST41b5fm2sCQTlprligxxYeE03or+JKB3SCouD5bGLScQ0gRXAtCAZbJVMslIQKIlJmJUIiKwA5QueUuYEAifBAkJxTKoCDPQzfmKN0VFn4EeMwTDkkSSUp2FhywMpZUD+aK2rIJUkWkSIqVUy8pLJ3WCla9qnqmjSraFHVGtTUa6q5Si1Va61W3dgSTl0x7EerZuYOpw7LjtkOBffGLbXcpJWmrTYLzTvKp+cuvXTttVv3wSMN7ONRho46bPikiVKaecosU2edNn2h1FZaeckqS8Oqy5a/qV2sP7R/QI0uNT6ktqK+qUGq+jJB+ziRzQzEOBOAK6iBGAp7M4uVcuZNbjOLxvv4YwQpG86gTQwE8ySWRW92l1xAFv8XbkHr4cb/lVzY6H6R3I/cfkZt7N9zP8SebbiTGhN230J2dBD+7dMoq9v2xIiNqy8sUSXhdxDgO22Ru424EtwgT97yrM6t9yNlhL6z3LJfKRKwRJ0ceUMWSWYogjlXXCbWv/0gChpx4AP2k1vZ02dpW7gwm0a2l6pZz/A9Q8UxCnn5kMM7TGyxL7G2HXakwm1OYRjY2M5SXY+0DUjDEcuHuD/K4yWVq0zThUFq2x2DsNyV2YecAKaFajjNCyJYSDj+tuFPP8wc6UFSOZQAAAGFaUNDUElDQyBwcm9maWxlAAB4nH2RPUjDQBzFX9NKVVoc7CAimKE6WRAVcZQqFsFCaSu06mBy6YfQpCFJcXEUXAsOfixWHVycdXVwFQTBDxAnRydFFynxf0mhRYwHx/14d+9x9w4QGhWmmoFxQNUsI52Ii7n8ihh8RQA9CGIYYYmZejKzkIXn+LqHj693MZ7lfe7PEVYKJgN8IvEs0w2LeJ14etPSOe8TR1hZUojPiccMuiDxI9dll984lxwWeGbEyKbniCPEYqmD5Q5mZUMlniKOKqpG+ULOZYXzFme1UmOte/IXhgracobrNIeQwCKSSEGEjBo2UIGFGK0aKSbStB/38A86/hS5ZHJtgJFjHlWokBw/+B/87tYsTk64SaE40PVi2x8jQHAXaNZt+/vYtpsngP8ZuNLa/moDmPkkvd7WokdA3zZwcd3W5D3gcgcYeNIlQ3IkP02hWATez+ib8kD/LdC76vbW2sfpA5ClrpZugINDYLRE2Wse7+7u7O3fM63+fgAqIHKK0aw4xgAAAAZiS0dEAP8A/wD/oL2nkwAAAAlwSFlzAAAuIwAALiMBeKU/dgAAAAd0SU1FB+QECQkwI7t5ZnAAAAAZdEVYdENvbW1lbnQAQ3JlYXRlZCB3aXRoIEdJTVBXgQ4XAAAAU0lEQVQI1z3GsQ0CMQwAwDMtiAIGiLMyC8ZhgRe/gGkQxUkX4dUtMYWpn1eRzUD+jBCzdfK4HVLJ2EaXEdu0jC5pux8nu/W6sFGo/v/8tCUsvPEFlsgikiRlU00AAAAASUVORK5CYII=",Plasma:"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJLDTe3b7qAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAF1JREFUCNcFwYEVgyAMQMGvIpAE+tymU3ZfEhV6t335LaPSOFEyRkI5MHaUhTERXqTcyBVUc6oFRQdFnSKDLE7WIOvglCCpk3SQzDnM2c3ZmrOaM3sw+8vzWURf/AFWPSD2bbx7BgAAAABJRU5ErkJggg==","Color brewer: orange purple":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJNSPGDpI1AAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAG1JREFUCNclxVESgiAUQNHrhGKATaa2u/bZpphmFHioKX10fk71fulijcJZhbUXrs7RdgP6NqG7AeVGMBOVeYIZKe2Ds7lTmp6z7tlLTV4Pcj7+y5cUViRspLARl0yYE8ssLHMifoToheCF5IUfnfI1FTW3dhwAAAAASUVORK5CYII=","Color brewer: pink purple":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJNDayyEefAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAFFJREFUCNclxUESwzAIBMHJ/z/rgi3bIKHNwX3pn3XZa0E37m/qxVVQBe/Cz8A93xocjWPhWEwOlUPloXN4ciMVikZq1JvkEBwSIwYxpDdi+AMwelG66MEL3gAAAABJRU5ErkJggg==","Color brewer: brown teal":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJJSlsGWl6AAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAFdJREFUCNdlxkEOQDAQQNHfMFQ0M9zOtZy0CZW2C2HBRix+/nPrMl/BlDApYTKCPh7VkEGRwWi9If51b5yNpzih0lERCkJ1HccJsWRizr9vKX3bd7aUuAHr4i3WlWQQTAAAAABJRU5ErkJggg==","Color brewer: purple green":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJJguSVHtdAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAGhJREFUCNdFxUsOwiAUQNGrpNIA7YC4E5fnCrpYPuEZX1ojOOjAMzmX52MbPgb8PeBjwMWAjw63zvjF4hZ7vlqm2WBuBmP/92vnGDufsXP0c/0qRStVK0UL5V3JWsjSyPIiNSGJkJrwA38hMN2MYoeyAAAAAElFTkSuQmCC","Color brewer: red blue":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJJju0jUvxAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAGVJREFUCNdVxUEOgjAQQNGvtYa2GgyIB/AE3t5LuWKqyUwo40I3LF7e7nl/+OmWKVPhdyZdzxwuA6Ef2fcj4c+7gseExw6PmfWYWAhoc3RxtK1ocz7WeL1tqxpzVUQMqcosShXjC794NUJ9t1wfAAAAAElFTkSuQmCC","Color brewer: red green":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJJxQGR0fpAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAF9JREFUCNdVxjEWgyAQQMGPvOA26EFygNz/GLlDpAoP2EVMYSysZtz79TzCIoRVCOvM9cciEAUXBeJ8ew8enUAnMH+qHuoxyNbI1vhaI5v+r6Ta2coglUGqO5+yk8rgBxeBLw+m/1kfAAAAAElFTkSuQmCC","Color brewer: red gray":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJNQxt369sAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAF5JREFUCNdVw8ENwyAMQNEPVRXcCBK8QSbo9t3LIAyHSu05T3rhc71/ooJoQlSQurNpJtXMVjPP8yTmyqMosVTCfhBSgddBkMKXyFrr1t2Zc+LujDHovd+aGWZGa40/OBUv+r839nUAAAAASUVORK5CYII=","Color brewer: pink green":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJNTar03beAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAG5JREFUCNcFwWEOgiAYgOE3CXJCm60f3KCLdrkuoyzATxwYPc/l83p34x3GO27+jn5a9GzRD4eeJ65uRFmDsho1GRgV3Qz8zEDXA6dq1C40hNaFckZyXdnqQq4L6QjEfeUrgbgHkiSSFPJWSFL4Ayk+Mw4lpeJYAAAAAElFTkSuQmCC","Color brewer: spectral":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJKA58vaJcAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAGhJREFUCNcFwVEOgjAQQMG33UgLtATP5Lf39xRoS8B046oz8rjdf2N2YnZSdi6LEtaIXhNhjcgyQpmRPEOZYMqQCpIKpIIHofuJfU/M3xwfp5pSTWmmvLqwGTy7sHVoh7LXgVYH9hb5A6mSKIFBSb+3AAAAAElFTkSuQmCC"}}getNiceColors(){return[15079755,4416472,3978315,16769305,16089649,9510580,4379892,15741670,12578629,16432830,4626832,15122175,10117924,16775880,8388608,11206595,8421376,16767153,117,11119017]}}class f{vertexShader(){return"\n#genericUniforms#\n#genericVaryings#\n#genericAttributes#\n#customVars#\n\nattribute float setId;\nattribute float axeType;\nattribute float drawIndex;\n\nvarying vec3 vOrientation;\nvarying vec3 vOrientationColor;\nvarying vec3 vPosition;\nvarying vec3 vNextPosition;\nvarying vec3 vNormal;\nvarying vec3 vView;\nvarying vec3 vCenter;\nvarying float vDepth;\nvarying float vSetId;\nvarying float vAxeType;\nvarying float vDrawIndex;\nvarying float vDiscardThis;\nvarying float vHideThis;\nvarying float vLongDiff;\nvarying float vLatDiff;\nuniform float scale;\nuniform float state;\nuniform float defocusState;\nuniform float shading;\nuniform float glossiness;\nuniform float darkenInside;\nuniform float mercator;\nuniform int mercatorMode;\nuniform float mercatorRadius;\nuniform float mercatorOffset;\nuniform float mercatorOffset2;\nuniform float mercatorOffset3;\nuniform float zLower;\nuniform float zUpper;\nuniform float xLower;\nuniform float xUpper;\nuniform float yLower;\nuniform float yUpper;\nuniform vec3 projPlane;\nuniform vec3 projPlaneN;\nuniform float projLevel;\n\nmat4 rotationMatrix(vec3 axis, float angle) \n{\n    axis = normalize(axis);\n    float s = sin(angle);\n    float c = cos(angle);\n    float oc = 1.0 - c;\n    \n    return mat4(oc * axis.x * axis.x + c,           oc * axis.x * axis.y - axis.z * s,  oc * axis.z * axis.x + axis.y * s,  0.0,\n                oc * axis.x * axis.y + axis.z * s,  oc * axis.y * axis.y + c,           oc * axis.y * axis.z - axis.x * s,  0.0,\n                oc * axis.z * axis.x - axis.y * s,  oc * axis.y * axis.z + axis.x * s,  oc * axis.z * axis.z + c,           0.0,\n                0.0,                                0.0,                                0.0,                                1.0);\n}\n\nvoid main() \n{\n    vSetId = setId;\n    vAxeType = axeType;\n    vDrawIndex = drawIndex;\n    // Define the state (for selected data), then calculate a position\n    float stateInternal = drawIndex >= 0. ? state : defocusState;\n    #genericAttributeInterpolation#\n\n    // Now some checks whether this item is selected or not\n    vDiscardThis = 0.;\n    vHideThis = 0.;\n    if(positionOut.z < zLower || positionOut.z > zUpper || \n        positionOut.x < xLower || positionOut.x > xUpper || \n        positionOut.y < yLower || positionOut.y > yUpper )\n    {\n        vHideThis = 1.;\n    }\n\n    vec3 projPlaneNn = normalize(projPlaneN);\n    vec3 planeTest = positionOut.xyz - projPlane;\n    bool isAbovePlane = dot(planeTest, projPlaneNn) >= 0.;\n    if(isAbovePlane)\n    {\n        vHideThis = 1.;\n    }\n\n    // In case this element is hidden, change the state accordingly and \n    // re-assign all elements that depend on the state\n    if(vHideThis > 0.5)\n    {\n        stateInternal = defocusState;\n    #genericAttributeInterpolation#\n    }\n    \n\n    if(!isAbovePlane && projLevel > 0.001)\n    {\n        float dist = length(planeTest) * dot(normalize(planeTest), projPlaneNn);\n        positionOut.xyz -= projPlaneNn * dist * projLevel;\n        \n        planeTest = nextPositionOut.xyz - projPlane;\n        dist = length(planeTest) * dot(normalize(planeTest), projPlaneNn);\n        nextPositionOut.xyz -= projPlaneNn * dist * projLevel;\n    }\n\n    // Always determine lon and lat, since we might need it for coloring\n    float r = length(positionOut.xyz);\n    vec4 v = vec4(positionOut.xyz, 1.) * rotationMatrix(vec3(1,0,0), mercatorOffset)\n        * rotationMatrix(vec3(0,1,0), mercatorOffset2)\n        * rotationMatrix(vec3(0,0,1), mercatorOffset3);\n        \n    float rNext = length(nextPositionOut.xyz);\n    vec4 vNext = vec4(nextPositionOut.xyz, 1.) * rotationMatrix(vec3(1,0,0), mercatorOffset)\n        * rotationMatrix(vec3(0,1,0), mercatorOffset2)\n        * rotationMatrix(vec3(0,0,1), mercatorOffset3);\n        \n    float lat = asin(v.z / r) ;  // z\n    float lon = atan(v.x, v.y);  // y x\n    float latNext = asin(vNext.z / rNext) ;  // z\n    float lonNext = atan(vNext.x, vNext.y);  // y x\n    vLongDiff = lonNext - lon; //lon > 0. ? lon - lonNext : lonNext - lon;\n    vLatDiff = positionOut.y > 0. ? lat - latNext : latNext - lat;\n\n    if(mercator > 0.002)\n    {\n        float mercatorHeight;\n        #mercatorModes#\n\n        if(abs(lon - lonNext) > 1.)\n        {\n            vDiscardThis = 1.;\n        }\n\n        vec3 posMercator = r / 3.142 * vec3(lon, log(tan(3.142 * 0.25 + lat * 0.5)), mercatorHeight * mercatorRadius - mercatorRadius/2.);\n        vec3 nextPosMercator = r / 3.142 * vec3(lonNext, log(tan(3.142 * 0.25 + latNext * 0.5)), mercatorHeight * mercatorRadius - mercatorRadius/2.);\n        positionOut = mix(positionOut, posMercator, mercator);\n        nextPositionOut = mix(nextPositionOut, nextPosMercator, mercator);\n    }\n    vOrientation = normalize(nextPositionOut - positionOut);\n    \n    vec4 modelViewProjection = modelViewMatrix * vec4(positionOut, 1.0 );\n    gl_Position = projectionMatrix * modelViewProjection;\n    vPosition = gl_Position.xyz;\n    vec4 modelViewProjectionNext = modelViewMatrix * vec4(nextPositionOut, 1.0 );\n    vNextPosition = (projectionMatrix * modelViewProjectionNext).xyz;\n    \n\n    vDepth = clamp((-2.-modelViewProjection.z) / 2., 0., 1.);\n\n    if(shading > 0.01)\n    {\n        // Assume camera is more distant, but just zoomed in. Leads to better shading,\n        // as if coming from a very far light source, like the sun\n        #customNormal#\n    }\n\n    if(darkenInside > 0.)\n    {\n        vCenter = (projectionMatrix * modelViewMatrix * vec4(0., 0., 0., 1.)).xyz;\n    }\n}"}vertexShaderLine(){return this.vertexShader().replace("#customVars#","").replace("#customNormal#","vView = normalize(vPosition - 1000. * cameraPosition);\nvec3 biNormal = normalize(cross(vView, vOrientation));\nvNormal = cross( biNormal, vOrientation );\nvNormal *= sign( dot( vNormal, vec3( 0.0, 0.0, 1.0 ) ) );\nvNormal *= sign( dot( vNormal, vView ) );\nvNormal *= -1.;\n")}vertexShaderTriangle(){return this.vertexShader().replace("#customVars#","attribute vec3 normalCustom;").replace("#customNormal#","vNormal = normalCustom;\nvView = normalize(vPosition - 1000. * cameraPosition);\n")}fragmentShader(){return"\n#genericUniforms#\n#genericVaryings#\nuniform float alpha;\nuniform int mode;\nvarying vec3 vOrientation;\nvarying float vLongDiff;\nvarying float vLatDiff;\nvarying vec3 vPosition;\nvarying vec3 vNormal;\nvarying vec3 vView;\nvarying vec3 vCenter;\nvarying float vSetId;\nvarying float vAxeType;\nvarying float vDrawIndex;\nvarying float vDepth;\nvarying float vDiscardThis;\nvarying float vHideThis;\nuniform vec3 diffuse;\nuniform float opacity;\nuniform float scale;\nuniform vec3 primaryColor;\nuniform vec3 secondaryColor;\nuniform vec3 defocusColor;\nuniform vec3 backgroundColor;\nuniform float shading;\nuniform float glossiness;\nuniform float darkenInside;\nuniform float defocusAlpha;\nuniform float colorScale;\nuniform sampler2D colorMap;\nuniform int colorMapMode;\nuniform float axesTransparancy;\nuniform vec3 axesColor;\n\n\nfloat lightIntensity2(vec3 viewDir, vec3 normalDir)\n{\n    float ambient = 0.2;\n    float diffuse = 1.0;\n    float specular = 7.0;\n    float shininess = 250.;\n\n    return ambient \n           + diffuse * abs(dot(-viewDir, normalDir)) //max(0., dot(-viewDir, normalDir)) \n           + specular *  pow(abs(dot(-viewDir, normalDir)), shininess);//pow(max(dot(-viewDir, normalDir), 0.0 ), shininess);\n}\nfloat lightIntensity(vec3 viewDir, vec3 normalDir)\n{\n    // diffuse term\n    vec3 lightDir = -viewDir;\n    float NdotL = dot(normalDir, lightDir);\n    float diffuse = NdotL;\n    float shininess = 50.;\n    vec3 rVector = normalize(2.0 * normalDir * abs(dot(normalDir, lightDir)) - lightDir);\n    float RdotV = dot(rVector, -viewDir);\n\n    float specular = 0.;\n    if(RdotV > 0.)\n        specular = glossiness * pow(RdotV, shininess);\n    return 0.2 + diffuse + specular;\n}\n\nvec3 pseudoRandomColor(float i) \n{\n    return vec3(mod(7.  * i, 206.) + 50., \n                mod(11. * i, 128.) + 50., \n                mod(31. * i, 206.) + 20.) / 256.;\n    float h = i * mod(2654435761., pow(2., 32.));\n    return vec3(mod(h, 256.), mod(h, 10000.) / 40., mod(h, 65536.) / 256.) / 256.;\n}\n\nvec4 getColor(float value, float alpha)\n{\n    if(colorMapMode == 0) {\n        return vec4(mix(primaryColor, secondaryColor, value), alpha);\n    }\n    else \n    {\n        return texture2D(colorMap, vec2(value, 0.5));\n    }\n}\n\nvoid main() \n{\n    if(vAxeType > 0.5) {\n        gl_FragColor = vec4(axesColor, axesTransparancy);\n        if(vDiscardThis > 0.001) {\n            discard;\n        }\n        return;\n    }\n\n    gl_FragColor = getColor(0., alpha);\n\n    if(mode==1)\n    {\n        gl_FragColor = vec4(vOrientation.x / 2. + 0.5, vOrientation.y / 2. + 0.5, vOrientation.z / 2. + 0.5, alpha);\n    }\n    else if(mode == 2)\n    {\n        gl_FragColor.xyz = normalize(vec3(vLongDiff, 0, vLatDiff));\n        gl_FragColor = vec4(gl_FragColor.x / 2. + 0.5, gl_FragColor.y / 2. + 0.5, gl_FragColor.z / 2. + 0.5, alpha);\n    }\n    else if(mode == 3)\n    {\n        gl_FragColor.xyz = vec3(clamp((vLatDiff) * colorScale, -1., 1.), 0,0);\n        gl_FragColor = vec4(gl_FragColor.x / 2. + 0.5, gl_FragColor.y / 2. + 0.5, gl_FragColor.z / 2. + 0.5, alpha);\n    }\n    else if(mode == 4)\n    {\n        gl_FragColor.xyz = vec3(clamp(vLongDiff * colorScale, -1., 1.), 0,0);\n        gl_FragColor = vec4(gl_FragColor.x / 2. + 0.5, gl_FragColor.y / 2. + 0.5, gl_FragColor.z / 2. + 0.5, alpha);\n    }\n    else if(mode == 5)\n    {\n        gl_FragColor.xyz = getColor(vDepth, 1.).xyz;\n    }\n    else if(mode == 6)\n    {\n        gl_FragColor.xyz = pseudoRandomColor(vDrawIndex);\n    }\n#colorModes#\n\n    float sim = 1.0;\n    if(shading > 0.01)\n    {\n        sim = mix(1.,  lightIntensity(vView, vNormal), shading);\n    }\n\n    gl_FragColor = vec4(clamp(sim * gl_FragColor.xyz, 0., 1.), alpha);\n\n\n    if(darkenInside > 0.)\n    {\n        if(vCenter.z < vPosition.z)\n        {\n            //gl_FragColor.xyz = 1. - darkenInside;\n            gl_FragColor.xyz = mix(gl_FragColor.xyz, backgroundColor, darkenInside);\n        }\n    }\n\n    float hideBecauseFilter = 0.;\n    #attributeFilter#\n\n    // Painting something in defocus color (because it is hidden)\n    if(vDrawIndex < 0. || vHideThis > 0.001 || hideBecauseFilter > 0.001)\n    {\n        gl_FragColor = vec4(clamp(sim * defocusColor, 0., 1.), defocusAlpha);\n    }\n    \n    if(vDiscardThis > 0.001)\n    {\n        discard;\n    }\n}"}}class m{constructor(t){this.isVideoRecording=!1,this.videoCapturer=null,this.videoTime=0,this.videoBitrate=5e7,this.videoFormat="video/webm",this.videoExport="video/webm",this.videoFileType="webm",this.exportHandler=t}init(t){this.renderer=t;var e=document.createElement("div");e.id="screenshotVideoHolder";var n=document.createElement("span");n.id="screenshotButton",n.innerHTML="&#128247;",n.onclick=this.screenshot.bind(this);var i=document.createElement("span");i.id="videoButton",i.innerHTML="&#x25cf;",i.onclick=this.video.bind(this),console.log("Video link",i.onclick),e.appendChild(n),e.appendChild(i),document.body.appendChild(e)}disableScreenshotButton(){var t=document.getElementById("screenshotButton");t.style.opacity=.5,t.style.cursor="default",t.onclick=0}enableScreenshotButton(){var t=document.getElementById("screenshotButton");t.style.opacity=1,t.style.cursor="pointer",t.onclick=this.screenshot.bind(this)}enableVideoButton(){document.getElementById("videoButton").innerHTML="&#x25cf;"}setVideoButtonStatus(t){document.getElementById("videoButton").innerHTML="&#x25a0; - "+t+"s"}screenshot(){console.log("Screenshot"),this.disableScreenshotButton(),this.renderer.domElement.toBlob(function(t){this.exportHandler.downloadRaw("screenshot-"+this.exportHandler.getExportFileName()+".png",t),this.enableScreenshotButton()}.bind(this),"image/png")}video(){this.isVideoRecording?this.stopRecording():this.startRecording()}startRecording(){this.videoTime=Date.now(),this.isVideoRecording=!0;var t={mimeType:this.videoFormat,videoBitsPerSecond:parseInt(this.videoBitrate)};console.log("options",t),this.recordedBlobs=[];try{this.mediaRecorder=new MediaRecorder(this.renderer.domElement.captureStream(),t)}catch(e){console.log("Unable to create MediaRecorder with options Object: ",e);try{this.videoFormat="video/webm,codecs=vp9",t.mimeType=this.videoFormat,this.mediaRecorder=new MediaRecorder(this.renderer.domElement.captureStream(),t)}catch(e){console.log("Unable to create MediaRecorder with options Object: ",e);try{this.videoFormat="video/vp8",t="video/vp8",this.mediaRecorder=new MediaRecorder(this.renderer.domElement.captureStream(),t)}catch(t){return alert("MediaRecorder is not supported by this browser.\n\nTry Firefox 29 or later, or Chrome 47 or later, with Enable experimental Web Platform features enabled from chrome://flags."),void console.error("Exception while creating MediaRecorder:",t)}}}console.log("Created MediaRecorder",this.mediaRecorder,"with options",t),this.mediaRecorder.onstop=this.handleStop.bind(this),this.mediaRecorder.ondataavailable=this.handleDataAvailable.bind(this),this.mediaRecorder.start(100),console.log("MediaRecorder started",this.mediaRecorder)}stopRecording(){this.mediaRecorder.stop()}handleStop(){console.log("Stop"),this.downloadVideo(),this.isVideoRecording=!1}handleDataAvailable(){console.log("Receive video data..."),event.data&&event.data.size>0&&this.recordedBlobs.push(event.data);var t=parseInt((Date.now()-this.videoTime)/1e3);this.setVideoButtonStatus(t)}downloadVideo(){const t=new Blob(this.recordedBlobs,{type:this.videoFormatExport});let e="video-"+this.exportHandler.getExportFileName()+".webm";this.exportHandler.downloadRaw(e,t),this.enableVideoButton()}}var g=n(2),v=n.n(g);class b{getExportFileName(){let t=new Date;return t.getFullYear()+"-"+(1+t.getMonth())+"-"+t.getDate()+"--"+t.getHours()+"-"+("00"+t.getMinutes()).slice(-2)+"-"+t.getSeconds()}downloadText(t,e){var n=new File([e],"data.json",{type:"text/plain;charset=utf-8"});v.a.saveAs(n,t)}downloadRaw(t,e){v.a.saveAs(e,t)}}class _{constructor(t){this.annotations=[],this.gui=t,this.aa=!1,this.noGui=!1,this.showFps=!1,this.lod=1,this.sortFrequency=0,this.sortNeedShuffle=!0,this.webVr=!1,this.backgroundColor=14869218,this.line=null,this.renderer=null,this.scene=null,this.camera=null,this.controls=null,this.vrControls=null,this.material=[],this.uniforms=[],this.bbox=null,this.container2=null,this.renderer2=null,this.scene2=null,this.camera2=null,this.axes2=null,this.data=null,this.numGlPrimitives=0,this.colorMapTextures=[],this.colorMapNames=["Custom colors"],this.colorMaps=(new p).getColorMaps(),this.shaders=new f,this.exportHandler=new b,this.screenCapture=new m(this.exportHandler),this.cameraUpdateCallback=function(){},this.recommendedScale=1,this.setsAndStates=[],this.customUniforms=[],this.customAttributes=[],this.dataAttributes=[],this.currentSelection={},this.actualTitle="",this.lastSort=0,this.sortForward=!0,this.lastCamPos=new i.Vector3(0,0,0),this.lastCamPosUpdate=0,this.sortedSinceLastCamPosUpdate=!1,this.div=null,this.x1=0,this.y1=0,this.x2=0,this.y2=0,this.pressingButton=!1,this.clickingMouseButton=!1,this.webVrDisplacement=new i.Vector3(0,1.5,-3),this.clickingVrOnCanvas=!1,this.clickingVrControllerButton=!1,this.lastVrRotation=null,this.stats=null,this.colorModeOptions=["Solid","Orientation xyz","Orientation LonLat","Orientation Lat","Orientation Lon","Depth","Random"],this.mercatorModeOptions=[],this.niceColors=(new p).getNiceColors(),this.niceColorsCopy=[]}setData(t){this.data=t}setVr(t){this.webVr=t,t&&(this.backgroundColor=1118481)}setAA(t){this.aa=t}disableGUI(t){this.noGui=t}setShowFps(t){this.showFps=t}setLOD(t){this.lod=t}spriteBackgroundDrawer(t,e,n,i,r){let a=e*r,o=(a-20)/2,s=n*r,l=i*r;console.log("Create sprite of size",a,s),t.beginPath(),t.moveTo(0+l,0),t.lineTo(0+a-l,0),t.quadraticCurveTo(0+a,0,0+a,0+l),t.lineTo(0+a,0+s-l),t.quadraticCurveTo(0+a,0+s,0+a-l,0+s),t.lineTo(0+o,0+s),t.lineTo(0+a/2,0+s+30),t.lineTo(0+a-o,0+s),t.lineTo(0+l,0+s),t.quadraticCurveTo(0,0+s,0,0+s-l),t.lineTo(0,0+l),t.quadraticCurveTo(0,0,0+l,0),t.closePath(),t.fill(),t.stroke()}makeTextSprite(t,e,n,r){let a=0,o=0,s=0,l=.5,c=255,h=255,u=255,d=document.createElement("canvas"),p=d.getContext("2d");p.font=parseInt(18)+"px Arial",console.log(p.font);let f=p.measureText(t),m=f.width,g=parseInt(m+20),v=parseInt(45.2),y=g,b=v+40;d.width=2*y,d.height=2*b,console.log("metrics",f,d),p.font=parseInt(36)+"px Arial",p.fillStyle="rgba("+a+","+o+","+s+","+l+")",p.strokeStyle="rgba(0, 0, 0, 0)",p.lineWidth=0,this.spriteBackgroundDrawer(p,g,v,8,2),p.fillStyle="rgba("+c+", "+h+", "+u+", 1.0)",p.fillText(t,20,56);let x=new i.Texture(d);x.needsUpdate=!0;let _=new i.SpriteMaterial({map:x,useScreenCoordinates:!1,sizeAttenuation:!1}),w=new i.Sprite(_);w.scale.set(.001*y,.001*b,1);let M=this.data.sets[0].scale*this.getScale();return console.log(M),w.position.set(M*e,M*n,M*r),this.webVr&&w.position.add(this.webVrDisplacement),w.material.depthTest=!1,w}addAnnotation(t,e,n,i,r){let a=this.makeTextSprite(r,e,n,i);a.internalName=t,this.scene.add(a);let o={name:t};this.annotations.push(o)}removeAnnotation(t){for(let e=this.annotations.length-1;e>=0;e--)this.annotations[e].name==t&&(console.log("Remove from array"),this.annotations.splice(e,1));for(let e=this.scene.children.length-1;e>0;e--)void 0!==this.scene.children[e].internalName&&this.scene.children[e].internalName===t&&this.scene.remove(this.scene.children[e]);this.renderer.renderLists.dispose()}toScreenXY(t,e,n){let r=new i.Matrix4;return r.multiplyMatrices(e.projectionMatrix,e.matrixWorldInverse),t.applyMatrix4(r),{x:((t.x+1)*n.width/2+n.offsetLeft)/window.devicePixelRatio,y:((1-t.y)*n.height/2+n.offsetTop)/window.devicePixelRatio}}setInsetLabels(t,e,n){document.getElementById("insetLabelRed").innerHTML=t,document.getElementById("insetLabelGreen").innerHTML=e,document.getElementById("insetLabelBlue").innerHTML=n}updateInsetLabels(){if(this.gui.getValue("0_mercator__Level")<.5)this.setInsetLabels("X","Y","Z");else{let t="time";1==this.gui.getValue("0_mercator__z Mapping")?t="signal":2==this.gui.getValue("0_mercator__z Mapping")&&(t="angle to start"),this.setInsetLabels("long.","lat.",t)}}createFilledArray(t,e){let n=[];for(let i=0;i<=e;i++)n.push(t);return n}shuffle(t){let e,n,i;for(i=t.length-1;i>0;i--)e=Math.floor(Math.random()*(i+1)),n=t[i],t[i]=t[e],t[e]=n;return t}posToOrientation(t,e){let n=new Array(t.length);if(t.length<2*e)return n.fill(0);let i=!1;for(let r=0;r<t.length;r+=e){let a=0==r?0:r-e,o=r>=t.length-e?r:r+e;x=t[o]-t[a],y=e>=2?t[o+1]-t[a+1]:0,z=e>=3?t[o+2]-t[a+2]:0,l=Math.sqrt(x*x+y*y+z*z),0==l&&(l=1,x=n[a+0],y=n[a+1],z=n[a+2],i=!0),n[r]=x/l,e>=2&&(n[r+1]=y/l),e>=3&&(n[r+2]=z/l)}return n}start(){let t=document.createElement("canvas");window.WebGLRenderingContext&&(t.getContext("webgl")||t.getContext("experimental-webgl"))||alert("Error - this browser does not support WebGL."),this.actualTitle=document.title,this.niceColorsCopy=JSON.parse(JSON.stringify(this.niceColors)),this.init(),this.webVr?this.renderer.setAnimationLoop(function(){this.animateFrame(this)}.bind(this)):this.animateFrame(this),document.addEventListener("keydown",this.onDocumentKeyDown.bind(this),!1),document.addEventListener("keyup",this.onDocumentKeyUp.bind(this),!1),document.addEventListener("scroll",this.onDocumentScroll.bind(this),!1)}addCustomAttribute(t,e,n,i,r,a,o,s){let l=this.customAttributes.length;for(let e=0;e<l;e++)if(this.customAttributes[e].name==n&&this.customAttributes[e].dataset==t)return;this.customAttributes.push({}),this.customAttributes[l].type=e,this.customAttributes[l].dataset=t,this.customAttributes[l].dependency=i,this.customAttributes[l].count=r,this.customAttributes[l].name=n,this.customAttributes[l].interpolate=a,this.customAttributes[l].normalize=o,this.customAttributes[l].shared=s}getDataAttributeIndex(t,e){for(let n=0;n<this.dataAttributes.length;n++)if(this.dataAttributes[n].name==e&&this.dataAttributes[n].dataset==t)return n;return-1}addDataAttribute(t,e,n,i,r,a,o){for(let n=0;n<this.dataAttributes.length;n++)if(this.dataAttributes[n].name==e&&this.dataAttributes[n].dataset==t)return void console.error("This attribute exists twice:",e,"of dataset",t);let s=this.dataAttributes.length,l="float";2==n?l="vec2":3==n&&(l="vec3"),this.dataAttributes.push({}),this.dataAttributes[s].type=l,this.dataAttributes[s].dataset=t,this.dataAttributes[s].dim=n,this.dataAttributes[s].name=e,this.dataAttributes[s].shared=a,this.dataAttributes[s].fixedColor=o,this.dataAttributes[s].min=i,this.dataAttributes[s].max=r}addCustomUniform(t,e,n,i,r){for(let e=0;e<this.customUniforms.length;e++)if(this.customUniforms[e].name===n&&this.customUniforms[e].dataset===t)return;let a={};a.dataset=t,a.type=e,a.name=n,a.num=i,a.value=r,this.customUniforms.push(a)}addColorModesToShader(t,e){console.log("Add color modes",this.dataAttributes);let n="\n"+Array(5).join(" "),i=n;for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;let r=this.cleanVarName(this.dataAttributes[e].name),a=this.dataAttributes[e].fixedColor?r+"Min":"max("+r+"Min, "+r+"From)",o=this.dataAttributes[e].fixedColor?r+"Max":"min("+r+"To,"+r+"Max)";i+="else if(mode == "+(7+e)+") {float t = (v"+this.capitalizeFirst(r)+" - "+a+") / ("+o+" - "+a+"); gl_FragColor.xyz = getColor(t, 1.).xyz;}"+n}return e=e.replace("#colorModes#",i)}addMercatorModesToShader(t,e){let n="\n"+Array(5).join(" "),i=n;i+="if(false) {} "+n;for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;let r=this.cleanVarName(this.dataAttributes[e].name),a=this.dataAttributes[e].fixedColor?r+"Min":"max("+r+"Min, "+r+"From)",o=this.dataAttributes[e].fixedColor?r+"Max":"min("+r+"To,"+r+"Max)";i+="else if(mercatorMode == "+(0+e)+") {mercatorHeight = (v"+this.capitalizeFirst(r)+" - "+a+") / ("+o+" - "+a+");}"+n}return e=e.replace("#mercatorModes#",i)}addFilterToShader(t,e,n){console.log("Add filter to shader for dataset:",t);let i="\n"+Array(n+1).join(" "),r=i;for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;console.log("Add ",this.dataAttributes[e].name," to dataset ",this.dataAttributes[e].dataset);let n=this.cleanVarName(this.dataAttributes[e].name);1==this.dataAttributes[e].dim&&(r+="if(v"+this.capitalizeFirst(n)+" < "+n+"From || v"+this.capitalizeFirst(n)+" > "+n+"To) {hideBecauseFilter = 1.;} "+i)}return e=e.replace("#attributeFilter#",r)}addUniformsToShader(t,e){let n="\n";for(let e=0;e<this.customUniforms.length;e++){if(this.customUniforms[e].dataset!==t)continue;let i=this.customUniforms[e].type;"color"==i&&(i="vec3");let r="";this.customUniforms[e].num>1&&(r="["+this.customUniforms[e].num+"]"),n+="uniform "+i+" "+this.cleanVarName(this.customUniforms[e].name)+r+";\n"}return e=(e=e.replace("#colorDefinition#",this.createAttributeForShader("colors","vec3","vSetId",this.setsAndStates.length,!1,!1,!1,!1,4,!0))).replace("#genericUniforms#",n)}addVaryingsToShader(t,e){console.log("Add varyings to shader for dataset ",t);Array(5).join(" ");let n="\n";for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;let i=this.dataAttributes[e].type;"color"==i&&(i="vec3"),n+="varying "+i+" v"+this.capitalizeFirst(this.cleanVarName(this.dataAttributes[e].name))+";\n"}return e=e.replace("#genericVaryings#",n)}addCustomAttributesToShader(t,e){return this.addCustomAttributesToShaderStep(t,!1,this.addCustomAttributesToShaderStep(t,!0,e))}addCustomAttributesToShaderStep(t,e,n){console.log("Call addCustomAttributesToShader for dataset ",t);let i="\n",r="\n";for(let n=0;n<this.customAttributes.length;n++){if(this.customAttributes[n].dataset!==t)continue;console.log("Handle attribute ",n,", ",this.customAttributes[n].name);let a=this.cleanVarName(this.customAttributes[n].name);if(r+=this.createAttributeForShader(a,this.customAttributes[n].type,this.customAttributes[n].dependency,this.customAttributes[n].count,this.customAttributes[n].shared,this.customAttributes[n].interpolate,this.customAttributes[n].normalize,!0,4,e),this.customAttributes[n].shared)i+="attribute "+this.customAttributes[n].type+" "+a+";\n";else for(let t=0;t<this.customAttributes[n].count;t++)i+="attribute "+this.customAttributes[n].type+" "+a+t+";\n"}return n=(n=n.replace("#genericAttributeInterpolation#",r)).replace("#genericAttributes#",i)}createAttributeForShader(t,e,n,i,r,a,o,s,l,c){let h="\n"+Array(l+1).join(" "),u=h;if(r)u+=(c?e+" ":"")+t+"Out = "+t+";\n";else if(1==i)u+=(c?e+" ":"")+t+"Out = "+t+"0;\n";else{u+=(c?"int ":"")+t+"Index = int("+n+");"+h,u+=(c?"float ":"")+t+"Fade = "+n+" - float("+t+"Index);"+h,u+=(c?e+" ":"")+t+"Out;"+h;for(let e=0;e<i;e++)a&&e>=1?(u+="if("+n+" < float("+e+"))  {"+t+"Out = (1. - "+t+"Fade) * "+t+(e-1)+" + "+t+"Fade * "+t+e+";} "+h+" else  ",e==i-1&&(u+="{"+t+"Out = "+t+e+";}"+h)):a||(u+="if(int("+n+") == "+e+")  {"+t+"Out = "+t+e+";}"+h)}return s&&(u+="v"+this.capitalizeFirst(t)+" = "+t+"Out;"+h),u}cleanVarName(t){let e=t.replace(/[^A-Za-z0-9]/g,"");if(e.match(/^\d/)){let e="Error! Attribute "+t+" must start with a non-numeric character.";throw alert(e),new Error(e)}return e}capitalizeFirst(t){return t.charAt(0).toUpperCase()+t.slice(1)}addDataHelperLines(t,e,n,r){let a=n,o=this.data.sets[t].states[0].positions[e].length/a,s=0;void 0!==this.data.sets[t].axes&&(s=this.data.sets[t].axes.length/a);let l=o+s,c=new i.BufferGeometry;c.type=this.data.sets[t].type,c.originIndex=e;let h=this.createFilledArray(t,l-1),u=this.createFilledArray(0,o-1),d=JSON.parse(JSON.stringify(this.data.sets[t].entities[e])),p=JSON.parse(JSON.stringify(this.data.sets[t].indices[e])),f=JSON.parse(JSON.stringify(this.data.sets[t].states[0].positions[e]));if(void 0!==this.data.sets[t].axes){for(let e=0;e<this.data.sets[t].axes.length/a;e++){d.push(-1),u.push(1);for(let i=0;i<n;i++)f.push(this.data.sets[t].axes[n*e+i])}for(let e=0;e<this.data.sets[t].axesIndices.length;e++)p.push(this.data.sets[t].axesIndices[e]+o)}c.setAttribute("setId",new i.Float32BufferAttribute(h,1)),c.setAttribute("drawIndex",new i.Float32BufferAttribute(d,1)),c.setAttribute("axeType",new i.Float32BufferAttribute(u,1)),c.setAttribute("position",new i.Float32BufferAttribute(f,n)),c.setIndex(p),this.numGlPrimitives+=p/2;for(let o=0;o<r;o++){let r=JSON.parse(JSON.stringify(this.data.sets[t].states[o].positions[e]));if(void 0!==this.data.sets[t].axes)for(let e=0;e<this.data.sets[t].axes.length;e++)r.push(this.data.sets[t].axes[e]);let s=[];for(let t=r.length-n;t<r.length;t++)s.push(r[t]+(r[t]-r[t-n]));c.setAttribute("position"+o,new i.Float32BufferAttribute(r,n)),c.setAttribute("nextPosition"+o,new i.Float32BufferAttribute(r.slice(n).concat(s),n));for(let n=0;n<this.data.sets[t].states[o].attributes.length;n++){let r=this.data.sets[t].states[o].attributes[n].dim,s=this.data.sets[t].states[o].attributes[n].shared,l=this.data.sets[t].states[o].attributes[n].name;if(1==s&&o>0)continue;let h=JSON.parse(JSON.stringify(this.data.sets[t].states[o].attributes[n].values[e]));if(void 0!==this.data.sets[t].axes)for(let e=0;e<this.data.sets[t].axes.length/a;e++)for(let t=0;t<r;t++)h.push(0);0==s&&(l+=o),c.setAttribute(this.cleanVarName(l),new i.Float32BufferAttribute(h,r));let u=this.getDataAttributeIndex(t,this.data.sets[t].states[o].attributes[n].name);for(let t=0;t<h.length;t++)this.dataAttributes[u].min=Math.min(this.dataAttributes[u].min,h[t]),this.dataAttributes[u].max=Math.max(this.dataAttributes[u].max,h[t])}}c.totalLineId=[];for(let n=0;n<this.data.sets[t].entities[e].length;n++)c.totalLineId.push(t.toString()+"_"+this.data.sets[t].entities[e][n].toString());return c}addDataHelperTriangles(t,e,n,r){console.log("Entities of",t,this.data.sets[t].entities);let a=n,o=this.data.sets[t].states[0].positions[e].length/a,s=new i.BufferGeometry;s.type=this.data.sets[t].type,s.originIndex=e;let l=this.createFilledArray(t,o-1),c=JSON.parse(JSON.stringify(this.data.sets[t].entities[e]));s.setAttribute("setId",new i.Float32BufferAttribute(l,1)),s.setAttribute("drawIndex",new i.Float32BufferAttribute(c,1)),s.setAttribute("position",new i.Float32BufferAttribute(this.data.sets[t].states[0].positions[e],n)),s.setAttribute("normalCustom",new i.Float32BufferAttribute(this.data.sets[t].states[0].normals[e],n)),s.setIndex(this.data.sets[t].indices[e]),this.numGlPrimitives+=this.data.sets[t].indices[e].length/3;for(let a=0;a<r;a++){let r=this.data.sets[t].states[a].positions[e],o=[];for(let t=r.length-n;t<r.length;t++)o.push(r[t]+(r[t]-r[t-n]));s.setAttribute("position"+a,new i.Float32BufferAttribute(r,n));for(let n=0;n<this.data.sets[t].states[a].attributes.length;n++){let r=this.data.sets[t].states[a].attributes[n].dim,o=this.data.sets[t].states[a].attributes[n].values[e],l=this.data.sets[t].states[a].attributes[n].shared,c=this.data.sets[t].states[a].attributes[n].name;if(!(1==l&&a>0)){0==l&&(c+=a),s.setAttribute(this.cleanVarName(c),new i.Float32BufferAttribute(o,r));for(let t=0;t<o.length;t++)this.dataAttributes[n].min=Math.min(this.dataAttributes[n].min,o[t]),this.dataAttributes[n].max=Math.max(this.dataAttributes[n].max,o[t])}}}s.totalLineId=[];for(let n=0;n<this.data.sets[t].entities[e].length;n++)s.totalLineId.push(t.toString()+"_"+this.data.sets[t].entities[e][n].toString());return s}preprocessData(t,e){let n=this.data.dim,i=[];this.setsAndStates.push({}),this.setsAndStates[e].name=this.data.sets[e].name,this.setsAndStates[e].scale=this.data.sets[e].scale,this.setsAndStates[e].type=this.data.sets[e].type,this.setsAndStates[e].states={};let r=this.data.sets[e].states.length;for(let t=0;t<r;t++)this.setsAndStates[e].states[t]=this.data.sets[e].states[t].name;for(let t=0;t<this.data.sets[e].states[0].attributes.length;t++){let n=this.data.sets[e].states[0].attributes[t].dim,i=this.data.sets[e].states[0].attributes[t].name,r=this.data.sets[e].states[0].attributes[t].shared,a=this.data.sets[e].states[0].attributes[t].fixedColor;this.addDataAttribute(e,i,n,Number.MAX_SAFE_INTEGER,Number.MIN_SAFE_INTEGER,r,a)}for(let t=0;t<this.data.sets[e].states[0].positions.length;t++){this.setStatus(0,this.data.sets[e].states.length*this.data.sets[e].states[0].positions.length,this.data.sets[e].states[0].positions.length*e+t,"Preparing data");let a=null;a="triangles"===this.data.sets[e].type?this.addDataHelperTriangles(e,t,n,r):this.addDataHelperLines(e,t,n,r),i.push(a)}return this.addCustomAttribute(e,"vec3","position","stateInternal",r,!0,!1,!1),this.addCustomAttribute(e,"vec3","nextPosition","stateInternal",r,!0,!1,!1),i}processAttributes(t){for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;let n=this.dataAttributes[e].dim,r=this.dataAttributes[e].name,a=this.dataAttributes[e].shared,o=this.dataAttributes[e].dataset,s="";1==n&&(s="float"),2==n&&(s="vec2"),3==n&&(s="vec3"),this.addCustomAttribute(o,s,r,"state",this.dataAttributes.length,!0,!1,a),this.addCustomUniform(o,s,r+"From",1,this.dataAttributes[e].min),this.addCustomUniform(o,s,r+"To",1,this.dataAttributes[e].max),this.addCustomUniform(o,s,r+"Min",1,this.dataAttributes[e].min),this.addCustomUniform(o,s,r+"Max",1,this.dataAttributes[e].max),this.uniforms[this.dataAttributes[e].dataset][this.cleanVarName(this.dataAttributes[e].name+"From")]=new i.Uniform(this.dataAttributes[e].min),this.uniforms[this.dataAttributes[e].dataset][this.cleanVarName(this.dataAttributes[e].name+"To")]=new i.Uniform(this.dataAttributes[e].max),this.uniforms[this.dataAttributes[e].dataset][this.cleanVarName(this.dataAttributes[e].name+"Min")]=new i.Uniform(this.dataAttributes[e].min),this.uniforms[this.dataAttributes[e].dataset][this.cleanVarName(this.dataAttributes[e].name+"Max")]=new i.Uniform(this.dataAttributes[e].max)}}init(){document.body.innerHTML=document.body.innerHTML+'<div id="selectionBox" hidden></div>\n            <div id="inset"></div>\n            <div id="insetLabel">\n                <span id="insetLabelRed">X</span>, \n                <span id="insetLabelGreen">Y</span>, \n                <span id="insetLabelBlue">Z</span>\n            </div>',this.initGl(),this.initGui(),this.screenCapture.init(this.renderer),this.div=document.getElementById("selectionBox"),this.makeAllElementsVisible()}getLineUniforms(){return{alpha:new i.Uniform(.1),mode:new i.Uniform(0),colorMapMode:new i.Uniform(0),colorMap:{value:0},axesTransparancy:new i.Uniform(1),axesColor:new i.Uniform(new i.Color(0)),mercatorMode:new i.Uniform(0),mercatorRadius:new i.Uniform(0),lineColor:new i.Uniform(new i.Color(16711740)),primaryColor:new i.Uniform(new i.Color(14945818)),secondaryColor:new i.Uniform(new i.Color(16863)),backgroundColor:new i.Uniform(new i.Color(this.backgroundColor)),defocusColor:new i.Uniform(new i.Color(8947848)),defocusAlpha:new i.Uniform(.02),defocusState:new i.Uniform(.5),scale:new i.Uniform(1),colorScale:new i.Uniform(30),shading:new i.Uniform(0),glossiness:new i.Uniform(10),darkenInside:new i.Uniform(0),mercator:new i.Uniform(0),mercatorOffset:new i.Uniform(1.571),mercatorOffset2:new i.Uniform(0),mercatorOffset3:new i.Uniform(0),zLower:new i.Uniform(-99999),zUpper:new i.Uniform(99999),xLower:new i.Uniform(-99999),xUpper:new i.Uniform(99999),yLower:new i.Uniform(-99999),yUpper:new i.Uniform(99999),state:new i.Uniform(0),projLevel:new i.Uniform(0),projPlane:new i.Uniform(new i.Vector3(0,0,99999)),projPlaneN:new i.Uniform(new i.Vector3(0,0,1))}}getTriangleUniforms(){return{alpha:new i.Uniform(.1),mode:new i.Uniform(0),mercatorMode:new i.Uniform(0),mercatorRadius:new i.Uniform(0),lineColor:new i.Uniform(new i.Color(16711740)),primaryColor:new i.Uniform(new i.Color(14945818)),secondaryColor:new i.Uniform(new i.Color(16769280)),backgroundColor:new i.Uniform(new i.Color(this.backgroundColor)),defocusColor:new i.Uniform(new i.Color(8947848)),defocusAlpha:new i.Uniform(.02),defocusState:new i.Uniform(.5),scale:new i.Uniform(1),colorScale:new i.Uniform(30),shading:new i.Uniform(0),glossiness:new i.Uniform(10),darkenInside:new i.Uniform(0),mercator:new i.Uniform(0),mercatorOffset:new i.Uniform(1.57079632),mercatorOffset2:new i.Uniform(0),mercatorOffset3:new i.Uniform(0),zLower:new i.Uniform(-99999),zUpper:new i.Uniform(99999),xLower:new i.Uniform(-99999),xUpper:new i.Uniform(99999),yLower:new i.Uniform(-99999),yUpper:new i.Uniform(99999),projLevel:new i.Uniform(0),projPlane:new i.Uniform(new i.Vector3(0,0,99999)),projPlaneN:new i.Uniform(new i.Vector3(0,0,1)),state:new i.Uniform(0)}}getLineMaterial(t){return new i.ShaderMaterial({uniforms:this.uniforms[t],transparent:!0,linewidth:2,depthFunc:i.AlwaysDepth,blending:i.NormalBlending,fragmentShader:this.addVaryingsToShader(t,this.addFilterToShader(t,this.addColorModesToShader(t,this.addUniformsToShader(t,this.shaders.fragmentShader())),4)),vertexShader:this.addVaryingsToShader(t,this.addCustomAttributesToShader(t,this.addMercatorModesToShader(t,this.addUniformsToShader(t,this.shaders.vertexShaderLine()))))})}getTriangleMaterial(t){return new i.ShaderMaterial({uniforms:this.uniforms[t],transparent:!0,depthFunc:i.AlwaysDepth,side:i.DoubleSide,blending:i.NormalBlending,fragmentShader:this.addVaryingsToShader(t,this.addFilterToShader(t,this.addColorModesToShader(t,this.addUniformsToShader(t,this.shaders.fragmentShader())),4)),vertexShader:this.addVaryingsToShader(t,this.addCustomAttributesToShader(t,this.addMercatorModesToShader(t,this.addUniformsToShader(t,this.shaders.vertexShaderTriangle()))))})}initColormaps(){for(let t in this.colorMaps)this.colorMapTextures.push((new i.TextureLoader).load(this.colorMaps[t])),this.colorMapNames.push(t)}initGl(){this.renderer=new i.WebGLRenderer({antialias:this.aa,alpha:!0,stencil:!1,preserveDrawingBuffer:!0}),this.renderer.setPixelRatio(window.devicePixelRatio),this.renderer.setClearColor(0,0),this.renderer.setSize(window.innerWidth,window.innerHeight),this.renderer.sortObjects=!1,this.renderer.depthWrite=!1,document.body.appendChild(this.renderer.domElement),this.initColormaps(),this.scene=new i.Scene,this.camera=new i.PerspectiveCamera(40,window.innerWidth/window.innerHeight,1,1e3),this.camera.position.set(0,0,2),this.controls=new r(this.camera,this.renderer.domElement),this.controls.staticMoving=!0,this.controls.dynamicDampingFactor=0,this.controls.rotateSpeed=2,this.controls.noPan=!0,this.webVr&&(this.renderer.xr.enabled=!0,this.vrControls=this.renderer.xr.getController(0),this.vrControls.addEventListener("selectstart",this.onVrSelectStart.bind(this)),this.vrControls.addEventListener("selectend",this.onVrSelectEnd.bind(this)),document.body.appendChild(s(this.renderer)),this.controls.enabled=!1),this.controls.minDistance=0,this.controls.maxDistance=5e3;let t=new i.Object3D;t.name="father","string"==typeof this.data&&(this.data=JSON.parse(h.a.inflate(atob(this.data),{to:"string"})),console.log("Inflating object done")),console.log(this.data);for(let e=0;e<this.data.sets.length;e++){"triangles"==this.data.sets[e].type?this.uniforms[e]=this.getTriangleUniforms():this.uniforms[e]=this.getLineUniforms();let n=this.preprocessData(this.data,e);this.processAttributes(e),"triangles"==this.data.sets[e].type?this.material[e]=this.getTriangleMaterial(e):this.material[e]=this.getLineMaterial(e);for(let r=0;r<n.length;r++){let a=null;a="triangles"===n[r].type?new i.Mesh(n[r],this.material[e]):new i.LineSegments(n[r],this.material[e]),a.sortObjects=!1,a.depthWrite=!1,a.frustumCulled=!1,a.selectable=this.data.sets[e].selectable,t.add(a)}}this.setStatus(0,1,1),this.webVr&&t.position.add(this.webVrDisplacement),this.scene.add(t),this.bbox=(new i.Box3).setFromObject(t),this.recommendedScale=2/(this.bbox.max.x-this.bbox.min.x),this.setScale(this.recommendedScale),console.log("THIS:",this),window.addEventListener("resize",this.onWindowResize.bind(this),!1),this.onWindowResize(),this.stats=new o.a,this.noGui&&this.gui.hide(),this.showFps&&document.body.appendChild(this.stats.dom),this.initInset()}initInset(){this.container2=document.getElementById("inset"),this.renderer2=new i.WebGLRenderer({antialias:!0,alpha:!0}),this.renderer2.setClearColor(15790320,0),this.renderer2.setSize(document.getElementById("inset").offsetWidth,document.getElementById("inset").offsetHeight),this.webVr?document.getElementById("insetLabel").className+=" hideMe":this.container2.appendChild(this.renderer2.domElement),this.scene2=new i.Scene,this.camera2=new i.PerspectiveCamera(50,document.getElementById("inset").offsetWidth/document.getElementById("inset").offsetHeight,.1,1e3),this.camera2.up=this.camera.up,this.axes2=new i.AxesHelper(.81);let t=this.axes2.geometry.attributes.color;t.setXYZ(0,1,.1,.1),t.setXYZ(1,1,.1,.1),t.setXYZ(2,.2,.8,.1),t.setXYZ(3,.2,.8,.1),t.setXYZ(4,.1,.4,1),t.setXYZ(5,.1,.4,1),this.axes2.material.linewidth=2,this.scene2.add(this.axes2),this.doneLoading()}getScale(){return this.scene.children[0].scale.x}setScale(t){for(let e=0;e<this.scene.children.length;e++)this.scene.children[e].scale.set(t,t,t)}onWindowResize(){this.camera.aspect=window.innerWidth/window.innerHeight,this.camera.updateProjectionMatrix(),this.renderer.setSize(window.innerWidth,window.innerHeight)}animateFrame(){this.stats.update(),this.sortSegments(),this.cameraUpdateCallback(),this.renderer.setClearColor(this.backgroundColor,1),this.renderer.setViewport(0,0,window.innerWidth,window.innerHeight),this.camera.updateProjectionMatrix(),this.renderer.render(this.scene,this.camera),this.camera2.position.copy(this.camera.position),this.camera2.position.sub(this.controls.target),this.camera2.position.setLength(2),this.camera2.lookAt(this.scene2.position),this.renderer2.render(this.scene2,this.camera2),this.webVr||(requestAnimationFrame(this.animateFrame.bind(this)),this.controls.update())}mergeSort(t,e){function n(t,e,n,i,r,a){let o=n,s=i+1,l=n;for(;;){if(a(t[o],t[s])<=0){if(e[l++]=t[o++],o>i){do{e[l++]=t[s++]}while(s<=r);break}}else if(e[l++]=t[s++],s>r){do{e[l++]=t[o++]}while(o<=i);break}}}function i(t,e,i,a,o){if(a<i)return;if(a==i)return void(e[i]=t[i]);let s=Math.floor(i+(a-i)/2);r(t,e,i,s,o),r(t,e,s+1,a,o),n(t,e,i,s,a,o)}function r(t,e,r,a,o){if(a<=r)return;let s=Math.floor(r+(a-r)/2);i(t,e,r,s,o),i(t,e,s+1,a,o),n(e,t,r,s,a,o)}return function(t,e){let n=t.slice(0);return r(t,n,0,t.length-1,e),t}(t,e)}sortSegments(){if(4==this.sortFrequency&&0==this.sortNeedShuffle||3==this.sortFrequency&&Date.now()-this.lastSort<5e3||2==this.sortFrequency&&Date.now()-this.lastSort<1e3)return;let t=new i.Vector3(0,0,1e3).unproject(this.camera).divideScalar(this.getScale());if(this.webVr){let e=new i.Quaternion;e=this.scene.children[0].getWorldQuaternion(e),e=e.inverse(e),t=new i.Vector3(0,0,-5),t.applyQuaternion(e)}if(0==this.sortFrequency&&t.distanceTo(this.lastCamPos)>0)return this.lastCamPos=t,this.lastCamPosUpdate=Date.now(),void(this.sortedSinceLastCamPosUpdate=!1);if(0==this.sortFrequency&&(this.sortedSinceLastCamPosUpdate||Date.now()-this.lastCamPosUpdate<300))return;performance.now();let e=0;for(let n=0;n<this.scene.children.length;n++)for(let i=0;i<this.scene.children[n].children.length;i++){if(null===this.scene.children[n].children[i].geometry.index)continue;let r=this.scene.children[n].children[i].geometry.index.array,a=r.slice(0),o=this.scene.children[n].children[i].geometry.attributes.position.array,s="Mesh"==this.scene.children[n].children[i].type?3:2,l=new Float32Array(r.length/s),c=-1;for(let e=0;e<l.length;e++)c=3*r[s*e],l[e]=Math.pow(o[c]-t.x,2)+Math.pow(o[c+1]-t.y,2)+Math.pow(o[c+2]-t.z,2);e=performance.now();let h=new Int32Array(l.length);for(let t=0;t<l.length;++t)h[t]=t;4==this.sortFrequency?(h=this.shuffle(h),this.sortNeedShuffle=!1):this.sortForward&&!this.webVr?h.sort((function(t,e){return l[t]>l[e]?-1:l[t]<l[e]?1:0})):h.sort((function(t,e){return l[t]<l[e]?-1:l[t]>l[e]?1:0})),console.log("Sorted",h.length);for(let t=0;t<h.length;t++)for(let e=0;e<s;e++)r[s*t+e]=a[s*h[t]+e];this.scene.children[n].children[i].geometry.needsUpdate=!0,this.scene.children[n].children[i].geometry.index.needsUpdate=!0}performance.now();this.lastSort=Date.now(),this.sortedSinceLastCamPosUpdate=!0}colorReset(t){t.niceColors=JSON.parse(JSON.stringify(t.niceColorsCopy)),t.primary.setValue(16062488),t.secondary.setValue(16769280),t.background.setValue(14540253)}colorListTo3D(t){this.gui.setValue(this.primary,t.niceColors[0]),this.gui.setValue(this.secondary,t.niceColors[1])}getRandomColor(){let t="#";for(let e=0;e<6;e++)t+="0123456789ABCDEF"[Math.floor(16*Math.random())];return t}initGui(){if(this.gui.create(),this.gui.addMainHeadline("General settings"),this.gui.addSelection("Gui scale",["Small","Medium","Large"],1,function(t){this.gui.scale(0==t?250:1==t?400:600)}.bind(this),!1),!this.webVr){let t=document.createElement("div"),e=document.createElement("div");e.innerHTML="Reset camera",e.classList.add("guiTag"),t.appendChild(e);let n=["+x","-x","+y","-y","+z","-z"];for(let e=0;e<n.length;e++){let i=document.createElement("a"),r=n[e];i.href="#",i.classList.add("resetCamLink"),i.innerHTML=r;let a={context:this,d:r};i.onclick=function(){this.context.setCamera(this.d)}.bind(a),t.appendChild(i)}this.gui.addChild(t);let i=document.createElement("div"),r=document.createElement("div");r.innerHTML="Rotate camera",r.classList.add("guiTag"),i.appendChild(r);for(let t=0;t<n.length;t++){let e=document.createElement("a"),r=n[t];e.href="#",e.classList.add("resetCamLink"),e.innerHTML=r;let a={context:this,d:r};e.onclick=function(){this.context.rotateCamera(this.d)}.bind(a),i.appendChild(e)}this.gui.addChild(i)}this.sortFrequency=0,this.gui.addSelection("Render: Update order",["When not moving","Every frame","every 1s","every 5s","Never"],this.sortFrequency,function(t){this.sortFrequency=t,this.sortNeedShuffle=4==t}.bind(this),!1),this.gui.addColor("Background color","#"+this.material[0].uniforms.backgroundColor.value.getHexString(),function(t){for(let e=0;e<this.setsAndStates.length;e++)this.material[e].uniforms.backgroundColor.value=new i.Color(t);this.backgroundColor=t}.bind(this),!1);let t=document.createElement("div"),e=document.createElement("div");e.innerHTML="Reset settings",e.classList.add("guiTag"),t.appendChild(e);var n=document.createElement("button");n.innerHTML="Load now",n.onclick=function(){this.gui.loadDefaults()}.bind(this),t.append(n),this.gui.addChild(t),this.webVr&&(this.gui.addFloat("VR Camera pos. x",-5,5,this.webVrDisplacement.x,function(t){this.scene.children[0].position.sub(this.webVrDisplacement),this.webVrDisplacement.setX(parseFloat(t)),this.scene.children[0].position.add(this.webVrDisplacement)}.bind(this),!1),this.gui.addFloat("VR Camera pos. y",-5,5,this.webVrDisplacement.y,function(t){this.scene.children[0].position.sub(this.webVrDisplacement),this.webVrDisplacement.setY(parseFloat(t)),this.scene.children[0].position.add(this.webVrDisplacement)}.bind(this),!1),this.gui.addFloat("VR Camera pos. z",-5,5,this.webVrDisplacement.z,function(t){this.scene.children[0].position.sub(this.webVrDisplacement),this.webVrDisplacement.setZ(parseFloat(t)),this.scene.children[0].position.add(this.webVrDisplacement)}.bind(this),!1));for(let t=0;t<this.setsAndStates.length;t++){this.gui.addMainHeadline("Dataset "+(t+1)+": "+this.setsAndStates[t].name);this.setsAndStates[t].name;let e=1/parseFloat(this.setsAndStates[t].scale);for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;this.gui.addHeadline("Attribute filter: "+this.dataAttributes[e].name);let n=e+": "+this.dataAttributes[e].name,i={};i.name=n,i.uniformName=this.cleanVarName(this.dataAttributes[e].name),i.i=e,i.to=parseFloat(this.dataAttributes[e].max),i.window=parseFloat(0),i.uniforms=this.material[t].uniforms,i.setId=t,i.gui=this.gui,this.gui.addFloat(t+"_"+n+" __Min",parseFloat(this.dataAttributes[e].min),parseFloat(this.dataAttributes[e].max),parseFloat(this.dataAttributes[e].min),function(t){this.uniforms[this.uniformName+"From"].value=t;let e=this.gui.getValue(this.setId+"_"+this.name+"__Window");e>0&&this.gui.setValue(this.setId+"_"+this.name+"__Max",parseFloat(t)+parseFloat(e))}.bind(i)),this.gui.addFloat(t+"_"+n+"__Max",parseFloat(this.dataAttributes[e].min),parseFloat(this.dataAttributes[e].max),parseFloat(this.dataAttributes[e].max),function(t){this.uniforms[this.uniformName+"To"].value=t}.bind(i)),this.gui.addFloat(t+"_"+n+"__Window",parseFloat(0),parseFloat(this.dataAttributes[e].max-this.dataAttributes[e].min),parseFloat(0),function(t){}.bind(i)),this.colorModeOptions.push(n),this.mercatorModeOptions.push(n)}let n={};n.niceColors=this.niceColors,n.niceColorsCopy=this.niceColorsCopy,n.colorMapMode=t.toString()+"__Color map",n.primary=t.toString()+"__Primary color",n.secondary=t.toString()+"__Secondary color",n.defocus=t.toString()+"__Defocus color",n.background="Background color",n.setsAndStates=this.setsAndStates,n.numStates=Object.keys(this.setsAndStates[t].states).length,n.colorListTo3D=this.colorListTo3D,n.gui=this.gui,n.getRandomColor=this.getRandomColor,n.material=this.material[t],n.setId=t,n.backgroundColor=this.backgroundColor,n.updateInsetLabels=this.updateInsetLabels.bind(this),n.setScale=this.setScale.bind(this),n.colorMapTextures=this.colorMapTextures,void 0!==this.data.sets[t].axes&&this.data.sets[t].axes.length>0&&(this.gui.addHeadline("Axes styling"),this.gui.addFloat(t.toString()+"__Axes transparancy",0,1,1,function(t){this.material.uniforms.axesTransparancy.value=t}.bind(n)),this.gui.addColor(t.toString()+"__Axes color","#000000",function(t){for(let e=0;e<this.setsAndStates.length;e++)this.material.uniforms.axesColor.value=new i.Color(t)}.bind(n))),this.gui.addHeadline("Render settings"),this.gui.addSelection(t.toString()+"__Color map",this.colorMapNames,0,function(t){this.material.uniforms.colorMapMode.value=t>0?1:0,t>0&&(this.material.uniforms.colorMap.value=this.colorMapTextures[t-1]),console.log("set to colormap ",t-1,this.colorMapTextures[t-1]),this.material.uniforms.colorMap.needsUpdate=!0}.bind(n)),this.gui.addSelection(t.toString()+"__Custom color: presets",["Default","Dark red/blue","Shuffle all","Cream 1","Cream 2","Cyan","Neon","Nico","Warm blue/red","b/w","b/w inverse","ice","purple","ocean"],0,function(t){1==t?(this.gui.setValue(this.primary,"#dc0d0d"),this.gui.setValue(this.secondary,"#1192f6"),this.gui.setValue(this.background,"#080b1a"),this.gui.setValue(this.defocus,"#4f4e51")):2==t?(this.gui.setValue(this.primary,this.getRandomColor()),this.gui.setValue(this.secondary,this.getRandomColor()),this.gui.setValue(this.background,this.getRandomColor()),this.gui.setValue(this.defocus,this.getRandomColor())):3==t?(this.gui.setValue(this.primary,"#123C69"),this.gui.setValue(this.secondary,"#AC3B61"),this.gui.setValue(this.background,"#f0cdbc"),this.gui.setValue(this.defocus,"#9f9f9f")):4==t?(this.gui.setValue(this.primary,"#6ca56b"),this.gui.setValue(this.secondary,"#e5e4d4"),this.gui.setValue(this.background,"#9a6755"),this.gui.setValue(this.defocus,"#5a362a")):5==t?(this.gui.setValue(this.primary,"#FFE400"),this.gui.setValue(this.secondary,"#f70253"),this.gui.setValue(this.background,"#10E7DC"),this.gui.setValue(this.defocus,"#ffffff")):6==t?(this.gui.setValue(this.primary,"#f3f315"),this.gui.setValue(this.secondary,"#ff0099"),this.gui.setValue(this.background,"#111111"),this.gui.setValue(this.defocus,"#888888")):7==t?(this.gui.setValue(this.primary,"#00b0e6"),this.gui.setValue(this.secondary,"#ff001e"),this.gui.setValue(this.background,"#ffffff"),this.gui.setValue(this.defocus,"#888888")):8==t?(this.gui.setValue(this.primary,"#f5ed70"),this.gui.setValue(this.secondary,"#e03335"),this.gui.setValue(this.background,"#0a7fa2"),this.gui.setValue(this.defocus,"#065e7c")):9==t?(this.gui.setValue(this.primary,"#000000"),this.gui.setValue(this.secondary,"#737373"),this.gui.setValue(this.background,"#ffffff"),this.gui.setValue(this.defocus,"#bfbfbf")):10==t?(this.gui.setValue(this.primary,"#ffffff"),this.gui.setValue(this.secondary,"#313131"),this.gui.setValue(this.background,"#000000"),this.gui.setValue(this.defocus,"#414141")):11==t?(this.gui.setValue(this.primary,"#00787e"),this.gui.setValue(this.secondary,"#92f5fa"),this.gui.setValue(this.background,"#07242a"),this.gui.setValue(this.defocus,"#1e152f")):12==t?(this.gui.setValue(this.primary,"#1d8c80"),this.gui.setValue(this.secondary,"#edaf9b"),this.gui.setValue(this.background,"#43283f"),this.gui.setValue(this.defocus,"#24454d")):13==t?(this.gui.setValue(this.primary,"#fff673"),this.gui.setValue(this.secondary,"#00ca60"),this.gui.setValue(this.background,"#042a55"),this.gui.setValue(this.defocus,"#214588")):(this.gui.setValue(this.primary,"#e40e1a"),this.gui.setValue(this.secondary,"#0041df"),this.gui.setValue(this.background,"#e2e2e2"),this.gui.setValue(this.defocus,"#888888"))}.bind(n)),this.gui.addColor(t.toString()+"__Primary color","#"+n.material.uniforms.primaryColor.value.getHexString(),function(t){this.material.uniforms.primaryColor.value=new i.Color(t),this.gui.setValue(this.colorMapMode,0)}.bind(n)),this.gui.addColor(t.toString()+"__Secondary color","#"+n.material.uniforms.secondaryColor.value.getHexString(),function(t){this.material.uniforms.secondaryColor.value=new i.Color(t),this.gui.setValue(this.colorMapMode,0)}.bind(n)),this.gui.addColor(t.toString()+"__Defocus color","#"+n.material.uniforms.defocusColor.value.getHexString(),function(t){this.material.uniforms.defocusColor.value=new i.Color(t)}.bind(n)),this.gui.addSelection(t.toString()+"__Color mode",this.colorModeOptions,0,function(t){this.material.uniforms.mode.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Line width (test)",0,20,2,function(t){this.material.linewidth=t}.bind(n)),this.gui.addFloat(t.toString()+"__Fade out behind center",0,1,0,function(t){this.material.uniforms.darkenInside.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Shading",0,2,0,function(t){this.material.uniforms.shading.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Glossiness",0,200,10,function(t){this.material.uniforms.glossiness.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Alpha",0,1,.1,function(t){this.material.uniforms.alpha.value=t}.bind(n)),n.numStates>1&&(console.log("Num states:",n.numStates),this.gui.addFloat(t.toString()+"__State",0,n.numStates-1,0,function(t){this.material.uniforms.state.value=t}.bind(n))),this.gui.addFloat(t.toString()+"__Defocus alpha",0,1,.02,function(t){this.material.uniforms.defocusAlpha.value=t}.bind(n)),n.numStates>1&&this.gui.addFloat(t.toString()+"__Defocus state",0,n.numStates-1,Math.min(.5,n.numStates-1),function(t){this.material.uniforms.defocusState.value=t}.bind(n)),this.gui.addHeadline("Mercator projections"),this.gui.addFloat(t.toString()+"_mercator__Level",0,1,0,function(t){this.material.uniforms.mercator.value=t,this.updateInsetLabels()}.bind(n)),this.gui.addFloat(t.toString()+"_mercator__Rotation x",0,6.28318,1.57079632,function(t){this.material.uniforms.mercatorOffset.value=t}.bind(n)),this.gui.addFloat(t.toString()+"_mercator__Rotation y",0,6.28318,0,function(t){this.material.uniforms.mercatorOffset2.value=t}.bind(n)),this.gui.addFloat(t.toString()+"_mercator__Rotation z",0,6.28318,0,function(t){this.material.uniforms.mercatorOffset3.value=t}.bind(n)),this.gui.addFloat(t.toString()+"_mercator__z Scale",0,10,0,function(t){this.material.uniforms.mercatorRadius.value=t}.bind(n)),this.gui.addSelection(t.toString()+"_mercator__z Mapping",this.mercatorModeOptions,0,function(t){this.material.uniforms.mercatorMode.value=t,this.updateInsetLabels()}.bind(n)),this.gui.addHeadline("Cutting planes"),this.gui.addFloat(t.toString()+"_cutting plane:__x Min",e*this.bbox.min.x,e*this.bbox.max.x,e*this.bbox.min.x,function(t){this.material.uniforms.xLower.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__x Max",e*this.bbox.min.x,e*this.bbox.max.x,e*this.bbox.max.x,function(t){this.material.uniforms.xUpper.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__y Min",e*this.bbox.min.y,e*this.bbox.max.y,e*this.bbox.min.y,function(t){this.material.uniforms.yLower.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__y Max",e*this.bbox.min.y,e*this.bbox.max.y,e*this.bbox.max.y,function(t){this.material.uniforms.yUpper.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__z Min",e*this.bbox.min.z,e*this.bbox.max.z,e*this.bbox.min.z,function(t){this.material.uniforms.zLower.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__z Max",e*this.bbox.min.z,e*this.bbox.max.z,e*this.bbox.max.z,function(t){this.material.uniforms.zUpper.value=t/e}.bind(n)),this.gui.addHeadline("Projection on 2D plane in 3D space"),this.gui.addFloat(t.toString()+"__Projection level",0,1,0,function(t){this.material.uniforms.projLevel.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Center x",e*this.bbox.min.x,e*this.bbox.max.x,0,function(t){this.material.uniforms.projPlane.value.setX(t/e)}.bind(n)),this.gui.addFloat(t.toString()+"__Center y",e*this.bbox.min.y,e*this.bbox.max.y,0,function(t){this.material.uniforms.projPlane.value.setY(t/e)}.bind(n)),this.gui.addFloat(t.toString()+"__Center z",e*this.bbox.min.z,e*this.bbox.max.z,e*this.bbox.max.z,function(t){this.material.uniforms.projPlane.value.setZ(t/e)}.bind(n)),this.gui.addFloat(t.toString()+"__Normal x",-1,1,0,function(t){this.material.uniforms.projPlaneN.value.setX(t)}.bind(n)),this.gui.addFloat(t.toString()+"__Normal y",-1,1,0,function(t){this.material.uniforms.projPlaneN.value.setY(t)}.bind(n)),this.gui.addFloat(t.toString()+"__Normal z",-1,1,1,function(t){this.material.uniforms.projPlaneN.value.setZ(t)}.bind(n))}this.gui.addMainHeadline("Tours and Data Export"),this.gui.addFloat("Video bitrate (mbit)",2,200,parseInt(this.videoBitrate/1e6),function(t){this.videoBitrate=1e6*t}.bind(this),!1);let r=document.createElement("div");r.setAttribute("id","exportLinkHolder");let a=document.createElement("a");a.innerHTML="&bull; Download selection",a.id="exportButton",a.href="#",a.onclick=this.exportSelection.bind(this);let o=document.createElement("span");o.style.marginLeft="5px",o.id="exportButtonStatus",r.appendChild(a),r.appendChild(o),this.gui.addChild(r),console.log("Default values",this.gui.defaultValues)}clickAndEnterPressing(){return this.pressingEnter&&this.clickingMouseButton}reCalc(){this.x3=Math.min(this.x1,this.x2),this.x4=Math.max(this.x1,this.x2),this.y3=Math.min(this.y1,this.y2),this.y4=Math.max(this.y1,this.y2),this.div.style.left=this.x3+"px",this.div.style.top=this.y3+"px",this.div.style.width=this.x4-this.x3+"px",this.div.style.height=this.y4-this.y3+"px"}onmousedown(t){this.renderer.domElement===t.target&&(document.activeElement.blur(),this.pressingButton?(this.clickingMouseButton=!0,this.div.hidden=0,this.x1=t.clientX,this.y1=t.clientY,this.reCalc()):this.webVr&&(this.clickingVrOnCanvas=!0))}onmousemove(t){if(this.clickingMouseButton)this.x2=t.clientX,this.y2=t.clientY,this.reCalc();else if(this.clickingVrOnCanvas){if(console.log("vr move",t.clientX,t.clientY),null!=this.lastVrPosX&&null!=this.lastVrPosY){let e=t.clientX-this.lastVrPosX,n=t.clientY-this.lastVrPosY;this.scene.children[0].rotation.y+=.01*e,this.scene.children[0].rotation.x+=.01*n;for(let t=1;t<this.scene.children.length;t++){let r=new i.Matrix4,a=new i.Matrix4;r.makeRotationY(.01*e),a.makeRotationX(.01*n),this.scene.children[t].position.sub(this.webVrDisplacement),this.scene.children[t].position.applyMatrix4(r).applyMatrix4(a),this.scene.children[t].position.add(this.webVrDisplacement)}}this.lastVrPosX=t.clientX,this.lastVrPosY=t.clientY}}onmouseup(t){if(0==this.div.hidden){let t=window.innerWidth||document.documentElement.clientWidth||document.body.clientWidth,e=window.innerHeight||document.documentElement.clientHeight||document.body.clientHeight;this.y1=e-this.y1,this.y2=e-this.y2;let n=this.x1/t*2-1,r=this.y1/e*2-1,a=this.x2/t*2-1,o=this.y2/e*2-1,s=Math.min(n,a),l=Math.max(r,o),c=Math.max(n,a),h=Math.min(r,o);console.log("Selection from",s,l,"to",c,h);let u=this.getScale(),d=new i.Vector3(s,l,-1).unproject(this.camera).divideScalar(u),p=new i.Vector3(c,l,-1).unproject(this.camera).divideScalar(u),f=new i.Vector3(c,h,-1).unproject(this.camera).divideScalar(u),m=new i.Vector3(s,h,-1).unproject(this.camera).divideScalar(u),g=new i.Vector3(s,l,1).unproject(this.camera).divideScalar(u),v=new i.Vector3(c,l,1).unproject(this.camera).divideScalar(u),y=new i.Vector3(c,h,1).unproject(this.camera).divideScalar(u),b=new i.Vector3(s,h,1).unproject(this.camera).divideScalar(u);this.checkPoints(d,p,f,m,g,v,y,b)}else this.clickingVrOnCanvas&&(this.clickingVrOnCanvas=!1,this.lastVrPosX=null,this.lastVrPosY=null);this.div.hidden=1,this.clickingMouseButton=!1}onVrSelectStart(){this.clickingVrControllerButton=!0,this.onVrMoveObserver()}onVrSelectEnd(){this.clickingVrControllerButton=!1,this.lastVrRotation=null}onVrMoveObserver(){if(null!==this.lastVrRotation){let t=this.lastVrRotation.x-this.vrControls.rotation.x,e=this.lastVrRotation.y-this.vrControls.rotation.y;this.clickingVrControllerButton&&(this.scene.children[0].rotation.x+=2*t,this.scene.children[0].rotation.y+=2*e)}this.clickingVrControllerButton&&(this.lastVrRotation=new i.Vector3(this.vrControls.rotation.x,this.vrControls.rotation.y,this.vrControls.rotation.z),setTimeout((function(t){t.onVrMoveObserver().bind(t)}),20,this))}ondblclick(t){t.target===this.renderer.domElement&&this.makeAllElementsVisible()}getPlane(t,e,n){let r=new i.Vector3(e.x,e.y,e.z);r.sub(t);let a=new i.Vector3(e.x,e.y,e.z);a.sub(n);let o=new i.Vector3(r.x,r.y,r.z);o=o.cross(a);let s=e.x*o.x+e.y*o.y+e.z*o.z;return{a:o.x,b:o.y,c:o.z,d:-s}}isInside(t,e,n,i){return e*t.a+n*t.b+i*t.c+t.d>0}makeAllElementsVisible(){this.currentSelection={};for(let t=0;t<this.scene.children[0].children.length;t++){let e=this.scene.children[0].children[t].geometry.originIndex,n=[];if(void 0!==this.data.sets[t].axes)for(let e=0;e<this.data.sets[t].axes.length/3;e++)n.push(-1);let r=JSON.parse(JSON.stringify(this.data.sets[t].entities[e]));r=r.concat(n),console.log("Draw index values",r),this.scene.children[0].children[t].geometry.setAttribute("drawIndex",new i.Float32BufferAttribute(r,1)),this.scene.children[0].children[t].geometry.attributes.drawIndex.needsUpdate=!0;for(let e=0;e<this.scene.children[0].children[t].geometry.totalLineId.length;e++)this.currentSelection[this.scene.children[0].children[t].geometry.totalLineId[e]]=1}}makeAllElementsInvisible(){for(let t=0;t<this.scene.children[0].children.length;t++){let e=this.createFilledArray(-1,this.scene.children[0].children[t].geometry.attributes.drawIndex.array.length);this.scene.children[0].children[t].geometry.setAttribute("drawIndex",new i.Float32BufferAttribute(e,1)),this.scene.children[0].children[t].geometry.attributes.drawIndex.needsUpdate=!0}}checkPoints(t,e,n,i,r,a,o,s){let l=this.getPlane(t,e,r),c=this.getPlane(e,n,a),h=this.getPlane(n,i,o),u=this.getPlane(i,t,s),d=[];this.currentSelection={};let p={};for(let t=0;t<this.scene.children[0].children.length;t++)for(let e=0;e<this.scene.children[0].children[t].geometry.attributes.drawIndex.array.length;e++)(!this.scene.children[0].children[t].selectable||this.scene.children[0].children[t].geometry.attributes.drawIndex.array[e]>.5)&&(p[this.scene.children[0].children[t].geometry.totalLineId[e]]=1);for(let t=0;t<this.scene.children[0].children.length;t++)for(let e=0;e<this.scene.children[0].children[t].geometry.attributes.drawIndex.array.length;e++){let n=this.scene.children[0].children[t].geometry.totalLineId[e];if(void 0===p[n]||void 0!==this.currentSelection[n])continue;let i=this.scene.children[0].children[t].geometry.attributes.position.array[3*e+0],r=this.scene.children[0].children[t].geometry.attributes.position.array[3*e+1],a=this.scene.children[0].children[t].geometry.attributes.position.array[3*e+2];this.scene.children[0].children[t].selectable?this.isInside(l,i,r,a)&&this.isInside(c,i,r,a)&&this.isInside(h,i,r,a)&&this.isInside(u,i,r,a)&&(d.push(this.scene.children[0].children[t].geometry.totalLineId[e]),this.currentSelection[n]=1):(d.push(this.scene.children[0].children[t].geometry.totalLineId[e]),this.currentSelection[n]=1)}this.hideAllButSelected(this.currentSelection),console.log(this.currentSelection)}hideAllButSelected(t){this.makeAllElementsInvisible(),console.log("SelectionMap",t);for(let e=0;e<this.scene.children[0].children.length;e++){let n=this.scene.children[0].children[e].geometry.originIndex,r=this.createFilledArray(-1,this.scene.children[0].children[e].geometry.attributes.drawIndex.array.length-1);for(let i=0;i<this.scene.children[0].children[e].geometry.attributes.drawIndex.array.length;i++){void 0!==t[this.scene.children[0].children[e].geometry.totalLineId[i]]&&(r[i]=this.data.sets[e].entities[n][i])}this.scene.children[0].children[e].geometry.setAttribute("drawIndex",new i.Float32BufferAttribute(r,1)),this.scene.children[0].children[e].geometry.attributes.drawIndex.needsUpdate=!0}}getSelection(){return this.currentSelection}disableExportButton(){let t=document.getElementById("exportButton");t.style.opacity=.5,t.style.cursor="default",t.onclick=0}enableExportButtonAndHideStatus(){let t=document.getElementById("exportButton");t.style.opacity=1,t.style.cursor="pointer",t.onclick=this.exportSelection.bind(this),document.getElementById("exportButtonStatus").innerHTML=""}getExportLine(t,e,n,i){let r="";for(let a=0;a<i;a++)r+=t.positions[e][n*i+a]+";";for(let i=0;i<t.attributes.length;i++)void 0!==t.attributes[i].values&&(t.attributes[i].values.length<=e||t.attributes[i].values[e].length<=n||(r+=t.attributes[i].values[e][n]+";"));return r+="\n",r}getExportHeader(t,e,n){let i="",r=["x","y","z","w"];for(let t=0;t<n;t++)i+=r[t]+";";for(let n=0;n<t.attributes.length;n++)void 0!==t.attributes[n].values&&(t.attributes[n].values.length<=e||0!==t.attributes[n].values[e].length&&(i+=t.attributes[n].name+";"));return i+="\n",i}exportShowStatus(t,e,n,i=null){e%n==0&&(document.getElementById("exportButtonStatus").innerHTML=t+": "+e+(null===i?"":" of "+i))}exportPrepareData(){let t=this.currentSelection,e=[];for(let n=0;n<this.data.sets.length;n++){console.log("Iterate over data sets ... now set ",n);let i={};i.name=n+"_"+this.data.sets[n].name;let r=2;if("lines"!==this.data.sets[n].type)continue;i.states=[];let a=0;for(let e=0;e<this.data.sets[n].states.length;e++){console.log("Iterate over data set states ... now state ",e);let o={};o.name=e+"_"+this.data.sets[n].states[e].name;let s=0,l=-1;o.elements=[];for(let i=0;i<this.data.sets[n].entities.length;i++){let c=!1,h=-1,u="";for(let d=1;d<this.data.sets[n].indices[i].length;d++){let p=this.data.sets[n].indices[i][d];if(l!=p){if(h!==this.data.sets[n].entities[i][p]){a++,s-=r,this.exportShowStatus("Converting trajectories",a,100),c=!1,void 0===t[n.toString()+"_"+this.data.sets[n].entities[i][p].toString()]&&(c=!0),""!==u&&o.elements.push(u),u="",c||(u+=this.getExportHeader(this.data.sets[n].states[e],i,3),u+=this.getExportLine(this.data.sets[n].states[e],i,p,3))}else c||(u+=this.getExportLine(this.data.sets[n].states[e],i,p,3));h=this.data.sets[n].entities[i][p],l=p}}""!==u&&o.elements.push(u)}i.states.push(o)}e.push(i)}return console.log("Export:",e),e}exportSelection(){this.disableExportButton();let t=this.exportPrepareData(),e="export"+this.exportHandler.getExportFileName()+".zip";this.downloadZippedCsv(e,t)}downloadZippedCsv(t,e){let n=new d.a;for(let t=0;t<e.length;t++){let i=n.folder(e[t].name);for(let n=0;n<e[t].states.length;n++){let r=i.folder(e[t].states[n].name);for(let i=0;i<e[t].states[n].elements.length;i++)r.file(i+".csv",e[t].states[n].elements[i])}}console.log("Zip was prepared"),n.generateAsync({type:"blob"},function(t){this.exportShowStatus("Zipping",parseInt(t.percent),1,100)}.bind(this)).then(function(e){console.log("Create downloadable file"),this.exportHandler.downloadRaw(t,e),this.enableExportButtonAndHideStatus()}.bind(this))}setCamera(t){console.log(t),this.controls.reset();let e="+x"===t?2:"-x"===t?-2:0,n="+y"===t?2:"-y"===t?-2:0,i="+z"===t?2:"-z"===t?-2:0;0!==n&&(e=1e-7),console.log("set cam to ",e,n,i),this.camera.position.x=e,this.camera.position.y=n,this.camera.position.z=i,this.camera.updateProjectionMatrix(),this.controls.update()}rotateCamera(t){let e=new i.Matrix4,n=5/180*Math.PI;switch(String(t)){case"+x":e.makeRotationX(n);break;case"-x":e.makeRotationX(-n);break;case"+y":e.makeRotationY(n);break;case"-y":e.makeRotationY(-n);break;case"+z":e.makeRotationZ(n);break;case"-z":e.makeRotationZ(-n)}this.camera.position.applyMatrix4(e),this.camera.up.applyMatrix4(e),this.camera.updateProjectionMatrix(),this.controls.update()}onDocumentKeyDown(t){if(console.log("Event:",t.target.tagName.toLowerCase(),t.which),"input"==t.target.tagName.toLowerCase())return!1;let e=t.which;return console.log("Button "+e),83!=e||(this.pressingButton=!0,this.controls.enabled=!1,!1)}onDocumentKeyUp(t){let e=t.which;console.log("Done with "+e),83==e&&(this.pressingButton=!1,this.controls.enabled=!this.webVr)}onDocumentScroll(t){console.log("scroll")}doneLoading(){document.getElementById("loadingBox").className+=" hideMe",setTimeout((function(){document.getElementById("loadingBox").className+=" removeMe"}),1e3),document.title=this.actualTitle}setStatus(t,e,n,i){let r=100*(n-t)/(e-t);document.title=Math.round(r)+"% "+i+" - "+this.actualTitle}}class w{constructor(){this.elementCounter=0,this.elementGroupCounter=0,this.elementMap=[],this.types={},this.values={},this.defaultValues={}}hide(){document.getElementById("guiArea").classList.add("hideMe"),document.getElementById("guiAreaToggle").classList.add("hideMe")}unhide(){document.getElementById("guiArea").classList.remove("hideMe"),document.getElementById("guiAreaToggle").classList.remove("hideMe")}create(){let t=document.createElement("div");t.setAttribute("id","guiArea"),t.setAttribute("class","guiArea noSelect"),document.body.appendChild(t);let e=document.createElement("div");e.setAttribute("id","guiAreaToggle"),e.setAttribute("class","guiAreaToggle crossed"),e.onclick=this.toggle.bind(this),document.body.appendChild(e)}addHeadline(t){this.elementGroupCounter+=1;let e=document.getElementById("guiArea"),n=document.createElement("div");n.textContent=t,n.setAttribute("class","guiHeadline"),n.setAttribute("id","guiElemGroup"+this.elementGroupCounter),n.onclick=function(){this.classList.toggle("guiHeadlineOpened"),document.getElementsByName(this.getAttribute("id")).forEach((function(t){t.classList.toggle("hideGuiElement")}))},e.appendChild(n)}addFloat(t,e,n,i,r,a=!0){this.defaultValues[t]=i,this.elementMap[t]=this.elementCounter,this.types[t]="float";let o=document.getElementById("guiArea"),s=document.createElement("div");s.setAttribute("class","guiLine"+(a?" hideGuiElement":"")),s.setAttribute("name","guiElemGroup"+this.elementGroupCounter);let l=document.createElement("div");l.textContent=this.getDisplayName(t),l.setAttribute("class","guiTag");let c=document.createElement("input");c.setAttribute("type","number"),c.value=i,c.setAttribute("class","guiValueFloat");let h=document.createElement("input");h.setAttribute("id","guiElem"+this.elementCounter),h.setAttribute("type","range"),h.setAttribute("min",e),h.setAttribute("max",n),h.setAttribute("step",(n-e)/1e9),h.setAttribute("value",i),h.setAttribute("class","guiSlider"),s.appendChild(l),s.appendChild(h),s.appendChild(c),o.appendChild(s),c.addEventListener("input",function(){this.values[t]=c.value,h.value=c.value,r(c.value)}.bind(this),!1),h.addEventListener("input",function(){this.values[t]=h.value,c.value=h.value,r(h.value)}.bind(this),!1),this.elementCounter+=1}addSelection(t,e,n,i,r=!0){this.defaultValues[t]=n,this.elementMap[t]=this.elementCounter,this.types[t]="select";let a=document.getElementById("guiArea"),o=document.createElement("div");o.setAttribute("class","guiLine"+(r?" hideGuiElement":"")),o.setAttribute("name","guiElemGroup"+this.elementGroupCounter);let s=document.createElement("div");s.textContent=this.getDisplayName(t),s.setAttribute("class","guiTag");let l=document.createElement("select");l.setAttribute("class","guiSelect"),l.setAttribute("id","guiElem"+this.elementCounter);for(let t=0;t<e.length;t++){let i=document.createElement("option");i.textContent=e[t],t==n&&i.setAttribute("selected","selected"),l.appendChild(i)}o.appendChild(s),o.appendChild(l),a.appendChild(o),l.addEventListener("change",function(){this.values[t]=l.selectedIndex,i(l.selectedIndex)}.bind(this),!1),this.elementCounter+=1}addColor(t,e,n,i=!0){this.defaultValues[t]=e,this.elementMap[t]=this.elementCounter,this.types[t]="color";let r=document.getElementById("guiArea"),a=document.createElement("div");a.setAttribute("class","guiLine"+(i?" hideGuiElement":"")),a.setAttribute("name","guiElemGroup"+this.elementGroupCounter);let o=document.createElement("div");o.textContent=this.getDisplayName(t),o.setAttribute("class","guiTag");let s=document.createElement("input");s.setAttribute("class","guiColor"),s.setAttribute("id","guiElem"+this.elementCounter),s.setAttribute("value",e),s.setAttribute("type","color"),a.appendChild(o),a.appendChild(s),r.appendChild(a),s.addEventListener("change",function(){this.values[t]=s.value,n(s.value)}.bind(this),!1),this.elementCounter+=1}addMainHeadline(t){let e=document.getElementById("guiArea"),n=document.createElement("div");n.textContent=t,n.setAttribute("class","guiMainHeadline"),e.appendChild(n)}addHtml(t){let e=document.getElementById("guiArea"),n=document.createElement("div");n.setAttribute("class","guiBlock"),n.innerHTML=t,e.appendChild(n)}addChild(t){let e=document.getElementById("guiArea"),n=document.createElement("div");n.setAttribute("class","guiBlock"),n.appendChild(t),e.appendChild(n)}getDisplayName(t){let e=t.split("__");return 2==e.length?e[1]:t}toggle(){document.getElementById("guiArea").classList.toggle("guiAreaRestricted"),document.getElementById("guiAreaToggle").classList.toggle("crossed")}loadDefaults(){for(let t in this.defaultValues)console.log(t,this.defaultValues[t]),this.setValue(t,this.defaultValues[t])}getValue(t){let e="guiElem"+this.elementMap[t];return"select"==this.types[t]?document.getElementById(e).selectedIndex:document.getElementById(e).value}hasChanged(t){let e=this.getValue(t);return"select"==this.types[t]||"color"==this.types[t]?e!==this.defaultValues[t]:Math.abs(this.defaultValues[t]-e)>1e-4}setValue(t,e){let n="guiElem"+this.elementMap[t];"select"==this.types[t]?document.getElementById(n).selectedIndex=e:(document.getElementById(n).value=e,console.log(document.getElementById(n).value,e));let i=new Event("input",{bubbles:!0,cancelable:!0}),r=new Event("change");document.getElementById(n).dispatchEvent(i),document.getElementById(n).dispatchEvent(r)}scale(t){document.getElementById("guiArea").style.width=t+"px"}}var M=n(3),A=n.n(M),S=n(7),E=n.n(S);class T{constructor(t,e,n){this.linus=t,this.gui=e,this.camera=t.camera,this.tourCreatorCheckedSettings={},this.tourChangeCounter=0,this.tourPreviewCallback=n}prepareTourUrl(){let t=this.createTourCodeUrl();document.getElementById("resultBox").textContent=t,document.getElementById("resultBox").select()}prepareTourQR(){let t=this.createTourCodeUrl();console.log(t);let e=new E.a({value:t,size:1e3});v.a.saveAs(e.toDataURL(),"linus_tour.png")}create(){let t=document.createElement("div");t.setAttribute("id","tourCreator");let e=document.createElement("button");e.textContent="Get settings",e.onclick=this.addTourState.bind(this);let n=document.createElement("button");n.onclick=this.createTourCode.bind(this),n.textContent="Create code";let i=document.createElement("button");i.onclick=this.addTourCamera.bind(this),i.textContent="Get camera";let r=document.createElement("button");r.onclick=this.addTourMarker.bind(this),r.textContent="Add marker";let a=document.createElement("button");a.onclick=this.addTourSelection.bind(this),a.textContent="Use selection";let o=document.createElement("button");o.onclick=this.startPreview.bind(this),o.textContent="Preview";let s=document.createElement("input");s.setAttribute("type","text"),s.setAttribute("id","tourCreatorName"),s.setAttribute("value","myTourName");let l=document.createElement("ul");l.setAttribute("id","tourCreatorList");let c=document.createElement("textarea");c.onclick=this.prepareTourUrl.bind(this),c.setAttribute("id","resultBox"),c.setAttribute("readonly",""),c.textContent="Click here to create your custom URL";let h=document.createElement("a");h.href="#",h.innerHTML="QR Code",h.onclick=this.prepareTourQR.bind(this);let u=document.createElement("span"),d=document.createElement("span");d.innerHTML="Auto start on call?",d.style.marginLeft="20px";let p=document.createElement("input");p.setAttribute("type","checkbox"),p.setAttribute("id","autoStartCheckbox"),p.setAttribute("checked","checked"),u.appendChild(d),u.appendChild(p),t.appendChild(e),t.appendChild(i),t.appendChild(r),t.appendChild(a),t.appendChild(o),t.appendChild(l),t.appendChild(c),t.appendChild(h),t.appendChild(u),document.body.appendChild(t)}startPreview(){this.tourPreviewCallback(this.createTourCode())}getCameraUpVector(){let t=new i.Vector3(0,0,0),e=new i.Vector3(0,1,0),n=t.applyMatrix4(this.camera.matrixWorld),r=e.applyMatrix4(this.camera.matrixWorld).sub(n);return console.log("Up vector",r),r}createTourCode(t=-1,e=!1){let n="",i=document.getElementById("tourCreatorList").getElementsByTagName("li");for(let r=0;r<i.length;++r){let a=i[r].getElementsByClassName("tourItemName")[0].textContent,o=i[r].getElementsByClassName("tourItemDelay")[0].value,s=i[r].getElementsByClassName("tourItemDuration")[0].value;if(e&&(o=r/1e3,s=0),!i[r].getElementsByClassName("tourItemCheckbox")[0].parentElement.parentElement.classList.contains("tourItemDisabled")){if("tourChangeCamera"==i[r].getAttribute("name")){n+=o+"~camera~"+i[r].getElementsByClassName("tourItemCameraX")[0].value+","+i[r].getElementsByClassName("tourItemCameraY")[0].value+","+i[r].getElementsByClassName("tourItemCameraZ")[0].value+","+i[r].getElementsByClassName("tourItemCameraUpX")[0].value+","+i[r].getElementsByClassName("tourItemCameraUpY")[0].value+","+i[r].getElementsByClassName("tourItemCameraUpZ")[0].value+"~"+s+"\n"}else if("tourChangeMarker"==i[r].getAttribute("name")){console.log("Add marker"),n+=o+"~marker~"+i[r].getElementsByClassName("tourItemMarkerX")[0].value+","+i[r].getElementsByClassName("tourItemMarkerY")[0].value+","+i[r].getElementsByClassName("tourItemMarkerZ")[0].value+"~"+i[r].getElementsByClassName("tourItemMarkerText")[0].value+"~"+s+"\n"}else if("tourChangeSelection"==i[r].getAttribute("name")){console.log("Add Selection"),n+=o+"~selection~"+i[r].getElementsByClassName("tourItemSelectionValue")[0].value+"\n"}else{console.log(a),n+=o+"~fade~"+a+"~"+i[r].getElementsByClassName("tourItemValue")[0].value+"~"+s+"\n"}if(i[r].getAttribute("id")==t)break}else console.log("Skip element, it's inactive!")}return n}createTourCodeUrl(){let t=this.createTourCode(),e=new URL(window.location.href);return e.searchParams.delete("editor"),e.searchParams.delete("tour"),e.searchParams.append("tour",t),document.getElementById("autoStartCheckbox").checked&&e.searchParams.append("autoStartTour",""),e.toString().replace("main.html","index.html")}loadTour(t){console.log("Load tour");let e=t.split("\n");for(let t=0;t<e.length;t++){console.log(e[t]);let n=e[t].split("~"),i=parseFloat(n[0]),r=n[1];if("camera"===r){let t=n[2].split(","),e=parseFloat(t[0]),r=parseFloat(t[1]),a=parseFloat(t[2]),o=parseFloat(t[3]),s=parseFloat(t[4]),l=parseFloat(t[5]),c=parseFloat(n[3]);this.addTourCamera(i,e,r,a,o,s,l,c)}else if("fade"===r){let t=n[2],e=n[3],r=parseFloat(n[4]);e=isNaN(e)?e:parseFloat(e),this.addTourChange(i,t,e,r)}else if("marker"===r){let t=n[2].split(","),e=parseFloat(t[0]),r=parseFloat(t[1]),a=parseFloat(t[2]),o=n[3],s=parseFloat(n[4]);this.addTourMarker(i,e,r,a,o,s)}else"selection"===r&&this.addTourSelection(i,n[2])}}addTourSelection(t=null,e=null,n=null){e=null==e?JSON.stringify(this.linus.getSelection()):e;let i=document.getElementById("tourCreatorList"),r=document.createElement("div");r.setAttribute("class","tourElementContentArea");let a=document.createElement("input");a.setAttribute("type","hidden"),a.setAttribute("class","tourItemSelectionValue"),a.setAttribute("value",e),r.appendChild(a);let o=this.createBasicTourElements("Selection",t,n,r,!0,!0);o.setAttribute("id","tourChange"+this.tourChangeCounter),o.setAttribute("class","tourElement tourSelection"),o.setAttribute("name","tourChangeSelection"),this.tourChangeCounter++,i.appendChild(o);new A.a(i,{animation:150,handle:".tourDragHandle"})}addTourCamera(t=null,e=null,n=null,i=null,r=null,a=null,o=null,s=null){e=null==e?this.camera.position.x:e,n=null==n?this.camera.position.y:n,i=null==i?this.camera.position.z:i;let l=this.getCameraUpVector();r=null==r?l.x:r,a=null==a?l.y:a,o=null==o?l.z:o;let c=document.getElementById("tourCreatorList"),h=document.createElement("div");h.setAttribute("class","tourElementContentArea");let u=document.createElement("span");u.textContent="x: ";let d=document.createElement("span");d.textContent="y: ";let p=document.createElement("span");p.textContent="z: ";let f=document.createElement("input");f.setAttribute("type","number"),f.setAttribute("class","tourItemCameraX"),f.setAttribute("title","x coordinate in world space, which is roughly in range [2,2]"),f.setAttribute("value",e);let m=document.createElement("input");m.setAttribute("type","number"),m.setAttribute("class","tourItemCameraY"),m.setAttribute("title","y coordinate in world space, which is roughly in range [2,2]"),m.setAttribute("value",n);let g=document.createElement("input");g.setAttribute("type","number"),g.setAttribute("class","tourItemCameraZ"),g.setAttribute("title","z coordinate in world space, which is roughly in range [2,2]"),g.setAttribute("value",i),h.appendChild(u),h.appendChild(f),h.appendChild(d),h.appendChild(m),h.appendChild(p),h.appendChild(g);let v=document.createElement("span");v.textContent="x: ";let y=document.createElement("span");y.textContent="y: ";let b=document.createElement("span");b.textContent="z: ";let x=document.createElement("input");x.setAttribute("type","number"),x.setAttribute("class","tourItemCameraUpX"),x.setAttribute("title","x coordinate in world space, which is roughly in range [2,2]"),x.setAttribute("value",r);let _=document.createElement("input");_.setAttribute("type","number"),_.setAttribute("class","tourItemCameraUpY"),_.setAttribute("title","y coordinate in world space, which is roughly in range [2,2]"),_.setAttribute("value",a);let w=document.createElement("input");w.setAttribute("type","number"),w.setAttribute("class","tourItemCameraUpZ"),w.setAttribute("title","z coordinate in world space, which is roughly in range [2,2]"),w.setAttribute("value",o),h.appendChild(document.createElement("br")),h.appendChild(v),h.appendChild(x),h.appendChild(y),h.appendChild(_),h.appendChild(b),h.appendChild(w);let M=this.createBasicTourElements("Camera",t,s,h,!1);M.setAttribute("id","tourChange"+this.tourChangeCounter),M.setAttribute("class","tourElement tourCamera"),M.setAttribute("name","tourChangeCamera"),c.appendChild(M),this.tourChangeCounter++;new A.a(c,{animation:150,handle:".tourDragHandle"})}addTourMarker(t=null,e=null,n=null,i=null,r=null,a=null){e=null==e?0:e,n=null==n?0:n,i=null==i?0:i,r=null==r?"My marker content":r;let o=document.getElementById("tourCreatorList"),s=document.createElement("div");s.setAttribute("class","tourElementContentArea");let l=document.createElement("span");l.textContent="Text: ",l.setAttribute("class","tourItemValueHeadline");let c=document.createElement("span");c.textContent="x: ";let h=document.createElement("span");h.textContent="y: ";let u=document.createElement("span");u.textContent="z: ";let d=document.createElement("input");d.setAttribute("type","number"),d.setAttribute("class","tourItemMarkerX"),d.setAttribute("title","x coordinate in data space"),d.setAttribute("value",e);let p=document.createElement("input");p.setAttribute("type","number"),p.setAttribute("class","tourItemMarkerY"),p.setAttribute("title","y coordinate in data space"),p.setAttribute("value",n);let f=document.createElement("input");f.setAttribute("type","number"),f.setAttribute("class","tourItemMarkerZ"),f.setAttribute("title","z coordinate in data space"),f.setAttribute("value",i);let m=document.createElement("input");m.setAttribute("type","text"),m.setAttribute("class","tourItemMarkerText"),m.setAttribute("value",r),s.appendChild(l),s.appendChild(m),s.appendChild(document.createElement("br")),s.appendChild(c),s.appendChild(d),s.appendChild(h),s.appendChild(p),s.appendChild(u),s.appendChild(f);let g=this.createBasicTourElements("Marker",t,a,s,!1);g.setAttribute("id","tourChange"+this.tourChangeCounter),g.setAttribute("class","tourElement tourMarker"),g.setAttribute("name","tourChangeMarker"),this.tourChangeCounter++,o.appendChild(g);new A.a(o,{animation:150,handle:".tourDragHandle"})}addTourState(){console.log("add tour state");let t=Object.keys(this.gui.values);for(let e=0;e<t.length;e++)console.log("check",e),void 0!==this.tourCreatorCheckedSettings[t[e]]?this.tourCreatorCheckedSettings[t[e]]!=this.gui.values[t[e]]&&(console.log("Entry ",t[e]," has changed"),this.addTourChange(null,t[e],this.gui.values[t[e]])):this.gui.hasChanged(t[e])&&(console.log("Entry ",t[e]," is new"),console.log(this.gui.values[t[e]]),console.log(this.gui.defaultValues[t[e]]),this.addTourChange(null,t[e],this.gui.values[t[e]]));this.tourCreatorCheckedSettings=JSON.parse(JSON.stringify(this.gui.values))}addTourChange(t=null,e=null,n=null,i=null){e=null==e?"":e,n=null==n?"":n;let r=document.getElementById("tourCreatorList"),a=document.createElement("div");a.setAttribute("class","tourElementContentArea"),console.log("Add parameter: ",this.gui.types[e]);let o="float"!=this.gui.types[e]&&"color"!=this.gui.types[e],s=document.createElement("span");s.textContent="Value: ",s.setAttribute("class","tourItemValueHeadline");let l=document.createElement("input");l.setAttribute("type","text"),l.setAttribute("class","tourItemValue"),l.setAttribute("value",n),l.setAttribute("id","value"),a.appendChild(s),a.appendChild(l);let c=this.createBasicTourElements(e,t,i,a,o);c.setAttribute("id","tourChange"+this.tourChangeCounter),c.setAttribute("class","tourElement tourChange"),c.setAttribute("name","tourChangeProperty"),console.log("Add content"),this.tourChangeCounter++,r.appendChild(c);new A.a(r,{animation:150,handle:".tourDragHandle"})}createBasicTourElements(t,e=null,n,i,r,a=!1){let o=document.createElement("li");o.setAttribute("class","tourItemHolder"),e=null==e||isNaN(e)?1:e,n=null==n||isNaN(n)?1:n;let s=document.createElement("span");s.setAttribute("class","tourItemControlArea"),document.createElement("span").setAttribute("class","tourItemDelayHeadline");let l=document.createElement("span");l.textContent="s ";let c=document.createElement("img");c.setAttribute("class","tourDragHandle"),c.src="./layout/symbols/hamburger.svg";let h=document.createElement("span");h.setAttribute("class","tourItemCheckbox"),h.setAttribute("onclick","this.parentElement.parentElement.classList.toggle('tourItemDisabled')"),h.innerHTML="&nbsp;";let u=document.createElement("img");u.setAttribute("class","tourItemPreview"),u.src="./layout/symbols/eye.svg";let d="tourChange"+this.tourChangeCounter;u.onclick=function(){this.previewSituation(d)}.bind(this),s.appendChild(u);let p=document.createElement("div");if(p.setAttribute("class","settingsHolder"),p.appendChild(i),!a){let t=document.createElement("img");t.setAttribute("class","tourItemOpenSettings"),t.src="./layout/symbols/edit.svg",t.onclick=function(){p.classList.toggle("tourElementContentAreaShow")}.bind(this),s.appendChild(t)}let f=document.createElement("span"),m=document.createElement("span"),g=document.createElement("input"),v=document.createElement("span");v.textContent="s ",g.setAttribute("type","number"),g.setAttribute("min","0"),g.setAttribute("max","100000"),g.setAttribute("value",e),g.setAttribute("title","delay in seconds after which this step should be performed"),g.setAttribute("class","tourItemDelay"),m.appendChild(g),m.appendChild(v),f.appendChild(m),f.setAttribute("class","tourItemDelayBox");let y=document.createElement("div");y.setAttribute("class","tourItemContentBox");let b=document.createElement("span");b.setAttribute("class","tourItemName"),b.textContent=t,y.appendChild(b);let x=document.createElement("input");x.setAttribute("type",r?"hidden":"number"),x.setAttribute("class","tourItemDuration"),x.setAttribute("min","0"),x.setAttribute("max","100000"),x.setAttribute("value",n),x.setAttribute("title","duration in seconds this step should take"),s.appendChild(c),s.appendChild(h),r||y.appendChild(document.createElement("br")),y.appendChild(x),r||y.appendChild(l),y.appendChild(document.createElement("br")),y.appendChild(p),s.appendChild(y);let _=document.createElement("img");_.setAttribute("class","tourItemArrow"),_.src="./layout/symbols/triangle.svg";let w=document.createElement("img");return w.src="./layout/symbols/triangle.svg",w.setAttribute("class","tourItemArrow"),o.appendChild(f),o.appendChild(_),o.appendChild(s),o.appendChild(w),o}previewSituation(t){console.log("Preview situation",t);let e=this.createTourCode(t,!0);this.tourPreviewCallback(e)}}class C{constructor(t,e){this.linus=t,this.gui=e,this.camera=t.camera,this.timer=0,this.timerSpeed=1,this.timerSpeedInput=0,this.tours={},this.tourEditor=new T(t,e,this.tourPreview.bind(this)),this.isShowingEditor=!1}create(){document.createElement("div").setAttribute("id","editorLinkHolder");let t=document.createElement("a");t.innerHTML="&bull; Open tour editor",t.href="#",t.id="tourEditorButton",t.onclick=this.showTourEditor.bind(this),this.gui.addChild(t),this.gui.addFloat("Tour speed",-10,10,0,function(t){this.setTourSpeed(t)}.bind(this),!1);let e=document.createElement("div");e.setAttribute("id","tourList");let n=!1;for(let t in this.tours){console.log("Add tour",t);let i=document.createElement("a"),r={context:this,id:t};i.onclick=function(){this.context.startOrLoadTour(this.id,!1)}.bind(r),i.innerHTML="&bull;  "+t+"<br />",i.href="#",e.appendChild(i),n=!0}if(n){let t=document.createElement("span");t.innerHTML="Start a tour:",t.id="tourEditorHeadline",this.gui.addChild(t)}this.gui.addChild(e)}tourPreview(t){console.log("Received preview code",t),this.resetTourTimer(),this.moveCameraTo(0,0,0,2,0,1,0,0),this.gui.loadDefaults(),this.startTourByString(t,!1)}changeStartTourHeadline(t){let e=document.getElementById("tourEditorHeadline");null!==e&&(e.innerHTML=t)}hideTourEditorLink(){let t=document.getElementById("tourEditorButton");t.parentElement.removeChild(t)}showTourEditor(){this.isShowingEditor||(this.changeStartTourHeadline("Add tour to editor:"),this.isShowingEditor=!0,this.hideTourEditorLink(),this.tourEditor.create())}addTour(t,e){this.tours[t]=e,this.isShowingEditor&&this.tourEditor.loadTour(e)}setTourSpeed(t){this.timerSpeedInput=t}resetTourTimer(){this.timer=0;let t=this.timerSpeedInput;this.timerSpeed=t>=0?1/(t+1):Math.abs(t-1),console.log("Timer speed:",this.timerSpeed)}showMenu(){setTimeout(function(){this.gui.unhide()}.bind(this),this.timer)}startOrLoadTour(t,e=!0){this.isShowingEditor?this.tourEditor.loadTour(this.tours[t]):this.startTour(t,e)}startTour(t,e=!0){console.log("Tour",t),this.startTourByString(this.tours[t],e)}startTourByString(t,e=!0){console.log("Start tour",t),this.resetTourTimer(),this.gui.hide();let n=t.split("\n");for(let t=0;t<n.length;t++){console.log(n[t]);let e=n[t].split("~"),i=parseFloat(e[0]),r=e[1];if("camera"===r){let t=e[2].split(","),n=parseFloat(t[0]),r=parseFloat(t[1]),a=parseFloat(t[2]),o=parseFloat(t[3]),s=parseFloat(t[4]),l=parseFloat(t[5]),c=parseFloat(e[3]);this.moveCameraTo(i,n,r,a,o,s,l,c)}else if("fade"===r){let t=e[2],n=e[3],r=parseFloat(e[4]);n=isNaN(n)?n:parseFloat(n),this.fadeParameter(i,t,n,r)}else if("marker"===r){let t=e[2].split(","),n=parseFloat(t[0]),r=parseFloat(t[1]),a=parseFloat(t[2]),o=e[3],s=parseFloat(e[4]);this.addMarker(i,n,r,a,o,s)}else"selection"===r&&this.setSelection(i,JSON.parse(e[2]))}e&&this.timer>0?setTimeout(function(){this.startTourByString(t)}.bind(this),this.timer):this.showMenu()}addMarker(t,e,n,i,r,a){this.timer+=1e3*t*this.timerSpeed;let o={};o.x=e,o.y=n,o.z=i,o.name=Math.random(),o.text=r,o.context=this.linus,setTimeout((function(t){t.context.addAnnotation(t.name,t.x,t.y,t.z,t.text)}),this.timer,o),setTimeout((function(t){t.context.removeAnnotation(t.name)}),this.timer+1e3*a*this.timerSpeed,o),this.timer+=1e3*a*this.timerSpeed}removeMarker(t,e){this.timer+=1e3*t*this.timerSpeed;let n={};n.name=e,n.context=this,setTimeout((function(t){t.context.removeAnnotation(t.name)}),this.timer,n)}setParameter(t,e,n){this.timer+=1e3*t*this.timerSpeed;let i={};i.name=e,i.value=n,i.gui=this.gui,setTimeout((function(t){t.gui.setValue(t.name,t.value)}),this.timer,i)}setSelection(t,e){console.log(e),this.timer+=1e3*t*this.timerSpeed;let n={};n.value=e,n.context=this.linus,setTimeout((function(t){t.context.hideAllButSelected(t.value)}),this.timer,n)}clearSelection(t){this.timer+=1e3*t*this.timerSpeed;let e={};e.context=this.linus,setTimeout((function(t){e.context.makeAllElementsVisible()}),this.timer,e)}moveCameraAroundY(t,e){this.timer+=1e3*t*this.timerSpeed;let n={};n.timespan=e*this.timerSpeed,n.context=this.linus,setTimeout((function(t){t.context.moveCameraAroundYHelper(t)}),this.timer,n),this.timer+=1e3*e*this.timerSpeed}moveCameraAroundYHelper(t){let e=Math.atan(t.context.camera.position.x,t.context.camera.position.z),n=Math.sqrt(t.context.camera.position.x*t.context.camera.position.x+t.context.camera.position.z*t.context.camera.position.z);console.log("Start angle ",e),console.log("Radius, ",n);let r=30*t.timespan,a=0;for(let o=0;o<r;o++){a=e+o/r*2*3.142;let s={};s.name=t.name,s.context=t.context,s.x=n*Math.sin(a),s.y=t.context.camera.position.y,s.z=n*Math.cos(a),setTimeout((function(t){t.context.camera.position.set(t.x,t.y,t.z),t.context.camera.lookAt(new i.Vector3(0,0,0))}),o*(1e3/30),s)}}moveCameraTo(t,e,n,i,r,a,o,s){this.timer+=1e3*t*this.timerSpeed;let l={};l.name=name,l.x=e,l.y=n,l.z=i,l.upX=r,l.upY=a,l.upZ=o,l.timespan=s*this.timerSpeed,l.context=this,l.linus=this.linus,setTimeout((function(t){t.context.moveCameraHelper(t)}),this.timer,l),this.timer+=1e3*s*this.timerSpeed}ease(t,e){let n=t/e,i=e*(Math.pow(n,2)/(Math.pow(n,2)+Math.pow(1-n,2)));return console.log(t,i),i}moveCameraHelper(t){let e=t.context.camera.position.x,n=t.context.camera.position.y,r=t.context.camera.position.z,a=t.context.camera.up.x,o=t.context.camera.up.y,s=t.context.camera.up.z,l=Math.max(1,60*t.timespan);console.log(l);let c=(t.x-e)/l,h=(t.y-n)/l,u=(t.z-r)/l,d=(t.upX-a)/l,p=(t.upY-o)/l,f=(t.upZ-s)/l;console.log("Up:",d,p,f);let m=Math.max(1,60*t.timespan);for(let l=1;l<=m;l++){let g=this.ease(l,m),v={};v.name=t.name,v.context=t.context,v.linus=t.linus,v.x=e+g*c,v.y=n+g*h,v.z=r+g*u,v.upX=a+g*d,v.upY=o+g*p,v.upZ=s+g*f,setTimeout((function(t){t.linus.cameraUpdateCallback=function(){t.linus.camera.position.set(t.x,t.y,t.z),t.linus.camera.up.set(t.upX,t.upY,t.upZ),t.linus.camera.lookAt(new i.Vector3(0,0,0)),t.linus.cameraUpdateCallback=function(){}}.bind(t)}),l*(1e3/60),v)}}fadeParameter(t,e,n,r){this.timer+=1e3*t*this.timerSpeed;let a={};a.name=e,"float"==this.gui.types[a.name]?(n=parseFloat(n),a.type="float"):"color"==this.gui.types[a.name]?a.type="color":(a.type="selection",r=0),a.to=n,a.duration=r*this.timerSpeed,a.context=this,a.gui=this.gui,setTimeout((function(t){t.context.fadeParameterHelper(t),t.context.camera.lookAt(new i.Vector3(0,0,0))}),this.timer,a),this.timer+=1e3*r*this.timerSpeed}interpolateColor(t,e,n){var i=parseInt(t.replace(/#/g,""),16),r=i>>16,a=i>>8&255,o=255&i,s=parseInt(e.replace(/#/g,""),16);return"#"+((1<<24)+(r+n*((s>>16)-r)<<16)+(a+n*((s>>8&255)-a)<<8)+(o+n*((255&s)-o))|0).toString(16).slice(1)}fadeParameterHelper(t){let e=t.gui.getValue(t.name);"float"==t.gui.types[t.name]&&(e=parseFloat(e));let n=Math.max(0,30*t.duration),i=(t.to-e)/n;for(let r=0;r<n;r++){let a={};a.name=t.name,a.gui=t.gui,console.log(t.type),"float"==t.type?a.value=e+r*i:"color"==t.type&&(a.value=t.context.interpolateColor(e,t.to,r/n)),setTimeout((function(t){t.gui.setValue(t.name,t.value)}),30*r,a)}let r={};r.name=t.name,r.gui=t.gui,r.value=t.to,setTimeout((function(t){t.gui.setValue(t.name,t.value)}),30*n,r)}}class L{constructor(t){this.tourList=t,console.time("time to load data");let e=new URL(window.location.href);if(window.location.protocol.includes("http")){let t=e.toString().substring(0,e.toString().lastIndexOf("/"))+"/data/data.json";this.handleLoadingFromServer(t)}else this.handleLoadingFromLocal()}handleLoadingFromLocal(){console.log("This script runs locally");let t=document.createElement("script");t.onload=()=>{this.loadData(data)},t.src="data/data.json",document.head.appendChild(t)}handleLoadingFromServer(t){console.log("This script runs on a server. ");let e=new XMLHttpRequest;e.open("GET",t),e.onprogress=t=>{let e=-1,n=1;t.lengthComputable&&(e=t.loaded,n=t.total),this.handleProgress(e,n)},e.onload=()=>{console.log(e.responseType),this.receiveDataFromServer(e.responseText)},e.send()}roundMegaBytes(t){return Math.ceil(t/1024/1024)}handleProgress(t,e){let n=t/e*100;document.getElementById("loadingBarInner").style.width=n+"%",document.getElementById("loadingBarInnerStatus").innerHTML=t>0?this.roundMegaBytes(t)+"MB of "+this.roundMegaBytes(e)+"MB":""}receiveDataFromServer(t){let e=t.replace("var data = ",""),n=null;"{"===e.charAt(0)?(console.log("Non-Zipped"),n=JSON.parse(e)):(console.log("Zipped"),n=e.slice(1,-1)),this.loadData(n)}loadData(t){console.timeEnd("time to load data");let e=new w,n=new _(e);n.setData(t);let i=new URL(window.location.href);n.setAA(null!==i.searchParams.get("aa")),n.setShowFps(null!==i.searchParams.get("fps")),n.disableGUI(null!==i.searchParams.get("nogui")),n.setLOD(i.searchParams.get("lod")?i.searchParams.get("lod"):1),n.setVr(null!==i.searchParams.get("vr")),onmousedown=n.onmousedown.bind(n),onmousemove=n.onmousemove.bind(n),onmouseup=n.onmouseup.bind(n),ondblclick=n.ondblclick.bind(n),n.start();let r=new C(n,e);if(null!==i.searchParams.get("editor")&&r.showTourEditor(),null!==i.searchParams.get("tour")&&r.addTour("Default tour",i.searchParams.get("tour")),r=this.addMoreTours(r),r.create(),null!==i.searchParams.get("autoStartTour")){let t=i.searchParams.get("autoStartTour");""===t&&(t="Default tour"),r.startTour(t)}}addMoreTours(t){console.log("Check for additional tours - found",this.tourList.length);for(let e=0;e<this.tourList.length;e++)t.addTour(this.tourList[e].name,this.tourList[e].code);return t}}}])}));
\ No newline at end of file
+var i=n(9),r=n(10),a=n(11);function o(){return l.TYPED_ARRAY_SUPPORT?2147483647:1073741823}function s(t,e){if(o()<e)throw new RangeError("Invalid typed array length");return l.TYPED_ARRAY_SUPPORT?(t=new Uint8Array(e)).__proto__=l.prototype:(null===t&&(t=new l(e)),t.length=e),t}function l(t,e,n){if(!(l.TYPED_ARRAY_SUPPORT||this instanceof l))return new l(t,e,n);if("number"==typeof t){if("string"==typeof e)throw new Error("If encoding is specified then the first argument must be a string");return u(this,t)}return c(this,t,e,n)}function c(t,e,n,i){if("number"==typeof e)throw new TypeError('"value" argument must not be a number');return"undefined"!=typeof ArrayBuffer&&e instanceof ArrayBuffer?function(t,e,n,i){if(e.byteLength,n<0||e.byteLength<n)throw new RangeError("'offset' is out of bounds");if(e.byteLength<n+(i||0))throw new RangeError("'length' is out of bounds");e=void 0===n&&void 0===i?new Uint8Array(e):void 0===i?new Uint8Array(e,n):new Uint8Array(e,n,i);l.TYPED_ARRAY_SUPPORT?(t=e).__proto__=l.prototype:t=d(t,e);return t}(t,e,n,i):"string"==typeof e?function(t,e,n){"string"==typeof n&&""!==n||(n="utf8");if(!l.isEncoding(n))throw new TypeError('"encoding" must be a valid string encoding');var i=0|f(e,n),r=(t=s(t,i)).write(e,n);r!==i&&(t=t.slice(0,r));return t}(t,e,n):function(t,e){if(l.isBuffer(e)){var n=0|p(e.length);return 0===(t=s(t,n)).length||e.copy(t,0,0,n),t}if(e){if("undefined"!=typeof ArrayBuffer&&e.buffer instanceof ArrayBuffer||"length"in e)return"number"!=typeof e.length||(i=e.length)!=i?s(t,0):d(t,e);if("Buffer"===e.type&&a(e.data))return d(t,e.data)}var i;throw new TypeError("First argument must be a string, Buffer, ArrayBuffer, Array, or array-like object.")}(t,e)}function h(t){if("number"!=typeof t)throw new TypeError('"size" argument must be a number');if(t<0)throw new RangeError('"size" argument must not be negative')}function u(t,e){if(h(e),t=s(t,e<0?0:0|p(e)),!l.TYPED_ARRAY_SUPPORT)for(var n=0;n<e;++n)t[n]=0;return t}function d(t,e){var n=e.length<0?0:0|p(e.length);t=s(t,n);for(var i=0;i<n;i+=1)t[i]=255&e[i];return t}function p(t){if(t>=o())throw new RangeError("Attempt to allocate Buffer larger than maximum size: 0x"+o().toString(16)+" bytes");return 0|t}function f(t,e){if(l.isBuffer(t))return t.length;if("undefined"!=typeof ArrayBuffer&&"function"==typeof ArrayBuffer.isView&&(ArrayBuffer.isView(t)||t instanceof ArrayBuffer))return t.byteLength;"string"!=typeof t&&(t=""+t);var n=t.length;if(0===n)return 0;for(var i=!1;;)switch(e){case"ascii":case"latin1":case"binary":return n;case"utf8":case"utf-8":case void 0:return U(t).length;case"ucs2":case"ucs-2":case"utf16le":case"utf-16le":return 2*n;case"hex":return n>>>1;case"base64":return H(t).length;default:if(i)return U(t).length;e=(""+e).toLowerCase(),i=!0}}function m(t,e,n){var i=!1;if((void 0===e||e<0)&&(e=0),e>this.length)return"";if((void 0===n||n>this.length)&&(n=this.length),n<=0)return"";if((n>>>=0)<=(e>>>=0))return"";for(t||(t="utf8");;)switch(t){case"hex":return L(this,e,n);case"utf8":case"utf-8":return E(this,e,n);case"ascii":return T(this,e,n);case"latin1":case"binary":return C(this,e,n);case"base64":return S(this,e,n);case"ucs2":case"ucs-2":case"utf16le":case"utf-16le":return R(this,e,n);default:if(i)throw new TypeError("Unknown encoding: "+t);t=(t+"").toLowerCase(),i=!0}}function g(t,e,n){var i=t[e];t[e]=t[n],t[n]=i}function v(t,e,n,i,r){if(0===t.length)return-1;if("string"==typeof n?(i=n,n=0):n>2147483647?n=2147483647:n<-2147483648&&(n=-2147483648),n=+n,isNaN(n)&&(n=r?0:t.length-1),n<0&&(n=t.length+n),n>=t.length){if(r)return-1;n=t.length-1}else if(n<0){if(!r)return-1;n=0}if("string"==typeof e&&(e=l.from(e,i)),l.isBuffer(e))return 0===e.length?-1:y(t,e,n,i,r);if("number"==typeof e)return e&=255,l.TYPED_ARRAY_SUPPORT&&"function"==typeof Uint8Array.prototype.indexOf?r?Uint8Array.prototype.indexOf.call(t,e,n):Uint8Array.prototype.lastIndexOf.call(t,e,n):y(t,[e],n,i,r);throw new TypeError("val must be string, number or Buffer")}function y(t,e,n,i,r){var a,o=1,s=t.length,l=e.length;if(void 0!==i&&("ucs2"===(i=String(i).toLowerCase())||"ucs-2"===i||"utf16le"===i||"utf-16le"===i)){if(t.length<2||e.length<2)return-1;o=2,s/=2,l/=2,n/=2}function c(t,e){return 1===o?t[e]:t.readUInt16BE(e*o)}if(r){var h=-1;for(a=n;a<s;a++)if(c(t,a)===c(e,-1===h?0:a-h)){if(-1===h&&(h=a),a-h+1===l)return h*o}else-1!==h&&(a-=a-h),h=-1}else for(n+l>s&&(n=s-l),a=n;a>=0;a--){for(var u=!0,d=0;d<l;d++)if(c(t,a+d)!==c(e,d)){u=!1;break}if(u)return a}return-1}function b(t,e,n,i){n=Number(n)||0;var r=t.length-n;i?(i=Number(i))>r&&(i=r):i=r;var a=e.length;if(a%2!=0)throw new TypeError("Invalid hex string");i>a/2&&(i=a/2);for(var o=0;o<i;++o){var s=parseInt(e.substr(2*o,2),16);if(isNaN(s))return o;t[n+o]=s}return o}function x(t,e,n,i){return G(U(e,t.length-n),t,n,i)}function _(t,e,n,i){return G(function(t){for(var e=[],n=0;n<t.length;++n)e.push(255&t.charCodeAt(n));return e}(e),t,n,i)}function w(t,e,n,i){return _(t,e,n,i)}function M(t,e,n,i){return G(H(e),t,n,i)}function A(t,e,n,i){return G(function(t,e){for(var n,i,r,a=[],o=0;o<t.length&&!((e-=2)<0);++o)n=t.charCodeAt(o),i=n>>8,r=n%256,a.push(r),a.push(i);return a}(e,t.length-n),t,n,i)}function S(t,e,n){return 0===e&&n===t.length?i.fromByteArray(t):i.fromByteArray(t.slice(e,n))}function E(t,e,n){n=Math.min(t.length,n);for(var i=[],r=e;r<n;){var a,o,s,l,c=t[r],h=null,u=c>239?4:c>223?3:c>191?2:1;if(r+u<=n)switch(u){case 1:c<128&&(h=c);break;case 2:128==(192&(a=t[r+1]))&&(l=(31&c)<<6|63&a)>127&&(h=l);break;case 3:a=t[r+1],o=t[r+2],128==(192&a)&&128==(192&o)&&(l=(15&c)<<12|(63&a)<<6|63&o)>2047&&(l<55296||l>57343)&&(h=l);break;case 4:a=t[r+1],o=t[r+2],s=t[r+3],128==(192&a)&&128==(192&o)&&128==(192&s)&&(l=(15&c)<<18|(63&a)<<12|(63&o)<<6|63&s)>65535&&l<1114112&&(h=l)}null===h?(h=65533,u=1):h>65535&&(h-=65536,i.push(h>>>10&1023|55296),h=56320|1023&h),i.push(h),r+=u}return function(t){var e=t.length;if(e<=4096)return String.fromCharCode.apply(String,t);var n="",i=0;for(;i<e;)n+=String.fromCharCode.apply(String,t.slice(i,i+=4096));return n}(i)}e.Buffer=l,e.SlowBuffer=function(t){+t!=t&&(t=0);return l.alloc(+t)},e.INSPECT_MAX_BYTES=50,l.TYPED_ARRAY_SUPPORT=void 0!==t.TYPED_ARRAY_SUPPORT?t.TYPED_ARRAY_SUPPORT:function(){try{var t=new Uint8Array(1);return t.__proto__={__proto__:Uint8Array.prototype,foo:function(){return 42}},42===t.foo()&&"function"==typeof t.subarray&&0===t.subarray(1,1).byteLength}catch(t){return!1}}(),e.kMaxLength=o(),l.poolSize=8192,l._augment=function(t){return t.__proto__=l.prototype,t},l.from=function(t,e,n){return c(null,t,e,n)},l.TYPED_ARRAY_SUPPORT&&(l.prototype.__proto__=Uint8Array.prototype,l.__proto__=Uint8Array,"undefined"!=typeof Symbol&&Symbol.species&&l[Symbol.species]===l&&Object.defineProperty(l,Symbol.species,{value:null,configurable:!0})),l.alloc=function(t,e,n){return function(t,e,n,i){return h(e),e<=0?s(t,e):void 0!==n?"string"==typeof i?s(t,e).fill(n,i):s(t,e).fill(n):s(t,e)}(null,t,e,n)},l.allocUnsafe=function(t){return u(null,t)},l.allocUnsafeSlow=function(t){return u(null,t)},l.isBuffer=function(t){return!(null==t||!t._isBuffer)},l.compare=function(t,e){if(!l.isBuffer(t)||!l.isBuffer(e))throw new TypeError("Arguments must be Buffers");if(t===e)return 0;for(var n=t.length,i=e.length,r=0,a=Math.min(n,i);r<a;++r)if(t[r]!==e[r]){n=t[r],i=e[r];break}return n<i?-1:i<n?1:0},l.isEncoding=function(t){switch(String(t).toLowerCase()){case"hex":case"utf8":case"utf-8":case"ascii":case"latin1":case"binary":case"base64":case"ucs2":case"ucs-2":case"utf16le":case"utf-16le":return!0;default:return!1}},l.concat=function(t,e){if(!a(t))throw new TypeError('"list" argument must be an Array of Buffers');if(0===t.length)return l.alloc(0);var n;if(void 0===e)for(e=0,n=0;n<t.length;++n)e+=t[n].length;var i=l.allocUnsafe(e),r=0;for(n=0;n<t.length;++n){var o=t[n];if(!l.isBuffer(o))throw new TypeError('"list" argument must be an Array of Buffers');o.copy(i,r),r+=o.length}return i},l.byteLength=f,l.prototype._isBuffer=!0,l.prototype.swap16=function(){var t=this.length;if(t%2!=0)throw new RangeError("Buffer size must be a multiple of 16-bits");for(var e=0;e<t;e+=2)g(this,e,e+1);return this},l.prototype.swap32=function(){var t=this.length;if(t%4!=0)throw new RangeError("Buffer size must be a multiple of 32-bits");for(var e=0;e<t;e+=4)g(this,e,e+3),g(this,e+1,e+2);return this},l.prototype.swap64=function(){var t=this.length;if(t%8!=0)throw new RangeError("Buffer size must be a multiple of 64-bits");for(var e=0;e<t;e+=8)g(this,e,e+7),g(this,e+1,e+6),g(this,e+2,e+5),g(this,e+3,e+4);return this},l.prototype.toString=function(){var t=0|this.length;return 0===t?"":0===arguments.length?E(this,0,t):m.apply(this,arguments)},l.prototype.equals=function(t){if(!l.isBuffer(t))throw new TypeError("Argument must be a Buffer");return this===t||0===l.compare(this,t)},l.prototype.inspect=function(){var t="",n=e.INSPECT_MAX_BYTES;return this.length>0&&(t=this.toString("hex",0,n).match(/.{2}/g).join(" "),this.length>n&&(t+=" ... ")),"<Buffer "+t+">"},l.prototype.compare=function(t,e,n,i,r){if(!l.isBuffer(t))throw new TypeError("Argument must be a Buffer");if(void 0===e&&(e=0),void 0===n&&(n=t?t.length:0),void 0===i&&(i=0),void 0===r&&(r=this.length),e<0||n>t.length||i<0||r>this.length)throw new RangeError("out of range index");if(i>=r&&e>=n)return 0;if(i>=r)return-1;if(e>=n)return 1;if(this===t)return 0;for(var a=(r>>>=0)-(i>>>=0),o=(n>>>=0)-(e>>>=0),s=Math.min(a,o),c=this.slice(i,r),h=t.slice(e,n),u=0;u<s;++u)if(c[u]!==h[u]){a=c[u],o=h[u];break}return a<o?-1:o<a?1:0},l.prototype.includes=function(t,e,n){return-1!==this.indexOf(t,e,n)},l.prototype.indexOf=function(t,e,n){return v(this,t,e,n,!0)},l.prototype.lastIndexOf=function(t,e,n){return v(this,t,e,n,!1)},l.prototype.write=function(t,e,n,i){if(void 0===e)i="utf8",n=this.length,e=0;else if(void 0===n&&"string"==typeof e)i=e,n=this.length,e=0;else{if(!isFinite(e))throw new Error("Buffer.write(string, encoding, offset[, length]) is no longer supported");e|=0,isFinite(n)?(n|=0,void 0===i&&(i="utf8")):(i=n,n=void 0)}var r=this.length-e;if((void 0===n||n>r)&&(n=r),t.length>0&&(n<0||e<0)||e>this.length)throw new RangeError("Attempt to write outside buffer bounds");i||(i="utf8");for(var a=!1;;)switch(i){case"hex":return b(this,t,e,n);case"utf8":case"utf-8":return x(this,t,e,n);case"ascii":return _(this,t,e,n);case"latin1":case"binary":return w(this,t,e,n);case"base64":return M(this,t,e,n);case"ucs2":case"ucs-2":case"utf16le":case"utf-16le":return A(this,t,e,n);default:if(a)throw new TypeError("Unknown encoding: "+i);i=(""+i).toLowerCase(),a=!0}},l.prototype.toJSON=function(){return{type:"Buffer",data:Array.prototype.slice.call(this._arr||this,0)}};function T(t,e,n){var i="";n=Math.min(t.length,n);for(var r=e;r<n;++r)i+=String.fromCharCode(127&t[r]);return i}function C(t,e,n){var i="";n=Math.min(t.length,n);for(var r=e;r<n;++r)i+=String.fromCharCode(t[r]);return i}function L(t,e,n){var i=t.length;(!e||e<0)&&(e=0),(!n||n<0||n>i)&&(n=i);for(var r="",a=e;a<n;++a)r+=F(t[a]);return r}function R(t,e,n){for(var i=t.slice(e,n),r="",a=0;a<i.length;a+=2)r+=String.fromCharCode(i[a]+256*i[a+1]);return r}function P(t,e,n){if(t%1!=0||t<0)throw new RangeError("offset is not uint");if(t+e>n)throw new RangeError("Trying to access beyond buffer length")}function D(t,e,n,i,r,a){if(!l.isBuffer(t))throw new TypeError('"buffer" argument must be a Buffer instance');if(e>r||e<a)throw new RangeError('"value" argument is out of bounds');if(n+i>t.length)throw new RangeError("Index out of range")}function O(t,e,n,i){e<0&&(e=65535+e+1);for(var r=0,a=Math.min(t.length-n,2);r<a;++r)t[n+r]=(e&255<<8*(i?r:1-r))>>>8*(i?r:1-r)}function I(t,e,n,i){e<0&&(e=4294967295+e+1);for(var r=0,a=Math.min(t.length-n,4);r<a;++r)t[n+r]=e>>>8*(i?r:3-r)&255}function k(t,e,n,i,r,a){if(n+i>t.length)throw new RangeError("Index out of range");if(n<0)throw new RangeError("Index out of range")}function B(t,e,n,i,a){return a||k(t,0,n,4),r.write(t,e,n,i,23,4),n+4}function N(t,e,n,i,a){return a||k(t,0,n,8),r.write(t,e,n,i,52,8),n+8}l.prototype.slice=function(t,e){var n,i=this.length;if((t=~~t)<0?(t+=i)<0&&(t=0):t>i&&(t=i),(e=void 0===e?i:~~e)<0?(e+=i)<0&&(e=0):e>i&&(e=i),e<t&&(e=t),l.TYPED_ARRAY_SUPPORT)(n=this.subarray(t,e)).__proto__=l.prototype;else{var r=e-t;n=new l(r,void 0);for(var a=0;a<r;++a)n[a]=this[a+t]}return n},l.prototype.readUIntLE=function(t,e,n){t|=0,e|=0,n||P(t,e,this.length);for(var i=this[t],r=1,a=0;++a<e&&(r*=256);)i+=this[t+a]*r;return i},l.prototype.readUIntBE=function(t,e,n){t|=0,e|=0,n||P(t,e,this.length);for(var i=this[t+--e],r=1;e>0&&(r*=256);)i+=this[t+--e]*r;return i},l.prototype.readUInt8=function(t,e){return e||P(t,1,this.length),this[t]},l.prototype.readUInt16LE=function(t,e){return e||P(t,2,this.length),this[t]|this[t+1]<<8},l.prototype.readUInt16BE=function(t,e){return e||P(t,2,this.length),this[t]<<8|this[t+1]},l.prototype.readUInt32LE=function(t,e){return e||P(t,4,this.length),(this[t]|this[t+1]<<8|this[t+2]<<16)+16777216*this[t+3]},l.prototype.readUInt32BE=function(t,e){return e||P(t,4,this.length),16777216*this[t]+(this[t+1]<<16|this[t+2]<<8|this[t+3])},l.prototype.readIntLE=function(t,e,n){t|=0,e|=0,n||P(t,e,this.length);for(var i=this[t],r=1,a=0;++a<e&&(r*=256);)i+=this[t+a]*r;return i>=(r*=128)&&(i-=Math.pow(2,8*e)),i},l.prototype.readIntBE=function(t,e,n){t|=0,e|=0,n||P(t,e,this.length);for(var i=e,r=1,a=this[t+--i];i>0&&(r*=256);)a+=this[t+--i]*r;return a>=(r*=128)&&(a-=Math.pow(2,8*e)),a},l.prototype.readInt8=function(t,e){return e||P(t,1,this.length),128&this[t]?-1*(255-this[t]+1):this[t]},l.prototype.readInt16LE=function(t,e){e||P(t,2,this.length);var n=this[t]|this[t+1]<<8;return 32768&n?4294901760|n:n},l.prototype.readInt16BE=function(t,e){e||P(t,2,this.length);var n=this[t+1]|this[t]<<8;return 32768&n?4294901760|n:n},l.prototype.readInt32LE=function(t,e){return e||P(t,4,this.length),this[t]|this[t+1]<<8|this[t+2]<<16|this[t+3]<<24},l.prototype.readInt32BE=function(t,e){return e||P(t,4,this.length),this[t]<<24|this[t+1]<<16|this[t+2]<<8|this[t+3]},l.prototype.readFloatLE=function(t,e){return e||P(t,4,this.length),r.read(this,t,!0,23,4)},l.prototype.readFloatBE=function(t,e){return e||P(t,4,this.length),r.read(this,t,!1,23,4)},l.prototype.readDoubleLE=function(t,e){return e||P(t,8,this.length),r.read(this,t,!0,52,8)},l.prototype.readDoubleBE=function(t,e){return e||P(t,8,this.length),r.read(this,t,!1,52,8)},l.prototype.writeUIntLE=function(t,e,n,i){(t=+t,e|=0,n|=0,i)||D(this,t,e,n,Math.pow(2,8*n)-1,0);var r=1,a=0;for(this[e]=255&t;++a<n&&(r*=256);)this[e+a]=t/r&255;return e+n},l.prototype.writeUIntBE=function(t,e,n,i){(t=+t,e|=0,n|=0,i)||D(this,t,e,n,Math.pow(2,8*n)-1,0);var r=n-1,a=1;for(this[e+r]=255&t;--r>=0&&(a*=256);)this[e+r]=t/a&255;return e+n},l.prototype.writeUInt8=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,1,255,0),l.TYPED_ARRAY_SUPPORT||(t=Math.floor(t)),this[e]=255&t,e+1},l.prototype.writeUInt16LE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,2,65535,0),l.TYPED_ARRAY_SUPPORT?(this[e]=255&t,this[e+1]=t>>>8):O(this,t,e,!0),e+2},l.prototype.writeUInt16BE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,2,65535,0),l.TYPED_ARRAY_SUPPORT?(this[e]=t>>>8,this[e+1]=255&t):O(this,t,e,!1),e+2},l.prototype.writeUInt32LE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,4,4294967295,0),l.TYPED_ARRAY_SUPPORT?(this[e+3]=t>>>24,this[e+2]=t>>>16,this[e+1]=t>>>8,this[e]=255&t):I(this,t,e,!0),e+4},l.prototype.writeUInt32BE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,4,4294967295,0),l.TYPED_ARRAY_SUPPORT?(this[e]=t>>>24,this[e+1]=t>>>16,this[e+2]=t>>>8,this[e+3]=255&t):I(this,t,e,!1),e+4},l.prototype.writeIntLE=function(t,e,n,i){if(t=+t,e|=0,!i){var r=Math.pow(2,8*n-1);D(this,t,e,n,r-1,-r)}var a=0,o=1,s=0;for(this[e]=255&t;++a<n&&(o*=256);)t<0&&0===s&&0!==this[e+a-1]&&(s=1),this[e+a]=(t/o>>0)-s&255;return e+n},l.prototype.writeIntBE=function(t,e,n,i){if(t=+t,e|=0,!i){var r=Math.pow(2,8*n-1);D(this,t,e,n,r-1,-r)}var a=n-1,o=1,s=0;for(this[e+a]=255&t;--a>=0&&(o*=256);)t<0&&0===s&&0!==this[e+a+1]&&(s=1),this[e+a]=(t/o>>0)-s&255;return e+n},l.prototype.writeInt8=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,1,127,-128),l.TYPED_ARRAY_SUPPORT||(t=Math.floor(t)),t<0&&(t=255+t+1),this[e]=255&t,e+1},l.prototype.writeInt16LE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,2,32767,-32768),l.TYPED_ARRAY_SUPPORT?(this[e]=255&t,this[e+1]=t>>>8):O(this,t,e,!0),e+2},l.prototype.writeInt16BE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,2,32767,-32768),l.TYPED_ARRAY_SUPPORT?(this[e]=t>>>8,this[e+1]=255&t):O(this,t,e,!1),e+2},l.prototype.writeInt32LE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,4,2147483647,-2147483648),l.TYPED_ARRAY_SUPPORT?(this[e]=255&t,this[e+1]=t>>>8,this[e+2]=t>>>16,this[e+3]=t>>>24):I(this,t,e,!0),e+4},l.prototype.writeInt32BE=function(t,e,n){return t=+t,e|=0,n||D(this,t,e,4,2147483647,-2147483648),t<0&&(t=4294967295+t+1),l.TYPED_ARRAY_SUPPORT?(this[e]=t>>>24,this[e+1]=t>>>16,this[e+2]=t>>>8,this[e+3]=255&t):I(this,t,e,!1),e+4},l.prototype.writeFloatLE=function(t,e,n){return B(this,t,e,!0,n)},l.prototype.writeFloatBE=function(t,e,n){return B(this,t,e,!1,n)},l.prototype.writeDoubleLE=function(t,e,n){return N(this,t,e,!0,n)},l.prototype.writeDoubleBE=function(t,e,n){return N(this,t,e,!1,n)},l.prototype.copy=function(t,e,n,i){if(n||(n=0),i||0===i||(i=this.length),e>=t.length&&(e=t.length),e||(e=0),i>0&&i<n&&(i=n),i===n)return 0;if(0===t.length||0===this.length)return 0;if(e<0)throw new RangeError("targetStart out of bounds");if(n<0||n>=this.length)throw new RangeError("sourceStart out of bounds");if(i<0)throw new RangeError("sourceEnd out of bounds");i>this.length&&(i=this.length),t.length-e<i-n&&(i=t.length-e+n);var r,a=i-n;if(this===t&&n<e&&e<i)for(r=a-1;r>=0;--r)t[r+e]=this[r+n];else if(a<1e3||!l.TYPED_ARRAY_SUPPORT)for(r=0;r<a;++r)t[r+e]=this[r+n];else Uint8Array.prototype.set.call(t,this.subarray(n,n+a),e);return a},l.prototype.fill=function(t,e,n,i){if("string"==typeof t){if("string"==typeof e?(i=e,e=0,n=this.length):"string"==typeof n&&(i=n,n=this.length),1===t.length){var r=t.charCodeAt(0);r<256&&(t=r)}if(void 0!==i&&"string"!=typeof i)throw new TypeError("encoding must be a string");if("string"==typeof i&&!l.isEncoding(i))throw new TypeError("Unknown encoding: "+i)}else"number"==typeof t&&(t&=255);if(e<0||this.length<e||this.length<n)throw new RangeError("Out of range index");if(n<=e)return this;var a;if(e>>>=0,n=void 0===n?this.length:n>>>0,t||(t=0),"number"==typeof t)for(a=e;a<n;++a)this[a]=t;else{var o=l.isBuffer(t)?t:U(new l(t,i).toString()),s=o.length;for(a=0;a<n-e;++a)this[a+e]=o[a%s]}return this};var z=/[^+\/0-9A-Za-z-_]/g;function F(t){return t<16?"0"+t.toString(16):t.toString(16)}function U(t,e){var n;e=e||1/0;for(var i=t.length,r=null,a=[],o=0;o<i;++o){if((n=t.charCodeAt(o))>55295&&n<57344){if(!r){if(n>56319){(e-=3)>-1&&a.push(239,191,189);continue}if(o+1===i){(e-=3)>-1&&a.push(239,191,189);continue}r=n;continue}if(n<56320){(e-=3)>-1&&a.push(239,191,189),r=n;continue}n=65536+(r-55296<<10|n-56320)}else r&&(e-=3)>-1&&a.push(239,191,189);if(r=null,n<128){if((e-=1)<0)break;a.push(n)}else if(n<2048){if((e-=2)<0)break;a.push(n>>6|192,63&n|128)}else if(n<65536){if((e-=3)<0)break;a.push(n>>12|224,n>>6&63|128,63&n|128)}else{if(!(n<1114112))throw new Error("Invalid code point");if((e-=4)<0)break;a.push(n>>18|240,n>>12&63|128,n>>6&63|128,63&n|128)}}return a}function H(t){return i.toByteArray(function(t){if((t=function(t){return t.trim?t.trim():t.replace(/^\s+|\s+$/g,"")}(t).replace(z,"")).length<2)return"";for(;t.length%4!=0;)t+="=";return t}(t))}function G(t,e,n,i){for(var r=0;r<i&&!(r+n>=e.length||r>=t.length);++r)e[r+n]=t[r];return r}}).call(this,n(1))},function(t,e,n){"use strict";e.byteLength=function(t){var e=c(t),n=e[0],i=e[1];return 3*(n+i)/4-i},e.toByteArray=function(t){var e,n,i=c(t),o=i[0],s=i[1],l=new a(function(t,e,n){return 3*(e+n)/4-n}(0,o,s)),h=0,u=s>0?o-4:o;for(n=0;n<u;n+=4)e=r[t.charCodeAt(n)]<<18|r[t.charCodeAt(n+1)]<<12|r[t.charCodeAt(n+2)]<<6|r[t.charCodeAt(n+3)],l[h++]=e>>16&255,l[h++]=e>>8&255,l[h++]=255&e;2===s&&(e=r[t.charCodeAt(n)]<<2|r[t.charCodeAt(n+1)]>>4,l[h++]=255&e);1===s&&(e=r[t.charCodeAt(n)]<<10|r[t.charCodeAt(n+1)]<<4|r[t.charCodeAt(n+2)]>>2,l[h++]=e>>8&255,l[h++]=255&e);return l},e.fromByteArray=function(t){for(var e,n=t.length,r=n%3,a=[],o=0,s=n-r;o<s;o+=16383)a.push(h(t,o,o+16383>s?s:o+16383));1===r?(e=t[n-1],a.push(i[e>>2]+i[e<<4&63]+"==")):2===r&&(e=(t[n-2]<<8)+t[n-1],a.push(i[e>>10]+i[e>>4&63]+i[e<<2&63]+"="));return a.join("")};for(var i=[],r=[],a="undefined"!=typeof Uint8Array?Uint8Array:Array,o="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",s=0,l=o.length;s<l;++s)i[s]=o[s],r[o.charCodeAt(s)]=s;function c(t){var e=t.length;if(e%4>0)throw new Error("Invalid string. Length must be a multiple of 4");var n=t.indexOf("=");return-1===n&&(n=e),[n,n===e?0:4-n%4]}function h(t,e,n){for(var r,a,o=[],s=e;s<n;s+=3)r=(t[s]<<16&16711680)+(t[s+1]<<8&65280)+(255&t[s+2]),o.push(i[(a=r)>>18&63]+i[a>>12&63]+i[a>>6&63]+i[63&a]);return o.join("")}r["-".charCodeAt(0)]=62,r["_".charCodeAt(0)]=63},function(t,e){e.read=function(t,e,n,i,r){var a,o,s=8*r-i-1,l=(1<<s)-1,c=l>>1,h=-7,u=n?r-1:0,d=n?-1:1,p=t[e+u];for(u+=d,a=p&(1<<-h)-1,p>>=-h,h+=s;h>0;a=256*a+t[e+u],u+=d,h-=8);for(o=a&(1<<-h)-1,a>>=-h,h+=i;h>0;o=256*o+t[e+u],u+=d,h-=8);if(0===a)a=1-c;else{if(a===l)return o?NaN:1/0*(p?-1:1);o+=Math.pow(2,i),a-=c}return(p?-1:1)*o*Math.pow(2,a-i)},e.write=function(t,e,n,i,r,a){var o,s,l,c=8*a-r-1,h=(1<<c)-1,u=h>>1,d=23===r?Math.pow(2,-24)-Math.pow(2,-77):0,p=i?0:a-1,f=i?1:-1,m=e<0||0===e&&1/e<0?1:0;for(e=Math.abs(e),isNaN(e)||e===1/0?(s=isNaN(e)?1:0,o=h):(o=Math.floor(Math.log(e)/Math.LN2),e*(l=Math.pow(2,-o))<1&&(o--,l*=2),(e+=o+u>=1?d/l:d*Math.pow(2,1-u))*l>=2&&(o++,l/=2),o+u>=h?(s=0,o=h):o+u>=1?(s=(e*l-1)*Math.pow(2,r),o+=u):(s=e*Math.pow(2,u-1)*Math.pow(2,r),o=0));r>=8;t[n+p]=255&s,p+=f,s/=256,r-=8);for(o=o<<r|s,c+=r;c>0;t[n+p]=255&o,p+=f,o/=256,c-=8);t[n+p-f]|=128*m}},function(t,e){var n={}.toString;t.exports=Array.isArray||function(t){return"[object Array]"==n.call(t)}},function(t,e,n){(function(t){var i=void 0!==t&&t||"undefined"!=typeof self&&self||window,r=Function.prototype.apply;function a(t,e){this._id=t,this._clearFn=e}e.setTimeout=function(){return new a(r.call(setTimeout,i,arguments),clearTimeout)},e.setInterval=function(){return new a(r.call(setInterval,i,arguments),clearInterval)},e.clearTimeout=e.clearInterval=function(t){t&&t.close()},a.prototype.unref=a.prototype.ref=function(){},a.prototype.close=function(){this._clearFn.call(i,this._id)},e.enroll=function(t,e){clearTimeout(t._idleTimeoutId),t._idleTimeout=e},e.unenroll=function(t){clearTimeout(t._idleTimeoutId),t._idleTimeout=-1},e._unrefActive=e.active=function(t){clearTimeout(t._idleTimeoutId);var e=t._idleTimeout;e>=0&&(t._idleTimeoutId=setTimeout((function(){t._onTimeout&&t._onTimeout()}),e))},n(13),e.setImmediate="undefined"!=typeof self&&self.setImmediate||void 0!==t&&t.setImmediate||this&&this.setImmediate,e.clearImmediate="undefined"!=typeof self&&self.clearImmediate||void 0!==t&&t.clearImmediate||this&&this.clearImmediate}).call(this,n(1))},function(t,e,n){(function(t,e){!function(t,n){"use strict";if(!t.setImmediate){var i,r,a,o,s,l=1,c={},h=!1,u=t.document,d=Object.getPrototypeOf&&Object.getPrototypeOf(t);d=d&&d.setTimeout?d:t,"[object process]"==={}.toString.call(t.process)?i=function(t){e.nextTick((function(){f(t)}))}:!function(){if(t.postMessage&&!t.importScripts){var e=!0,n=t.onmessage;return t.onmessage=function(){e=!1},t.postMessage("","*"),t.onmessage=n,e}}()?t.MessageChannel?((a=new MessageChannel).port1.onmessage=function(t){f(t.data)},i=function(t){a.port2.postMessage(t)}):u&&"onreadystatechange"in u.createElement("script")?(r=u.documentElement,i=function(t){var e=u.createElement("script");e.onreadystatechange=function(){f(t),e.onreadystatechange=null,r.removeChild(e),e=null},r.appendChild(e)}):i=function(t){setTimeout(f,0,t)}:(o="setImmediate$"+Math.random()+"$",s=function(e){e.source===t&&"string"==typeof e.data&&0===e.data.indexOf(o)&&f(+e.data.slice(o.length))},t.addEventListener?t.addEventListener("message",s,!1):t.attachEvent("onmessage",s),i=function(e){t.postMessage(o+e,"*")}),d.setImmediate=function(t){"function"!=typeof t&&(t=new Function(""+t));for(var e=new Array(arguments.length-1),n=0;n<e.length;n++)e[n]=arguments[n+1];var r={callback:t,args:e};return c[l]=r,i(l),l++},d.clearImmediate=p}function p(t){delete c[t]}function f(t){if(h)setTimeout(f,0,t);else{var e=c[t];if(e){h=!0;try{!function(t){var e=t.callback,n=t.args;switch(n.length){case 0:e();break;case 1:e(n[0]);break;case 2:e(n[0],n[1]);break;case 3:e(n[0],n[1],n[2]);break;default:e.apply(void 0,n)}}(e)}finally{p(t),h=!1}}}}}("undefined"==typeof self?void 0===t?this:t:self)}).call(this,n(1),n(14))},function(t,e){var n,i,r=t.exports={};function a(){throw new Error("setTimeout has not been defined")}function o(){throw new Error("clearTimeout has not been defined")}function s(t){if(n===setTimeout)return setTimeout(t,0);if((n===a||!n)&&setTimeout)return n=setTimeout,setTimeout(t,0);try{return n(t,0)}catch(e){try{return n.call(null,t,0)}catch(e){return n.call(this,t,0)}}}!function(){try{n="function"==typeof setTimeout?setTimeout:a}catch(t){n=a}try{i="function"==typeof clearTimeout?clearTimeout:o}catch(t){i=o}}();var l,c=[],h=!1,u=-1;function d(){h&&l&&(h=!1,l.length?c=l.concat(c):u=-1,c.length&&p())}function p(){if(!h){var t=s(d);h=!0;for(var e=c.length;e;){for(l=c,c=[];++u<e;)l&&l[u].run();u=-1,e=c.length}l=null,h=!1,function(t){if(i===clearTimeout)return clearTimeout(t);if((i===o||!i)&&clearTimeout)return i=clearTimeout,clearTimeout(t);try{i(t)}catch(e){try{return i.call(null,t)}catch(e){return i.call(this,t)}}}(t)}}function f(t,e){this.fun=t,this.array=e}function m(){}r.nextTick=function(t){var e=new Array(arguments.length-1);if(arguments.length>1)for(var n=1;n<arguments.length;n++)e[n-1]=arguments[n];c.push(new f(t,e)),1!==c.length||h||s(p)},f.prototype.run=function(){this.fun.apply(null,this.array)},r.title="browser",r.browser=!0,r.env={},r.argv=[],r.version="",r.versions={},r.on=m,r.addListener=m,r.once=m,r.off=m,r.removeListener=m,r.removeAllListeners=m,r.emit=m,r.prependListener=m,r.prependOnceListener=m,r.listeners=function(t){return[]},r.binding=function(t){throw new Error("process.binding is not supported")},r.cwd=function(){return"/"},r.chdir=function(t){throw new Error("process.chdir is not supported")},r.umask=function(){return 0}},function(t,e,n){"use strict";n.r(e),n.d(e,"LinusStarter",(function(){return L}));var i=n(0),r=function(t,e){var n=this,r=-1,a=0,o=1,s=2,l=3,c=4;this.object=t,this.domElement=void 0!==e?e:document,this.enabled=!0,this.screen={left:0,top:0,width:0,height:0},this.rotateSpeed=1,this.zoomSpeed=1.2,this.panSpeed=.3,this.noRotate=!1,this.noZoom=!1,this.noPan=!1,this.staticMoving=!1,this.dynamicDampingFactor=.2,this.minDistance=0,this.maxDistance=1/0,this.keys=[65,83,68],this.mouseButtons={LEFT:i.MOUSE.ROTATE,MIDDLE:i.MOUSE.ZOOM,RIGHT:i.MOUSE.PAN},this.target=new i.Vector3;var h=new i.Vector3,u=r,d=r,p=new i.Vector3,f=new i.Vector2,m=new i.Vector2,g=new i.Vector3,v=0,y=new i.Vector2,b=new i.Vector2,x=0,_=0,w=new i.Vector2,M=new i.Vector2;this.target0=this.target.clone(),this.position0=this.object.position.clone(),this.up0=this.object.up.clone();var A={type:"change"},S={type:"start"},E={type:"end"};this.handleResize=function(){if(this.domElement===document)this.screen.left=0,this.screen.top=0,this.screen.width=window.innerWidth,this.screen.height=window.innerHeight;else{var t=this.domElement.getBoundingClientRect(),e=this.domElement.ownerDocument.documentElement;this.screen.left=t.left+window.pageXOffset-e.clientLeft,this.screen.top=t.top+window.pageYOffset-e.clientTop,this.screen.width=t.width,this.screen.height=t.height}};var T,C,L,R,P,D,O,I,k,B,N,z=(T=new i.Vector2,function(t,e){return T.set((t-n.screen.left)/n.screen.width,(e-n.screen.top)/n.screen.height),T}),F=function(){var t=new i.Vector2;return function(e,i){return t.set((e-.5*n.screen.width-n.screen.left)/(.5*n.screen.width),(n.screen.height+2*(n.screen.top-i))/n.screen.width),t}}();function U(t){!1!==n.enabled&&(window.removeEventListener("keydown",U),d===r&&(t.keyCode!==n.keys[a]||n.noRotate?t.keyCode!==n.keys[o]||n.noZoom?t.keyCode!==n.keys[s]||n.noPan||(d=s):d=o:d=a))}function H(){!1!==n.enabled&&(d=r,window.addEventListener("keydown",U,!1))}function G(t){if(!1!==n.enabled){if(t.preventDefault(),t.stopPropagation(),u===r)switch(t.button){case n.mouseButtons.LEFT:u=a;break;case n.mouseButtons.MIDDLE:u=o;break;case n.mouseButtons.RIGHT:u=s;break;default:u=r}var e=d!==r?d:u;e!==a||n.noRotate?e!==o||n.noZoom?e!==s||n.noPan||(w.copy(z(t.pageX,t.pageY)),M.copy(w)):(y.copy(z(t.pageX,t.pageY)),b.copy(y)):(m.copy(F(t.pageX,t.pageY)),f.copy(m)),document.addEventListener("mousemove",V,!1),document.addEventListener("mouseup",j,!1),n.dispatchEvent(S)}}function V(t){if(!1!==n.enabled){t.preventDefault(),t.stopPropagation();var e=d!==r?d:u;e!==a||n.noRotate?e!==o||n.noZoom?e!==s||n.noPan||M.copy(z(t.pageX,t.pageY)):b.copy(z(t.pageX,t.pageY)):(f.copy(m),m.copy(F(t.pageX,t.pageY)))}}function j(t){!1!==n.enabled&&(t.preventDefault(),t.stopPropagation(),u=r,document.removeEventListener("mousemove",V),document.removeEventListener("mouseup",j),n.dispatchEvent(E))}function W(t){if(!1!==n.enabled&&!0!==n.noZoom){switch(t.preventDefault(),t.stopPropagation(),t.deltaMode){case 2:y.y-=.025*t.deltaY;break;case 1:y.y-=.01*t.deltaY;break;default:y.y-=25e-5*t.deltaY}n.dispatchEvent(S),n.dispatchEvent(E)}}function Y(t){if(!1!==n.enabled){switch(t.preventDefault(),t.touches.length){case 1:u=l,m.copy(F(t.touches[0].pageX,t.touches[0].pageY)),f.copy(m);break;default:u=c;var e=t.touches[0].pageX-t.touches[1].pageX,i=t.touches[0].pageY-t.touches[1].pageY;_=x=Math.sqrt(e*e+i*i);var r=(t.touches[0].pageX+t.touches[1].pageX)/2,a=(t.touches[0].pageY+t.touches[1].pageY)/2;w.copy(z(r,a)),M.copy(w)}n.dispatchEvent(S)}}function X(t){if(!1!==n.enabled)switch(t.preventDefault(),t.stopPropagation(),t.touches.length){case 1:f.copy(m),m.copy(F(t.touches[0].pageX,t.touches[0].pageY));break;default:var e=t.touches[0].pageX-t.touches[1].pageX,i=t.touches[0].pageY-t.touches[1].pageY;_=Math.sqrt(e*e+i*i);var r=(t.touches[0].pageX+t.touches[1].pageX)/2,a=(t.touches[0].pageY+t.touches[1].pageY)/2;M.copy(z(r,a))}}function Z(t){if(!1!==n.enabled){switch(t.touches.length){case 0:u=r;break;case 1:u=l,m.copy(F(t.touches[0].pageX,t.touches[0].pageY)),f.copy(m)}n.dispatchEvent(E)}}function q(t){!1!==n.enabled&&t.preventDefault()}this.rotateCamera=(L=new i.Vector3,R=new i.Quaternion,P=new i.Vector3,D=new i.Vector3,O=new i.Vector3,I=new i.Vector3,function(){I.set(m.x-f.x,m.y-f.y,0),(C=I.length())?(p.copy(n.object.position).sub(n.target),P.copy(p).normalize(),D.copy(n.object.up).normalize(),O.crossVectors(D,P).normalize(),D.setLength(m.y-f.y),O.setLength(m.x-f.x),I.copy(D.add(O)),L.crossVectors(I,p).normalize(),C*=n.rotateSpeed,R.setFromAxisAngle(L,C),p.applyQuaternion(R),n.object.up.applyQuaternion(R),g.copy(L),v=C):!n.staticMoving&&v&&(v*=Math.sqrt(1-n.dynamicDampingFactor),p.copy(n.object.position).sub(n.target),R.setFromAxisAngle(g,v),p.applyQuaternion(R),n.object.up.applyQuaternion(R)),f.copy(m)}),this.zoomCamera=function(){var t;u===c?(t=x/_,x=_,p.multiplyScalar(t)):(1!==(t=1+(b.y-y.y)*n.zoomSpeed)&&t>0&&p.multiplyScalar(t),n.staticMoving?y.copy(b):y.y+=(b.y-y.y)*this.dynamicDampingFactor)},this.panCamera=(k=new i.Vector2,B=new i.Vector3,N=new i.Vector3,function(){k.copy(M).sub(w),k.lengthSq()&&(k.multiplyScalar(p.length()*n.panSpeed),N.copy(p).cross(n.object.up).setLength(k.x),N.add(B.copy(n.object.up).setLength(k.y)),n.object.position.add(N),n.target.add(N),n.staticMoving?w.copy(M):w.add(k.subVectors(M,w).multiplyScalar(n.dynamicDampingFactor)))}),this.checkDistances=function(){n.noZoom&&n.noPan||(p.lengthSq()>n.maxDistance*n.maxDistance&&(n.object.position.addVectors(n.target,p.setLength(n.maxDistance)),y.copy(b)),p.lengthSq()<n.minDistance*n.minDistance&&(n.object.position.addVectors(n.target,p.setLength(n.minDistance)),y.copy(b)))},this.update=function(){p.subVectors(n.object.position,n.target),n.noRotate||n.rotateCamera(),n.noZoom||n.zoomCamera(),n.noPan||n.panCamera(),n.object.position.addVectors(n.target,p),n.checkDistances(),n.object.lookAt(n.target),h.distanceToSquared(n.object.position)>1e-6&&(n.dispatchEvent(A),h.copy(n.object.position))},this.reset=function(){u=r,d=r,n.target.copy(n.target0),n.object.position.copy(n.position0),n.object.up.copy(n.up0),p.subVectors(n.object.position,n.target),n.object.lookAt(n.target),n.dispatchEvent(A),h.copy(n.object.position)},this.dispose=function(){this.domElement.removeEventListener("contextmenu",q,!1),this.domElement.removeEventListener("mousedown",G,!1),this.domElement.removeEventListener("wheel",W,!1),this.domElement.removeEventListener("touchstart",Y,!1),this.domElement.removeEventListener("touchend",Z,!1),this.domElement.removeEventListener("touchmove",X,!1),document.removeEventListener("mousemove",V,!1),document.removeEventListener("mouseup",j,!1),window.removeEventListener("keydown",U,!1),window.removeEventListener("keyup",H,!1)},this.domElement.addEventListener("contextmenu",q,!1),this.domElement.addEventListener("mousedown",G,!1),this.domElement.addEventListener("wheel",W,!1),this.domElement.addEventListener("touchstart",Y,!1),this.domElement.addEventListener("touchend",Z,!1),this.domElement.addEventListener("touchmove",X,!1),window.addEventListener("keydown",U,!1),window.addEventListener("keyup",H,!1),this.handleResize(),this.update()};(r.prototype=Object.create(i.EventDispatcher.prototype)).constructor=r;var a=n(4),o=n.n(a),s=function(t,e){function n(){r.style.display="",r.style.cursor="auto",r.style.left="calc(50% - 75px)",r.style.width="150px",r.onmouseenter=null,r.onmouseleave=null,r.onclick=null,r.textContent="VR NOT SUPPORTED"}function i(t){t.style.position="absolute",t.style.bottom="20px",t.style.padding="12px 6px",t.style.border="1px solid #fff",t.style.borderRadius="4px",t.style.background="rgba(0,0,0,0.1)",t.style.color="#fff",t.style.font="normal 13px sans-serif",t.style.textAlign="center",t.style.opacity="0.5",t.style.outline="none",t.style.zIndex="999"}if(e&&console.error('THREE.VRButton: The "options" parameter has been removed. Please set the reference space type via renderer.xr.setReferenceSpaceType() instead.'),"xr"in navigator){var r=document.createElement("button");return r.style.display="none",i(r),navigator.xr.isSessionSupported("immersive-vr").then((function(e){e?function(){var e=null;function n(n){n.addEventListener("end",i),t.xr.setSession(n),r.textContent="EXIT VR",e=n}function i(){e.removeEventListener("end",i),r.textContent="ENTER VR",e=null}r.style.display="",r.style.cursor="pointer",r.style.left="calc(50% - 50px)",r.style.width="100px",r.textContent="ENTER VR",r.onmouseenter=function(){r.style.opacity="1.0"},r.onmouseleave=function(){r.style.opacity="0.5"},r.onclick=function(){if(null===e){navigator.xr.requestSession("immersive-vr",{optionalFeatures:["local-floor","bounded-floor"]}).then(n)}else e.end()}}():n()})),r}var a=document.createElement("a");return!1===window.isSecureContext?(a.href=document.location.href.replace(/^http:/,"https:"),a.innerHTML="WEBXR NEEDS HTTPS"):(a.href="https://immersiveweb.dev/",a.innerHTML="WEBXR NOT AVAILABLE"),a.style.left="calc(50% - 90px)",a.style.width="180px",a.style.textDecoration="none",i(a),a},c=n(5),h=n.n(c),u=n(6),d=n.n(u);class p{getColorMaps(){return{"Hot iron":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAADSHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHjarZVrruQoDIX/s4peQvzCsBye0uxglt8HQlXdqr7dUo8mKC/H2OZ8QML4958ZfuCgSzWoeYo5xguHZs1c8JCu+7jv8NvXffD5hPc3e3g8wIMuwV3u1ziOf4HdXh1cj72+24O3EyedQI/AJ6CszKuMfoo8gYRvO533kE+tJX4Zzjln47xMVu9Pn+/qEKMb4gkHHkJy7SvfmeQ+C07dV+TCV8KzSsJVtueHfuEp3TcCPkX/0O9qx0NectyBHsOKHzodO9n3+m2VvlZEfFz49WFrUl+0f9Fv9jTnuEdXNAbIFc+gHkPcT3CEpCq7W0RznIZn3y2jpatcDdQ6hlrDVfGSiaH4JKVOhSaNfW/UUKLyYMedubFsWxLnzE0WAl2NJnuQLB0sWBrICcz8rIV23rzyIVlC5k7wZEIwMH5v4dPwX9tboDnXNCc6gtINmJfgKGORW1d4AQjNo6ltfSnct+vzWGAFBG3LnDDActU7RDV6zS3ZnOWyAFe97vVC3k8ASITchmIwo5WuSGIU6XJmJ4KOCXwKKmdRriBAFow7qmQViYCTeOVGH6fty8a3GdsLQJhEcaDJUgBL1TRivSVMoRJMTM0smluybCVK1GgxRo9rnyourm4e3T159pIkabIUk6eUciqZs2Abs5Bj9pxyzqUgadGCWAX+BYbKVapWq7F6TTXX0jB9mjZrsXlLLbfSuUvHFhB67N5Tz70MGphKQ4eNOHykkUeZmGtTpk6bcfpMM8/ypHaovlP7JPdnanSo8Qa1/PxFDWb3Rwha24ktZiDGSiDuiwAmNC9mVyJVXuQWsyuzBBFjVGkLTqdFDAR1ENukJ7sXud9yC1D3b7nxd+TCQvd/kAsL3Rdyv3L7hlove7uVDWitQmiKHVKw/OaFYlJB9kzddZa8JocaWarYZop3RXVx+TTLI5uMguhYOGqgAeewfcbxgXAl7zCmc4fRNDXmiYXUrS2fYZnwGxmPV865YU+vIUPGVUoa0dFBCjmX0ZHJSdtEZsceaacbCh7IzNOsPgwNc8JL8N0nGqEHMikQrLi9FdTbcpovA8GAHb/4GpDXvMrPItAMv83wE2rk5dPhHy6XAAABhWlDQ1BJQ0MgcHJvZmlsZQAAeJx9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitGsOMYAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJMCAicDfKAAAARElEQVQI13WKIQ7AMAzE3JLQSm3agWnT/v/CkGygASED1lnWFRV5mxkTGMEMNHkHtIC0dNLw9dN6BTmAC7iBJ3yv+8kHKRwH7I3cRvoAAAAASUVORK5CYII=",Viridis:"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAIAAAAw6DswAAADOnpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHjarZRpjiQpDIX/c4o5QnjDcBxWaW4wx58HQWZWZlWPNK0GxYJxGPt9BGH88/cMf6HRxSmoeYo5xgtNs2YueEnX3e4nXbrvu/GZwvjNHh4v8KBL8JR7GMfxL7Db6wPXY6/v9uDtxEkn0CPwCShr5ZVGP0meQMK3nc445JNriV/KOddsnJfJ6j31OVaHGN0QTzjwEJJr3/leSe6r4NJ9x1qYJbyrJNxZ5Lt+4SndDwI+Rf/Q72rHQ15y3IEeZcUPnY6d7Gf9tkpfMyI+LvyaWG20F+1v+s2e5hx3dUVjgFzxFPUocb/BEZLqrUZEd1yGd989o6erXA3UOkqt4aoYZGIoPkmpU6FJYz8bNaSoPNjxZG4s25bEOXOThUBXp8keJEsHC5YGcgIzP3OhvW5e62GxhJU7wZMJwcD4vYdPw+/2t0Bzrm1OdASlGzAvwZHGIrfu8AIQmkdT2/pSuB/XZ1tgBQRty5xQYLnqHaIavfaWbM5yWYCrXvf/Qt5PAEiEtQ3JYEcrXZHEKNLlzE4EHRP4FGTOolxBgCwYd2TJKhIBJ/FaG984bV82vs04XgDCJIoDTZYCWKqmEf9bwhYqwcTUzKK5JctWokSNFmP0uM6p4uLq5tHdk2cvSZImSzF5SimnkjkLjjELOWbPKedcChYtWhCrwL/AULlK1Wo1Vq+p5loatk/TZi02b6nlVjp36TgCQo/de+q5l0EDW2nosBGHjzTyKBN7bcrUaTNOn2nmWZ7UDtV3ap/k/psaHWq8QS0/f1GD2f0RgtZxYosZiLESiPsigA3Ni9mVSJUXucXsyixBxBhZ2oLTaREDQR3ENunJ7kXul9wC1P2/3PgncmGh+xPkwkL3hdx3bj9Q62Uft7IBrb8QmuKEFPx+k6lUUSMbg7EvMqRCTpxgzUWxGP4RNfwjLUEqWzO6BxEFYJBDdNbk+HRFudqI+ZooOhWUFF0U3+W55jJCDoXfXB82xJHKhuqXax5BY3ysh5CtqiH8WJMJcmtTlNf2bK4mhXrGNimVdvbWdSQvpC2HcVcwuRRX6Siov75lGqmLQJUc/gWKktqrxMhodAAAAYVpQ0NQSUNDIHByb2ZpbGUAAHicfZE9SMNAHMVf00pVWhzsICKYoTpZEBVxlCoWwUJpK7TqYHLph9CkIUlxcRRcCw5+LFYdXJx1dXAVBMEPECdHJ0UXKfF/SaFFjAfH/Xh373H3DhAaFaaagXFA1SwjnYiLufyKGHxFAD0IYhhhiZl6MrOQhef4uoePr3cxnuV97s8RVgomA3wi8SzTDYt4nXh609I57xNHWFlSiM+Jxwy6IPEj12WX3ziXHBZ4ZsTIpueII8RiqYPlDmZlQyWeIo4qqkb5Qs5lhfMWZ7VSY6178heGCtpyhus0h5DAIpJIQYSMGjZQgYUYrRopJtK0H/fwDzr+FLlkcm2AkWMeVaiQHD/4H/zu1ixOTrhJoTjQ9WLbHyNAcBdo1m37+9i2myeA/xm40tr+agOY+SS93taiR0DfNnBx3dbkPeByBxh40iVDciQ/TaFYBN7P6JvyQP8t0Lvq9tbax+kDkKWulm6Ag0NgtETZax7v7u7s7d8zrf5+ACogcorRrDjGAAAABmJLR0QA/wD/AP+gvaeTAAAACXBIWXMAAC4jAAAuIwF4pT92AAAAB3RJTUUH5AQJCTAXms2SxQAAAFtJREFUCNcFwYkNgCAMAMDytgViNIobOYT7b+CTEG3RO7OF3ZZicoLMPaGmoOyUvbAVBiGjZARBCZS+jp8QACqQRhLCN+MzYBtjm+I9x3vxZw3n6o7qr2qfavEHhDge/yNMINEAAAAASUVORK5CYII=",Rainbow:"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAADjHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHjarZVrsuQmDEb/s4osAQmE0HLEqyo7yPLzgelO3zuTqsnDlDGWhSR0BA7zj99X+A0XUYkhi9ZipURc2bKxY1Djc/npKebTn4vvJ7x/kYfXABoUE57pea3lyifkmE3XQu3XjkMuH4Zs3g/t6we/hrheBy+H11Gix0Ec15BfQ4mv5/y8t+u5WNXPJdx5cd3vJw11Lw1dTspFCmlGnzmqFsO4csyKvA05E9n2PGkvQ1/fw0uVERPPRCmenp8o03M77nx6gx6hOd4r+pRuOgKQIQSM7eb2jeXn199FHz7Dv9i/YH2PvuF+l8ilHV4UCl+V9I1SeT9/Kid5GfqG9bD78FzqHfFXOVKRPpccXvj2vdaoa81ndZ4Lllzuol5LPCPotZ2tM6ugaSwBRVgx2M3QKrZFRy2N2GND62TEQLko0yCnRfM8O3WEmHmy4sncA6cjrIBh3NOGm3ejxZosDUDm1FESCVJ+x0LHrR13nWocIQ6CKhOMoXr+fQu/qrjOniC6+aSHL++qQxSRgH8/oAYitG5S5ST41b5fm2sCQTlprligxxYeE03or+JKB3SCouD5bGLScQ0gRXAtCAZbJVMslIQKIlJmJUIiKwA5QueUuYEAifBAkJxTKoCDPQzfmKN0VFn4EeMwTDkkSSUp2FhywMpZUD+aK2rIJUkWkSIqVUy8pLJ3WCla9qnqmjSraFHVGtTUa6q5Si1Va61W3dgSTl0x7EerZuYOpw7LjtkOBffGLbXcpJWmrTYLzTvKp+cuvXTttVv3wSMN7ONRho46bPikiVKaecosU2edNn2h1FZaeckqS8Oqy5a/qV2sP7R/QI0uNT6ktqK+qUGq+jJB+ziRzQzEOBOAK6iBGAp7M4uVcuZNbjOLxvv4YwQpG86gTQwE8ySWRW92l1xAFv8XbkHr4cb/lVzY6H6R3I/cfkZt7N9zP8SebbiTGhN230J2dBD+7dMoq9v2xIiNqy8sUSXhdxDgO22Ru424EtwgT97yrM6t9yNlhL6z3LJfKRKwRJ0ceUMWSWYogjlXXCbWv/0gChpx4AP2k1vZ02dpW7gwm0a2l6pZz/A9Q8UxCnn5kMM7TGyxL7G2HXakwm1OYRjY2M5SXY+0DUjDEcuHuD/K4yWVq0zThUFq2x2DsNyV2YecAKaFajjNCyJYSDj+tuFPP8wc6UFSOZQAAAGFaUNDUElDQyBwcm9maWxlAAB4nH2RPUjDQBzFX9NKVVoc7CAimKE6WRAVcZQqFsFCaSu06mBy6YfQpCFJcXEUXAsOfixWHVycdXVwFQTBDxAnRydFFynxf0mhRYwHx/14d+9x9w4QGhWmmoFxQNUsI52Ii7n8ihh8RQA9CGIYYYmZejKzkIXn+LqHj693MZ7lfe7PEVYKJgN8IvEs0w2LeJ14etPSOe8TR1hZUojPiccMuiDxI9dll984lxwWeGbEyKbniCPEYqmD5Q5mZUMlniKOKqpG+ULOZYXzFme1UmOte/IXhgracobrNIeQwCKSSEGEjBo2UIGFGK0aKSbStB/38A86/hS5ZHJtgJFjHlWokBw/+B/87tYsTk64SaE40PVi2x8jQHAXaNZt+/vYtpsngP8ZuNLa/moDmPkkvd7WokdA3zZwcd3W5D3gcgcYeNIlQ3IkP02hWATez+ib8kD/LdC76vbW2sfpA5ClrpZugINDYLRE2Wse7+7u7O3fM63+fgAqIHKK0aw4xgAAAAZiS0dEAP8A/wD/oL2nkwAAAAlwSFlzAAAuIwAALiMBeKU/dgAAAAd0SU1FB+QECQkwI7t5ZnAAAAAZdEVYdENvbW1lbnQAQ3JlYXRlZCB3aXRoIEdJTVBXgQ4XAAAAU0lEQVQI1z3GsQ0CMQwAwDMtiAIGiLMyC8ZhgRe/gGkQxUkX4dUtMYWpn1eRzUD+jBCzdfK4HVLJ2EaXEdu0jC5pux8nu/W6sFGo/v/8tCUsvPEFlsgikiRlU00AAAAASUVORK5CYII=",Plasma:"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJLDTe3b7qAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAF1JREFUCNcFwYEVgyAMQMGvIpAE+tymU3ZfEhV6t335LaPSOFEyRkI5MHaUhTERXqTcyBVUc6oFRQdFnSKDLE7WIOvglCCpk3SQzDnM2c3ZmrOaM3sw+8vzWURf/AFWPSD2bbx7BgAAAABJRU5ErkJggg==","Color brewer: orange purple":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJNSPGDpI1AAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAG1JREFUCNclxVESgiAUQNHrhGKATaa2u/bZpphmFHioKX10fk71fulijcJZhbUXrs7RdgP6NqG7AeVGMBOVeYIZKe2Ds7lTmp6z7tlLTV4Pcj7+y5cUViRspLARl0yYE8ssLHMifoToheCF5IUfnfI1FTW3dhwAAAAASUVORK5CYII=","Color brewer: pink purple":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJNDayyEefAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAFFJREFUCNclxUESwzAIBMHJ/z/rgi3bIKHNwX3pn3XZa0E37m/qxVVQBe/Cz8A93xocjWPhWEwOlUPloXN4ciMVikZq1JvkEBwSIwYxpDdi+AMwelG66MEL3gAAAABJRU5ErkJggg==","Color brewer: brown teal":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJJSlsGWl6AAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAFdJREFUCNdlxkEOQDAQQNHfMFQ0M9zOtZy0CZW2C2HBRix+/nPrMl/BlDApYTKCPh7VkEGRwWi9If51b5yNpzih0lERCkJ1HccJsWRizr9vKX3bd7aUuAHr4i3WlWQQTAAAAABJRU5ErkJggg==","Color brewer: purple green":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJJguSVHtdAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAGhJREFUCNdFxUsOwiAUQNGrpNIA7YC4E5fnCrpYPuEZX1ojOOjAMzmX52MbPgb8PeBjwMWAjw63zvjF4hZ7vlqm2WBuBmP/92vnGDufsXP0c/0qRStVK0UL5V3JWsjSyPIiNSGJkJrwA38hMN2MYoeyAAAAAElFTkSuQmCC","Color brewer: red blue":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJJju0jUvxAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAGVJREFUCNdVxUEOgjAQQNGvtYa2GgyIB/AE3t5LuWKqyUwo40I3LF7e7nl/+OmWKVPhdyZdzxwuA6Ef2fcj4c+7gseExw6PmfWYWAhoc3RxtK1ocz7WeL1tqxpzVUQMqcosShXjC794NUJ9t1wfAAAAAElFTkSuQmCC","Color brewer: red green":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJJxQGR0fpAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAF9JREFUCNdVxjEWgyAQQMGPvOA26EFygNz/GLlDpAoP2EVMYSysZtz79TzCIoRVCOvM9cciEAUXBeJ8ew8enUAnMH+qHuoxyNbI1vhaI5v+r6Ta2coglUGqO5+yk8rgBxeBLw+m/1kfAAAAAElFTkSuQmCC","Color brewer: red gray":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJNQxt369sAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAF5JREFUCNdVw8ENwyAMQNEPVRXcCBK8QSbo9t3LIAyHSu05T3rhc71/ooJoQlSQurNpJtXMVjPP8yTmyqMosVTCfhBSgddBkMKXyFrr1t2Zc+LujDHovd+aGWZGa40/OBUv+r839nUAAAAASUVORK5CYII=","Color brewer: pink green":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJNTar03beAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAG5JREFUCNcFwWEOgiAYgOE3CXJCm60f3KCLdrkuoyzATxwYPc/l83p34x3GO27+jn5a9GzRD4eeJ65uRFmDsho1GRgV3Qz8zEDXA6dq1C40hNaFckZyXdnqQq4L6QjEfeUrgbgHkiSSFPJWSFL4Ayk+Mw4lpeJYAAAAAElFTkSuQmCC","Color brewer: spectral":"data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAABCAYAAAC/iqxnAAABhWlDQ1BJQ0MgcHJvZmlsZQAAKJF9kT1Iw0AcxV/TSlVaHOwgIpihOlkQFXGUKhbBQmkrtOpgcumH0KQhSXFxFFwLDn4sVh1cnHV1cBUEwQ8QJ0cnRRcp8X9JoUWMB8f9eHfvcfcOEBoVppqBcUDVLCOdiIu5/IoYfEUAPQhiGGGJmXoys5CF5/i6h4+vdzGe5X3uzxFWCiYDfCLxLNMNi3ideHrT0jnvE0dYWVKIz4nHDLog8SPXZZffOJccFnhmxMim54gjxGKpg+UOZmVDJZ4ijiqqRvlCzmWF8xZntVJjrXvyF4YK2nKG6zSHkMAikkhBhIwaNlCBhRitGikm0rQf9/APOv4UuWRybYCRYx5VqJAcP/gf/O7WLE5OuEmhOND1YtsfI0BwF2jWbfv72LabJ4D/GbjS2v5qA5j5JL3e1qJHQN82cHHd1uQ94HIHGHjSJUNyJD9NoVgE3s/om/JA/y3Qu+r21trH6QOQpa6WboCDQ2C0RNlrHu/u7uzt3zOt/n4AKiByitl/8gEAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAALiMAAC4jAXilP3YAAAAHdElNRQfkBAkJKA58vaJcAAAAGXRFWHRDb21tZW50AENyZWF0ZWQgd2l0aCBHSU1QV4EOFwAAAGhJREFUCNcFwVEOgjAQQMG33UgLtATP5Lf39xRoS8B046oz8rjdf2N2YnZSdi6LEtaIXhNhjcgyQpmRPEOZYMqQCpIKpIIHofuJfU/M3xwfp5pSTWmmvLqwGTy7sHVoh7LXgVYH9hb5A6mSKIFBSb+3AAAAAElFTkSuQmCC"}}getNiceColors(){return[15079755,4416472,3978315,16769305,16089649,9510580,4379892,15741670,12578629,16432830,4626832,15122175,10117924,16775880,8388608,11206595,8421376,16767153,117,11119017]}}class f{vertexShader(){return"\n#genericUniforms#\n#genericVaryings#\n#genericAttributes#\n#customVars#\n\nattribute float setId;\nattribute float axeType;\nattribute float drawIndex;\n\nvarying vec3 vOrientation;\nvarying vec3 vOrientationColor;\nvarying vec3 vPosition;\nvarying vec3 vNextPosition;\nvarying vec3 vNormal;\nvarying vec3 vView;\nvarying vec3 vCenter;\nvarying float vDepth;\nvarying float vSetId;\nvarying float vAxeType;\nvarying float vDrawIndex;\nvarying float vDiscardThis;\nvarying float vHideThis;\nvarying float vLongDiff;\nvarying float vLatDiff;\nuniform float scale;\nuniform float state;\nuniform float defocusState;\nuniform float shading;\nuniform float glossiness;\nuniform float darkenInside;\nuniform float mercator;\nuniform int mercatorMode;\nuniform float mercatorRadius;\nuniform float mercatorOffset;\nuniform float mercatorOffset2;\nuniform float mercatorOffset3;\nuniform float zLower;\nuniform float zUpper;\nuniform float xLower;\nuniform float xUpper;\nuniform float yLower;\nuniform float yUpper;\nuniform vec3 projPlane;\nuniform vec3 projPlaneN;\nuniform float projLevel;\n\nmat4 rotationMatrix(vec3 axis, float angle) \n{\n    axis = normalize(axis);\n    float s = sin(angle);\n    float c = cos(angle);\n    float oc = 1.0 - c;\n    \n    return mat4(oc * axis.x * axis.x + c,           oc * axis.x * axis.y - axis.z * s,  oc * axis.z * axis.x + axis.y * s,  0.0,\n                oc * axis.x * axis.y + axis.z * s,  oc * axis.y * axis.y + c,           oc * axis.y * axis.z - axis.x * s,  0.0,\n                oc * axis.z * axis.x - axis.y * s,  oc * axis.y * axis.z + axis.x * s,  oc * axis.z * axis.z + c,           0.0,\n                0.0,                                0.0,                                0.0,                                1.0);\n}\n\nvoid main() \n{\n    vSetId = setId;\n    vAxeType = axeType;\n    vDrawIndex = drawIndex;\n    // Define the state (for selected data), then calculate a position\n    float stateInternal = drawIndex >= 0. ? state : defocusState;\n    #genericAttributeInterpolation#\n\n    // Now some checks whether this item is selected or not\n    vDiscardThis = 0.;\n    vHideThis = 0.;\n    if(positionOut.z < zLower || positionOut.z > zUpper || \n        positionOut.x < xLower || positionOut.x > xUpper || \n        positionOut.y < yLower || positionOut.y > yUpper )\n    {\n        vHideThis = 1.;\n    }\n\n    vec3 projPlaneNn = normalize(projPlaneN);\n    vec3 planeTest = positionOut.xyz - projPlane;\n    bool isAbovePlane = dot(planeTest, projPlaneNn) >= 0.;\n    if(isAbovePlane)\n    {\n        vHideThis = 1.;\n    }\n\n    // In case this element is hidden, change the state accordingly and \n    // re-assign all elements that depend on the state\n    if(vHideThis > 0.5)\n    {\n        stateInternal = defocusState;\n    #genericAttributeInterpolation#\n    }\n    \n\n    if(!isAbovePlane && projLevel > 0.001)\n    {\n        float dist = length(planeTest) * dot(normalize(planeTest), projPlaneNn);\n        positionOut.xyz -= projPlaneNn * dist * projLevel;\n        \n        planeTest = nextPositionOut.xyz - projPlane;\n        dist = length(planeTest) * dot(normalize(planeTest), projPlaneNn);\n        nextPositionOut.xyz -= projPlaneNn * dist * projLevel;\n    }\n\n    // Always determine lon and lat, since we might need it for coloring\n    float r = length(positionOut.xyz);\n    vec4 v = vec4(positionOut.xyz, 1.) * rotationMatrix(vec3(1,0,0), mercatorOffset)\n        * rotationMatrix(vec3(0,1,0), mercatorOffset2)\n        * rotationMatrix(vec3(0,0,1), mercatorOffset3);\n        \n    float rNext = length(nextPositionOut.xyz);\n    vec4 vNext = vec4(nextPositionOut.xyz, 1.) * rotationMatrix(vec3(1,0,0), mercatorOffset)\n        * rotationMatrix(vec3(0,1,0), mercatorOffset2)\n        * rotationMatrix(vec3(0,0,1), mercatorOffset3);\n        \n    float lat = asin(v.z / r) ;  // z\n    float lon = atan(v.x, v.y);  // y x\n    float latNext = asin(vNext.z / rNext) ;  // z\n    float lonNext = atan(vNext.x, vNext.y);  // y x\n    vLongDiff = lonNext - lon; //lon > 0. ? lon - lonNext : lonNext - lon;\n    vLatDiff = positionOut.y > 0. ? lat - latNext : latNext - lat;\n\n    if(mercator > 0.002)\n    {\n        float mercatorHeight;\n        #mercatorModes#\n\n        if(abs(lon - lonNext) > 1.)\n        {\n            vDiscardThis = 1.;\n        }\n\n        vec3 posMercator = r / 3.142 * vec3(lon, log(tan(3.142 * 0.25 + lat * 0.5)), mercatorHeight * mercatorRadius - mercatorRadius/2.);\n        vec3 nextPosMercator = r / 3.142 * vec3(lonNext, log(tan(3.142 * 0.25 + latNext * 0.5)), mercatorHeight * mercatorRadius - mercatorRadius/2.);\n        positionOut = mix(positionOut, posMercator, mercator);\n        nextPositionOut = mix(nextPositionOut, nextPosMercator, mercator);\n    }\n    vOrientation = normalize(nextPositionOut - positionOut);\n    \n    vec4 modelViewProjection = modelViewMatrix * vec4(positionOut, 1.0 );\n    gl_Position = projectionMatrix * modelViewProjection;\n    vPosition = gl_Position.xyz;\n    vec4 modelViewProjectionNext = modelViewMatrix * vec4(nextPositionOut, 1.0 );\n    vNextPosition = (projectionMatrix * modelViewProjectionNext).xyz;\n    \n\n    vDepth = clamp((-2.-modelViewProjection.z) / 2., 0., 1.);\n\n    if(shading > 0.01)\n    {\n        // Assume camera is more distant, but just zoomed in. Leads to better shading,\n        // as if coming from a very far light source, like the sun\n        #customNormal#\n    }\n\n    if(darkenInside > 0.)\n    {\n        vCenter = (projectionMatrix * modelViewMatrix * vec4(0., 0., 0., 1.)).xyz;\n    }\n}"}vertexShaderLine(){return this.vertexShader().replace("#customVars#","").replace("#customNormal#","vView = normalize(vPosition - 1000. * cameraPosition);\nvec3 biNormal = normalize(cross(vView, vOrientation));\nvNormal = cross( biNormal, vOrientation );\nvNormal *= sign( dot( vNormal, vec3( 0.0, 0.0, 1.0 ) ) );\nvNormal *= sign( dot( vNormal, vView ) );\nvNormal *= -1.;\n")}vertexShaderTriangle(){return this.vertexShader().replace("#customVars#","attribute vec3 normalCustom;").replace("#customNormal#","vNormal = normalCustom;\nvView = normalize(vPosition - 1000. * cameraPosition);\n")}fragmentShader(){return"\n#genericUniforms#\n#genericVaryings#\nuniform float alpha;\nuniform int mode;\nvarying vec3 vOrientation;\nvarying float vLongDiff;\nvarying float vLatDiff;\nvarying vec3 vPosition;\nvarying vec3 vNormal;\nvarying vec3 vView;\nvarying vec3 vCenter;\nvarying float vSetId;\nvarying float vAxeType;\nvarying float vDrawIndex;\nvarying float vDepth;\nvarying float vDiscardThis;\nvarying float vHideThis;\nuniform vec3 diffuse;\nuniform float opacity;\nuniform float scale;\nuniform vec3 primaryColor;\nuniform vec3 secondaryColor;\nuniform vec3 defocusColor;\nuniform vec3 backgroundColor;\nuniform float shading;\nuniform float glossiness;\nuniform float darkenInside;\nuniform float defocusAlpha;\nuniform float colorScale;\nuniform sampler2D colorMap;\nuniform int colorMapMode;\nuniform float axesTransparancy;\nuniform vec3 axesColor;\n\n\nfloat lightIntensity2(vec3 viewDir, vec3 normalDir)\n{\n    float ambient = 0.2;\n    float diffuse = 1.0;\n    float specular = 7.0;\n    float shininess = 250.;\n\n    return ambient \n           + diffuse * abs(dot(-viewDir, normalDir)) //max(0., dot(-viewDir, normalDir)) \n           + specular *  pow(abs(dot(-viewDir, normalDir)), shininess);//pow(max(dot(-viewDir, normalDir), 0.0 ), shininess);\n}\nfloat lightIntensity(vec3 viewDir, vec3 normalDir)\n{\n    // diffuse term\n    vec3 lightDir = -viewDir;\n    float NdotL = dot(normalDir, lightDir);\n    float diffuse = NdotL;\n    float shininess = 50.;\n    vec3 rVector = normalize(2.0 * normalDir * abs(dot(normalDir, lightDir)) - lightDir);\n    float RdotV = dot(rVector, -viewDir);\n\n    float specular = 0.;\n    if(RdotV > 0.)\n        specular = glossiness * pow(RdotV, shininess);\n    return 0.2 + diffuse + specular;\n}\n\nvec3 pseudoRandomColor(float i) \n{\n    return vec3(mod(7.  * i, 206.) + 50., \n                mod(11. * i, 128.) + 50., \n                mod(31. * i, 206.) + 20.) / 256.;\n    float h = i * mod(2654435761., pow(2., 32.));\n    return vec3(mod(h, 256.), mod(h, 10000.) / 40., mod(h, 65536.) / 256.) / 256.;\n}\n\nvec4 getColor(float value, float alpha)\n{\n    if(colorMapMode == 0) {\n        return vec4(mix(primaryColor, secondaryColor, value), alpha);\n    }\n    else \n    {\n        return texture2D(colorMap, vec2(value, 0.5));\n    }\n}\n\nvoid main() \n{\n    if(vAxeType > 0.5) {\n        gl_FragColor = vec4(axesColor, axesTransparancy);\n        if(vDiscardThis > 0.001) {\n            discard;\n        }\n        return;\n    }\n\n    gl_FragColor = getColor(0., alpha);\n\n    if(mode==1)\n    {\n        gl_FragColor = vec4(vOrientation.x / 2. + 0.5, vOrientation.y / 2. + 0.5, vOrientation.z / 2. + 0.5, alpha);\n    }\n    else if(mode == 2)\n    {\n        gl_FragColor.xyz = normalize(vec3(vLongDiff, 0, vLatDiff));\n        gl_FragColor = vec4(gl_FragColor.x / 2. + 0.5, gl_FragColor.y / 2. + 0.5, gl_FragColor.z / 2. + 0.5, alpha);\n    }\n    else if(mode == 3)\n    {\n        gl_FragColor.xyz = vec3(clamp((vLatDiff) * colorScale, -1., 1.), 0,0);\n        gl_FragColor = vec4(gl_FragColor.x / 2. + 0.5, gl_FragColor.y / 2. + 0.5, gl_FragColor.z / 2. + 0.5, alpha);\n    }\n    else if(mode == 4)\n    {\n        gl_FragColor.xyz = vec3(clamp(vLongDiff * colorScale, -1., 1.), 0,0);\n        gl_FragColor = vec4(gl_FragColor.x / 2. + 0.5, gl_FragColor.y / 2. + 0.5, gl_FragColor.z / 2. + 0.5, alpha);\n    }\n    else if(mode == 5)\n    {\n        gl_FragColor.xyz = getColor(vDepth, 1.).xyz;\n    }\n    else if(mode == 6)\n    {\n        gl_FragColor.xyz = pseudoRandomColor(vDrawIndex);\n    }\n#colorModes#\n\n    float sim = 1.0;\n    if(shading > 0.01)\n    {\n        sim = mix(1.,  lightIntensity(vView, vNormal), shading);\n    }\n\n    gl_FragColor = vec4(clamp(sim * gl_FragColor.xyz, 0., 1.), alpha);\n\n\n    if(darkenInside > 0.)\n    {\n        if(vCenter.z < vPosition.z)\n        {\n            //gl_FragColor.xyz = 1. - darkenInside;\n            gl_FragColor.xyz = mix(gl_FragColor.xyz, backgroundColor, darkenInside);\n        }\n    }\n\n    float hideBecauseFilter = 0.;\n    #attributeFilter#\n\n    // Painting something in defocus color (because it is hidden)\n    if(vDrawIndex < 0. || vHideThis > 0.001 || hideBecauseFilter > 0.001)\n    {\n        gl_FragColor = vec4(clamp(sim * defocusColor, 0., 1.), defocusAlpha);\n    }\n    \n    if(vDiscardThis > 0.001)\n    {\n        discard;\n    }\n}"}}class m{constructor(t){this.isVideoRecording=!1,this.videoCapturer=null,this.videoTime=0,this.videoBitrate=5e7,this.videoFormat="video/webm",this.videoExport="video/webm",this.videoFileType="webm",this.exportHandler=t}init(t){this.renderer=t;var e=document.createElement("div");e.id="screenshotVideoHolder";var n=document.createElement("span");n.id="screenshotButton",n.innerHTML="&#128247;",n.onclick=this.screenshot.bind(this);var i=document.createElement("span");i.id="videoButton",i.innerHTML="&#x25cf;",i.onclick=this.video.bind(this),console.log("Video link",i.onclick),e.appendChild(n),e.appendChild(i),document.body.appendChild(e)}disableScreenshotButton(){var t=document.getElementById("screenshotButton");t.style.opacity=.5,t.style.cursor="default",t.onclick=0}enableScreenshotButton(){var t=document.getElementById("screenshotButton");t.style.opacity=1,t.style.cursor="pointer",t.onclick=this.screenshot.bind(this)}enableVideoButton(){document.getElementById("videoButton").innerHTML="&#x25cf;"}setVideoButtonStatus(t){document.getElementById("videoButton").innerHTML="&#x25a0; - "+t+"s"}screenshot(){console.log("Screenshot"),this.disableScreenshotButton(),this.renderer.domElement.toBlob(function(t){this.exportHandler.downloadRaw("screenshot-"+this.exportHandler.getExportFileName()+".png",t),this.enableScreenshotButton()}.bind(this),"image/png")}video(){this.isVideoRecording?this.stopRecording():this.startRecording()}startRecording(){this.videoTime=Date.now(),this.isVideoRecording=!0;var t={mimeType:this.videoFormat,videoBitsPerSecond:parseInt(this.videoBitrate)};console.log("options",t),this.recordedBlobs=[];try{this.mediaRecorder=new MediaRecorder(this.renderer.domElement.captureStream(),t)}catch(e){console.log("Unable to create MediaRecorder with options Object: ",e);try{this.videoFormat="video/webm,codecs=vp9",t.mimeType=this.videoFormat,this.mediaRecorder=new MediaRecorder(this.renderer.domElement.captureStream(),t)}catch(e){console.log("Unable to create MediaRecorder with options Object: ",e);try{this.videoFormat="video/vp8",t="video/vp8",this.mediaRecorder=new MediaRecorder(this.renderer.domElement.captureStream(),t)}catch(t){return alert("MediaRecorder is not supported by this browser.\n\nTry Firefox 29 or later, or Chrome 47 or later, with Enable experimental Web Platform features enabled from chrome://flags."),void console.error("Exception while creating MediaRecorder:",t)}}}console.log("Created MediaRecorder",this.mediaRecorder,"with options",t),this.mediaRecorder.onstop=this.handleStop.bind(this),this.mediaRecorder.ondataavailable=this.handleDataAvailable.bind(this),this.mediaRecorder.start(100),console.log("MediaRecorder started",this.mediaRecorder)}stopRecording(){this.mediaRecorder.stop()}handleStop(){console.log("Stop"),this.downloadVideo(),this.isVideoRecording=!1}handleDataAvailable(){console.log("Receive video data..."),event.data&&event.data.size>0&&this.recordedBlobs.push(event.data);var t=parseInt((Date.now()-this.videoTime)/1e3);this.setVideoButtonStatus(t)}downloadVideo(){const t=new Blob(this.recordedBlobs,{type:this.videoFormatExport});let e="video-"+this.exportHandler.getExportFileName()+".webm";this.exportHandler.downloadRaw(e,t),this.enableVideoButton()}}var g=n(2),v=n.n(g);class b{getExportFileName(){let t=new Date;return t.getFullYear()+"-"+(1+t.getMonth())+"-"+t.getDate()+"--"+t.getHours()+"-"+("00"+t.getMinutes()).slice(-2)+"-"+t.getSeconds()}downloadText(t,e){var n=new File([e],"data.json",{type:"text/plain;charset=utf-8"});v.a.saveAs(n,t)}downloadRaw(t,e){v.a.saveAs(e,t)}}class _{constructor(t){this.annotations=[],this.gui=t,this.aa=!1,this.noGui=!1,this.showFps=!1,this.lod=1,this.sortFrequency=0,this.sortNeedShuffle=!0,this.webVr=!1,this.backgroundColor=14869218,this.line=null,this.renderer=null,this.scene=null,this.camera=null,this.controls=null,this.vrControls=null,this.material=[],this.uniforms=[],this.bbox=null,this.container2=null,this.renderer2=null,this.scene2=null,this.camera2=null,this.axes2=null,this.data=null,this.numGlPrimitives=0,this.colorMapTextures=[],this.colorMapNames=["Custom colors"],this.colorMaps=(new p).getColorMaps(),this.shaders=new f,this.exportHandler=new b,this.screenCapture=new m(this.exportHandler),this.cameraUpdateCallback=function(){},this.recommendedScale=1,this.setsAndStates=[],this.customUniforms=[],this.customAttributes=[],this.dataAttributes=[],this.currentSelection={},this.actualTitle="",this.lastSort=0,this.sortForward=!0,this.lastCamPos=new i.Vector3(0,0,0),this.lastCamPosUpdate=0,this.sortedSinceLastCamPosUpdate=!1,this.div=null,this.x1=0,this.y1=0,this.x2=0,this.y2=0,this.pressingButton=!1,this.clickingMouseButton=!1,this.webVrDisplacement=new i.Vector3(0,1.5,-3),this.clickingVrOnCanvas=!1,this.clickingVrControllerButton=!1,this.lastVrRotation=null,this.stats=null,this.colorModeOptions=["Solid","Orientation xyz","Orientation LonLat","Orientation Lat","Orientation Lon","Depth","Random"],this.mercatorModeOptions=[],this.niceColors=(new p).getNiceColors(),this.niceColorsCopy=[]}setData(t){this.data=t}inflate(t){try{return h.a.inflate(t,{to:"string"})}catch(e){return h.a.inflateRaw(t,{to:"string"})}}dequantizeData(){for(let t=0;t<this.data.sets.length;t++){let e=this.data.sets[t].quantization;if(void 0!==e)for(let n=0;n<this.data.sets[t].states.length;n++){let i=this.data.sets[t].states[n];void 0!==e.positions&&(i.positions=i.positions.map(t=>this.dequantize(t,e.positions)));for(let t=0;t<i.attributes.length;t++){let n=e.attributes[i.attributes[t].name];void 0!==n&&(i.attributes[t].values=i.attributes[t].values.map(t=>this.dequantize(t,n)))}}}}dequantize(t,e){let n=e.scale.length,i=new Float32Array(t.length);for(let r=0;r<t.length;r++)i[r]=t[r]*e.scale[r%n]+e.offset[r%n];return i}setVr(t){this.webVr=t,t&&(this.backgroundColor=1118481)}setAA(t){this.aa=t}disableGUI(t){this.noGui=t}setShowFps(t){this.showFps=t}setLOD(t){this.lod=t}spriteBackgroundDrawer(t,e,n,i,r){let a=e*r,o=(a-20)/2,s=n*r,l=i*r;console.log("Create sprite of size",a,s),t.beginPath(),t.moveTo(0+l,0),t.lineTo(0+a-l,0),t.quadraticCurveTo(0+a,0,0+a,0+l),t.lineTo(0+a,0+s-l),t.quadraticCurveTo(0+a,0+s,0+a-l,0+s),t.lineTo(0+o,0+s),t.lineTo(0+a/2,0+s+30),t.lineTo(0+a-o,0+s),t.lineTo(0+l,0+s),t.quadraticCurveTo(0,0+s,0,0+s-l),t.lineTo(0,0+l),t.quadraticCurveTo(0,0,0+l,0),t.closePath(),t.fill(),t.stroke()}makeTextSprite(t,e,n,r){let a=0,o=0,s=0,l=.5,c=255,h=255,u=255,d=document.createElement("canvas"),p=d.getContext("2d");p.font=parseInt(18)+"px Arial",console.log(p.font);let f=p.measureText(t),m=f.width,g=parseInt(m+20),v=parseInt(45.2),y=g,b=v+40;d.width=2*y,d.height=2*b,console.log("metrics",f,d),p.font=parseInt(36)+"px Arial",p.fillStyle="rgba("+a+","+o+","+s+","+l+")",p.strokeStyle="rgba(0, 0, 0, 0)",p.lineWidth=0,this.spriteBackgroundDrawer(p,g,v,8,2),p.fillStyle="rgba("+c+", "+h+", "+u+", 1.0)",p.fillText(t,20,56);let x=new i.Texture(d);x.needsUpdate=!0;let _=new i.SpriteMaterial({map:x,useScreenCoordinates:!1,sizeAttenuation:!1}),w=new i.Sprite(_);w.scale.set(.001*y,.001*b,1);let M=this.data.sets[0].scale*this.getScale();return console.log(M),w.position.set(M*e,M*n,M*r),this.webVr&&w.position.add(this.webVrDisplacement),w.material.depthTest=!1,w}addAnnotation(t,e,n,i,r){let a=this.makeTextSprite(r,e,n,i);a.internalName=t,this.scene.add(a);let o={name:t};this.annotations.push(o)}removeAnnotation(t){for(let e=this.annotations.length-1;e>=0;e--)this.annotations[e].name==t&&(console.log("Remove from array"),this.annotations.splice(e,1));for(let e=this.scene.children.length-1;e>0;e--)void 0!==this.scene.children[e].internalName&&this.scene.children[e].internalName===t&&this.scene.remove(this.scene.children[e]);this.renderer.renderLists.dispose()}toScreenXY(t,e,n){let r=new i.Matrix4;return r.multiplyMatrices(e.projectionMatrix,e.matrixWorldInverse),t.applyMatrix4(r),{x:((t.x+1)*n.width/2+n.offsetLeft)/window.devicePixelRatio,y:((1-t.y)*n.height/2+n.offsetTop)/window.devicePixelRatio}}setInsetLabels(t,e,n){document.getElementById("insetLabelRed").innerHTML=t,document.getElementById("insetLabelGreen").innerHTML=e,document.getElementById("insetLabelBlue").innerHTML=n}updateInsetLabels(){if(this.gui.getValue("0_mercator__Level")<.5)this.setInsetLabels("X","Y","Z");else{let t="time";1==this.gui.getValue("0_mercator__z Mapping")?t="signal":2==this.gui.getValue("0_mercator__z Mapping")&&(t="angle to start"),this.setInsetLabels("long.","lat.",t)}}createFilledArray(t,e){let n=[];for(let i=0;i<=e;i++)n.push(t);return n}concatFloat32(t,e=[]){if(0==e.length&&t instanceof Float32Array)return t;let n=new Float32Array(t.length+e.length);return n.set(t),n.set(e,t.length),n}concatUint32(t,e=[]){let n=new Uint32Array(t.length+e.length);return n.set(t),n.set(e,t.length),n}shuffle(t){let e,n,i;for(i=t.length-1;i>0;i--)e=Math.floor(Math.random()*(i+1)),n=t[i],t[i]=t[e],t[e]=n;return t}posToOrientation(t,e){let n=new Array(t.length);if(t.length<2*e)return n.fill(0);let i=!1;for(let r=0;r<t.length;r+=e){let a=0==r?0:r-e,o=r>=t.length-e?r:r+e;x=t[o]-t[a],y=e>=2?t[o+1]-t[a+1]:0,z=e>=3?t[o+2]-t[a+2]:0,l=Math.sqrt(x*x+y*y+z*z),0==l&&(l=1,x=n[a+0],y=n[a+1],z=n[a+2],i=!0),n[r]=x/l,e>=2&&(n[r+1]=y/l),e>=3&&(n[r+2]=z/l)}return n}start(){let t=document.createElement("canvas");window.WebGLRenderingContext&&(t.getContext("webgl")||t.getContext("experimental-webgl"))||alert("Error - this browser does not support WebGL."),this.actualTitle=document.title,this.niceColorsCopy=JSON.parse(JSON.stringify(this.niceColors)),this.init(),this.webVr?this.renderer.setAnimationLoop(function(){this.animateFrame(this)}.bind(this)):this.animateFrame(this),document.addEventListener("keydown",this.onDocumentKeyDown.bind(this),!1),document.addEventListener("keyup",this.onDocumentKeyUp.bind(this),!1),document.addEventListener("scroll",this.onDocumentScroll.bind(this),!1)}addCustomAttribute(t,e,n,i,r,a,o,s){let l=this.customAttributes.length;for(let e=0;e<l;e++)if(this.customAttributes[e].name==n&&this.customAttributes[e].dataset==t)return;this.customAttributes.push({}),this.customAttributes[l].type=e,this.customAttributes[l].dataset=t,this.customAttributes[l].dependency=i,this.customAttributes[l].count=r,this.customAttributes[l].name=n,this.customAttributes[l].interpolate=a,this.customAttributes[l].normalize=o,this.customAttributes[l].shared=s}getDataAttributeIndex(t,e){for(let n=0;n<this.dataAttributes.length;n++)if(this.dataAttributes[n].name==e&&this.dataAttributes[n].dataset==t)return n;return-1}addDataAttribute(t,e,n,i,r,a,o){for(let n=0;n<this.dataAttributes.length;n++)if(this.dataAttributes[n].name==e&&this.dataAttributes[n].dataset==t)return void console.error("This attribute exists twice:",e,"of dataset",t);let s=this.dataAttributes.length,l="float";2==n?l="vec2":3==n&&(l="vec3"),this.dataAttributes.push({}),this.dataAttributes[s].type=l,this.dataAttributes[s].dataset=t,this.dataAttributes[s].dim=n,this.dataAttributes[s].name=e,this.dataAttributes[s].shared=a,this.dataAttributes[s].fixedColor=o,this.dataAttributes[s].min=i,this.dataAttributes[s].max=r}addCustomUniform(t,e,n,i,r){for(let e=0;e<this.customUniforms.length;e++)if(this.customUniforms[e].name===n&&this.customUniforms[e].dataset===t)return;let a={};a.dataset=t,a.type=e,a.name=n,a.num=i,a.value=r,this.customUniforms.push(a)}addColorModesToShader(t,e){console.log("Add color modes",this.dataAttributes);let n="\n"+Array(5).join(" "),i=n;for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;let r=this.cleanVarName(this.dataAttributes[e].name),a=this.dataAttributes[e].fixedColor?r+"Min":"max("+r+"Min, "+r+"From)",o=this.dataAttributes[e].fixedColor?r+"Max":"min("+r+"To,"+r+"Max)";i+="else if(mode == "+(7+e)+") {float t = (v"+this.capitalizeFirst(r)+" - "+a+") / ("+o+" - "+a+"); gl_FragColor.xyz = getColor(t, 1.).xyz;}"+n}return e=e.replace("#colorModes#",i)}addMercatorModesToShader(t,e){let n="\n"+Array(5).join(" "),i=n;i+="if(false) {} "+n;for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;let r=this.cleanVarName(this.dataAttributes[e].name),a=this.dataAttributes[e].fixedColor?r+"Min":"max("+r+"Min, "+r+"From)",o=this.dataAttributes[e].fixedColor?r+"Max":"min("+r+"To,"+r+"Max)";i+="else if(mercatorMode == "+(0+e)+") {mercatorHeight = (v"+this.capitalizeFirst(r)+" - "+a+") / ("+o+" - "+a+");}"+n}return e=e.replace("#mercatorModes#",i)}addFilterToShader(t,e,n){console.log("Add filter to shader for dataset:",t);let i="\n"+Array(n+1).join(" "),r=i;for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;console.log("Add ",this.dataAttributes[e].name," to dataset ",this.dataAttributes[e].dataset);let n=this.cleanVarName(this.dataAttributes[e].name);1==this.dataAttributes[e].dim&&(r+="if(v"+this.capitalizeFirst(n)+" < "+n+"From || v"+this.capitalizeFirst(n)+" > "+n+"To) {hideBecauseFilter = 1.;} "+i)}return e=e.replace("#attributeFilter#",r)}addUniformsToShader(t,e){let n="\n";for(let e=0;e<this.customUniforms.length;e++){if(this.customUniforms[e].dataset!==t)continue;let i=this.customUniforms[e].type;"color"==i&&(i="vec3");let r="";this.customUniforms[e].num>1&&(r="["+this.customUniforms[e].num+"]"),n+="uniform "+i+" "+this.cleanVarName(this.customUniforms[e].name)+r+";\n"}return e=(e=e.replace("#colorDefinition#",this.createAttributeForShader("colors","vec3","vSetId",this.setsAndStates.length,!1,!1,!1,!1,4,!0))).replace("#genericUniforms#",n)}addVaryingsToShader(t,e){console.log("Add varyings to shader for dataset ",t);Array(5).join(" ");let n="\n";for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;let i=this.dataAttributes[e].type;"color"==i&&(i="vec3"),n+="varying "+i+" v"+this.capitalizeFirst(this.cleanVarName(this.dataAttributes[e].name))+";\n"}return e=e.replace("#genericVaryings#",n)}addCustomAttributesToShader(t,e){return this.addCustomAttributesToShaderStep(t,!1,this.addCustomAttributesToShaderStep(t,!0,e))}addCustomAttributesToShaderStep(t,e,n){console.log("Call addCustomAttributesToShader for dataset ",t);let i="\n",r="\n";for(let n=0;n<this.customAttributes.length;n++){if(this.customAttributes[n].dataset!==t)continue;console.log("Handle attribute ",n,", ",this.customAttributes[n].name);let a=this.cleanVarName(this.customAttributes[n].name);if(r+=this.createAttributeForShader(a,this.customAttributes[n].type,this.customAttributes[n].dependency,this.customAttributes[n].count,this.customAttributes[n].shared,this.customAttributes[n].interpolate,this.customAttributes[n].normalize,!0,4,e),this.customAttributes[n].shared)i+="attribute "+this.customAttributes[n].type+" "+a+";\n";else for(let t=0;t<this.customAttributes[n].count;t++)i+="attribute "+this.customAttributes[n].type+" "+a+t+";\n"}return n=(n=n.replace("#genericAttributeInterpolation#",r)).replace("#genericAttributes#",i)}createAttributeForShader(t,e,n,i,r,a,o,s,l,c){let h="\n"+Array(l+1).join(" "),u=h;if(r)u+=(c?e+" ":"")+t+"Out = "+t+";\n";else if(1==i)u+=(c?e+" ":"")+t+"Out = "+t+"0;\n";else{u+=(c?"int ":"")+t+"Index = int("+n+");"+h,u+=(c?"float ":"")+t+"Fade = "+n+" - float("+t+"Index);"+h,u+=(c?e+" ":"")+t+"Out;"+h;for(let e=0;e<i;e++)a&&e>=1?(u+="if("+n+" < float("+e+"))  {"+t+"Out = (1. - "+t+"Fade) * "+t+(e-1)+" + "+t+"Fade * "+t+e+";} "+h+" else  ",e==i-1&&(u+="{"+t+"Out = "+t+e+";}"+h)):a||(u+="if(int("+n+") == "+e+")  {"+t+"Out = "+t+e+";}"+h)}return s&&(u+="v"+this.capitalizeFirst(t)+" = "+t+"Out;"+h),u}cleanVarName(t){let e=t.replace(/[^A-Za-z0-9]/g,"");if(e.match(/^\d/)){let e="Error! Attribute "+t+" must start with a non-numeric character.";throw alert(e),new Error(e)}return e}capitalizeFirst(t){return t.charAt(0).toUpperCase()+t.slice(1)}addDataHelperLines(t,e,n,r){let a=n,o=this.data.sets[t].states[0].positions[e].length/a,s=0;void 0!==this.data.sets[t].axes&&(s=this.data.sets[t].axes.length/a);let l=o+s,c=new i.BufferGeometry;c.type=this.data.sets[t].type,c.originIndex=e;let h=this.createFilledArray(t,l-1),u=this.createFilledArray(0,o-1),d=[],p=[];if(void 0!==this.data.sets[t].axes){d=this.data.sets[t].axes,p=this.data.sets[t].axesIndices.map(t=>t+o);for(let t=0;t<s;t++)u.push(1)}let f=this.concatFloat32(this.data.sets[t].entities[e],this.createFilledArray(-1,s-1)),g=this.concatUint32(this.data.sets[t].indices[e],p),m=this.concatFloat32(this.data.sets[t].states[0].positions[e],d);c.setAttribute("setId",new i.Float32BufferAttribute(h,1)),c.setAttribute("drawIndex",new i.BufferAttribute(f,1)),c.setAttribute("axeType",new i.Float32BufferAttribute(u,1)),c.setAttribute("position",new i.BufferAttribute(m,n)),c.setIndex(new i.BufferAttribute(g,1)),this.numGlPrimitives+=g/2;for(let o=0;o<r;o++){let r=this.concatFloat32(this.data.sets[t].states[o].positions[e],d),a=[];for(let t=r.length-n;t<r.length;t++)a.push(r[t]+(r[t]-r[t-n]));c.setAttribute("position"+o,new i.BufferAttribute(r,n)),c.setAttribute("nextPosition"+o,new i.BufferAttribute(this.concatFloat32(r.subarray(n),a),n));for(let n=0;n<this.data.sets[t].states[o].attributes.length;n++){let r=this.data.sets[t].states[o].attributes[n].dim,l=this.data.sets[t].states[o].attributes[n].shared,h=this.data.sets[t].states[o].attributes[n].name;if(1==l&&o>0)continue;let u=this.concatFloat32(this.data.sets[t].states[o].attributes[n].values[e],this.createFilledArray(0,s*r-1));0==l&&(h+=o),c.setAttribute(this.cleanVarName(h),new i.BufferAttribute(u,r));let d=this.getDataAttributeIndex(t,this.data.sets[t].states[o].attributes[n].name);for(let t=0;t<u.length;t++)this.dataAttributes[d].min=Math.min(this.dataAttributes[d].min,u[t]),this.dataAttributes[d].max=Math.max(this.dataAttributes[d].max,u[t])}}c.totalLineId=[];for(let n=0;n<this.data.sets[t].entities[e].length;n++)c.totalLineId.push(t.toString()+"_"+this.data.sets[t].entities[e][n].toString());return c}addDataHelperTriangles(t,e,n,r){console.log("Entities of",t,this.data.sets[t].entities);let a=n,o=this.data.sets[t].states[0].positions[e].length/a,s=new i.BufferGeometry;s.type=this.data.sets[t].type,s.originIndex=e;let l=this.createFilledArray(t,o-1),c=this.concatFloat32(this.data.sets[t].entities[e]);s.setAttribute("setId",new i.Float32BufferAttribute(l,1)),s.setAttribute("drawIndex",new i.BufferAttribute(c,1)),s.setAttribute("position",new i.BufferAttribute(this.concatFloat32(this.data.sets[t].states[0].positions[e]),n)),s.setAttribute("normalCustom",new i.BufferAttribute(this.concatFloat32(this.data.sets[t].states[0].normals[e]),n)),s.setIndex(new i.BufferAttribute(this.concatUint32(this.data.sets[t].indices[e]),1)),this.numGlPrimitives+=this.data.sets[t].indices[e].length/3;for(let a=0;a<r;a++){let r=this.data.sets[t].states[a].positions[e],o=[];for(let t=r.length-n;t<r.length;t++)o.push(r[t]+(r[t]-r[t-n]));s.setAttribute("position"+a,new i.BufferAttribute(this.concatFloat32(r),n));for(let n=0;n<this.data.sets[t].states[a].attributes.length;n++){let r=this.data.sets[t].states[a].attributes[n].dim,o=this.data.sets[t].states[a].attributes[n].values[e],l=this.data.sets[t].states[a].attributes[n].shared,c=this.data.sets[t].states[a].attributes[n].name;if(!(1==l&&a>0)){0==l&&(c+=a),s.setAttribute(this.cleanVarName(c),new i.BufferAttribute(this.concatFloat32(o),r));for(let t=0;t<o.length;t++)this.dataAttributes[n].min=Math.min(this.dataAttributes[n].min,o[t]),this.dataAttributes[n].max=Math.max(this.dataAttributes[n].max,o[t])}}}s.totalLineId=[];for(let n=0;n<this.data.sets[t].entities[e].length;n++)s.totalLineId.push(t.toString()+"_"+this.data.sets[t].entities[e][n].toString());return s}preprocessData(t,e){let n=this.data.dim,i=[];this.setsAndStates.push({}),this.setsAndStates[e].name=this.data.sets[e].name,this.setsAndStates[e].scale=this.data.sets[e].scale,this.setsAndStates[e].type=this.data.sets[e].type,this.setsAndStates[e].states={};let r=this.data.sets[e].states.length;for(let t=0;t<r;t++)this.setsAndStates[e].states[t]=this.data.sets[e].states[t].name;for(let t=0;t<this.data.sets[e].states[0].attributes.length;t++){let n=this.data.sets[e].states[0].attributes[t].dim,i=this.data.sets[e].states[0].attributes[t].name,r=this.data.sets[e].states[0].attributes[t].shared,a=this.data.sets[e].states[0].attributes[t].fixedColor;this.addDataAttribute(e,i,n,Number.MAX_SAFE_INTEGER,Number.MIN_SAFE_INTEGER,r,a)}for(let t=0;t<this.data.sets[e].states[0].positions.length;t++){this.setStatus(0,this.data.sets[e].states.length*this.data.sets[e].states[0].positions.length,this.data.sets[e].states[0].positions.length*e+t,"Preparing data");let a=null;a="triangles"===this.data.sets[e].type?this.addDataHelperTriangles(e,t,n,r):this.addDataHelperLines(e,t,n,r),i.push(a)}return this.addCustomAttribute(e,"vec3","position","stateInternal",r,!0,!1,!1),this.addCustomAttribute(e,"vec3","nextPosition","stateInternal",r,!0,!1,!1),i}processAttributes(t){for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;let n=this.dataAttributes[e].dim,r=this.dataAttributes[e].name,a=this.dataAttributes[e].shared,o=this.dataAttributes[e].dataset,s="";1==n&&(s="float"),2==n&&(s="vec2"),3==n&&(s="vec3"),this.addCustomAttribute(o,s,r,"state",this.dataAttributes.length,!0,!1,a),this.addCustomUniform(o,s,r+"From",1,this.dataAttributes[e].min),this.addCustomUniform(o,s,r+"To",1,this.dataAttributes[e].max),this.addCustomUniform(o,s,r+"Min",1,this.dataAttributes[e].min),this.addCustomUniform(o,s,r+"Max",1,this.dataAttributes[e].max),this.uniforms[this.dataAttributes[e].dataset][this.cleanVarName(this.dataAttributes[e].name+"From")]=new i.Uniform(this.dataAttributes[e].min),this.uniforms[this.dataAttributes[e].dataset][this.cleanVarName(this.dataAttributes[e].name+"To")]=new i.Uniform(this.dataAttributes[e].max),this.uniforms[this.dataAttributes[e].dataset][this.cleanVarName(this.dataAttributes[e].name+"Min")]=new i.Uniform(this.dataAttributes[e].min),this.uniforms[this.dataAttributes[e].dataset][this.cleanVarName(this.dataAttributes[e].name+"Max")]=new i.Uniform(this.dataAttributes[e].max)}}init(){document.body.innerHTML=document.body.innerHTML+'<div id="selectionBox" hidden></div>\n            <div id="inset"></div>\n            <div id="insetLabel">\n                <span id="insetLabelRed">X</span>, \n                <span id="insetLabelGreen">Y</span>, \n                <span id="insetLabelBlue">Z</span>\n            </div>',this.initGl(),this.initGui(),this.screenCapture.init(this.renderer),this.div=document.getElementById("selectionBox"),this.makeAllElementsVisible()}getLineUniforms(){return{alpha:new i.Uniform(.1),mode:new i.Uniform(0),colorMapMode:new i.Uniform(0),colorMap:{value:0},axesTransparancy:new i.Uniform(1),axesColor:new i.Uniform(new i.Color(0)),mercatorMode:new i.Uniform(0),mercatorRadius:new i.Uniform(0),lineColor:new i.Uniform(new i.Color(16711740)),primaryColor:new i.Uniform(new i.Color(14945818)),secondaryColor:new i.Uniform(new i.Color(16863)),backgroundColor:new i.Uniform(new i.Color(this.backgroundColor)),defocusColor:new i.Uniform(new i.Color(8947848)),defocusAlpha:new i.Uniform(.02),defocusState:new i.Uniform(.5),scale:new i.Uniform(1),colorScale:new i.Uniform(30),shading:new i.Uniform(0),glossiness:new i.Uniform(10),darkenInside:new i.Uniform(0),mercator:new i.Uniform(0),mercatorOffset:new i.Uniform(1.571),mercatorOffset2:new i.Uniform(0),mercatorOffset3:new i.Uniform(0),zLower:new i.Uniform(-99999),zUpper:new i.Uniform(99999),xLower:new i.Uniform(-99999),xUpper:new i.Uniform(99999),yLower:new i.Uniform(-99999),yUpper:new i.Uniform(99999),state:new i.Uniform(0),projLevel:new i.Uniform(0),projPlane:new i.Uniform(new i.Vector3(0,0,99999)),projPlaneN:new i.Uniform(new i.Vector3(0,0,1))}}getTriangleUniforms(){return{alpha:new i.Uniform(.1),mode:new i.Uniform(0),mercatorMode:new i.Uniform(0),mercatorRadius:new i.Uniform(0),lineColor:new i.Uniform(new i.Color(16711740)),primaryColor:new i.Uniform(new i.Color(14945818)),secondaryColor:new i.Uniform(new i.Color(16769280)),backgroundColor:new i.Uniform(new i.Color(this.backgroundColor)),defocusColor:new i.Uniform(new i.Color(8947848)),defocusAlpha:new i.Uniform(.02),defocusState:new i.Uniform(.5),scale:new i.Uniform(1),colorScale:new i.Uniform(30),shading:new i.Uniform(0),glossiness:new i.Uniform(10),darkenInside:new i.Uniform(0),mercator:new i.Uniform(0),mercatorOffset:new i.Uniform(1.57079632),mercatorOffset2:new i.Uniform(0),mercatorOffset3:new i.Uniform(0),zLower:new i.Uniform(-99999),zUpper:new i.Uniform(99999),xLower:new i.Uniform(-99999),xUpper:new i.Uniform(99999),yLower:new i.Uniform(-99999),yUpper:new i.Uniform(99999),projLevel:new i.Uniform(0),projPlane:new i.Uniform(new i.Vector3(0,0,99999)),projPlaneN:new i.Uniform(new i.Vector3(0,0,1)),state:new i.Uniform(0)}}getLineMaterial(t){return new i.ShaderMaterial({uniforms:this.uniforms[t],transparent:!0,linewidth:2,depthFunc:i.AlwaysDepth,blending:i.NormalBlending,fragmentShader:this.addVaryingsToShader(t,this.addFilterToShader(t,this.addColorModesToShader(t,this.addUniformsToShader(t,this.shaders.fragmentShader())),4)),vertexShader:this.addVaryingsToShader(t,this.addCustomAttributesToShader(t,this.addMercatorModesToShader(t,this.addUniformsToShader(t,this.shaders.vertexShaderLine()))))})}getTriangleMaterial(t){return new i.ShaderMaterial({uniforms:this.uniforms[t],transparent:!0,depthFunc:i.AlwaysDepth,side:i.DoubleSide,blending:i.NormalBlending,fragmentShader:this.addVaryingsToShader(t,this.addFilterToShader(t,this.addColorModesToShader(t,this.addUniformsToShader(t,this.shaders.fragmentShader())),4)),vertexShader:this.addVaryingsToShader(t,this.addCustomAttributesToShader(t,this.addMercatorModesToShader(t,this.addUniformsToShader(t,this.shaders.vertexShaderTriangle()))))})}initColormaps(){for(let t in this.colorMaps)this.colorMapTextures.push((new i.TextureLoader).load(this.colorMaps[t])),this.colorMapNames.push(t)}initGl(){this.renderer=new i.WebGLRenderer({antialias:this.aa,alpha:!0,stencil:!1,preserveDrawingBuffer:!0}),this.renderer.setPixelRatio(window.devicePixelRatio),this.renderer.setClearColor(0,0),this.renderer.setSize(window.innerWidth,window.innerHeight),this.renderer.sortObjects=!1,this.renderer.depthWrite=!1,document.body.appendChild(this.renderer.domElement),this.initColormaps(),this.scene=new i.Scene,this.camera=new i.PerspectiveCamera(40,window.innerWidth/window.innerHeight,1,1e3),this.camera.position.set(0,0,2),this.controls=new r(this.camera,this.renderer.domElement),this.controls.staticMoving=!0,this.controls.dynamicDampingFactor=0,this.controls.rotateSpeed=2,this.controls.noPan=!0,this.webVr&&(this.renderer.xr.enabled=!0,this.vrControls=this.renderer.xr.getController(0),this.vrControls.addEventListener("selectstart",this.onVrSelectStart.bind(this)),this.vrControls.addEventListener("selectend",this.onVrSelectEnd.bind(this)),document.body.appendChild(s(this.renderer)),this.controls.enabled=!1),this.controls.minDistance=0,this.controls.maxDistance=5e3;let t=new i.Object3D;t.name="father",("string"==typeof this.data||this.data instanceof Uint8Array)&&(this.data=JSON.parse(this.inflate("string"==typeof this.data?atob(this.data):this.data)),console.log("Inflating object done")),this.dequantizeData(),console.log(this.data);for(let e=0;e<this.data.sets.length;e++){"triangles"==this.data.sets[e].type?this.uniforms[e]=this.getTriangleUniforms():this.uniforms[e]=this.getLineUniforms();let n=this.preprocessData(this.data,e);this.processAttributes(e),"triangles"==this.data.sets[e].type?this.material[e]=this.getTriangleMaterial(e):this.material[e]=this.getLineMaterial(e);for(let r=0;r<n.length;r++){let a=null;a="triangles"===n[r].type?new i.Mesh(n[r],this.material[e]):new i.LineSegments(n[r],this.material[e]),a.sortObjects=!1,a.depthWrite=!1,a.frustumCulled=!1,a.selectable=this.data.sets[e].selectable,t.add(a)}}this.setStatus(0,1,1),this.webVr&&t.position.add(this.webVrDisplacement),this.scene.add(t),this.bbox=(new i.Box3).setFromObject(t),this.recommendedScale=2/(this.bbox.max.x-this.bbox.min.x),this.setScale(this.recommendedScale),console.log("THIS:",this),window.addEventListener("resize",this.onWindowResize.bind(this),!1),this.onWindowResize(),this.stats=new o.a,this.noGui&&this.gui.hide(),this.showFps&&document.body.appendChild(this.stats.dom),this.initInset()}initInset(){this.container2=document.getElementById("inset"),this.renderer2=new i.WebGLRenderer({antialias:!0,alpha:!0}),this.renderer2.setClearColor(15790320,0),this.renderer2.setSize(document.getElementById("inset").offsetWidth,document.getElementById("inset").offsetHeight),this.webVr?document.getElementById("insetLabel").className+=" hideMe":this.container2.appendChild(this.renderer2.domElement),this.scene2=new i.Scene,this.camera2=new i.PerspectiveCamera(50,document.getElementById("inset").offsetWidth/document.getElementById("inset").offsetHeight,.1,1e3),this.camera2.up=this.camera.up,this.axes2=new i.AxesHelper(.81);let t=this.axes2.geometry.attributes.color;t.setXYZ(0,1,.1,.1),t.setXYZ(1,1,.1,.1),t.setXYZ(2,.2,.8,.1),t.setXYZ(3,.2,.8,.1),t.setXYZ(4,.1,.4,1),t.setXYZ(5,.1,.4,1),this.axes2.material.linewidth=2,this.scene2.add(this.axes2),this.doneLoading()}getScale(){return this.scene.children[0].scale.x}setScale(t){for(let e=0;e<this.scene.children.length;e++)this.scene.children[e].scale.set(t,t,t)}onWindowResize(){this.camera.aspect=window.innerWidth/window.innerHeight,this.camera.updateProjectionMatrix(),this.renderer.setSize(window.innerWidth,window.innerHeight)}animateFrame(){this.stats.update(),this.sortSegments(),this.cameraUpdateCallback(),this.renderer.setClearColor(this.backgroundColor,1),this.renderer.setViewport(0,0,window.innerWidth,window.innerHeight),this.camera.updateProjectionMatrix(),this.renderer.render(this.scene,this.camera),this.camera2.position.copy(this.camera.position),this.camera2.position.sub(this.controls.target),this.camera2.position.setLength(2),this.camera2.lookAt(this.scene2.position),this.renderer2.render(this.scene2,this.camera2),this.webVr||(requestAnimationFrame(this.animateFrame.bind(this)),this.controls.update())}mergeSort(t,e){function n(t,e,n,i,r,a){let o=n,s=i+1,l=n;for(;;){if(a(t[o],t[s])<=0){if(e[l++]=t[o++],o>i){do{e[l++]=t[s++]}while(s<=r);break}}else if(e[l++]=t[s++],s>r){do{e[l++]=t[o++]}while(o<=i);break}}}function i(t,e,i,a,o){if(a<i)return;if(a==i)return void(e[i]=t[i]);let s=Math.floor(i+(a-i)/2);r(t,e,i,s,o),r(t,e,s+1,a,o),n(t,e,i,s,a,o)}function r(t,e,r,a,o){if(a<=r)return;let s=Math.floor(r+(a-r)/2);i(t,e,r,s,o),i(t,e,s+1,a,o),n(e,t,r,s,a,o)}return function(t,e){let n=t.slice(0);return r(t,n,0,t.length-1,e),t}(t,e)}sortSegments(){if(4==this.sortFrequency&&0==this.sortNeedShuffle||3==this.sortFrequency&&Date.now()-this.lastSort<5e3||2==this.sortFrequency&&Date.now()-this.lastSort<1e3)return;let t=new i.Vector3(0,0,1e3).unproject(this.camera).divideScalar(this.getScale());if(this.webVr){let e=new i.Quaternion;e=this.scene.children[0].getWorldQuaternion(e),e=e.inverse(e),t=new i.Vector3(0,0,-5),t.applyQuaternion(e)}if(0==this.sortFrequency&&t.distanceTo(this.lastCamPos)>0)return this.lastCamPos=t,this.lastCamPosUpdate=Date.now(),void(this.sortedSinceLastCamPosUpdate=!1);if(0==this.sortFrequency&&(this.sortedSinceLastCamPosUpdate||Date.now()-this.lastCamPosUpdate<300))return;performance.now();let e=0;for(let n=0;n<this.scene.children.length;n++)for(let i=0;i<this.scene.children[n].children.length;i++){if(null===this.scene.children[n].children[i].geometry.index)continue;let r=this.scene.children[n].children[i].geometry.index.array,a=r.slice(0),o=this.scene.children[n].children[i].geometry.attributes.position.array,s="Mesh"==this.scene.children[n].children[i].type?3:2,l=new Float32Array(r.length/s),c=-1;for(let e=0;e<l.length;e++)c=3*r[s*e],l[e]=Math.pow(o[c]-t.x,2)+Math.pow(o[c+1]-t.y,2)+Math.pow(o[c+2]-t.z,2);e=performance.now();let h=new Int32Array(l.length);for(let t=0;t<l.length;++t)h[t]=t;4==this.sortFrequency?(h=this.shuffle(h),this.sortNeedShuffle=!1):this.sortForward&&!this.webVr?h.sort((function(t,e){return l[t]>l[e]?-1:l[t]<l[e]?1:0})):h.sort((function(t,e){return l[t]<l[e]?-1:l[t]>l[e]?1:0})),console.log("Sorted",h.length);for(let t=0;t<h.length;t++)for(let e=0;e<s;e++)r[s*t+e]=a[s*h[t]+e];this.scene.children[n].children[i].geometry.needsUpdate=!0,this.scene.children[n].children[i].geometry.index.needsUpdate=!0}performance.now();this.lastSort=Date.now(),this.sortedSinceLastCamPosUpdate=!0}colorReset(t){t.niceColors=JSON.parse(JSON.stringify(t.niceColorsCopy)),t.primary.setValue(16062488),t.secondary.setValue(16769280),t.background.setValue(14540253)}colorListTo3D(t){this.gui.setValue(this.primary,t.niceColors[0]),this.gui.setValue(this.secondary,t.niceColors[1])}getRandomColor(){let t="#";for(let e=0;e<6;e++)t+="0123456789ABCDEF"[Math.floor(16*Math.random())];return t}initGui(){if(this.gui.create(),this.gui.addMainHeadline("General settings"),this.gui.addSelection("Gui scale",["Small","Medium","Large"],1,function(t){this.gui.scale(0==t?250:1==t?400:600)}.bind(this),!1),!this.webVr){let t=document.createElement("div"),e=document.createElement("div");e.innerHTML="Reset camera",e.classList.add("guiTag"),t.appendChild(e);let n=["+x","-x","+y","-y","+z","-z"];for(let e=0;e<n.length;e++){let i=document.createElement("a"),r=n[e];i.href="#",i.classList.add("resetCamLink"),i.innerHTML=r;let a={context:this,d:r};i.onclick=function(){this.context.setCamera(this.d)}.bind(a),t.appendChild(i)}this.gui.addChild(t);let i=document.createElement("div"),r=document.createElement("div");r.innerHTML="Rotate camera",r.classList.add("guiTag"),i.appendChild(r);for(let t=0;t<n.length;t++){let e=document.createElement("a"),r=n[t];e.href="#",e.classList.add("resetCamLink"),e.innerHTML=r;let a={context:this,d:r};e.onclick=function(){this.context.rotateCamera(this.d)}.bind(a),i.appendChild(e)}this.gui.addChild(i)}this.sortFrequency=0,this.gui.addSelection("Render: Update order",["When not moving","Every frame","every 1s","every 5s","Never"],this.sortFrequency,function(t){this.sortFrequency=t,this.sortNeedShuffle=4==t}.bind(this),!1),this.gui.addColor("Background color","#"+this.material[0].uniforms.backgroundColor.value.getHexString(),function(t){for(let e=0;e<this.setsAndStates.length;e++)this.material[e].uniforms.backgroundColor.value=new i.Color(t);this.backgroundColor=t}.bind(this),!1);let t=document.createElement("div"),e=document.createElement("div");e.innerHTML="Reset settings",e.classList.add("guiTag"),t.appendChild(e);var n=document.createElement("button");n.innerHTML="Load now",n.onclick=function(){this.gui.loadDefaults()}.bind(this),t.append(n),this.gui.addChild(t),this.webVr&&(this.gui.addFloat("VR Camera pos. x",-5,5,this.webVrDisplacement.x,function(t){this.scene.children[0].position.sub(this.webVrDisplacement),this.webVrDisplacement.setX(parseFloat(t)),this.scene.children[0].position.add(this.webVrDisplacement)}.bind(this),!1),this.gui.addFloat("VR Camera pos. y",-5,5,this.webVrDisplacement.y,function(t){this.scene.children[0].position.sub(this.webVrDisplacement),this.webVrDisplacement.setY(parseFloat(t)),this.scene.children[0].position.add(this.webVrDisplacement)}.bind(this),!1),this.gui.addFloat("VR Camera pos. z",-5,5,this.webVrDisplacement.z,function(t){this.scene.children[0].position.sub(this.webVrDisplacement),this.webVrDisplacement.setZ(parseFloat(t)),this.scene.children[0].position.add(this.webVrDisplacement)}.bind(this),!1));for(let t=0;t<this.setsAndStates.length;t++){this.gui.addMainHeadline("Dataset "+(t+1)+": "+this.setsAndStates[t].name);this.setsAndStates[t].name;let e=1/parseFloat(this.setsAndStates[t].scale);for(let e=0;e<this.dataAttributes.length;e++){if(this.dataAttributes[e].dataset!==t)continue;this.gui.addHeadline("Attribute filter: "+this.dataAttributes[e].name);let n=e+": "+this.dataAttributes[e].name,i={};i.name=n,i.uniformName=this.cleanVarName(this.dataAttributes[e].name),i.i=e,i.to=parseFloat(this.dataAttributes[e].max),i.window=parseFloat(0),i.uniforms=this.material[t].uniforms,i.setId=t,i.gui=this.gui,this.gui.addFloat(t+"_"+n+" __Min",parseFloat(this.dataAttributes[e].min),parseFloat(this.dataAttributes[e].max),parseFloat(this.dataAttributes[e].min),function(t){this.uniforms[this.uniformName+"From"].value=t;let e=this.gui.getValue(this.setId+"_"+this.name+"__Window");e>0&&this.gui.setValue(this.setId+"_"+this.name+"__Max",parseFloat(t)+parseFloat(e))}.bind(i)),this.gui.addFloat(t+"_"+n+"__Max",parseFloat(this.dataAttributes[e].min),parseFloat(this.dataAttributes[e].max),parseFloat(this.dataAttributes[e].max),function(t){this.uniforms[this.uniformName+"To"].value=t}.bind(i)),this.gui.addFloat(t+"_"+n+"__Window",parseFloat(0),parseFloat(this.dataAttributes[e].max-this.dataAttributes[e].min),parseFloat(0),function(t){}.bind(i)),this.colorModeOptions.push(n),this.mercatorModeOptions.push(n)}let n={};n.niceColors=this.niceColors,n.niceColorsCopy=this.niceColorsCopy,n.colorMapMode=t.toString()+"__Color map",n.primary=t.toString()+"__Primary color",n.secondary=t.toString()+"__Secondary color",n.defocus=t.toString()+"__Defocus color",n.background="Background color",n.setsAndStates=this.setsAndStates,n.numStates=Object.keys(this.setsAndStates[t].states).length,n.colorListTo3D=this.colorListTo3D,n.gui=this.gui,n.getRandomColor=this.getRandomColor,n.material=this.material[t],n.setId=t,n.backgroundColor=this.backgroundColor,n.updateInsetLabels=this.updateInsetLabels.bind(this),n.setScale=this.setScale.bind(this),n.colorMapTextures=this.colorMapTextures,void 0!==this.data.sets[t].axes&&this.data.sets[t].axes.length>0&&(this.gui.addHeadline("Axes styling"),this.gui.addFloat(t.toString()+"__Axes transparancy",0,1,1,function(t){this.material.uniforms.axesTransparancy.value=t}.bind(n)),this.gui.addColor(t.toString()+"__Axes color","#000000",function(t){for(let e=0;e<this.setsAndStates.length;e++)this.material.uniforms.axesColor.value=new i.Color(t)}.bind(n))),this.gui.addHeadline("Render settings"),this.gui.addSelection(t.toString()+"__Color map",this.colorMapNames,0,function(t){this.material.uniforms.colorMapMode.value=t>0?1:0,t>0&&(this.material.uniforms.colorMap.value=this.colorMapTextures[t-1]),console.log("set to colormap ",t-1,this.colorMapTextures[t-1]),this.material.uniforms.colorMap.needsUpdate=!0}.bind(n)),this.gui.addSelection(t.toString()+"__Custom color: presets",["Default","Dark red/blue","Shuffle all","Cream 1","Cream 2","Cyan","Neon","Nico","Warm blue/red","b/w","b/w inverse","ice","purple","ocean"],0,function(t){1==t?(this.gui.setValue(this.primary,"#dc0d0d"),this.gui.setValue(this.secondary,"#1192f6"),this.gui.setValue(this.background,"#080b1a"),this.gui.setValue(this.defocus,"#4f4e51")):2==t?(this.gui.setValue(this.primary,this.getRandomColor()),this.gui.setValue(this.secondary,this.getRandomColor()),this.gui.setValue(this.background,this.getRandomColor()),this.gui.setValue(this.defocus,this.getRandomColor())):3==t?(this.gui.setValue(this.primary,"#123C69"),this.gui.setValue(this.secondary,"#AC3B61"),this.gui.setValue(this.background,"#f0cdbc"),this.gui.setValue(this.defocus,"#9f9f9f")):4==t?(this.gui.setValue(this.primary,"#6ca56b"),this.gui.setValue(this.secondary,"#e5e4d4"),this.gui.setValue(this.background,"#9a6755"),this.gui.setValue(this.defocus,"#5a362a")):5==t?(this.gui.setValue(this.primary,"#FFE400"),this.gui.setValue(this.secondary,"#f70253"),this.gui.setValue(this.background,"#10E7DC"),this.gui.setValue(this.defocus,"#ffffff")):6==t?(this.gui.setValue(this.primary,"#f3f315"),this.gui.setValue(this.secondary,"#ff0099"),this.gui.setValue(this.background,"#111111"),this.gui.setValue(this.defocus,"#888888")):7==t?(this.gui.setValue(this.primary,"#00b0e6"),this.gui.setValue(this.secondary,"#ff001e"),this.gui.setValue(this.background,"#ffffff"),this.gui.setValue(this.defocus,"#888888")):8==t?(this.gui.setValue(this.primary,"#f5ed70"),this.gui.setValue(this.secondary,"#e03335"),this.gui.setValue(this.background,"#0a7fa2"),this.gui.setValue(this.defocus,"#065e7c")):9==t?(this.gui.setValue(this.primary,"#000000"),this.gui.setValue(this.secondary,"#737373"),this.gui.setValue(this.background,"#ffffff"),this.gui.setValue(this.defocus,"#bfbfbf")):10==t?(this.gui.setValue(this.primary,"#ffffff"),this.gui.setValue(this.secondary,"#313131"),this.gui.setValue(this.background,"#000000"),this.gui.setValue(this.defocus,"#414141")):11==t?(this.gui.setValue(this.primary,"#00787e"),this.gui.setValue(this.secondary,"#92f5fa"),this.gui.setValue(this.background,"#07242a"),this.gui.setValue(this.defocus,"#1e152f")):12==t?(this.gui.setValue(this.primary,"#1d8c80"),this.gui.setValue(this.secondary,"#edaf9b"),this.gui.setValue(this.background,"#43283f"),this.gui.setValue(this.defocus,"#24454d")):13==t?(this.gui.setValue(this.primary,"#fff673"),this.gui.setValue(this.secondary,"#00ca60"),this.gui.setValue(this.background,"#042a55"),this.gui.setValue(this.defocus,"#214588")):(this.gui.setValue(this.primary,"#e40e1a"),this.gui.setValue(this.secondary,"#0041df"),this.gui.setValue(this.background,"#e2e2e2"),this.gui.setValue(this.defocus,"#888888"))}.bind(n)),this.gui.addColor(t.toString()+"__Primary color","#"+n.material.uniforms.primaryColor.value.getHexString(),function(t){this.material.uniforms.primaryColor.value=new i.Color(t),this.gui.setValue(this.colorMapMode,0)}.bind(n)),this.gui.addColor(t.toString()+"__Secondary color","#"+n.material.uniforms.secondaryColor.value.getHexString(),function(t){this.material.uniforms.secondaryColor.value=new i.Color(t),this.gui.setValue(this.colorMapMode,0)}.bind(n)),this.gui.addColor(t.toString()+"__Defocus color","#"+n.material.uniforms.defocusColor.value.getHexString(),function(t){this.material.uniforms.defocusColor.value=new i.Color(t)}.bind(n)),this.gui.addSelection(t.toString()+"__Color mode",this.colorModeOptions,0,function(t){this.material.uniforms.mode.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Line width (test)",0,20,2,function(t){this.material.linewidth=t}.bind(n)),this.gui.addFloat(t.toString()+"__Fade out behind center",0,1,0,function(t){this.material.uniforms.darkenInside.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Shading",0,2,0,function(t){this.material.uniforms.shading.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Glossiness",0,200,10,function(t){this.material.uniforms.glossiness.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Alpha",0,1,.1,function(t){this.material.uniforms.alpha.value=t}.bind(n)),n.numStates>1&&(console.log("Num states:",n.numStates),this.gui.addFloat(t.toString()+"__State",0,n.numStates-1,0,function(t){this.material.uniforms.state.value=t}.bind(n))),this.gui.addFloat(t.toString()+"__Defocus alpha",0,1,.02,function(t){this.material.uniforms.defocusAlpha.value=t}.bind(n)),n.numStates>1&&this.gui.addFloat(t.toString()+"__Defocus state",0,n.numStates-1,Math.min(.5,n.numStates-1),function(t){this.material.uniforms.defocusState.value=t}.bind(n)),this.gui.addHeadline("Mercator projections"),this.gui.addFloat(t.toString()+"_mercator__Level",0,1,0,function(t){this.material.uniforms.mercator.value=t,this.updateInsetLabels()}.bind(n)),this.gui.addFloat(t.toString()+"_mercator__Rotation x",0,6.28318,1.57079632,function(t){this.material.uniforms.mercatorOffset.value=t}.bind(n)),this.gui.addFloat(t.toString()+"_mercator__Rotation y",0,6.28318,0,function(t){this.material.uniforms.mercatorOffset2.value=t}.bind(n)),this.gui.addFloat(t.toString()+"_mercator__Rotation z",0,6.28318,0,function(t){this.material.uniforms.mercatorOffset3.value=t}.bind(n)),this.gui.addFloat(t.toString()+"_mercator__z Scale",0,10,0,function(t){this.material.uniforms.mercatorRadius.value=t}.bind(n)),this.gui.addSelection(t.toString()+"_mercator__z Mapping",this.mercatorModeOptions,0,function(t){this.material.uniforms.mercatorMode.value=t,this.updateInsetLabels()}.bind(n)),this.gui.addHeadline("Cutting planes"),this.gui.addFloat(t.toString()+"_cutting plane:__x Min",e*this.bbox.min.x,e*this.bbox.max.x,e*this.bbox.min.x,function(t){this.material.uniforms.xLower.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__x Max",e*this.bbox.min.x,e*this.bbox.max.x,e*this.bbox.max.x,function(t){this.material.uniforms.xUpper.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__y Min",e*this.bbox.min.y,e*this.bbox.max.y,e*this.bbox.min.y,function(t){this.material.uniforms.yLower.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__y Max",e*this.bbox.min.y,e*this.bbox.max.y,e*this.bbox.max.y,function(t){this.material.uniforms.yUpper.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__z Min",e*this.bbox.min.z,e*this.bbox.max.z,e*this.bbox.min.z,function(t){this.material.uniforms.zLower.value=t/e}.bind(n)),this.gui.addFloat(t.toString()+"_cutting plane:__z Max",e*this.bbox.min.z,e*this.bbox.max.z,e*this.bbox.max.z,function(t){this.material.uniforms.zUpper.value=t/e}.bind(n)),this.gui.addHeadline("Projection on 2D plane in 3D space"),this.gui.addFloat(t.toString()+"__Projection level",0,1,0,function(t){this.material.uniforms.projLevel.value=t}.bind(n)),this.gui.addFloat(t.toString()+"__Center x",e*this.bbox.min.x,e*this.bbox.max.x,0,function(t){this.material.uniforms.projPlane.value.setX(t/e)}.bind(n)),this.gui.addFloat(t.toString()+"__Center y",e*this.bbox.min.y,e*this.bbox.max.y,0,function(t){this.material.uniforms.projPlane.value.setY(t/e)}.bind(n)),this.gui.addFloat(t.toString()+"__Center z",e*this.bbox.min.z,e*this.bbox.max.z,e*this.bbox.max.z,function(t){this.material.uniforms.projPlane.value.setZ(t/e)}.bind(n)),this.gui.addFloat(t.toString()+"__Normal x",-1,1,0,function(t){this.material.uniforms.projPlaneN.value.setX(t)}.bind(n)),this.gui.addFloat(t.toString()+"__Normal y",-1,1,0,function(t){this.material.uniforms.projPlaneN.value.setY(t)}.bind(n)),this.gui.addFloat(t.toString()+"__Normal z",-1,1,1,function(t){this.material.uniforms.projPlaneN.value.setZ(t)}.bind(n))}this.gui.addMainHeadline("Tours and Data Export"),this.gui.addFloat("Video bitrate (mbit)",2,200,parseInt(this.videoBitrate/1e6),function(t){this.videoBitrate=1e6*t}.bind(this),!1);let r=document.createElement("div");r.setAttribute("id","exportLinkHolder");let a=document.createElement("a");a.innerHTML="&bull; Download selection",a.id="exportButton",a.href="#",a.onclick=this.exportSelection.bind(this);let o=document.createElement("span");o.style.marginLeft="5px",o.id="exportButtonStatus",r.appendChild(a),r.appendChild(o),this.gui.addChild(r),console.log("Default values",this.gui.defaultValues)}clickAndEnterPressing(){return this.pressingEnter&&this.clickingMouseButton}reCalc(){this.x3=Math.min(this.x1,this.x2),this.x4=Math.max(this.x1,this.x2),this.y3=Math.min(this.y1,this.y2),this.y4=Math.max(this.y1,this.y2),this.div.style.left=this.x3+"px",this.div.style.top=this.y3+"px",this.div.style.width=this.x4-this.x3+"px",this.div.style.height=this.y4-this.y3+"px"}onmousedown(t){this.renderer.domElement===t.target&&(document.activeElement.blur(),this.pressingButton?(this.clickingMouseButton=!0,this.div.hidden=0,this.x1=t.clientX,this.y1=t.clientY,this.reCalc()):this.webVr&&(this.clickingVrOnCanvas=!0))}onmousemove(t){if(this.clickingMouseButton)this.x2=t.clientX,this.y2=t.clientY,this.reCalc();else if(this.clickingVrOnCanvas){if(console.log("vr move",t.clientX,t.clientY),null!=this.lastVrPosX&&null!=this.lastVrPosY){let e=t.clientX-this.lastVrPosX,n=t.clientY-this.lastVrPosY;this.scene.children[0].rotation.y+=.01*e,this.scene.children[0].rotation.x+=.01*n;for(let t=1;t<this.scene.children.length;t++){let r=new i.Matrix4,a=new i.Matrix4;r.makeRotationY(.01*e),a.makeRotationX(.01*n),this.scene.children[t].position.sub(this.webVrDisplacement),this.scene.children[t].position.applyMatrix4(r).applyMatrix4(a),this.scene.children[t].position.add(this.webVrDisplacement)}}this.lastVrPosX=t.clientX,this.lastVrPosY=t.clientY}}onmouseup(t){if(0==this.div.hidden){let t=window.innerWidth||document.documentElement.clientWidth||document.body.clientWidth,e=window.innerHeight||document.documentElement.clientHeight||document.body.clientHeight;this.y1=e-this.y1,this.y2=e-this.y2;let n=this.x1/t*2-1,r=this.y1/e*2-1,a=this.x2/t*2-1,o=this.y2/e*2-1,s=Math.min(n,a),l=Math.max(r,o),c=Math.max(n,a),h=Math.min(r,o);console.log("Selection from",s,l,"to",c,h);let u=this.getScale(),d=new i.Vector3(s,l,-1).unproject(this.camera).divideScalar(u),p=new i.Vector3(c,l,-1).unproject(this.camera).divideScalar(u),f=new i.Vector3(c,h,-1).unproject(this.camera).divideScalar(u),m=new i.Vector3(s,h,-1).unproject(this.camera).divideScalar(u),g=new i.Vector3(s,l,1).unproject(this.camera).divideScalar(u),v=new i.Vector3(c,l,1).unproject(this.camera).divideScalar(u),y=new i.Vector3(c,h,1).unproject(this.camera).divideScalar(u),b=new i.Vector3(s,h,1).unproject(this.camera).divideScalar(u);this.checkPoints(d,p,f,m,g,v,y,b)}else this.clickingVrOnCanvas&&(this.clickingVrOnCanvas=!1,this.lastVrPosX=null,this.lastVrPosY=null);this.div.hidden=1,this.clickingMouseButton=!1}onVrSelectStart(){this.clickingVrControllerButton=!0,this.onVrMoveObserver()}onVrSelectEnd(){this.clickingVrControllerButton=!1,this.lastVrRotation=null}onVrMoveObserver(){if(null!==this.lastVrRotation){let t=this.lastVrRotation.x-this.vrControls.rotation.x,e=this.lastVrRotation.y-this.vrControls.rotation.y;this.clickingVrControllerButton&&(this.scene.children[0].rotation.x+=2*t,this.scene.children[0].rotation.y+=2*e)}this.clickingVrControllerButton&&(this.lastVrRotation=new i.Vector3(this.vrControls.rotation.x,this.vrControls.rotation.y,this.vrControls.rotation.z),setTimeout((function(t){t.onVrMoveObserver().bind(t)}),20,this))}ondblclick(t){t.target===this.renderer.domElement&&this.makeAllElementsVisible()}getPlane(t,e,n){let r=new i.Vector3(e.x,e.y,e.z);r.sub(t);let a=new i.Vector3(e.x,e.y,e.z);a.sub(n);let o=new i.Vector3(r.x,r.y,r.z);o=o.cross(a);let s=e.x*o.x+e.y*o.y+e.z*o.z;return{a:o.x,b:o.y,c:o.z,d:-s}}isInside(t,e,n,i){return e*t.a+n*t.b+i*t.c+t.d>0}makeAllElementsVisible(){this.currentSelection={};for(let t=0;t<this.scene.children[0].children.length;t++){let e=this.scene.children[0].children[t].geometry.originIndex,n=[];if(void 0!==this.data.sets[t].axes)for(let e=0;e<this.data.sets[t].axes.length/3;e++)n.push(-1);let r=this.concatFloat32(this.data.sets[t].entities[e],n);console.log("Draw index values",r),this.scene.children[0].children[t].geometry.setAttribute("drawIndex",new i.BufferAttribute(r,1)),this.scene.children[0].children[t].geometry.attributes.drawIndex.needsUpdate=!0;for(let e=0;e<this.scene.children[0].children[t].geometry.totalLineId.length;e++)this.currentSelection[this.scene.children[0].children[t].geometry.totalLineId[e]]=1}}makeAllElementsInvisible(){for(let t=0;t<this.scene.children[0].children.length;t++){let e=this.createFilledArray(-1,this.scene.children[0].children[t].geometry.attributes.drawIndex.array.length);this.scene.children[0].children[t].geometry.setAttribute("drawIndex",new i.Float32BufferAttribute(e,1)),this.scene.children[0].children[t].geometry.attributes.drawIndex.needsUpdate=!0}}checkPoints(t,e,n,i,r,a,o,s){let l=this.getPlane(t,e,r),c=this.getPlane(e,n,a),h=this.getPlane(n,i,o),u=this.getPlane(i,t,s),d=[];this.currentSelection={};let p={};for(let t=0;t<this.scene.children[0].children.length;t++)for(let e=0;e<this.scene.children[0].children[t].geometry.attributes.drawIndex.array.length;e++)(!this.scene.children[0].children[t].selectable||this.scene.children[0].children[t].geometry.attributes.drawIndex.array[e]>.5)&&(p[this.scene.children[0].children[t].geometry.totalLineId[e]]=1);for(let t=0;t<this.scene.children[0].children.length;t++)for(let e=0;e<this.scene.children[0].children[t].geometry.attributes.drawIndex.array.length;e++){let n=this.scene.children[0].children[t].geometry.totalLineId[e];if(void 0===p[n]||void 0!==this.currentSelection[n])continue;let i=this.scene.children[0].children[t].geometry.attributes.position.array[3*e+0],r=this.scene.children[0].children[t].geometry.attributes.position.array[3*e+1],a=this.scene.children[0].children[t].geometry.attributes.position.array[3*e+2];this.scene.children[0].children[t].selectable?this.isInside(l,i,r,a)&&this.isInside(c,i,r,a)&&this.isInside(h,i,r,a)&&this.isInside(u,i,r,a)&&(d.push(this.scene.children[0].children[t].geometry.totalLineId[e]),this.currentSelection[n]=1):(d.push(this.scene.children[0].children[t].geometry.totalLineId[e]),this.currentSelection[n]=1)}this.hideAllButSelected(this.currentSelection),console.log(this.currentSelection)}hideAllButSelected(t){this.makeAllElementsInvisible(),console.log("SelectionMap",t);for(let e=0;e<this.scene.children[0].children.length;e++){let n=this.scene.children[0].children[e].geometry.originIndex,r=this.createFilledArray(-1,this.scene.children[0].children[e].geometry.attributes.drawIndex.array.length-1);for(let i=0;i<this.scene.children[0].children[e].geometry.attributes.drawIndex.array.length;i++){void 0!==t[this.scene.children[0].children[e].geometry.totalLineId[i]]&&(r[i]=this.data.sets[e].entities[n][i])}this.scene.children[0].children[e].geometry.setAttribute("drawIndex",new i.Float32BufferAttribute(r,1)),this.scene.children[0].children[e].geometry.attributes.drawIndex.needsUpdate=!0}}getSelection(){return this.currentSelection}disableExportButton(){let t=document.getElementById("exportButton");t.style.opacity=.5,t.style.cursor="default",t.onclick=0}enableExportButtonAndHideStatus(){let t=document.getElementById("exportButton");t.style.opacity=1,t.style.cursor="pointer",t.onclick=this.exportSelection.bind(this),document.getElementById("exportButtonStatus").innerHTML=""}getExportLine(t,e,n,i){let r="";for(let a=0;a<i;a++)r+=t.positions[e][n*i+a]+";";for(let i=0;i<t.attributes.length;i++)void 0!==t.attributes[i].values&&(t.attributes[i].values.length<=e||t.attributes[i].values[e].length<=n||(r+=t.attributes[i].values[e][n]+";"));return r+="\n",r}getExportHeader(t,e,n){let i="",r=["x","y","z","w"];for(let t=0;t<n;t++)i+=r[t]+";";for(let n=0;n<t.attributes.length;n++)void 0!==t.attributes[n].values&&(t.attributes[n].values.length<=e||0!==t.attributes[n].values[e].length&&(i+=t.attributes[n].name+";"));return i+="\n",i}exportShowStatus(t,e,n,i=null){e%n==0&&(document.getElementById("exportButtonStatus").innerHTML=t+": "+e+(null===i?"":" of "+i))}exportPrepareData(){let t=this.currentSelection,e=[];for(let n=0;n<this.data.sets.length;n++){console.log("Iterate over data sets ... now set ",n);let i={};i.name=n+"_"+this.data.sets[n].name;let r=2;if("lines"!==this.data.sets[n].type)continue;i.states=[];let a=0;for(let e=0;e<this.data.sets[n].states.length;e++){console.log("Iterate over data set states ... now state ",e);let o={};o.name=e+"_"+this.data.sets[n].states[e].name;let s=0,l=-1;o.elements=[];for(let i=0;i<this.data.sets[n].entities.length;i++){let c=!1,h=-1,u="";for(let d=1;d<this.data.sets[n].indices[i].length;d++){let p=this.data.sets[n].indices[i][d];if(l!=p){if(h!==this.data.sets[n].entities[i][p]){a++,s-=r,this.exportShowStatus("Converting trajectories",a,100),c=!1,void 0===t[n.toString()+"_"+this.data.sets[n].entities[i][p].toString()]&&(c=!0),""!==u&&o.elements.push(u),u="",c||(u+=this.getExportHeader(this.data.sets[n].states[e],i,3),u+=this.getExportLine(this.data.sets[n].states[e],i,p,3))}else c||(u+=this.getExportLine(this.data.sets[n].states[e],i,p,3));h=this.data.sets[n].entities[i][p],l=p}}""!==u&&o.elements.push(u)}i.states.push(o)}e.push(i)}return console.log("Export:",e),e}exportSelection(){this.disableExportButton();let t=this.exportPrepareData(),e="export"+this.exportHandler.getExportFileName()+".zip";this.downloadZippedCsv(e,t)}downloadZippedCsv(t,e){let n=new d.a;for(let t=0;t<e.length;t++){let i=n.folder(e[t].name);for(let n=0;n<e[t].states.length;n++){let r=i.folder(e[t].states[n].name);for(let i=0;i<e[t].states[n].elements.length;i++)r.file(i+".csv",e[t].states[n].elements[i])}}console.log("Zip was prepared"),n.generateAsync({type:"blob"},function(t){this.exportShowStatus("Zipping",parseInt(t.percent),1,100)}.bind(this)).then(function(e){console.log("Create downloadable file"),this.exportHandler.downloadRaw(t,e),this.enableExportButtonAndHideStatus()}.bind(this))}setCamera(t){console.log(t),this.controls.reset();let e="+x"===t?2:"-x"===t?-2:0,n="+y"===t?2:"-y"===t?-2:0,i="+z"===t?2:"-z"===t?-2:0;0!==n&&(e=1e-7),console.log("set cam to ",e,n,i),this.camera.position.x=e,this.camera.position.y=n,this.camera.position.z=i,this.camera.updateProjectionMatrix(),this.controls.update()}rotateCamera(t){let e=new i.Matrix4,n=5/180*Math.PI;switch(String(t)){case"+x":e.makeRotationX(n);break;case"-x":e.makeRotationX(-n);break;case"+y":e.makeRotationY(n);break;case"-y":e.makeRotationY(-n);break;case"+z":e.makeRotationZ(n);break;case"-z":e.makeRotationZ(-n)}this.camera.position.applyMatrix4(e),this.camera.up.applyMatrix4(e),this.camera.updateProjectionMatrix(),this.controls.update()}onDocumentKeyDown(t){if(console.log("Event:",t.target.tagName.toLowerCase(),t.which),"input"==t.target.tagName.toLowerCase())return!1;let e=t.which;return console.log("Button "+e),83!=e||(this.pressingButton=!0,this.controls.enabled=!1,!1)}onDocumentKeyUp(t){let e=t.which;console.log("Done with "+e),83==e&&(this.pressingButton=!1,this.controls.enabled=!this.webVr)}onDocumentScroll(t){console.log("scroll")}doneLoading(){document.getElementById("loadingBox").className+=" hideMe",setTimeout((function(){document.getElementById("loadingBox").className+=" removeMe"}),1e3),document.title=this.actualTitle}setStatus(t,e,n,i){let r=100*(n-t)/(e-t);document.title=Math.round(r)+"% "+i+" - "+this.actualTitle}}class w{constructor(){this.elementCounter=0,this.elementGroupCounter=0,this.elementMap=[],this.types={},this.values={},this.defaultValues={}}hide(){document.getElementById("guiArea").classList.add("hideMe"),document.getElementById("guiAreaToggle").classList.add("hideMe")}unhide(){document.getElementById("guiArea").classList.remove("hideMe"),document.getElementById("guiAreaToggle").classList.remove("hideMe")}create(){let t=document.createElement("div");t.setAttribute("id","guiArea"),t.setAttribute("class","guiArea noSelect"),document.body.appendChild(t);let e=document.createElement("div");e.setAttribute("id","guiAreaToggle"),e.setAttribute("class","guiAreaToggle crossed"),e.onclick=this.toggle.bind(this),document.body.appendChild(e)}addHeadline(t){this.elementGroupCounter+=1;let e=document.getElementById("guiArea"),n=document.createElement("div");n.textContent=t,n.setAttribute("class","guiHeadline"),n.setAttribute("id","guiElemGroup"+this.elementGroupCounter),n.onclick=function(){this.classList.toggle("guiHeadlineOpened"),document.getElementsByName(this.getAttribute("id")).forEach((function(t){t.classList.toggle("hideGuiElement")}))},e.appendChild(n)}addFloat(t,e,n,i,r,a=!0){this.defaultValues[t]=i,this.elementMap[t]=this.elementCounter,this.types[t]="float";let o=document.getElementById("guiArea"),s=document.createElement("div");s.setAttribute("class","guiLine"+(a?" hideGuiElement":"")),s.setAttribute("name","guiElemGroup"+this.elementGroupCounter);let l=document.createElement("div");l.textContent=this.getDisplayName(t),l.setAttribute("class","guiTag");let c=document.createElement("input");c.setAttribute("type","number"),c.value=i,c.setAttribute("class","guiValueFloat");let h=document.createElement("input");h.setAttribute("id","guiElem"+this.elementCounter),h.setAttribute("type","range"),h.setAttribute("min",e),h.setAttribute("max",n),h.setAttribute("step",(n-e)/1e9),h.setAttribute("value",i),h.setAttribute("class","guiSlider"),s.appendChild(l),s.appendChild(h),s.appendChild(c),o.appendChild(s),c.addEventListener("input",function(){this.values[t]=c.value,h.value=c.value,r(c.value)}.bind(this),!1),h.addEventListener("input",function(){this.values[t]=h.value,c.value=h.value,r(h.value)}.bind(this),!1),this.elementCounter+=1}addSelection(t,e,n,i,r=!0){this.defaultValues[t]=n,this.elementMap[t]=this.elementCounter,this.types[t]="select";let a=document.getElementById("guiArea"),o=document.createElement("div");o.setAttribute("class","guiLine"+(r?" hideGuiElement":"")),o.setAttribute("name","guiElemGroup"+this.elementGroupCounter);let s=document.createElement("div");s.textContent=this.getDisplayName(t),s.setAttribute("class","guiTag");let l=document.createElement("select");l.setAttribute("class","guiSelect"),l.setAttribute("id","guiElem"+this.elementCounter);for(let t=0;t<e.length;t++){let i=document.createElement("option");i.textContent=e[t],t==n&&i.setAttribute("selected","selected"),l.appendChild(i)}o.appendChild(s),o.appendChild(l),a.appendChild(o),l.addEventListener("change",function(){this.values[t]=l.selectedIndex,i(l.selectedIndex)}.bind(this),!1),this.elementCounter+=1}addColor(t,e,n,i=!0){this.defaultValues[t]=e,this.elementMap[t]=this.elementCounter,this.types[t]="color";let r=document.getElementById("guiArea"),a=document.createElement("div");a.setAttribute("class","guiLine"+(i?" hideGuiElement":"")),a.setAttribute("name","guiElemGroup"+this.elementGroupCounter);let o=document.createElement("div");o.textContent=this.getDisplayName(t),o.setAttribute("class","guiTag");let s=document.createElement("input");s.setAttribute("class","guiColor"),s.setAttribute("id","guiElem"+this.elementCounter),s.setAttribute("value",e),s.setAttribute("type","color"),a.appendChild(o),a.appendChild(s),r.appendChild(a),s.addEventListener("change",function(){this.values[t]=s.value,n(s.value)}.bind(this),!1),this.elementCounter+=1}addMainHeadline(t){let e=document.getElementById("guiArea"),n=document.createElement("div");n.textContent=t,n.setAttribute("class","guiMainHeadline"),e.appendChild(n)}addHtml(t){let e=document.getElementById("guiArea"),n=document.createElement("div");n.setAttribute("class","guiBlock"),n.innerHTML=t,e.appendChild(n)}addChild(t){let e=document.getElementById("guiArea"),n=document.createElement("div");n.setAttribute("class","guiBlock"),n.appendChild(t),e.appendChild(n)}getDisplayName(t){let e=t.split("__");return 2==e.length?e[1]:t}toggle(){document.getElementById("guiArea").classList.toggle("guiAreaRestricted"),document.getElementById("guiAreaToggle").classList.toggle("crossed")}loadDefaults(){for(let t in this.defaultValues)console.log(t,this.defaultValues[t]),this.setValue(t,this.defaultValues[t])}getValue(t){let e="guiElem"+this.elementMap[t];return"select"==this.types[t]?document.getElementById(e).selectedIndex:document.getElementById(e).value}hasChanged(t){let e=this.getValue(t);return"select"==this.types[t]||"color"==this.types[t]?e!==this.defaultValues[t]:Math.abs(this.defaultValues[t]-e)>1e-4}setValue(t,e){let n="guiElem"+this.elementMap[t];"select"==this.types[t]?document.getElementById(n).selectedIndex=e:(document.getElementById(n).value=e,console.log(document.getElementById(n).value,e));let i=new Event("input",{bubbles:!0,cancelable:!0}),r=new Event("change");document.getElementById(n).dispatchEvent(i),document.getElementById(n).dispatchEvent(r)}scale(t){document.getElementById("guiArea").style.width=t+"px"}}var M=n(3),A=n.n(M),S=n(7),E=n.n(S);class T{constructor(t,e,n){this.linus=t,this.gui=e,this.camera=t.camera,this.tourCreatorCheckedSettings={},this.tourChangeCounter=0,this.tourPreviewCallback=n}prepareTourUrl(){let t=this.createTourCodeUrl();document.getElementById("resultBox").textContent=t,document.getElementById("resultBox").select()}prepareTourQR(){let t=this.createTourCodeUrl();console.log(t);let e=new E.a({value:t,size:1e3});v.a.saveAs(e.toDataURL(),"linus_tour.png")}create(){let t=document.createElement("div");t.setAttribute("id","tourCreator");let e=document.createElement("button");e.textContent="Get settings",e.onclick=this.addTourState.bind(this);let n=document.createElement("button");n.onclick=this.createTourCode.bind(this),n.textContent="Create code";let i=document.createElement("button");i.onclick=this.addTourCamera.bind(this),i.textContent="Get camera";let r=document.createElement("button");r.onclick=this.addTourMarker.bind(this),r.textContent="Add marker";let a=document.createElement("button");a.onclick=this.addTourSelection.bind(this),a.textContent="Use selection";let o=document.createElement("button");o.onclick=this.startPreview.bind(this),o.textContent="Preview";let s=document.createElement("input");s.setAttribute("type","text"),s.setAttribute("id","tourCreatorName"),s.setAttribute("value","myTourName");let l=document.createElement("ul");l.setAttribute("id","tourCreatorList");let c=document.createElement("textarea");c.onclick=this.prepareTourUrl.bind(this),c.setAttribute("id","resultBox"),c.setAttribute("readonly",""),c.textContent="Click here to create your custom URL";let h=document.createElement("a");h.href="#",h.innerHTML="QR Code",h.onclick=this.prepareTourQR.bind(this);let u=document.createElement("span"),d=document.createElement("span");d.innerHTML="Auto start on call?",d.style.marginLeft="20px";let p=document.createElement("input");p.setAttribute("type","checkbox"),p.setAttribute("id","autoStartCheckbox"),p.setAttribute("checked","checked"),u.appendChild(d),u.appendChild(p),t.appendChild(e),t.appendChild(i),t.appendChild(r),t.appendChild(a),t.appendChild(o),t.appendChild(l),t.appendChild(c),t.appendChild(h),t.appendChild(u),document.body.appendChild(t)}startPreview(){this.tourPreviewCallback(this.createTourCode())}getCameraUpVector(){let t=new i.Vector3(0,0,0),e=new i.Vector3(0,1,0),n=t.applyMatrix4(this.camera.matrixWorld),r=e.applyMatrix4(this.camera.matrixWorld).sub(n);return console.log("Up vector",r),r}createTourCode(t=-1,e=!1){let n="",i=document.getElementById("tourCreatorList").getElementsByTagName("li");for(let r=0;r<i.length;++r){let a=i[r].getElementsByClassName("tourItemName")[0].textContent,o=i[r].getElementsByClassName("tourItemDelay")[0].value,s=i[r].getElementsByClassName("tourItemDuration")[0].value;if(e&&(o=r/1e3,s=0),!i[r].getElementsByClassName("tourItemCheckbox")[0].parentElement.parentElement.classList.contains("tourItemDisabled")){if("tourChangeCamera"==i[r].getAttribute("name")){n+=o+"~camera~"+i[r].getElementsByClassName("tourItemCameraX")[0].value+","+i[r].getElementsByClassName("tourItemCameraY")[0].value+","+i[r].getElementsByClassName("tourItemCameraZ")[0].value+","+i[r].getElementsByClassName("tourItemCameraUpX")[0].value+","+i[r].getElementsByClassName("tourItemCameraUpY")[0].value+","+i[r].getElementsByClassName("tourItemCameraUpZ")[0].value+"~"+s+"\n"}else if("tourChangeMarker"==i[r].getAttribute("name")){console.log("Add marker"),n+=o+"~marker~"+i[r].getElementsByClassName("tourItemMarkerX")[0].value+","+i[r].getElementsByClassName("tourItemMarkerY")[0].value+","+i[r].getElementsByClassName("tourItemMarkerZ")[0].value+"~"+i[r].getElementsByClassName("tourItemMarkerText")[0].value+"~"+s+"\n"}else if("tourChangeSelection"==i[r].getAttribute("name")){console.log("Add Selection"),n+=o+"~selection~"+i[r].getElementsByClassName("tourItemSelectionValue")[0].value+"\n"}else{console.log(a),n+=o+"~fade~"+a+"~"+i[r].getElementsByClassName("tourItemValue")[0].value+"~"+s+"\n"}if(i[r].getAttribute("id")==t)break}else console.log("Skip element, it's inactive!")}return n}createTourCodeUrl(){let t=this.createTourCode(),e=new URL(window.location.href);return e.searchParams.delete("editor"),e.searchParams.delete("tour"),e.searchParams.append("tour",t),document.getElementById("autoStartCheckbox").checked&&e.searchParams.append("autoStartTour",""),e.toString().replace("main.html","index.html")}loadTour(t){console.log("Load tour");let e=t.split("\n");for(let t=0;t<e.length;t++){console.log(e[t]);let n=e[t].split("~"),i=parseFloat(n[0]),r=n[1];if("camera"===r){let t=n[2].split(","),e=parseFloat(t[0]),r=parseFloat(t[1]),a=parseFloat(t[2]),o=parseFloat(t[3]),s=parseFloat(t[4]),l=parseFloat(t[5]),c=parseFloat(n[3]);this.addTourCamera(i,e,r,a,o,s,l,c)}else if("fade"===r){let t=n[2],e=n[3],r=parseFloat(n[4]);e=isNaN(e)?e:parseFloat(e),this.addTourChange(i,t,e,r)}else if("marker"===r){let t=n[2].split(","),e=parseFloat(t[0]),r=parseFloat(t[1]),a=parseFloat(t[2]),o=n[3],s=parseFloat(n[4]);this.addTourMarker(i,e,r,a,o,s)}else"selection"===r&&this.addTourSelection(i,n[2])}}addTourSelection(t=null,e=null,n=null){e=null==e?JSON.stringify(this.linus.getSelection()):e;let i=document.getElementById("tourCreatorList"),r=document.createElement("div");r.setAttribute("class","tourElementContentArea");let a=document.createElement("input");a.setAttribute("type","hidden"),a.setAttribute("class","tourItemSelectionValue"),a.setAttribute("value",e),r.appendChild(a);let o=this.createBasicTourElements("Selection",t,n,r,!0,!0);o.setAttribute("id","tourChange"+this.tourChangeCounter),o.setAttribute("class","tourElement tourSelection"),o.setAttribute("name","tourChangeSelection"),this.tourChangeCounter++,i.appendChild(o);new A.a(i,{animation:150,handle:".tourDragHandle"})}addTourCamera(t=null,e=null,n=null,i=null,r=null,a=null,o=null,s=null){e=null==e?this.camera.position.x:e,n=null==n?this.camera.position.y:n,i=null==i?this.camera.position.z:i;let l=this.getCameraUpVector();r=null==r?l.x:r,a=null==a?l.y:a,o=null==o?l.z:o;let c=document.getElementById("tourCreatorList"),h=document.createElement("div");h.setAttribute("class","tourElementContentArea");let u=document.createElement("span");u.textContent="x: ";let d=document.createElement("span");d.textContent="y: ";let p=document.createElement("span");p.textContent="z: ";let f=document.createElement("input");f.setAttribute("type","number"),f.setAttribute("class","tourItemCameraX"),f.setAttribute("title","x coordinate in world space, which is roughly in range [2,2]"),f.setAttribute("value",e);let m=document.createElement("input");m.setAttribute("type","number"),m.setAttribute("class","tourItemCameraY"),m.setAttribute("title","y coordinate in world space, which is roughly in range [2,2]"),m.setAttribute("value",n);let g=document.createElement("input");g.setAttribute("type","number"),g.setAttribute("class","tourItemCameraZ"),g.setAttribute("title","z coordinate in world space, which is roughly in range [2,2]"),g.setAttribute("value",i),h.appendChild(u),h.appendChild(f),h.appendChild(d),h.appendChild(m),h.appendChild(p),h.appendChild(g);let v=document.createElement("span");v.textContent="x: ";let y=document.createElement("span");y.textContent="y: ";let b=document.createElement("span");b.textContent="z: ";let x=document.createElement("input");x.setAttribute("type","number"),x.setAttribute("class","tourItemCameraUpX"),x.setAttribute("title","x coordinate in world space, which is roughly in range [2,2]"),x.setAttribute("value",r);let _=document.createElement("input");_.setAttribute("type","number"),_.setAttribute("class","tourItemCameraUpY"),_.setAttribute("title","y coordinate in world space, which is roughly in range [2,2]"),_.setAttribute("value",a);let w=document.createElement("input");w.setAttribute("type","number"),w.setAttribute("class","tourItemCameraUpZ"),w.setAttribute("title","z coordinate in world space, which is roughly in range [2,2]"),w.setAttribute("value",o),h.appendChild(document.createElement("br")),h.appendChild(v),h.appendChild(x),h.appendChild(y),h.appendChild(_),h.appendChild(b),h.appendChild(w);let M=this.createBasicTourElements("Camera",t,s,h,!1);M.setAttribute("id","tourChange"+this.tourChangeCounter),M.setAttribute("class","tourElement tourCamera"),M.setAttribute("name","tourChangeCamera"),c.appendChild(M),this.tourChangeCounter++;new A.a(c,{animation:150,handle:".tourDragHandle"})}addTourMarker(t=null,e=null,n=null,i=null,r=null,a=null){e=null==e?0:e,n=null==n?0:n,i=null==i?0:i,r=null==r?"My marker content":r;let o=document.getElementById("tourCreatorList"),s=document.createElement("div");s.setAttribute("class","tourElementContentArea");let l=document.createElement("span");l.textContent="Text: ",l.setAttribute("class","tourItemValueHeadline");let c=document.createElement("span");c.textContent="x: ";let h=document.createElement("span");h.textContent="y: ";let u=document.createElement("span");u.textContent="z: ";let d=document.createElement("input");d.setAttribute("type","number"),d.setAttribute("class","tourItemMarkerX"),d.setAttribute("title","x coordinate in data space"),d.setAttribute("value",e);let p=document.createElement("input");p.setAttribute("type","number"),p.setAttribute("class","tourItemMarkerY"),p.setAttribute("title","y coordinate in data space"),p.setAttribute("value",n);let f=document.createElement("input");f.setAttribute("type","number"),f.setAttribute("class","tourItemMarkerZ"),f.setAttribute("title","z coordinate in data space"),f.setAttribute("value",i);let m=document.createElement("input");m.setAttribute("type","text"),m.setAttribute("class","tourItemMarkerText"),m.setAttribute("value",r),s.appendChild(l),s.appendChild(m),s.appendChild(document.createElement("br")),s.appendChild(c),s.appendChild(d),s.appendChild(h),s.appendChild(p),s.appendChild(u),s.appendChild(f);let g=this.createBasicTourElements("Marker",t,a,s,!1);g.setAttribute("id","tourChange"+this.tourChangeCounter),g.setAttribute("class","tourElement tourMarker"),g.setAttribute("name","tourChangeMarker"),this.tourChangeCounter++,o.appendChild(g);new A.a(o,{animation:150,handle:".tourDragHandle"})}addTourState(){console.log("add tour state");let t=Object.keys(this.gui.values);for(let e=0;e<t.length;e++)console.log("check",e),void 0!==this.tourCreatorCheckedSettings[t[e]]?this.tourCreatorCheckedSettings[t[e]]!=this.gui.values[t[e]]&&(console.log("Entry ",t[e]," has changed"),this.addTourChange(null,t[e],this.gui.values[t[e]])):this.gui.hasChanged(t[e])&&(console.log("Entry ",t[e]," is new"),console.log(this.gui.values[t[e]]),console.log(this.gui.defaultValues[t[e]]),this.addTourChange(null,t[e],this.gui.values[t[e]]));this.tourCreatorCheckedSettings=JSON.parse(JSON.stringify(this.gui.values))}addTourChange(t=null,e=null,n=null,i=null){e=null==e?"":e,n=null==n?"":n;let r=document.getElementById("tourCreatorList"),a=document.createElement("div");a.setAttribute("class","tourElementContentArea"),console.log("Add parameter: ",this.gui.types[e]);let o="float"!=this.gui.types[e]&&"color"!=this.gui.types[e],s=document.createElement("span");s.textContent="Value: ",s.setAttribute("class","tourItemValueHeadline");let l=document.createElement("input");l.setAttribute("type","text"),l.setAttribute("class","tourItemValue"),l.setAttribute("value",n),l.setAttribute("id","value"),a.appendChild(s),a.appendChild(l);let c=this.createBasicTourElements(e,t,i,a,o);c.setAttribute("id","tourChange"+this.tourChangeCounter),c.setAttribute("class","tourElement tourChange"),c.setAttribute("name","tourChangeProperty"),console.log("Add content"),this.tourChangeCounter++,r.appendChild(c);new A.a(r,{animation:150,handle:".tourDragHandle"})}createBasicTourElements(t,e=null,n,i,r,a=!1){let o=document.createElement("li");o.setAttribute("class","tourItemHolder"),e=null==e||isNaN(e)?1:e,n=null==n||isNaN(n)?1:n;let s=document.createElement("span");s.setAttribute("class","tourItemControlArea"),document.createElement("span").setAttribute("class","tourItemDelayHeadline");let l=document.createElement("span");l.textContent="s ";let c=document.createElement("img");c.setAttribute("class","tourDragHandle"),c.src="./layout/symbols/hamburger.svg";let h=document.createElement("span");h.setAttribute("class","tourItemCheckbox"),h.setAttribute("onclick","this.parentElement.parentElement.classList.toggle('tourItemDisabled')"),h.innerHTML="&nbsp;";let u=document.createElement("img");u.setAttribute("class","tourItemPreview"),u.src="./layout/symbols/eye.svg";let d="tourChange"+this.tourChangeCounter;u.onclick=function(){this.previewSituation(d)}.bind(this),s.appendChild(u);let p=document.createElement("div");if(p.setAttribute("class","settingsHolder"),p.appendChild(i),!a){let t=document.createElement("img");t.setAttribute("class","tourItemOpenSettings"),t.src="./layout/symbols/edit.svg",t.onclick=function(){p.classList.toggle("tourElementContentAreaShow")}.bind(this),s.appendChild(t)}let f=document.createElement("span"),m=document.createElement("span"),g=document.createElement("input"),v=document.createElement("span");v.textContent="s ",g.setAttribute("type","number"),g.setAttribute("min","0"),g.setAttribute("max","100000"),g.setAttribute("value",e),g.setAttribute("title","delay in seconds after which this step should be performed"),g.setAttribute("class","tourItemDelay"),m.appendChild(g),m.appendChild(v),f.appendChild(m),f.setAttribute("class","tourItemDelayBox");let y=document.createElement("div");y.setAttribute("class","tourItemContentBox");let b=document.createElement("span");b.setAttribute("class","tourItemName"),b.textContent=t,y.appendChild(b);let x=document.createElement("input");x.setAttribute("type",r?"hidden":"number"),x.setAttribute("class","tourItemDuration"),x.setAttribute("min","0"),x.setAttribute("max","100000"),x.setAttribute("value",n),x.setAttribute("title","duration in seconds this step should take"),s.appendChild(c),s.appendChild(h),r||y.appendChild(document.createElement("br")),y.appendChild(x),r||y.appendChild(l),y.appendChild(document.createElement("br")),y.appendChild(p),s.appendChild(y);let _=document.createElement("img");_.setAttribute("class","tourItemArrow"),_.src="./layout/symbols/triangle.svg";let w=document.createElement("img");return w.src="./layout/symbols/triangle.svg",w.setAttribute("class","tourItemArrow"),o.appendChild(f),o.appendChild(_),o.appendChild(s),o.appendChild(w),o}previewSituation(t){console.log("Preview situation",t);let e=this.createTourCode(t,!0);this.tourPreviewCallback(e)}}class C{constructor(t,e){this.linus=t,this.gui=e,this.camera=t.camera,this.timer=0,this.timerSpeed=1,this.timerSpeedInput=0,this.tours={},this.tourEditor=new T(t,e,this.tourPreview.bind(this)),this.isShowingEditor=!1}create(){document.createElement("div").setAttribute("id","editorLinkHolder");let t=document.createElement("a");t.innerHTML="&bull; Open tour editor",t.href="#",t.id="tourEditorButton",t.onclick=this.showTourEditor.bind(this),this.gui.addChild(t),this.gui.addFloat("Tour speed",-10,10,0,function(t){this.setTourSpeed(t)}.bind(this),!1);let e=document.createElement("div");e.setAttribute("id","tourList");let n=!1;for(let t in this.tours){console.log("Add tour",t);let i=document.createElement("a"),r={context:this,id:t};i.onclick=function(){this.context.startOrLoadTour(this.id,!1)}.bind(r),i.innerHTML="&bull;  "+t+"<br />",i.href="#",e.appendChild(i),n=!0}if(n){let t=document.createElement("span");t.innerHTML="Start a tour:",t.id="tourEditorHeadline",this.gui.addChild(t)}this.gui.addChild(e)}tourPreview(t){console.log("Received preview code",t),this.resetTourTimer(),this.moveCameraTo(0,0,0,2,0,1,0,0),this.gui.loadDefaults(),this.startTourByString(t,!1)}changeStartTourHeadline(t){let e=document.getElementById("tourEditorHeadline");null!==e&&(e.innerHTML=t)}hideTourEditorLink(){let t=document.getElementById("tourEditorButton");t.parentElement.removeChild(t)}showTourEditor(){this.isShowingEditor||(this.changeStartTourHeadline("Add tour to editor:"),this.isShowingEditor=!0,this.hideTourEditorLink(),this.tourEditor.create())}addTour(t,e){this.tours[t]=e,this.isShowingEditor&&this.tourEditor.loadTour(e)}setTourSpeed(t){this.timerSpeedInput=t}resetTourTimer(){this.timer=0;let t=this.timerSpeedInput;this.timerSpeed=t>=0?1/(t+1):Math.abs(t-1),console.log("Timer speed:",this.timerSpeed)}showMenu(){setTimeout(function(){this.gui.unhide()}.bind(this),this.timer)}startOrLoadTour(t,e=!0){this.isShowingEditor?this.tourEditor.loadTour(this.tours[t]):this.startTour(t,e)}startTour(t,e=!0){console.log("Tour",t),this.startTourByString(this.tours[t],e)}startTourByString(t,e=!0){console.log("Start tour",t),this.resetTourTimer(),this.gui.hide();let n=t.split("\n");for(let t=0;t<n.length;t++){console.log(n[t]);let e=n[t].split("~"),i=parseFloat(e[0]),r=e[1];if("camera"===r){let t=e[2].split(","),n=parseFloat(t[0]),r=parseFloat(t[1]),a=parseFloat(t[2]),o=parseFloat(t[3]),s=parseFloat(t[4]),l=parseFloat(t[5]),c=parseFloat(e[3]);this.moveCameraTo(i,n,r,a,o,s,l,c)}else if("fade"===r){let t=e[2],n=e[3],r=parseFloat(e[4]);n=isNaN(n)?n:parseFloat(n),this.fadeParameter(i,t,n,r)}else if("marker"===r){let t=e[2].split(","),n=parseFloat(t[0]),r=parseFloat(t[1]),a=parseFloat(t[2]),o=e[3],s=parseFloat(e[4]);this.addMarker(i,n,r,a,o,s)}else"selection"===r&&this.setSelection(i,JSON.parse(e[2]))}e&&this.timer>0?setTimeout(function(){this.startTourByString(t)}.bind(this),this.timer):this.showMenu()}addMarker(t,e,n,i,r,a){this.timer+=1e3*t*this.timerSpeed;let o={};o.x=e,o.y=n,o.z=i,o.name=Math.random(),o.text=r,o.context=this.linus,setTimeout((function(t){t.context.addAnnotation(t.name,t.x,t.y,t.z,t.text)}),this.timer,o),setTimeout((function(t){t.context.removeAnnotation(t.name)}),this.timer+1e3*a*this.timerSpeed,o),this.timer+=1e3*a*this.timerSpeed}removeMarker(t,e){this.timer+=1e3*t*this.timerSpeed;let n={};n.name=e,n.context=this,setTimeout((function(t){t.context.removeAnnotation(t.name)}),this.timer,n)}setParameter(t,e,n){this.timer+=1e3*t*this.timerSpeed;let i={};i.name=e,i.value=n,i.gui=this.gui,setTimeout((function(t){t.gui.setValue(t.name,t.value)}),this.timer,i)}setSelection(t,e){console.log(e),this.timer+=1e3*t*this.timerSpeed;let n={};n.value=e,n.context=this.linus,setTimeout((function(t){t.context.hideAllButSelected(t.value)}),this.timer,n)}clearSelection(t){this.timer+=1e3*t*this.timerSpeed;let e={};e.context=this.linus,setTimeout((function(t){e.context.makeAllElementsVisible()}),this.timer,e)}moveCameraAroundY(t,e){this.timer+=1e3*t*this.timerSpeed;let n={};n.timespan=e*this.timerSpeed,n.context=this.linus,setTimeout((function(t){t.context.moveCameraAroundYHelper(t)}),this.timer,n),this.timer+=1e3*e*this.timerSpeed}moveCameraAroundYHelper(t){let e=Math.atan(t.context.camera.position.x,t.context.camera.position.z),n=Math.sqrt(t.context.camera.position.x*t.context.camera.position.x+t.context.camera.position.z*t.context.camera.position.z);console.log("Start angle ",e),console.log("Radius, ",n);let r=30*t.timespan,a=0;for(let o=0;o<r;o++){a=e+o/r*2*3.142;let s={};s.name=t.name,s.context=t.context,s.x=n*Math.sin(a),s.y=t.context.camera.position.y,s.z=n*Math.cos(a),setTimeout((function(t){t.context.camera.position.set(t.x,t.y,t.z),t.context.camera.lookAt(new i.Vector3(0,0,0))}),o*(1e3/30),s)}}moveCameraTo(t,e,n,i,r,a,o,s){this.timer+=1e3*t*this.timerSpeed;let l={};l.name=name,l.x=e,l.y=n,l.z=i,l.upX=r,l.upY=a,l.upZ=o,l.timespan=s*this.timerSpeed,l.context=this,l.linus=this.linus,setTimeout((function(t){t.context.moveCameraHelper(t)}),this.timer,l),this.timer+=1e3*s*this.timerSpeed}ease(t,e){let n=t/e,i=e*(Math.pow(n,2)/(Math.pow(n,2)+Math.pow(1-n,2)));return console.log(t,i),i}moveCameraHelper(t){let e=t.context.camera.position.x,n=t.context.camera.position.y,r=t.context.camera.position.z,a=t.context.camera.up.x,o=t.context.camera.up.y,s=t.context.camera.up.z,l=Math.max(1,60*t.timespan);console.log(l);let c=(t.x-e)/l,h=(t.y-n)/l,u=(t.z-r)/l,d=(t.upX-a)/l,p=(t.upY-o)/l,f=(t.upZ-s)/l;console.log("Up:",d,p,f);let m=Math.max(1,60*t.timespan);for(let l=1;l<=m;l++){let g=this.ease(l,m),v={};v.name=t.name,v.context=t.context,v.linus=t.linus,v.x=e+g*c,v.y=n+g*h,v.z=r+g*u,v.upX=a+g*d,v.upY=o+g*p,v.upZ=s+g*f,setTimeout((function(t){t.linus.cameraUpdateCallback=function(){t.linus.camera.position.set(t.x,t.y,t.z),t.linus.camera.up.set(t.upX,t.upY,t.upZ),t.linus.camera.lookAt(new i.Vector3(0,0,0)),t.linus.cameraUpdateCallback=function(){}}.bind(t)}),l*(1e3/60),v)}}fadeParameter(t,e,n,r){this.timer+=1e3*t*this.timerSpeed;let a={};a.name=e,"float"==this.gui.types[a.name]?(n=parseFloat(n),a.type="float"):"color"==this.gui.types[a.name]?a.type="color":(a.type="selection",r=0),a.to=n,a.duration=r*this.timerSpeed,a.context=this,a.gui=this.gui,setTimeout((function(t){t.context.fadeParameterHelper(t),t.context.camera.lookAt(new i.Vector3(0,0,0))}),this.timer,a),this.timer+=1e3*r*this.timerSpeed}interpolateColor(t,e,n){var i=parseInt(t.replace(/#/g,""),16),r=i>>16,a=i>>8&255,o=255&i,s=parseInt(e.replace(/#/g,""),16);return"#"+((1<<24)+(r+n*((s>>16)-r)<<16)+(a+n*((s>>8&255)-a)<<8)+(o+n*((255&s)-o))|0).toString(16).slice(1)}fadeParameterHelper(t){let e=t.gui.getValue(t.name);"float"==t.gui.types[t.name]&&(e=parseFloat(e));let n=Math.max(0,30*t.duration),i=(t.to-e)/n;for(let r=0;r<n;r++){let a={};a.name=t.name,a.gui=t.gui,console.log(t.type),"float"==t.type?a.value=e+r*i:"color"==t.type&&(a.value=t.context.interpolateColor(e,t.to,r/n)),setTimeout((function(t){t.gui.setValue(t.name,t.value)}),30*r,a)}let r={};r.name=t.name,r.gui=t.gui,r.value=t.to,setTimeout((function(t){t.gui.setValue(t.name,t.value)}),30*n,r)}}class L{constructor(t){this.tourList=t,console.time("time to load data");let e=new URL(window.location.href);if(window.location.protocol.includes("http")){let t=e.toString().substring(0,e.toString().lastIndexOf("/"))+"/data/data.json";this.handleLoadingFromServer(t)}else this.handleLoadingFromLocal()}handleLoadingFromLocal(){console.log("This script runs locally");let t=document.createElement("script");t.onload=()=>{this.receiveData(data)},t.src="data/data.json",document.head.appendChild(t)}handleLoadingFromServer(t){console.log("This script runs on a server. ");let e=new XMLHttpRequest;e.open("GET",t),e.onprogress=t=>{let e=-1,n=1;t.lengthComputable&&(e=t.loaded,n=t.total),this.handleProgress(e,n)},e.onload=()=>{console.log(e.responseType),this.receiveDataFromServer(e.responseText)},e.send()}roundMegaBytes(t){return Math.ceil(t/1024/1024)}handleProgress(t,e){let n=t/e*100;document.getElementById("loadingBarInner").style.width=n+"%",document.getElementById("loadingBarInnerStatus").innerHTML=t>0?this.roundMegaBytes(t)+"MB of "+this.roundMegaBytes(e)+"MB":""}receiveDataFromServer(t){let e=t.replace("var data = ",""),n=null;"{"===e.charAt(0)?(console.log("Non-Zipped"),n=JSON.parse(e)):(console.log("Zipped"),n=e.slice(1,-1)),this.receiveData(n)}receiveData(t){"string"==typeof t?this.loadData(t):void 0!==t.compressed?(console.log("Zipped ("+t.codec+"), raw bytes"),this.loadBinaryFile(t.compressed,t=>this.loadData(new Uint8Array(t)))):void 0!==t.binary?(console.log("Binary"),this.loadBinaryFile(t.binary,e=>this.loadData(this.resolveBinaryReferences(t,e)))):this.loadData(t)}loadBinaryFile(t,e){let n=new XMLHttpRequest;n.open("GET","data/"+t),n.responseType="arraybuffer",n.onprogress=t=>{this.handleProgress(t.lengthComputable?t.loaded:-1,t.lengthComputable?t.total:1)},n.onload=()=>{e(n.response)},n.onerror=()=>{console.error("Could not load data/"+t+". This data must be opened via a (local) web server.")},n.send()}resolveBinaryReferences(t,e){if(Array.isArray(t))return t.map(t=>this.resolveBinaryReferences(t,e));if(null===t||"object"!=typeof t)return t;if("float32"==t.binaryType)return new Float32Array(e,t.offset,t.length);if("uint32"==t.binaryType)return new Uint32Array(e,t.offset,t.length);if("uint16"==t.binaryType)return new Uint16Array(e,t.offset,t.length);for(let n in t)t[n]=this.resolveBinaryReferences(t[n],e);return t}loadData(t){console.timeEnd("time to load data");let e=new w,n=new _(e);n.setData(t);let i=new URL(window.location.href);n.setAA(null!==i.searchParams.get("aa")),n.setShowFps(null!==i.searchParams.get("fps")),n.disableGUI(null!==i.searchParams.get("nogui")),n.setLOD(i.searchParams.get("lod")?i.searchParams.get("lod"):1),n.setVr(null!==i.searchParams.get("vr")),onmousedown=n.onmousedown.bind(n),onmousemove=n.onmousemove.bind(n),onmouseup=n.onmouseup.bind(n),ondblclick=n.ondblclick.bind(n),n.start();let r=new C(n,e);if(null!==i.searchParams.get("editor")&&r.showTourEditor(),null!==i.searchParams.get("tour")&&r.addTour("Default tour",i.searchParams.get("tour")),r=this.addMoreTours(r),r.create(),null!==i.searchParams.get("autoStartTour")){let t=i.searchParams.get("autoStartTour");""===t&&(t="Default tour"),r.startTour(t)}}addMoreTours(t){console.log("Check for additional tours - found",this.tourList.length);for(let e=0;e<this.tourList.length;e++)t.addTour(this.tourList[e].name,this.tourList[e].code);return t}}}])}));
\ No newline at end of file
@@ -16,6 +16,7 @@ import {
     LineSegments,
     Box3,
     BufferGeometry,
+    BufferAttribute,
     Float32BufferAttribute,
     PerspectiveCamera,
     Scene,
@@ -130,6 +131,45 @@ export default class Linus {
         this.data = data;
     }
 
+    // zlib and gzip are detected by pako, raw deflate streams have no header
+    inflate(compressed) {
+        try {
+            return Pako.inflate(compressed, { to: "string" });
+        } catch (e) {
+            return Pako.inflateRaw(compressed, { to: "string" });
+        }
+    }
+
+    // Quantized positions/attributes (see "quantization" of a set) are converted back to floats
+    dequantizeData() {
+        for (let i = 0; i < this.data.sets.length; i++) {
+            let quantization = this.data.sets[i].quantization;
+            if (quantization === undefined) continue;
+            for (let j = 0; j < this.data.sets[i].states.length; j++) {
+                let state = this.data.sets[i].states[j];
+                if (quantization.positions !== undefined) {
+                    state.positions = state.positions.map(p => this.dequantize(p, quantization.positions));
+                }
+                for (let a = 0; a < state.attributes.length; a++) {
+                    let parameters = quantization.attributes[state.attributes[a].name];
+                    if (parameters !== undefined) {
+                        state.attributes[a].values = state.attributes[a].values.map(v => this.dequantize(v, parameters));
+                    }
+                }
+            }
+        }
+    }
+
+    // value = quantized * scale + offset, scale and offset per dimension
+    dequantize(values, parameters) {
+        let dim = parameters.scale.length;
+        let result = new Float32Array(values.length);
+        for (let i = 0; i < values.length; i++) {
+            result[i] = values[i] * parameters.scale[i % dim] + parameters.offset[i % dim];
+        }
+        return result;
+    }
+
     // Setter for a data file that follows our JSON layout
     setVr(shouldEnable) {
         this.webVr = shouldEnable;
@@ -360,6 +400,27 @@ export default class Linus {
         return arr;
     }
 
+    // Float32Array of values followed by tail. A Float32Array without tail (binary export)
+    // is returned as it is, so the buffer attribute uses the loaded data without a copy
+    concatFloat32(values, tail = []) {
+        if (tail.length == 0 && values instanceof Float32Array) {
+            return values;
+        }
+        let result = new Float32Array(values.length + tail.length);
+        result.set(values);
+        result.set(tail, values.length);
+        return result;
+    }
+
+    // Uint32Array of indices followed by tail. Always a copy, since sorting the scene
+    // reorders the index of a geometry in place
+    concatUint32(values, tail = []) {
+        let result = new Uint32Array(values.length + tail.length);
+        result.set(values);
+        result.set(tail, values.length);
+        return result;
+    }
+
     // Just a little helper to shuffle an array
     shuffle(a) {
         let j, x, i;
@@ -937,23 +998,18 @@ export default class Linus {
         let setIds = this.createFilledArray(i, numElementsWithAxes - 1);
         let axeType = this.createFilledArray(0, numElements - 1);
 
-        let drawIndexValues = JSON.parse(JSON.stringify(this.data.sets[i].entities[k]));
-        let primitiveIndices = JSON.parse(JSON.stringify(this.data.sets[i].indices[k]));
-        
-
-        let positions = JSON.parse(JSON.stringify(this.data.sets[i].states[0].positions[k]));
+        let axes = [];
+        let axesIndices = [];
         if(this.data.sets[i].axes !== undefined) {
-            for (let axeItem = 0; axeItem < this.data.sets[i].axes.length / elementSize; axeItem++) {
-                drawIndexValues.push(-1)
+            axes = this.data.sets[i].axes;
+            axesIndices = this.data.sets[i].axesIndices.map(index => index + numElements);
+            for (let axeItem = 0; axeItem < axesElements; axeItem++) {
                 axeType.push(1)
-                for (let d = 0; d < dim; d++) {
-                    positions.push(this.data.sets[i].axes[dim * axeItem + d])
-                }
-            }
-            for (let axeItem = 0; axeItem < this.data.sets[i].axesIndices.length; axeItem++) {
-                primitiveIndices.push(this.data.sets[i].axesIndices[axeItem] + numElements)
             }
         }
+        let drawIndexValues = this.concatFloat32(this.data.sets[i].entities[k], this.createFilledArray(-1, axesElements - 1));
+        let primitiveIndices = this.concatUint32(this.data.sets[i].indices[k], axesIndices);
+        let positions = this.concatFloat32(this.data.sets[i].states[0].positions[k], axes);
 
         geometry.setAttribute(
             "setId", 
@@ -961,7 +1017,7 @@ export default class Linus {
 
         geometry.setAttribute(
             "drawIndex",
-            new Float32BufferAttribute(drawIndexValues, 1)
+            new BufferAttribute(drawIndexValues, 1)
         );
 
         geometry.setAttribute(
@@ -972,11 +1028,11 @@ export default class Linus {
         // Make it twice (once here, once as attribute), otherwise three js problems
         geometry.setAttribute(
             "position",
-            new Float32BufferAttribute(positions, dim)
+            new BufferAttribute(positions, dim)
         );
 
 
-        geometry.setIndex(primitiveIndices);
+        geometry.setIndex(new BufferAttribute(primitiveIndices, 1));
         this.numGlPrimitives += primitiveIndices / 2;
 /*
         console.log("--- Positions " )
@@ -1004,13 +1060,7 @@ export default class Linus {
             j < numStates;
             j++ 
         ) {
-            let positionsState = JSON.parse(JSON.stringify(this.data.sets[i].states[j].positions[k]));
-
-            if(this.data.sets[i].axes !== undefined) {
-                for (let axePos = 0; axePos < this.data.sets[i].axes.length; axePos++) {
-                    positionsState.push(this.data.sets[i].axes[axePos])
-                }
-            }
+            let positionsState = this.concatFloat32(this.data.sets[i].states[j].positions[k], axes);
 
             let last = [];
             for (let l = positionsState.length - dim; l < positionsState.length; l++) {
@@ -1019,13 +1069,13 @@ export default class Linus {
 
             geometry.setAttribute(
                 "position" + j,
-                new Float32BufferAttribute(positionsState, dim)
+                new BufferAttribute(positionsState, dim)
             );
 
             geometry.setAttribute(
                 "nextPosition" + j,
-                new Float32BufferAttribute(
-                    positionsState.slice(dim).concat(last),
+                new BufferAttribute(
+                    this.concatFloat32(positionsState.subarray(dim), last),
                     dim
                     )
                     );
@@ -1053,24 +1103,17 @@ export default class Linus {
                     continue;
                 }
 
-                let values = JSON.parse(JSON.stringify(this.data.sets[i].states[j].attributes[a].values[
-                    k
-                ])); 
-
-                if(this.data.sets[i].axes !== undefined) {
-                    for (let axePos = 0; axePos < this.data.sets[i].axes.length / elementSize; axePos++) {
-                        for(let fillDim = 0; fillDim < aDim; fillDim++) {
-                            values.push(0)
-                        }
-                    }
-                }
+                let values = this.concatFloat32(
+                    this.data.sets[i].states[j].attributes[a].values[k],
+                    this.createFilledArray(0, axesElements * aDim - 1)
+                );
 
                 if (shared == false) {
                     attName += j; // If we save all attributes, name them with number
                 }
                 geometry.setAttribute(
                     this.cleanVarName(attName),
-                    new Float32BufferAttribute(values, aDim)
+                    new BufferAttribute(values, aDim)
                 );
                 /*
                 console.log("----- att " + this.cleanVarName(attName))
@@ -1123,32 +1166,30 @@ export default class Linus {
         geometry.originIndex = k;
 
         let setIds = this.createFilledArray(i, numElements - 1);
-        let drawIndexValues = JSON.parse(
-            JSON.stringify(this.data.sets[i].entities[k])
-        ); // this.createFilledArray(1, numElements - 1)
+        let drawIndexValues = this.concatFloat32(this.data.sets[i].entities[k]); // this.createFilledArray(1, numElements - 1)
 
         geometry.setAttribute("setId", new Float32BufferAttribute(setIds, 1));
         geometry.setAttribute(
             "drawIndex",
-            new Float32BufferAttribute(drawIndexValues, 1)
+            new BufferAttribute(drawIndexValues, 1)
         );
 
         // Make it twice (once here, once as attribute), otherwise three js problems
         geometry.setAttribute(
             "position",
-            new Float32BufferAttribute(
-                this.data.sets[i].states[0].positions[k],
+            new BufferAttribute(
+                this.concatFloat32(this.data.sets[i].states[0].positions[k]),
                 dim
             )
         );
         geometry.setAttribute(
             "normalCustom",
-            new Float32BufferAttribute(
-                this.data.sets[i].states[0].normals[k],
+            new BufferAttribute(
+                this.concatFloat32(this.data.sets[i].states[0].normals[k]),
                 dim
             )
         );
-        geometry.setIndex(this.data.sets[i].indices[k]);
+        geometry.setIndex(new BufferAttribute(this.concatUint32(this.data.sets[i].indices[k]), 1));
         this.numGlPrimitives += this.data.sets[i].indices[k].length / 3;
 
         for (
@@ -1166,7 +1207,7 @@ export default class Linus {
 
             geometry.setAttribute(
                 "position" + j,
-                new Float32BufferAttribute(positions, dim)
+                new BufferAttribute(this.concatFloat32(positions), dim)
             );
 
             for (
@@ -1190,7 +1231,7 @@ export default class Linus {
                 }
                 geometry.setAttribute(
                     this.cleanVarName(attName),
-                    new Float32BufferAttribute(values, aDim)
+                    new BufferAttribute(this.concatFloat32(values), aDim)
                 );
 
                 for (let vv = 0; vv < values.length; vv++) {
@@ -1634,13 +1675,14 @@ export default class Linus {
         father.name = "father";
 
         // All the static uniforms
-        if (typeof this.data == "string") {
+        if (typeof this.data == "string" || this.data instanceof Uint8Array) {
             //alert("Data looks zipped. This saves 90% of traffic but takes some seconds extra to unzip.");
-            this.data = JSON.parse(
-                Pako.inflate(atob(this.data), { to: "string" })
-            );
+            // Either a base64 string or the raw bytes (of a separate file)
+            let compressed = typeof this.data == "string" ? atob(this.data) : this.data;
+            this.data = JSON.parse(this.inflate(compressed));
             console.log("Inflating object done");
         }
+        this.dequantizeData();
 
         console.log(this.data);
         for (let i = 0; i < this.data.sets.length; i++) {
@@ -2980,17 +3022,14 @@ export default class Linus {
                     newValuesAxes.push(-1);
                 }
             }
-            let newValues = JSON.parse(
-                JSON.stringify(this.data.sets[i].entities[k])
-            );
-            newValues = newValues.concat(newValuesAxes)
+            let newValues = this.concatFloat32(this.data.sets[i].entities[k], newValuesAxes);
             console.log("Draw index values", newValues)
             
             //this.scene.children[0].children[i].geometry.attributes.drawIndex.setArray(new Float32Array(newValues));
             
             this.scene.children[0].children[i].geometry.setAttribute(
                 "drawIndex",
-                new Float32BufferAttribute(newValues, 1)
+                new BufferAttribute(newValues, 1)
                 );
             this.scene.children[0].children[i].geometry.attributes.drawIndex.needsUpdate = true;
             for (let j = 0; j < this.scene.children[0].children[i].geometry.totalLineId.length; j++) {
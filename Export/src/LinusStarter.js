@@ -34,7 +34,7 @@ export class LinusStarter {
     handleLoadingFromLocal() {
         console.log("This script runs locally")
         let script = document.createElement('script');
-        script.onload = () => { this.loadData(data) };
+        script.onload = () => { this.receiveData(data) };
         script.src = "data/data.json";
         document.head.appendChild(script);
     }
@@ -96,7 +96,74 @@ export class LinusStarter {
             console.log("Zipped")
             data = receivedData.slice(1, -1) // Zipped - remove surrounding quotes
         }
-        this.loadData(data)
+        this.receiveData(data)
+    }
+
+    /**
+     * Data exported with writeBinary only holds references into a binary
+     * file (data.binary), which must be loaded before we can start. Zipped
+     * data can also be stored as raw bytes in a separate file (data.compressed).
+     */
+    receiveData(data) {
+        if (typeof data == "string") {
+            this.loadData(data)
+        }
+        else if (data.compressed !== undefined) {
+            console.log("Zipped (" + data.codec + "), raw bytes")
+            this.loadBinaryFile(data.compressed, (buffer) => this.loadData(new Uint8Array(buffer)))
+        }
+        else if (data.binary !== undefined) {
+            console.log("Binary")
+            this.loadBinaryFile(data.binary, (buffer) => this.loadData(this.resolveBinaryReferences(data, buffer)))
+        }
+        else {
+            this.loadData(data)
+        }
+    }
+
+    /**
+     * Loads a file from the data folder as ArrayBuffer (only works via http)
+     */
+    loadBinaryFile(filename, onLoad) {
+        let client = new XMLHttpRequest();
+        client.open('GET', "data/" + filename);
+        client.responseType = "arraybuffer";
+        client.onprogress = (e) => {
+            this.handleProgress(e.lengthComputable ? e.loaded : -1, e.lengthComputable ? e.total : 1);
+        }
+        client.onload = () => {
+            onLoad(client.response)
+        }
+        client.onerror = () => {
+            console.error("Could not load data/" + filename + ". This data must be opened via a (local) web server.")
+        }
+        client.send();
+    }
+
+    /**
+     * Replaces all references {binaryType, offset, length} by typed arrays,
+     * which are views on the loaded buffer (no copy).
+     */
+    resolveBinaryReferences(item, buffer) {
+        if (Array.isArray(item)) {
+            return item.map(x => this.resolveBinaryReferences(x, buffer))
+        }
+        if (item === null || typeof item != "object") {
+            return item
+        }
+        if (item.binaryType == "float32") {
+            return new Float32Array(buffer, item.offset, item.length)
+        }
+        if (item.binaryType == "uint32") {
+            return new Uint32Array(buffer, item.offset, item.length)
+        }
+        if (item.binaryType == "uint16") {
+            return new Uint16Array(buffer, item.offset, item.length)
+        }
+        for (let key in item) {
+            item[key] = this.resolveBinaryReferences(item[key], buffer)
+        }
+        return item
     }
 
     /**
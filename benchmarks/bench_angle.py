@@ -0,0 +1,58 @@
+""" Angle to start attribute: the former loop over tracks and positions vs. the
+    blockwise TrackModifier.addAttributeAngleToStart. Both must give the same
+    values (including stationary segments and tracks).
+    Usage: python benchmarks/bench_angle.py [numTracks] [numPositions] """
+import math
+import os
+import sys
+import numpy as np
+
+# Run as script from any folder: the modules are imported from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import bestOf, printComparison
+from DataConverter.TrackModifier import TrackModifier
+
+
+def simScalar(p1, p2):
+    l1 = math.sqrt((p1[0])**2 + (p1[1])**2 + (p1[2])**2)
+    l2 = math.sqrt((p2[0])**2 + (p2[1])**2 + (p2[2])**2)
+    if l1 == 0 or l2 == 0:
+        return 0.
+    return ((p1[0] * p2[0] + p1[1] * p2[1] + p1[2] * p2[2]) / l1 / l2) / 2. + 0.5
+
+
+def angleToStartScalar(tracks):
+    """ Values of the attribute "Angle to start", as the TrackModifier computed them before """
+    similarityValues = np.zeros((tracks.shape[0], tracks.shape[1]))
+    for t in range(tracks.shape[0]):
+        endOfFirstPart = int(0.05 * tracks.shape[1])
+        initialDirection = tracks[t, endOfFirstPart, :] - tracks[t, 0, :]
+        for p in range(tracks.shape[1] - 1):
+            currentDirection = tracks[t, p+1, :] - tracks[t, p, :]
+            similarityValues[t, p] = simScalar(initialDirection, currentDirection)
+    return similarityValues
+
+
+def angleToStart(tracks):
+    tm = TrackModifier(tracks, np.zeros(tracks.shape[0:2] + (0,), dtype=tracks.dtype), [])
+    tm.addAttributeAngleToStart()
+    return tm.get()[1][:, :, 0]
+
+
+def compare(numTracks=5000, numPositions=50, repeats=3):
+    """ Times both versions, checks that they give the same values and returns
+        the (old, new) durations in s """
+    rng = np.random.default_rng(0)
+    tracks = np.cumsum(rng.normal(0, 1, (numTracks, numPositions, 3)), axis=1)
+    # Stationary segments and a stationary track (no direction at all)
+    tracks[::7, -1] = tracks[::7, -2]
+    tracks[0] = 1.
+    oldDuration, old = bestOf(lambda: angleToStartScalar(tracks), 1)
+    newDuration, new = bestOf(lambda: angleToStart(tracks), repeats)
+    assert np.allclose(old, new, rtol=1e-12, atol=1e-12)
+    printComparison(str(numTracks) + " tracks x " + str(numPositions) + " positions", oldDuration, newDuration)
+    return oldDuration, newDuration
+
+
+if __name__ == "__main__":
+    compare(*[int(x) for x in sys.argv[1:3]])
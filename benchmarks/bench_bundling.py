@@ -0,0 +1,134 @@
+""" CPU edge bundling: checks the numpy kernels (skeletonizeTracks with and
+    without grid index, smoothTracks) against a literal scalar port of
+    EdgeBundlerKernel.cl, then measures how runEdgeBundlingCpu scales with the
+    number of tracks.
+    Usage: python benchmarks/bench_bundling.py [iterations] [numTracks ...] """
+import math
+import os
+import sys
+import time
+import numpy as np
+
+# Run as script from any folder: the modules are imported from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DataConverter.EdgeBundler import EdgeBundler, skeletonizeTracks, smoothTracks
+
+
+def normalize(vector):
+    length = math.sqrt(float((vector**2).sum()))
+    return vector / length if length > 0 else np.full(3, np.nan, dtype=np.float32)
+
+
+def transformForcePerpendicularScalar(direction, force):
+    l = math.sqrt(float((force**2).sum()))
+    if l <= 0.:
+        return force
+    normalized = force / np.float32(l)
+    t = float((direction * normalized).sum())
+    if t > 0.:
+        t = -t
+    normalized = normalized - np.float32(t) * direction
+    if float((force * normalized).sum()) < 0:
+        normalized = -normalized
+    return np.float32(l) * normalized
+
+
+def skeletonizeScalar(points, clusters, clusterInverse, radius, stepsize, bundleEndPoints):
+    """ The skeletonize kernel, point by point (angleMin/angleStick have no effect there) """
+    pointsResult = points.copy()
+    numTracks, trackLength = points.shape[0], points.shape[1]
+    skip = 1 - bundleEndPoints
+    for track in range(numTracks):
+        direction = normalize(points[track, -1] - points[track, 0])
+        for i in range(skip, trackLength - skip):
+            myPosition = points[track, i]
+            weightSum = np.float32(1.)
+            force = np.zeros(3, dtype=np.float32)
+            for member in clusters[clusterInverse[track]]:
+                minDistance = 99999.
+                closest = -1
+                for j in range(trackLength):
+                    distance = math.sqrt(float(((points[member, j] - myPosition)**2).sum()))
+                    if distance < minDistance:
+                        minDistance, closest = distance, j
+                if minDistance > radius or minDistance <= 0.:
+                    continue
+                weight = np.float32(((radius - minDistance) / radius)**2)
+                weightSum += weight
+                force += weight * (points[member, closest] - myPosition)
+            force /= weightSum
+            if not np.isnan(direction[0]):
+                force = transformForcePerpendicularScalar(direction, force)
+            pointsResult[track, i] = myPosition + np.float32(stepsize) * force
+    return pointsResult
+
+
+def smoothScalar(points, radius, intensity):
+    """ The smooth kernel, point by point """
+    pointsResult = points.copy()
+    trackLength = points.shape[1]
+    for track in range(points.shape[0]):
+        for i in range(1, trackLength - 1):
+            first, last = max(0, i - radius), min(trackLength - 1, i + radius)
+            mean = points[track, first:last + 1].sum(axis=0) / (last - first + 1)
+            pointsResult[track, i] = mean * intensity + points[track, i] * (1. - intensity)
+    return pointsResult
+
+
+def randomTracks(numTracks, trackLength, seed=0):
+    """ Random walks that start in a few places, so that tracks of a cluster are close """
+    rng = np.random.default_rng(seed)
+    starts = rng.random((5, 3))[rng.integers(0, 5, numTracks)] + rng.normal(0, 0.02, (numTracks, 3))
+    steps = rng.normal(0.01, 0.01, (numTracks, trackLength, 3))
+    steps[:, 0] = 0
+    return starts[:, None, :] + np.cumsum(steps, axis=1)
+
+
+def compareKernels(numTracks=40, trackLength=12, numClusters=3, bundleEndPoints=0):
+    """ Maximum difference of one skeletonize and smooth step between the numpy
+        kernels and the scalar port """
+    points = randomTracks(numTracks, trackLength).astype(np.float32)
+    clusterInverse = np.random.default_rng(1).integers(0, numClusters, numTracks)
+    clusters = [np.flatnonzero(clusterInverse == c) for c in range(numClusters)]
+    radius, stepsize = 0.05, 0.5
+    expected = skeletonizeScalar(points, clusters, clusterInverse, radius, stepsize, bundleEndPoints)
+    differences = []
+    for useGridIndex in [True, False]:
+        result = points.copy()
+        skeletonizeTracks(points, result, np.arange(numTracks), clusters, clusterInverse, radius, stepsize,
+                          bundleEndPoints, useGridIndex)
+        differences.append(np.abs(result - expected).max())
+    result = points.copy()
+    smoothTracks(points, result, np.arange(numTracks), 1, 0.5)
+    differences.append(np.abs(result - smoothScalar(points, 1, 0.5)).max())
+    return max(differences)
+
+
+def measureScaling(trackCounts=(250, 500, 1000), trackLength=50, iterations=3):
+    """ Duration of runEdgeBundlingCpu with estimateDefaultValues (~100 tracks per
+        cluster) for each number of tracks """
+    durations = []
+    for numTracks in trackCounts:
+        bundler = EdgeBundler(randomTracks(numTracks, trackLength))
+        bundler.estimateDefaultValues()
+        bundler.setBundlingIterations(iterations)
+        start = time.perf_counter()
+        bundler.runEdgeBundlingCpu()
+        durations.append(time.perf_counter() - start)
+    for numTracks, duration in zip(trackCounts, durations):
+        print(numTracks, "tracks:", round(duration, 2), "s,", round(duration / numTracks / iterations * 1000, 3),
+              "ms per track and iteration")
+    return durations
+
+
+def compare(iterations=3, trackCounts=(250, 500, 1000), kernelTracks=40):
+    difference = compareKernels(kernelTracks)
+    print("Maximum difference to the scalar kernels:", difference)
+    assert difference < 1e-5
+    assert compareKernels(kernelTracks // 2, bundleEndPoints=1) < 1e-5
+    return measureScaling(trackCounts, iterations=iterations)
+
+
+if __name__ == "__main__":
+    arguments = [int(x) for x in sys.argv[1:]]
+    compare(*arguments[0:1], *([arguments[1:]] if len(arguments) > 1 else []))
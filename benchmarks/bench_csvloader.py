@@ -0,0 +1,51 @@
+""" CSV loading: the former csv.reader loop vs. the bulk numpy parsing of
+    CsvLoader (readCsv) on a synthetic folder. Both must read identical values.
+    Usage: python benchmarks/bench_csvloader.py [numFiles] [rowsPerFile] """
+import csv
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Run as script from any folder: the modules are imported from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import bestOf, printComparison
+from DataConverter.CsvLoader import CsvLoader, readCsv
+
+
+def readCsvScalar(filename, csvSeparator=",", firstLineIsHeader=True):
+    """ Rows of a csv file as the CsvLoader did before, row by row with csv.reader """
+    with open(filename) as f:
+        objectReader = csv.reader(f, delimiter=csvSeparator, skipinitialspace=True)
+        if firstLineIsHeader:
+            next(objectReader)
+        return [[float(x) for x in row] for row in objectReader]
+
+
+def writeFolder(folder, numFiles, rowsPerFile, numAttributes=3, seed=0):
+    rng = np.random.default_rng(seed)
+    header = ",".join(["x", "y", "z"] + ["a" + str(i) for i in range(numAttributes)])
+    for i in range(numFiles):
+        np.savetxt(os.path.join(folder, "track" + str(i).zfill(6) + ".csv"), rng.random((rowsPerFile, 3 + numAttributes)) * 100,
+                   delimiter=",", header=header, comments="", fmt="%.6f")
+
+
+def compare(numFiles=200, rowsPerFile=500, repeats=3):
+    """ Times both parsers on all files of a synthetic folder, checks that they
+        read the same values and returns (old, new) durations in s """
+    with tempfile.TemporaryDirectory() as folder:
+        writeFolder(folder, numFiles, rowsPerFile)
+        filenames = [os.path.join(folder, f) for f in sorted(os.listdir(folder))]
+        oldDuration, old = bestOf(lambda: [readCsvScalar(f) for f in filenames], repeats)
+        newDuration, new = bestOf(lambda: [readCsv(f) for f in filenames], repeats)
+        for oldRows, newRows in zip(old, new):
+            assert np.array_equal(np.array(oldRows), newRows)
+        loaderDuration, loader = bestOf(lambda: CsvLoader(folder, resampleTo=50), 1)
+        assert loader.get()[0].shape == (numFiles, 50, 3)
+    printComparison("Parse " + str(numFiles) + " files of " + str(rowsPerFile) + " rows", oldDuration, newDuration)
+    print("Whole CsvLoader (parsing and resampling):", round(loaderDuration, 2), "s")
+    return oldDuration, newDuration
+
+
+if __name__ == "__main__":
+    compare(*[int(x) for x in sys.argv[1:3]])
@@ -0,0 +1,51 @@
+""" Neighbour search of the CPU edge bundling: comparing each point with all
+    points of its cluster (denseForces) vs. the grid index (gridForces), for one
+    skeletonize step over a single cluster at constant point density. Both must
+    move the points the same way.
+    Usage: python benchmarks/bench_gridindex.py [numTracks ...] """
+import os
+import sys
+import numpy as np
+
+# Run as script from any folder: the modules are imported from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import bestOf, printComparison
+from DataConverter.EdgeBundler import skeletonizeTracks
+
+
+def denseTracks(numTracks, trackLength=50, seed=0):
+    """ Random walks in a cube that grows with the number of tracks (constant density) """
+    rng = np.random.default_rng(seed)
+    side = (numTracks / 1000.) ** (1. / 3.)
+    steps = rng.normal(0., 0.01, (numTracks, trackLength, 3))
+    steps[:, 0] = rng.random((numTracks, 3)) * side
+    return np.cumsum(steps, axis=1).astype(np.float32)
+
+
+def skeletonize(points, useGridIndex, radius=0.05, maxValuesPerBlock=2**22):
+    """ One skeletonize step with all tracks in one cluster """
+    numTracks = len(points)
+    result = points.copy()
+    skeletonizeTracks(points, result, np.arange(numTracks), [np.arange(numTracks)], np.zeros(numTracks, dtype=np.int64),
+                      radius, 0.5, 0, useGridIndex, maxValuesPerBlock)
+    return result
+
+
+def compare(trackCounts=(500, 1000, 2000), repeats=1):
+    """ Times both neighbour searches, checks that they give the same positions
+        (also with tiny blocks) and returns the list of (dense, grid) durations in s """
+    durations = []
+    for numTracks in trackCounts:
+        points = denseTracks(numTracks)
+        denseDuration, dense = bestOf(lambda: skeletonize(points, False), repeats)
+        gridDuration, grid = bestOf(lambda: skeletonize(points, True), repeats)
+        assert np.abs(dense - grid).max() < 1e-5
+        assert np.abs(skeletonize(points, True, maxValuesPerBlock=64) - grid).max() < 1e-5
+        printComparison("One cluster of " + str(numTracks) + " tracks (cluster only -> grid index)",
+                        denseDuration, gridDuration)
+        durations.append((denseDuration, gridDuration))
+    return durations
+
+
+if __name__ == "__main__":
+    compare(*([[int(x) for x in sys.argv[1:]]] if len(sys.argv) > 1 else []))
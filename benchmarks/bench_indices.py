@@ -0,0 +1,54 @@
+""" Index and line id generation of the WebGL export: the former nested loops
+    vs. WebGlToolBuilder.tracksToIndices (and TrackStore.getIndices, which
+    writes them block by block). All must give the same lists.
+    Usage: python benchmarks/bench_indices.py [numTracks] [numPositions] """
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Run as script from any folder: the modules are imported from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import bestOf, printComparison
+from DataConverter.TrackStore import TrackStore
+from DataConverter.WebGlToolBuilder import WebGlToolBuilder
+
+
+def tracksToIndicesScalar(tracks):
+    """ Line ids and segment indices as lists, as WebGlToolBuilder created them before """
+    indices = []
+    lineIds = []
+    counter = 0
+    for trackId in range(tracks.shape[0]):
+        for posId in range(tracks.shape[1] - 1):
+            lineIds.append(trackId)
+            indices.append(counter)
+            counter += 1
+            indices.append(counter)
+        lineIds.append(trackId)
+        counter += 1  # the skipped one
+    return lineIds, indices
+
+
+def compare(numTracks=100000, numPositions=200, repeats=3):
+    """ Times the former loops against tracksToIndices, checks that both (and the
+        track store) give the same lists and returns the (old, new) durations in s """
+    # Only the shape matters, a broadcast view avoids allocating the positions
+    tracks = np.broadcast_to(np.zeros(1), (numTracks, numPositions, 3))
+    oldDuration, (oldLineIds, oldIndices) = bestOf(lambda: tracksToIndicesScalar(tracks), 1)
+    newDuration, (lineIds, indices) = bestOf(lambda: WebGlToolBuilder().tracksToIndices(tracks), repeats)
+    assert lineIds.dtype == indices.dtype == np.uint32
+    assert np.array_equal(lineIds, oldLineIds) and np.array_equal(indices, oldIndices)
+    del oldLineIds, oldIndices
+    with tempfile.TemporaryDirectory() as folder:
+        store = TrackStore.create(folder, numTracks, numPositions, [], np.float32)
+        storeDuration, (storeLineIds, storeIndices) = bestOf(store.getIndices, 1)
+        assert np.array_equal(storeLineIds, lineIds) and np.array_equal(storeIndices, indices)
+        del store, storeLineIds, storeIndices
+    printComparison(str(numTracks) + " tracks x " + str(numPositions) + " positions", oldDuration, newDuration)
+    print("Track store (memory-mapped, block by block):", round(storeDuration * 1000, 2), "ms")
+    return oldDuration, newDuration
+
+
+if __name__ == "__main__":
+    compare(*[int(x) for x in sys.argv[1:3]])
@@ -0,0 +1,63 @@
+""" QuickBundles clustering: one k-means iteration (assignment and mean tracks)
+    of the former per-track loop vs. assignToClusters/calculateMeanTracks, for a
+    growing number of tracks (about 100 tracks per cluster). Both must assign
+    the tracks to the same clusters and compute the same means.
+    Usage: python benchmarks/bench_kmeans.py [numTracks ...] """
+import os
+import sys
+import numpy as np
+
+# Run as script from any folder: the modules are imported from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import bestOf, printComparison
+from DataConverter.EdgeBundler import assignToClusters, calculateMeanTracks
+
+
+def kMeansIterationScalar(tracksQb, meanTracks):
+    """ One iteration of the former quickBundles: the closest mean for each track,
+        then the running mean of each cluster (empty clusters become 0) """
+    clustersReverse = list(range(len(tracksQb)))
+    for t in range(len(tracksQb)):
+        trackRepeated = np.zeros_like(meanTracks)
+        for ii in range(len(trackRepeated)):
+            trackRepeated[ii] = tracksQb[t]
+        diff = np.sum(np.sum(np.square(trackRepeated - meanTracks), axis=2), axis=1)
+        clustersReverse[t] = np.argmin(diff)
+    newMeans = np.zeros_like(meanTracks)
+    meanTrackCounter = [0] * len(newMeans)
+    for t in range(len(tracksQb)):
+        meanTrackCounter[clustersReverse[t]] += 1.
+        ratio = 1. / float(meanTrackCounter[clustersReverse[t]])
+        newMeans[clustersReverse[t]] = (1. - ratio) * newMeans[clustersReverse[t]] + ratio * tracksQb[t]
+    return np.array(clustersReverse), newMeans
+
+
+def kMeansIteration(tracksQb, meanTracks):
+    vectors = tracksQb.reshape((len(tracksQb), -1))
+    clustersReverse = assignToClusters(vectors, meanTracks.reshape((len(meanTracks), -1)))
+    newMeans, counts = calculateMeanTracks(vectors, clustersReverse, meanTracks.reshape((len(meanTracks), -1)))
+    return clustersReverse, newMeans.reshape(meanTracks.shape)
+
+
+def compare(trackCounts=(1000, 4000, 16000), quickBundleLength=8, repeats=1):
+    """ Times one iteration of both versions, checks that they give the same
+        clusters and means and returns the list of (old, new) durations in s """
+    rng = np.random.default_rng(0)
+    durations = []
+    for numTracks in trackCounts:
+        tracksQb = np.cumsum(rng.normal(0, 1, (numTracks, quickBundleLength, 3)), axis=1)
+        numClusters = max(1, numTracks // 100)
+        meanTracks = tracksQb[np.arange(numClusters) * (numTracks // numClusters)]
+        oldDuration, (oldClusters, oldMeans) = bestOf(lambda: kMeansIterationScalar(tracksQb, meanTracks), repeats)
+        newDuration, (newClusters, newMeans) = bestOf(lambda: kMeansIteration(tracksQb, meanTracks), repeats)
+        assert np.array_equal(oldClusters, newClusters)
+        nonEmpty = np.bincount(newClusters, minlength=numClusters) > 0
+        assert np.allclose(oldMeans[nonEmpty], newMeans[nonEmpty])
+        printComparison("Iteration with " + str(numTracks) + " tracks, " + str(numClusters) + " clusters",
+                        oldDuration, newDuration)
+        durations.append((oldDuration, newDuration))
+    return durations
+
+
+if __name__ == "__main__":
+    compare(*([[int(x) for x in sys.argv[1:]]] if len(sys.argv) > 1 else []))
@@ -0,0 +1,93 @@
+""" TGMM loading: the former element tree parsing with a deep copy of the
+    lineage per frame vs. the streaming TgmmLoader, on a synthetic folder. Both
+    must produce the same tracks.
+    Usage: python benchmarks/bench_tgmmloader.py [numFrames] [cellsPerFrame] """
+import copy
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+import numpy as np
+
+# Run as script from any folder: the modules are imported from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.common import bestOf, printComparison
+from DataConverter.AbstractLoader import AbstractLoader
+from DataConverter.TgmmLoader import TgmmLoader
+
+
+def loadTgmmScalar(folder):
+    """ Raw tracks (name -> list of [x, y, z, frame]) as the TgmmLoader read them before """
+    trackList = {}
+    lastCells = {}
+    counter = 0
+    for filename in sorted(os.listdir(folder)):
+        if not filename.endswith(".xml"):
+            continue
+        currentCells = {}
+        for cellCounter, xmlTrack in enumerate(ET.parse(os.path.join(folder, filename)).getroot()):
+            if not xmlTrack.attrib["parent"] in lastCells.keys():
+                trackName = str(counter) + "_" + str(cellCounter)
+                trackList[trackName] = []
+            else:
+                trackName = lastCells[xmlTrack.attrib["parent"]]
+            currentCells[xmlTrack.attrib["id"]] = trackName
+            coords = [float(x) for x in xmlTrack.attrib["m"].strip().split(" ")]
+            if "scale" in xmlTrack.attrib:
+                scales = [float(x) for x in xmlTrack.attrib["scale"].strip().split(" ")]
+                coords = [a*b for a, b in zip(scales, coords)]
+            for i in range(len(coords), 3):
+                coords.append(0)
+            coords.append(counter)
+            trackList[trackName].append(coords)
+        lastCells = copy.deepcopy(currentCells)
+        counter += 1
+    return trackList
+
+
+def loadTgmmStreaming(folder):
+    """ Raw tracks of the current TgmmLoader (without resampling) """
+    loader = TgmmLoader.__new__(TgmmLoader)
+    AbstractLoader.__init__(loader, 50, 2)
+    loader.loadXMLs(folder)
+    return loader.trackList
+
+
+def writeFolder(folder, numFrames, cellsPerFrame, seed=0):
+    """ Frames of cells that move a bit from frame to frame; a few cells per frame
+        are lost and replaced by new ones (parent -1) """
+    rng = np.random.default_rng(seed)
+    positions = rng.random((cellsPerFrame, 3)) * 1000
+    ids = np.arange(cellsPerFrame)
+    nextId = cellsPerFrame
+    parents = np.full(cellsPerFrame, -1)
+    for frame in range(numFrames):
+        cells = ['<GaussianMixtureModel id="%d" lineage="%d" parent="%d" dims="3" m="%.4f %.4f %.4f " scale="1 1 2.5 " />'
+                 % (i, i, p, x, y, z) for i, p, (x, y, z) in zip(ids, parents, positions)]
+        with open(os.path.join(folder, "GMEMfinalResult_frame" + str(frame).zfill(4) + ".xml"), "w") as f:
+            f.write("<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<document>\n" + "\n".join(cells) + "\n</document>\n")
+        positions = positions + rng.normal(0, 1, positions.shape)
+        parents = ids.copy()
+        ids = np.arange(nextId, nextId + cellsPerFrame)
+        nextId += cellsPerFrame
+        lost = rng.random(cellsPerFrame) < 0.02
+        parents[lost] = -1
+
+
+def compare(numFrames=100, cellsPerFrame=1000, repeats=3):
+    """ Times both loaders, checks that they produce the same tracks and returns
+        the (old, new) duration per frame in s """
+    with tempfile.TemporaryDirectory() as folder:
+        writeFolder(folder, numFrames, cellsPerFrame)
+        oldDuration, old = bestOf(lambda: loadTgmmScalar(folder), repeats)
+        newDuration, new = bestOf(lambda: loadTgmmStreaming(folder), repeats)
+    assert old.keys() == new.keys()
+    for name in old:
+        assert np.array_equal(np.array(old[name]), new[name])
+    printComparison("Per frame of " + str(cellsPerFrame) + " cells (" + str(numFrames) + " frames, " +
+                    str(len(old)) + " tracks)", oldDuration / numFrames, newDuration / numFrames)
+    return oldDuration / numFrames, newDuration / numFrames
+
+
+if __name__ == "__main__":
+    compare(*[int(x) for x in sys.argv[1:3]])
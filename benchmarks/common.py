@@ -0,0 +1,17 @@
+import time
+
+
+def bestOf(function, repeats=3):
+    """ Calls function repeats times, returns the shortest duration (in s) and the
+        result of the last call """
+    best = float("inf")
+    for i in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def printComparison(description, oldDuration, newDuration):
+    print(description + ":", "old", round(oldDuration * 1000, 2), "ms, new", round(newDuration * 1000, 2),
+          "ms, speedup", round(oldDuration / max(newDuration, 1e-12), 1))
@@ -1,5 +1,6 @@
 import os
 import argparse
+import numpy as np
 import DataConverter as dc
 
 # Output OpenCL compiler messages (including warnings).
@@ -19,22 +20,48 @@ parser.add_argument("--obj", help="An obj file for context/background", default=
 parser.add_argument("--addRadius", help="Create an attribute containing the radius (distance to center)", action='store_true', default=None)
 parser.add_argument("--addAngle", help="Create an attribute containing the angle between initial orientation and local orientation", action='store_true', default=None)
 parser.add_argument("--addTime", help="Create an attribute containing the time/counter of the track position (first pos is 0, ..., n)", action='store_true', default=None)
+parser.add_argument("--addDerived", help="Create derived attributes, all or some of: " + " ".join(dc.TrackModifier.derivedAttributes), action='store', default=None, nargs="*", choices=list(dc.TrackModifier.derivedAttributes))
 parser.add_argument("--addBundled", help="Creates a bundled version of the tracks and adds them as a second state", action='store_true', default=None)
+parser.add_argument("--bundleBackend", help="Compute --addBundled with opencl (GPU) or cpu (numpy, no OpenCL needed) (default: opencl)", action='store', default="opencl", choices=["opencl", "cpu"])
+parser.add_argument("--bundleClustering", help="Clustering before --addBundled: full, or hierarchical for millions of tracks (default: full)", action='store', default="full", choices=["full", "hierarchical"])
+parser.add_argument("--bundleSweepRadius", help="Parameter sweep for --addBundled: one state per magnet radius, given as factors of the automatic radius (e.g. 0.5 1 2)", action='store', default=None, nargs="+")
+parser.add_argument("--bundleSweepStepsize", help="Parameter sweep for --addBundled: one state per step size (e.g. 0.25 0.5)", action='store', default=None, nargs="+")
+parser.add_argument("--bundleSweepSnapshots", help="Parameter sweep for --addBundled: one state after each of these numbers of iterations (e.g. 5 10 15)", action='store', default=None, nargs="+")
+parser.add_argument("--bundleClusterMemory", help="Memory budget of the clustering before --addBundled in MB (default: 64)", action='store', default=64)
 parser.add_argument("--moveToCenter", help="Moves the data to its barycenter", action='store_true', default=None)
 parser.add_argument("--scaleToUnit", help="Scale the data to a maximum width of 1", action='store_true', default=None)
 parser.add_argument("--zip", help="Zip the result and wrap it to base64", action='store_true', default=None)
+parser.add_argument("--zipCodec", help="Compression used by --zip: zlib, gzip or deflate (default: zlib)", action='store', default="zlib", choices=dc.Compressor.codecs)
+parser.add_argument("--zipLevel", help="Compression level used by --zip, 0 (fast) to 9 (small) (default: 6)", action='store', default=6)
+parser.add_argument("--zipThreads", help="Number of threads used by --zip (default: 1)", action='store', default=1)
+parser.add_argument("--zipSidecar", help="With --zip, store the compressed data as raw bytes in data.json.z instead of base64 (smaller, but requires a web server)", action='store_true', default=None)
+parser.add_argument("--compareCodecs", help="Report size and time of each compression codec/level for this data", action='store_true', default=None)
+parser.add_argument("--binary", help="Write positions/attributes/indices to a binary file (data.bin) next to the JSON. Faster to write and load, but requires a web server", action='store_true', default=None)
+parser.add_argument("--quantize", help="Store positions and attributes as 16 bit integers (relative to the bounding box of the data). Smaller files, slightly less precise", action='store_true', default=None)
 parser.add_argument("--skipSmallerThan", help="Skips tracks that are smaller than n points (default: 2)", action='store', default=2)
 parser.add_argument("--resampleTo", help="Target track length (after resampling) (default: 50)", action='store', default=50)
+parser.add_argument("--resampleMode", help="How tracks are resampled: spline, linear or arclength (evenly spaced along the track) (default: spline)", action='store', default="spline", choices=dc.TrackResampler.modes)
+parser.add_argument("--store", help="Keep tracks and attributes in a memory-mapped track store in this folder (for datasets larger than the memory)", default=None, nargs="?")
+parser.add_argument("--incremental", help="Remember the state of the CSV/TGMM loader in this folder, later runs only read new or changed files (e.g. while an experiment is running)", default=None, nargs="?")
+parser.add_argument("--cacheDir", help="Cache loaded tracks, derived attributes and bundled states in this folder, repeated runs with the same input and parameters skip these steps", default=None, nargs="?")
+parser.add_argument("--cacheSize", help="Maximum size of --cacheDir in MB, the least recently used results are removed first (default: 4096)", action='store', default=4096)
+parser.add_argument("--float32", help="Keep tracks and attributes as 32 bit floats (halves the memory)", action='store_true', default=None)
 parser.add_argument("--csvNoHeader", help="By default, the first line is assumed to be a header. If table is full of numeric values, use this option.", action='store_true', default=None)
 parser.add_argument("--csvSep", help="Add the CSV separator you are using (default: ,)", action='store_true', default=",")
+parser.add_argument("--svfChunkSize", help="Number of rows of the SVF file that are read at once (default: 1000000)", action='store', default=1000000)
+parser.add_argument("--svfLineageWindow", help="Only remember cells of the last n frames as mothers (saves memory for huge SVF files, which then must be sorted by time and must not have tracking gaps longer than n frames) (default: all cells)", action='store', default=None)
 parser.add_argument("--addXYZAxes", help="Add x,y,z axes",  action='store_true', default=None)
 parser.add_argument("--tickDistance", help="Tick distance of axes, in dataspace (default: 1)",  action='store', default=1)
 parser.add_argument("--addCustomAxes", help="Add custom axes from a csv folder", default=None, nargs="?")
+parser.add_argument("--workers", help="Number of processes used to parse CSV/TGMM folders and for --bundleBackend cpu (default: 1)", action='store', default=1)
 
-print("Prepare your trajectory data for a WebGL-based interactive visualization.")
-print("Please provide at least one data source. Find the result in ./Export/")
-print("Use -h to show the help.")
-print()
+# The loaders' worker processes may re-import this script, they must not run the pipeline
+isMainProcess = __name__ == "__main__"
+if isMainProcess:
+    print("Prepare your trajectory data for a WebGL-based interactive visualization.")
+    print("Please provide at least one data source. Find the result in ./Export/")
+    print("Use -h to show the help.")
+    print()
 
 # Get the arguments. Not-provided arguments default to "None"
 args = parser.parse_args()
@@ -48,72 +75,134 @@ objPath = args.obj
 addRadius = args.addRadius
 addAngle = args.addAngle
 addTime = args.addTime
+addDerived = args.addDerived
 addBundled = args.addBundled
+bundleBackend = args.bundleBackend
+bundleClustering = args.bundleClustering
+bundleClusterMemory = int(args.bundleClusterMemory)
+bundleSweepRadius = None if args.bundleSweepRadius is None else [float(x) for x in args.bundleSweepRadius]
+bundleSweepStepsize = None if args.bundleSweepStepsize is None else [float(x) for x in args.bundleSweepStepsize]
+bundleSweepSnapshots = None if args.bundleSweepSnapshots is None else [int(x) for x in args.bundleSweepSnapshots]
 moveToCenter = args.moveToCenter
 scaleToUnit = args.scaleToUnit
 useZip = args.zip
+zipCodec = args.zipCodec
+zipLevel = int(args.zipLevel)
+zipThreads = int(args.zipThreads)
+zipSidecar = args.zipSidecar
+compareCodecs = args.compareCodecs
+useBinary = args.binary
+useQuantization = args.quantize
 csvNoHeader = args.csvNoHeader
 skipSmallerThan = int(args.skipSmallerThan)
 resampleTo = int(args.resampleTo)
+resampleMode = args.resampleMode
+dtype = "float32" if args.float32 is not None else "float64"
+storePath = args.store
+storePathState2 = None if storePath is None else os.path.join(storePath, "state2")
+statePath = args.incremental
+statePathState2 = None if statePath is None else os.path.join(statePath, "state2")
+cacheDir = args.cacheDir
+cacheSize = int(args.cacheSize)
 csvSep = args.csvSep
+svfChunkSize = int(args.svfChunkSize)
+svfLineageWindow = None if args.svfLineageWindow is None else int(args.svfLineageWindow)
 addXYZAxes = args.addXYZAxes
 tickDistance = args.tickDistance
 addCustomAxes = args.addCustomAxes
+workers = int(args.workers)
 
 
-# Case 1: Use the command line interface
-loadFromCmd = tgmmPath != None or csvPath != None or biotracksPath != None or svfPath != None
-loaderState2 = None
-if loadFromCmd:
-    if csvPath is not None:
-        print("Load from CSV...")
-        loader = dc.CsvLoader(csvPath, resampleTo=resampleTo, minTrackLength=skipSmallerThan, firstLineIsHeader=(csvNoHeader is None), csvSeparator=csvSep)
-        if addState2 is not None:
-            loaderState2 = dc.CsvLoader(addState2, resampleTo=resampleTo, minTrackLength=skipSmallerThan, firstLineIsHeader=(csvNoHeader is None), csvSeparator=csvSep)
+def createLoader(path, storePath, statePath):
+    """ Loads path with the loader of the data source given on the command line """
+    if svfPath is not None:
+        print("Load from SVF...")
+        return dc.SvfLoader(path, resampleTo=resampleTo, minTrackLength=skipSmallerThan, resampleMode=resampleMode, dtype=dtype, csvSeparator=csvSep, chunkSize=svfChunkSize, lineageFrameWindow=svfLineageWindow, storePath=storePath)
+    if biotracksPath is not None:
+        print("Load from Biotracks...")
+        return dc.BiotracksLoader(path, resampleTo=resampleTo, minTrackLength=skipSmallerThan, resampleMode=resampleMode, dtype=dtype, storePath=storePath)
     if tgmmPath is not None:
         print("Load from TGMM...")
-        loader = dc.TgmmLoader(tgmmPath, resampleTo=resampleTo, minTrackLength=skipSmallerThan,)
-        if addState2 is not None:
-            loaderState2 = dc.TgmmLoader(addState2, resampleTo=resampleTo, minTrackLength=skipSmallerThan,)
+        return dc.TgmmLoader(path, resampleTo=resampleTo, minTrackLength=skipSmallerThan, resampleMode=resampleMode, dtype=dtype, workers=workers, storePath=storePath, statePath=statePath)
+    print("Load from CSV...")
+    return dc.CsvLoader(path, resampleTo=resampleTo, minTrackLength=skipSmallerThan, resampleMode=resampleMode, dtype=dtype, firstLineIsHeader=(csvNoHeader is None), csvSeparator=csvSep, workers=workers, storePath=storePath, statePath=statePath)
 
-    if biotracksPath is not None:
-        print("Load from Biotracks...")
-        loader = dc.BiotracksLoader(biotracksPath, resampleTo=resampleTo, minTrackLength=skipSmallerThan,)
-        if addState2 is not None:
-            loaderState2 = dc.BiotracksLoader(addState2, resampleTo=resampleTo, minTrackLength=skipSmallerThan,)
 
-    if svfPath is not None:
-        print("Load from SVF...")
-        loader = dc.SvfLoader(svfPath, resampleTo=resampleTo, minTrackLength=skipSmallerThan, csvSeparator=csvSep)
-        if addState2 is not None:
-            loaderState2 = dc.SvfLoader(addState2, resampleTo=resampleTo, minTrackLength=skipSmallerThan, csvSeparator=csvSep)
+def loadFromCache(stage, inputPaths, parameters):
+    """ Key and cached entry of a preprocessing stage (None without --cacheDir or if not cached yet) """
+    if cache is None:
+        return None, None
+    key = cache.getKey(stage, inputPaths, parameters)
+    entry = cache.load(key)
+    if entry is not None:
+        print("Use cached", stage)
+    return key, entry
+
 
+def loadTracks(path, storePath, statePath):
+    """ Tracks, attributes, names, TrackStore (or None) and cache key of the data in path """
+    key, entry = loadFromCache("tracks", [path], loaderParameters)
+    if entry is not None:
+        return entry["tracks"], entry["attributes"], entry["names"], None, key
+    loader = createLoader(path, storePath, statePath)
     tracks, attributes, names = loader.get()
+    if cache is not None:
+        cache.save(key, {"tracks": tracks, "attributes": attributes, "names": list(names)})
+    return tracks, attributes, names, loader.store, key
+
+
+# Case 1: Use the command line interface
+loadFromCmd = tgmmPath != None or csvPath != None or biotracksPath != None or svfPath != None
+if loadFromCmd and isMainProcess:
+    cache = None
+    if cacheDir is not None and storePath is not None:
+        print("The cache is not used together with --store")
+    elif cacheDir is not None:
+        cache = dc.PreprocessingCache(cacheDir, cacheSize * 2**20)
+    # Everything the loaded tracks depend on (besides the input files)
+    loaderParameters = {"source": [csvPath is not None, tgmmPath is not None, biotracksPath is not None, svfPath is not None],
+                        "resampleTo": resampleTo, "minTrackLength": skipSmallerThan, "resampleMode": resampleMode,
+                        "dtype": dtype, "csvSeparator": csvSep, "csvHeader": csvNoHeader is None}
+    inputPath = [path for path in [csvPath, tgmmPath, biotracksPath, svfPath] if path is not None][-1]
+    tracks, attributes, names, store, tracksKey = loadTracks(inputPath, storePath, statePath)
+    if addState2 is not None:
+        tracksState2, attributesState2, namesState2, storeState2, tracksKeyState2 = loadTracks(addState2, storePathState2, statePathState2)
 
 
     # Start the track modifier that adjusts the data or adds attributes
-    tm = dc.TrackModifier(tracks, attributes, names)
+    tm = dc.TrackModifier(tracks, attributes, names, store)
+    numLoadedAttributes = len(names)
+    derivedParameters = {"tracks": tracksKey, "scaleToUnit": scaleToUnit, "moveToCenter": moveToCenter, "addTime": addTime,
+                         "addRadius": addRadius, "addAngle": addAngle, "addDerived": addDerived}
+    derivedKey, derived = loadFromCache("derived attributes", [], derivedParameters)
 
     scale = 1.
     if scaleToUnit is not None:
-        extent = tm.getExtent()
-        scale = 1. / extent
+        scale = derived["scale"][()] if derived is not None else 1. / tm.getExtent()
         tm.scale(scale)
 
     bary = [0., 0., 0.]
     if moveToCenter is not None:
-        bary = tm.getBarycenter()
+        bary = list(derived["barycenter"]) if derived is not None else tm.getBarycenter()
         print("New center is at:", bary)
         tm.translate(-bary[0], -bary[1], -bary[2])
+    if store is not None:
+        store.setTransformation(scale, bary)
 
     # Add optional auto-generated attributes
-    if addTime is not None:
-        tm.addAttributeTime()
-    if addRadius is not None:
-        tm.addAttributeRadius()
-    if addAngle is not None:
-        tm.addAttributeAngleToStart()
-
+    if derived is not None:
+        if len(derived["names"]) > 0:
+            tm.allocateAttributes(derived["names"])[:] = derived["attributes"]
+    else:
+        # All at once, so that the attributes are copied only once
+        basic = [key for key, requested in [("time", addTime), ("radius", addRadius), ("angleToStart", addAngle)]
+                 if requested is not None]
+        derived = [] if addDerived is None else addDerived if len(addDerived) > 0 else list(dc.TrackModifier.derivedAttributes)
+        tm.addAttributes(basic, derived)
+        if cache is not None:
+            _, attributes, names = tm.get()
+            cache.save(derivedKey, {"scale": np.asarray(scale), "barycenter": np.asarray(bary),
+                                    "names": names[numLoadedAttributes:], "attributes": attributes[:, :, numLoadedAttributes:]})
 
     tracks, attributes, names = tm.get()
 
@@ -138,20 +227,39 @@ if loadFromCmd:
         wgb.addTriangleDataset(positions, indices, normals, "Context", scale)
 
     # Finally, add the track data
-    wgb.addTrajectoryDataset(tracks, attributes, names, "Trajectories", scale)
+    wgb.addTrajectoryDataset(tracks, attributes, names, "Trajectories", scale, store)
 
     # Add states (to the last dataset, which is the trajectory set)
     if addBundled is not None:
-        tm.addAttributeAngleToStart()
-        bundler = dc.EdgeBundler(tracks)
-        bundler.estimateDefaultValues()
-        bundler.runEdgeBundlingOpenCl()
-        tracksBundled = bundler.getResult()
-        wgb.addTrajectoryDatasetState(tracksBundled, "bundled")
+        bundleParameters = {"derived": derivedKey, "backend": bundleBackend, "clustering": bundleClustering,
+                            "clusterMemory": bundleClusterMemory, "sweepRadius": bundleSweepRadius,
+                            "sweepStepsize": bundleSweepStepsize, "sweepSnapshots": bundleSweepSnapshots}
+        bundleKey, bundled = loadFromCache("bundled states", [], bundleParameters)
+        if bundled is not None:
+            bundledStates = [(name, bundled["state" + str(i)]) for i, name in enumerate(bundled["names"])]
+        else:
+            bundler = dc.EdgeBundler(tracks)
+            bundler.estimateDefaultValues()
+            bundler.setClusterMode(bundleClustering, bundleClusterMemory * 2**20)
+            bundler.setWorkers(workers)
+            if bundleSweepRadius is not None or bundleSweepStepsize is not None or bundleSweepSnapshots is not None:
+                magnetRadii = None if bundleSweepRadius is None else [bundler.magnetRadius * x for x in bundleSweepRadius]
+                bundledStates = bundler.runParameterSweep(magnetRadii, bundleSweepStepsize, bundleSweepSnapshots, bundleBackend)
+            else:
+                if bundleBackend == "cpu":
+                    bundler.runEdgeBundlingCpu()
+                else:
+                    bundler.runEdgeBundlingOpenCl()
+                bundledStates = [("bundled", bundler.getResult())]
+            if cache is not None:
+                entry = {"state" + str(i): tracksBundled for i, (name, tracksBundled) in enumerate(bundledStates)}
+                entry["names"] = [name for name, tracksBundled in bundledStates]
+                cache.save(bundleKey, entry)
+        for name, tracksBundled in bundledStates:
+            wgb.addTrajectoryDatasetState(tracksBundled, name)
 
     if addState2 is not None:
-        tracks, attributes, names = loaderState2.get()
-        wgb.addTrajectoryDatasetState(tracks, "state2", attributes)
+        wgb.addTrajectoryDatasetState(tracksState2, "state2", attributesState2)
 
     if addXYZAxes is not None:
         wgb.addXYZAxes(float(tickDistance) * float(scale))
@@ -162,10 +270,20 @@ if loadFromCmd:
 
     # Output results
     wgb.setDecimalDigits(5)
+    if useQuantization is not None:
+        wgb.setQuantization(16)
     outDir = "Export/data/"
     if not os.path.isdir(outDir):
         os.mkdir(outDir)
-    wgb.writeJson(outDir + "data.json", (useZip is not None))
+    if compareCodecs is not None:
+        wgb.compareCompression(threads=zipThreads)
+    if useBinary is not None:
+        wgb.writeBinary(outDir + "data.json", outDir + "data.bin")
+    else:
+        # Only zipped exports need a compressor (and its thread pool)
+        compressor = dc.Compressor(zipCodec, zipLevel, zipThreads) if useZip is not None else None
+        wgb.writeJson(outDir + "data.json", (useZip is not None), compressor,
+                      outDir + "data.json.z" if zipSidecar is not None else None)
     print("Created", tracks.shape[0], "tracks, each of size", tracks.shape[1])
     print("Added the following attributes:", names)
 
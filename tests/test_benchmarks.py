@@ -0,0 +1,34 @@
+""" Runs the benchmarks at tiny sizes: each of them checks that the vectorized
+    code gives the same results as the former scalar implementation """
+from benchmarks import (bench_csvloader, bench_tgmmloader, bench_indices, bench_bundling, bench_gridindex,
+                        bench_kmeans, bench_angle)
+
+
+def test_csvLoaderMatchesScalar():
+    bench_csvloader.compare(numFiles=5, rowsPerFile=20, repeats=1)
+
+
+def test_tgmmLoaderMatchesScalar():
+    bench_tgmmloader.compare(numFrames=6, cellsPerFrame=50, repeats=1)
+
+
+def test_tracksToIndicesMatchesScalar():
+    bench_indices.compare(numTracks=7, numPositions=5, repeats=1)
+    bench_indices.compare(numTracks=3, numPositions=1, repeats=1)
+
+
+def test_cpuBundlingMatchesScalarKernels():
+    bench_bundling.compare(iterations=1, trackCounts=(30,), kernelTracks=12)
+
+
+def test_gridIndexMatchesClusterOnly():
+    bench_gridindex.compare(trackCounts=(60,))
+
+
+def test_kMeansIterationMatchesScalar():
+    bench_kmeans.compare(trackCounts=(50, 300))
+
+
+def test_angleToStartMatchesScalar():
+    bench_angle.compare(numTracks=30, numPositions=50, repeats=1)
+    bench_angle.compare(numTracks=8, numPositions=3, repeats=1)
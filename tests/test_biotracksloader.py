@@ -0,0 +1,52 @@
+import json
+import numpy as np
+
+from DataConverter.BiotracksLoader import BiotracksLoader
+
+
+def writeBiotracks(folder, withZ=True):
+    """ Two tracks: track 1 with links 10 and 11 (objects 1-4, listed unsorted by
+        frame), track 2 with link 12 (objects 5-7) """
+    resources = [
+        {"name": "objects", "path": "objects.csv",
+         "schema": {"primaryKey": "cmso_object_id", "fields": [{"name": "cmso_object_id"}]}},
+        {"name": "links", "path": "links.csv",
+         "schema": {"foreignKeys": [{"fields": "cmso_object_id",
+                                     "reference": {"resource": "objects", "fields": "cmso_object_id"}}]}}]
+    (folder / "datapackage.json").write_text(json.dumps({"resources": resources}))
+    columns = ["cmso_object_id", "cmso_frame_id", "cmso_x_coord", "cmso_y_coord"] + (["cmso_z_coord"] if withZ else [])
+    rows = [[1, 0, 0, 0, 0], [2, 1, 1, 0, 1], [3, 3, 3, 0, 3], [4, 2, 2, 0, 2],
+            [5, 0, 0, 5, 0], [6, 1, 0, 6, 1], [7, 2, 0, 7, 2]]
+    (folder / "objects.csv").write_text(",".join(columns) + "\n" +
+                                        "".join(",".join(str(v) for v in row[0:len(columns)]) + "\n" for row in rows))
+    (folder / "links.csv").write_text("cmso_link_id,cmso_object_id\n10,1\n10,2\n11,3\n11,4\n12,5\n12,6\n12,7\n")
+    (folder / "tracks.csv").write_text("cmso_track_id,cmso_link_id\n1,10\n1,11\n2,12\n")
+    return str(folder / "datapackage.json")
+
+
+def test_biotracksTracks(tmp_path):
+    loader = BiotracksLoader(writeBiotracks(tmp_path), resampleTo=5, resampleMode="linear")
+    assert list(loader.trackList.keys()) == ["1", "2"]
+    assert np.array_equal(loader.trackList["1"][:, 3], [0, 1, 2, 3])
+    assert np.array_equal(loader.trackList["1"][:, 0], [0, 1, 2, 3])
+    assert np.array_equal(loader.trackList["2"][:, 1], [5, 6, 7])
+    tracks, attributes, names = loader.get()
+    assert tracks.shape == (2, 5, 3) and names == ["Frame"]
+
+
+def test_biotracksWithoutZ(tmp_path):
+    loader = BiotracksLoader(writeBiotracks(tmp_path, withZ=False), resampleTo=5, resampleMode="linear")
+    assert np.array_equal(loader.trackList["1"][:, 2], [0, 0, 0, 0])
+    assert np.array_equal(loader.trackList["2"][:, 1], [5, 6, 7])
+
+
+def test_biotracksObjectsReadOnce(tmp_path):
+    # A second link file refers to the same object list
+    path = writeBiotracks(tmp_path)
+    package = json.loads((tmp_path / "datapackage.json").read_text())
+    package["resources"].append(dict(package["resources"][1], name="links2", path="links2.csv"))
+    (tmp_path / "datapackage.json").write_text(json.dumps(package))
+    (tmp_path / "links2.csv").write_text("cmso_link_id,cmso_object_id\n13,7\n")
+    loader = BiotracksLoader(path, resampleTo=5, resampleMode="linear")
+    assert len(loader.objectIds) == 1
+    assert np.array_equal(loader.trackList["2"][:, 1], [5, 6, 7])
@@ -0,0 +1,41 @@
+import numpy as np
+
+from DataConverter.CsvLoader import CsvLoader, readCsv
+
+
+def writeFile(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_readCsvPlainNumbers(tmp_path):
+    filename = writeFile(tmp_path / "t.csv", "x,y,z,a\n1,2,3,4\n5,6,7,8\n")
+    assert np.array_equal(readCsv(filename), [[1, 2, 3, 4], [5, 6, 7, 8]])
+
+
+def test_readCsvQuotedNumbers(tmp_path):
+    filename = writeFile(tmp_path / "t.csv", "x,y,z,a\n\"1.5\",\"2\",3,4\n5,6,7,8\n")
+    assert np.array_equal(readCsv(filename), [[1.5, 2, 3, 4], [5, 6, 7, 8]])
+
+
+def test_readCsvHashIsNoComment(tmp_path):
+    # The header may start with "#", data rows are never dropped
+    filename = writeFile(tmp_path / "t.csv", "#x,y,z,a\n1,2,3,4\n5,6,7,8\n")
+    assert np.array_equal(readCsv(filename), [[1, 2, 3, 4], [5, 6, 7, 8]])
+    filename = writeFile(tmp_path / "u.csv", "1,2,3,4\n5,6,7,8\n")
+    assert np.array_equal(readCsv(filename, firstLineIsHeader=False), [[1, 2, 3, 4], [5, 6, 7, 8]])
+
+
+def test_readCsvWhitespaceSeparator(tmp_path):
+    filename = writeFile(tmp_path / "t.csv", "x y z\n1  2 3\n4 5  6\n")
+    assert np.array_equal(readCsv(filename, " "), [[1, 2, 3], [4, 5, 6]])
+
+
+def test_csvLoaderQuotedFolder(tmp_path):
+    for i in range(3):
+        rows = "\n".join("\"" + str(i + j) + "\"," + str(j) + ",0,\"" + str(j) + "\"" for j in range(5))
+        writeFile(tmp_path / ("t" + str(i) + ".csv"), "x,y,z,speed\n" + rows + "\n")
+    tracks, attributes, names = CsvLoader(str(tmp_path), resampleTo=5, resampleMode="linear").get()
+    assert tracks.shape == (3, 5, 3)
+    assert names == ["speed"]
+    assert np.allclose(tracks[2, :, 0], np.arange(2, 7))
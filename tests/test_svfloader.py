@@ -0,0 +1,63 @@
+import numpy as np
+
+from DataConverter.SvfLoader import SvfLoader
+
+
+def writeSvf(path, rows):
+    path.write_text("id,mother_id,x,y,z,t\n" + "\n".join(",".join(str(v) for v in row) for row in rows) + "\n")
+    return str(path)
+
+
+def referenceTracks(rows):
+    """ Track of each row like the original row-by-row loader: a dictionary
+        from cell id to track that is overwritten by each row """
+    parentsTrack = {}
+    tracks = []
+    for row in rows:
+        track = len(set(tracks)) if row[1] == -1 else parentsTrack[row[1]]
+        parentsTrack[row[0]] = track
+        tracks.append(track)
+    return tracks
+
+
+def loadedTracks(filename, **kwargs):
+    loader = SvfLoader(filename, resampleTo=5, minTrackLength=0, resampleMode="linear", **kwargs)
+    tracks = {}
+    for track, points in loader.trackList.items():
+        for point in points:
+            tracks[tuple(point)] = track
+    return tracks
+
+
+def checkTracks(rows, filename, **kwargs):
+    tracks = loadedTracks(filename, **kwargs)
+    assert [tracks[tuple(float(v) for v in row[2:6])] for row in rows] == referenceTracks(rows)
+
+
+def test_svfTrackingGap(tmp_path):
+    # Cell 5 is the daughter of cell 1, three frames later
+    rows = [[1, -1, 0, 0, 0, 0], [2, -1, 1, 0, 0, 0], [3, 2, 1, 1, 0, 1], [4, 3, 1, 2, 0, 2], [5, 1, 0, 1, 0, 3]]
+    filename = writeSvf(tmp_path / "gap.csv", rows)
+    for chunkSize in [1, 2, 1000000]:
+        checkTracks(rows, filename, chunkSize=chunkSize)
+    checkTracks(rows, filename, chunkSize=1, lineageFrameWindow=3)
+
+
+def test_svfReusedIds(tmp_path):
+    # Cell id 1 is used twice, daughters belong to the most recent cell 1
+    rows = [[1, -1, 0, 0, 0, 0], [2, 1, 0, 1, 0, 1], [1, -1, 5, 0, 0, 2], [3, 1, 5, 1, 0, 3],
+            [4, 3, 5, 2, 0, 4], [1, 4, 5, 3, 0, 5], [6, 1, 5, 4, 0, 6], [7, 2, 0, 2, 0, 7]]
+    filename = writeSvf(tmp_path / "reused.csv", rows)
+    for chunkSize in [1, 2, 3, 5, 1000000]:
+        checkTracks(rows, filename, chunkSize=chunkSize)
+
+
+def test_svfRandomLineages(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(300):
+        mother = -1 if i < 5 or rng.random() < 0.05 else rows[rng.integers(max(0, i - 50), i)][0]
+        rows.append([int(rng.integers(0, 100)), mother, i, 0, 0, i])
+    filename = writeSvf(tmp_path / "random.csv", rows)
+    for chunkSize in [1, 7, 64, 1000000]:
+        checkTracks(rows, filename, chunkSize=chunkSize)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from DataConverter.TrackModifier import TrackModifier
+
+
+def randomTracks(dtype, numAttributes=1):
+    rng = np.random.default_rng(0)
+    tracks = rng.random((4, 10, 3)).astype(dtype)
+    attributes = rng.random((4, 10, numAttributes)).astype(dtype)
+    return tracks, attributes, ["a" + str(i) for i in range(numAttributes)]
+
+
+def test_derivedAttributesKeepFloat32():
+    tm = TrackModifier(*randomTracks(np.float32))
+    tm.addDerivedAttributes()
+    tracks, attributes, names = tm.get()
+    assert attributes.dtype == np.float32
+    assert attributes.shape == (4, 10, 1 + len(TrackModifier.derivedAttributes))
+    assert len(names) == attributes.shape[2]
+
+
+def test_derivedAttributesWithoutLoadedAttributes():
+    tm = TrackModifier(*randomTracks(np.float32, 0))
+    tm.addAttributeTime()
+    assert tm.get()[1].dtype == np.float32
+
+
+def test_derivedAttributesMatchFloat64():
+    tracks, attributes, names = randomTracks(np.float32)
+    tm32 = TrackModifier(tracks, attributes, list(names))
+    tm64 = TrackModifier(tracks.astype(np.float64), attributes.astype(np.float64), list(names))
+    tm32.addDerivedAttributes()
+    tm64.addDerivedAttributes()
+    assert tm64.get()[1].dtype == np.float64
+    assert np.allclose(tm32.get()[1], tm64.get()[1], rtol=1e-5, atol=1e-6)
+
+
+def test_addAttributesAllocatesOnce():
+    tracks, attributes, names = randomTracks(np.float64)
+    separate = TrackModifier(tracks, attributes, list(names))
+    separate.addAttributeTime()
+    separate.addAttributeRadius()
+    separate.addAttributeAngleToStart()
+    separate.addDerivedAttributes(["speed", "msd"])
+
+    combined = TrackModifier(tracks, attributes, list(names))
+    allocations = []
+    allocate = combined.allocateAttributes
+    combined.allocateAttributes = lambda newNames: allocations.append(newNames) or allocate(newNames)
+    combined.addAttributes(["angleToStart", "time", "radius"], ["speed", "msd"])
+    assert allocations == [["Time", "Radius", "Angle to start", "Speed", "MSD"]]
+    assert combined.get()[2] == separate.get()[2]
+    assert np.allclose(combined.get()[1], separate.get()[1])
+
+
+def test_addAttributesNothingRequested():
+    tracks, attributes, names = randomTracks(np.float64)
+    tm = TrackModifier(tracks, attributes, list(names))
+    tm.addAttributes([], [])
+    assert tm.get()[1] is attributes
@@ -0,0 +1,49 @@
+import json
+import numpy as np
+
+from DataConverter.WebGlToolBuilder import WebGlToolBuilder
+
+
+def readBinaryExport(path, binaryPath):
+    """ The manifest of writeBinary with all references replaced by the arrays """
+    with open(path) as f:
+        manifest = json.loads(f.read()[len("var data = "):])
+    blob = open(binaryPath, "rb").read()
+    types = {"float32": "<f4", "uint32": "<u4", "uint16": "<u2"}
+
+    def resolve(item):
+        if isinstance(item, list):
+            return [resolve(x) for x in item]
+        if isinstance(item, dict) and "binaryType" in item:
+            return np.frombuffer(blob, dtype=types[item["binaryType"]], count=item["length"], offset=item["offset"])
+        if isinstance(item, dict):
+            return {k: resolve(v) for k, v in item.items()}
+        return item
+    return resolve(manifest)
+
+
+def dequantize(values, parameters):
+    return values.reshape((-1, len(parameters["scale"]))) * parameters["scale"] + parameters["offset"]
+
+
+def test_binaryExportQuantizedLargeDataset(tmp_path):
+    # More than 2^20 position values, i.e. several chunks
+    rng = np.random.default_rng(0)
+    tracks = rng.random((7000, 60, 3)) * [10., 20., 5.]
+    attributes = rng.random((7000, 60, 1))
+    wgb = WebGlToolBuilder()
+    wgb.addTrajectoryDataset(tracks, attributes, ["a"], "tracks", 1.)
+    wgb.setQuantization(16)
+    wgb.writeBinary(str(tmp_path / "data.json"), str(tmp_path / "data.bin"))
+
+    data = readBinaryExport(tmp_path / "data.json", tmp_path / "data.bin")
+    dataset = data["sets"][0]
+    quantization = dataset["quantization"]
+    positions = dataset["states"][0]["positions"][0]
+    assert positions.dtype == np.uint16 and positions.size == tracks.size
+    assert np.abs(dequantize(positions, quantization["positions"]) - tracks.reshape((-1, 3))).max() <= \
+        max(quantization["positions"]["scale"]) / 2 * 1.0001
+    values = dataset["states"][0]["attributes"][0]["values"][0]
+    assert np.abs(dequantize(values, quantization["attributes"]["a"]).reshape(-1) - attributes.reshape(-1)).max() <= \
+        quantization["attributes"]["a"]["scale"][0] / 2 * 1.0001
+    assert np.array_equal(dataset["indices"][0], wgb.tracksToIndices(tracks)[1])